@@ -1,5 +1,6 @@
-from django.contrib import admin
+from django.contrib import admin, messages
 from .models import HistoriaClinica
+from users.directorio import FiltroMedico
 
 @admin.register(HistoriaClinica)
 class HistoriaClinicaAdmin(admin.ModelAdmin):
@@ -14,7 +15,7 @@ class HistoriaClinicaAdmin(admin.ModelAdmin):
 
     # Filtros laterales en el admin
     list_filter = [
-        'medico_responsable',
+        FiltroMedico,
         'fecha_ingreso',
         'tipo_historia',
     ]
@@ -74,3 +75,27 @@ class HistoriaClinicaAdmin(admin.ModelAdmin):
             )
         }),
     )
+
+    # Acciones masivas: solo se eliminan historias sin registros asociados
+    actions = ['eliminar_sin_dependencias']
+
+    def get_actions(self, request):
+        actions = super().get_actions(request)
+        # delete_selected borraría en cascada diagnósticos, citas, etc.
+        actions.pop('delete_selected', None)
+        return actions
+
+    @admin.action(description="Eliminar historias seleccionadas sin registros asociados")
+    def eliminar_sin_dependencias(self, request, queryset):
+        ids = list(queryset.eliminables().values_list('pk', flat=True))
+        omitidas = queryset.count() - len(ids)
+
+        if ids:
+            HistoriaClinica.objects.filter(pk__in=ids).delete()
+            self.message_user(request, f"{len(ids)} historia(s) eliminada(s).", messages.SUCCESS)
+        if omitidas:
+            self.message_user(
+                request,
+                f"{omitidas} historia(s) no se eliminaron porque tienen registros asociados.",
+                messages.WARNING
+            )
@@ -0,0 +1,95 @@
+# =====================================================================
+# Proyecto: SOFT-MEDIC
+# Archivo: historias/agenda.py
+# Versión: 1.0
+# Fecha: 17/10/2026
+# Elaborado por: Prixma Software Projects
+# Revisado por: Dirección Técnica de SOFT-MEDIC
+# =====================================================================
+#
+# Agenda por médico sobre Cita.
+#
+# Cada cita ocupa el intervalo [fecha, fin). Como ninguna cita dura más
+# de DURACION_MAXIMA, las que se cruzan con [desde, hasta) empiezan en
+# [desde - DURACION_MAXIMA, hasta): un rango acotado sobre el índice
+# (medico, fecha), sin recorrer toda la agenda del médico.
+# ---------------------------------------------------------------------
+
+from datetime import timedelta
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.exceptions import ValidationError
+from django.db import transaction
+
+from .models import Cita
+
+DURACION_POR_DEFECTO = timedelta(minutes=getattr(settings, 'AGENDA_DURACION_POR_DEFECTO_MINUTOS', 30))
+DURACION_MAXIMA = timedelta(minutes=getattr(settings, 'AGENDA_DURACION_MAXIMA_MINUTOS', 240))
+
+
+def citas_en_rango(medico_id, desde, hasta):
+    """
+    Citas activas del médico que se cruzan con [desde, hasta),
+    ordenadas por inicio. Una sola consulta por rango de índice.
+    """
+    return (
+        Cita.objects
+        .filter(
+            medico_id=medico_id,
+            fecha__gte=desde - DURACION_MAXIMA,
+            fecha__lt=hasta,
+            fin__gt=desde,
+        )
+        .exclude(estado=Cita.ESTADO_CANCELADA)
+        .order_by('fecha', 'id')
+    )
+
+
+def conflictos(medico_id, inicio, fin, excluir_pk=None):
+    """Citas que impedirían agendar [inicio, fin) al médico."""
+    queryset = citas_en_rango(medico_id, inicio, fin)
+    if excluir_pk:
+        queryset = queryset.exclude(pk=excluir_pk)
+    return queryset
+
+
+def validar_cita(cita):
+    """
+    Valida duración y cruces de una cita. Lanza ValidationError con
+    el detalle de la primera cita en conflicto.
+    """
+    if cita.fecha is None:
+        return
+    fin = cita.fin or cita.fecha + DURACION_POR_DEFECTO
+    if fin <= cita.fecha:
+        raise ValidationError({'fin': "La hora de fin debe ser posterior a la de inicio."})
+    if fin - cita.fecha > DURACION_MAXIMA:
+        raise ValidationError({'fin': f"Una cita no puede durar más de {DURACION_MAXIMA}."})
+
+    if cita.medico_id and cita.estado != Cita.ESTADO_CANCELADA:
+        cruce = conflictos(cita.medico_id, cita.fecha, fin, excluir_pk=cita.pk).only('id', 'fecha', 'fin').first()
+        if cruce:
+            raise ValidationError(
+                f"El médico ya tiene una cita entre {cruce.fecha:%d/%m/%Y %H:%M} y {cruce.fin:%H:%M}."
+            )
+
+
+def agendar_cita(historia, medico, inicio, fin=None, motivo=''):
+    """
+    Crea una cita validando cruces dentro de una transacción. En motores
+    con bloqueo de filas se bloquea al médico para serializar reservas
+    simultáneas; SQLite ya serializa las escrituras.
+    """
+    with transaction.atomic():
+        get_user_model().objects.select_for_update().filter(pk=medico.pk).exists()
+        cita = Cita(historia=historia, medico=medico, fecha=inicio, fin=fin, motivo=motivo)
+        validar_cita(cita)
+        cita.save()
+    return cita
+
+
+def cancelar_cita(cita):
+    cita.estado = Cita.ESTADO_CANCELADA
+    cita.save(update_fields=['estado'])
+    return cita
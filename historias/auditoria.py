@@ -0,0 +1,362 @@
+# =====================================================================
+# Proyecto: SOFT-MEDIC
+# Archivo: historias/auditoria.py
+# Versión: 1.3
+# Fecha: 17/10/2026
+# Elaborado por: Prixma Software Projects
+# Revisado por: Dirección Técnica de SOFT-MEDIC
+# =====================================================================
+#
+# Escritura de auditoría fuera del ciclo de la petición.
+#
+# Los receptores de señales (historias/signals/auditoria.py) solo
+# encolan una tupla compacta al confirmarse la transacción. Un hilo
+# escritor agrupa los registros y los inserta con bulk_create en
+# AuditoriaEliminacion o AuditoriaCambio, y emite la línea
+# correspondiente en el logger 'audit'. Cada evento se agrega además a
+# la cadena de hashes (historias/cadena_auditoria.py); la línea del log
+# lleva su número de eslabón. Al terminar el proceso (atexit) la cola
+# se vacía antes de salir.
+#
+# Si la base de datos no responde (bloqueada o caída), el lote se
+# reintenta con espera exponencial y, si sigue fallando, se guarda en un
+# archivo de AUDITORIA_PENDIENTES_DIR que se reprocesa antes del
+# siguiente lote. Ningún evento confirmado se descarta.
+#
+# El usuario que actúa se toma de una variable de contexto que fija
+# UsuarioAuditoriaMiddleware (historias/middleware.py).
+#
+# Con AUDITORIA_ASINCRONA = False (pruebas) se escribe en el acto.
+# ---------------------------------------------------------------------
+
+import atexit
+import itertools
+import json
+import logging
+import os
+import queue
+import threading
+import time
+from collections import namedtuple
+from contextvars import ContextVar
+from functools import partial
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import connection, transaction
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+logger = logging.getLogger('audit')
+
+LOTE = getattr(settings, 'AUDITORIA_LOTE', 200)
+INTERVALO = getattr(settings, 'AUDITORIA_INTERVALO_SEGUNDOS', 1.0)
+CAPACIDAD_COLA = 10000
+REINTENTOS = 3
+# Segundos antes del primer reintento; se duplica en cada intento
+ESPERA_REINTENTO = 0.5
+# Un archivo reclamado por más de este tiempo (proceso caído) vuelve a quedar pendiente
+RECLAMO_VENCIDO = 600
+
+# Id del usuario autenticado de la petición en curso (o None)
+usuario_actual = ContextVar('usuario_auditoria', default=None)
+
+RegistroEliminacion = namedtuple(
+    'RegistroEliminacion', ['modelo', 'objeto_id', 'historia_id', 'descripcion', 'usuario_id', 'fecha']
+)
+
+RegistroCambio = namedtuple(
+    'RegistroCambio', ['modelo', 'objeto_id', 'historia_id', 'cambios', 'usuario_id', 'fecha']
+)
+
+_FIN = object()
+
+
+def _linea(registro):
+    if isinstance(registro, RegistroEliminacion):
+        accion, detalle = "eliminado", registro.descripcion
+    else:
+        accion, detalle = "modificado", f"Campos: {', '.join(registro.cambios)}"
+    return (
+        f"[AUDITORÍA] {registro.modelo} {accion} | ID {registro.objeto_id} | Historia {registro.historia_id} | "
+        f"{detalle} | Usuario: {registro.usuario_id or 'Desconocido'} | Fecha: {registro.fecha}"
+    )
+
+
+def _guardar(registros):
+    from .cadena_auditoria import encadenar
+    from .models import AuditoriaEliminacion, AuditoriaCambio
+
+    eliminaciones = [r for r in registros if isinstance(r, RegistroEliminacion)]
+    cambios = [r for r in registros if isinstance(r, RegistroCambio)]
+
+    with transaction.atomic():
+        if eliminaciones:
+            AuditoriaEliminacion.objects.bulk_create([
+                AuditoriaEliminacion(
+                    modelo_afectado=r.modelo,
+                    objeto_id=str(r.objeto_id),
+                    historia_id=r.historia_id,
+                    descripcion=r.descripcion,
+                    usuario_id=r.usuario_id,
+                    fecha=r.fecha,
+                )
+                for r in eliminaciones
+            ])
+        if cambios:
+            AuditoriaCambio.objects.bulk_create([
+                AuditoriaCambio(
+                    modelo_afectado=r.modelo,
+                    objeto_id=str(r.objeto_id),
+                    historia_id=r.historia_id,
+                    cambios=r.cambios,
+                    usuario_id=r.usuario_id,
+                    fecha=r.fecha,
+                )
+                for r in cambios
+            ])
+        # Cada evento queda también en la cadena de hashes (historias/cadena_auditoria.py),
+        # con la línea del log para poder verificar logs/audit.log
+        lineas = [_linea(r) for r in registros]
+        secuencias = encadenar([
+            {'tipo': type(r).__name__, **r._asdict(), 'linea': linea} for r, linea in zip(registros, lineas)
+        ])
+
+    for linea, secuencia in zip(lineas, secuencias):
+        logger.info(f"{linea} | Eslabón {secuencia}")
+
+
+# ------------------------------------------------------------
+# Lotes pendientes en disco
+# ------------------------------------------------------------
+
+_TIPOS = {tipo.__name__: tipo for tipo in (RegistroEliminacion, RegistroCambio)}
+_numero_archivo = itertools.count()
+
+
+def _directorio_pendientes():
+    return str(settings.AUDITORIA_PENDIENTES_DIR)
+
+
+def _deserializar(linea):
+    datos = json.loads(linea)
+    tipo = _TIPOS[datos.pop('tipo')]
+    datos['fecha'] = parse_datetime(datos['fecha'])
+    return tipo(**datos)
+
+
+def derramar(registros):
+    """
+    Guarda en disco un lote que no se pudo escribir en la base de datos.
+    El archivo se publica completo (rename) y no se modifica después.
+    """
+    directorio = _directorio_pendientes()
+    os.makedirs(directorio, exist_ok=True)
+    # El nombre empieza por la hora: el orden alfabético es el de llegada
+    ruta = os.path.join(directorio, f"{time.time_ns():020d}-{os.getpid()}-{next(_numero_archivo)}.jsonl")
+    with open(f"{ruta}.part", 'w', encoding='utf-8') as archivo:
+        for registro in registros:
+            archivo.write(json.dumps({'tipo': type(registro).__name__, **registro._asdict()}, cls=DjangoJSONEncoder))
+            archivo.write('\n')
+        archivo.flush()
+        os.fsync(archivo.fileno())
+    os.replace(f"{ruta}.part", ruta)
+    return ruta
+
+
+def reprocesar_pendientes():
+    """
+    Guarda los lotes pendientes, del más antiguo al más reciente. Cada
+    archivo se reclama con un rename atómico (un solo proceso lo toma);
+    si el guardado falla vuelve a quedar pendiente y se propaga el error.
+    Devuelve la cantidad de registros guardados.
+    """
+    directorio = _directorio_pendientes()
+    try:
+        nombres = sorted(os.listdir(directorio))
+    except FileNotFoundError:
+        return 0
+
+    total = 0
+    for nombre in nombres:
+        ruta = os.path.join(directorio, nombre)
+        if nombre.endswith('.reclamado'):
+            try:
+                if time.time() - os.path.getmtime(ruta) > RECLAMO_VENCIDO:
+                    os.replace(ruta, os.path.join(directorio, nombre.rsplit('.', 2)[0]))
+            except FileNotFoundError:
+                pass
+            continue
+        if not nombre.endswith('.jsonl'):
+            continue
+
+        reclamado = f"{ruta}.{os.getpid()}.reclamado"
+        try:
+            os.replace(ruta, reclamado)
+        except FileNotFoundError:
+            continue  # Lo tomó otro proceso
+        os.utime(reclamado)
+
+        try:
+            with open(reclamado, encoding='utf-8') as archivo:
+                registros = [_deserializar(linea) for linea in archivo if linea.strip()]
+        except (ValueError, KeyError, TypeError):
+            os.replace(reclamado, f"{ruta}.invalido")
+            logger.error(f"Archivo de auditoría pendiente ilegible, apartado como {ruta}.invalido")
+            continue
+        try:
+            _guardar(registros)
+        except Exception:
+            os.replace(reclamado, ruta)
+            raise
+        os.remove(reclamado)
+        total += len(registros)
+    return total
+
+
+class EscritorAuditoria(threading.Thread):
+    """Hilo que vacía la cola de auditoría por lotes."""
+
+    def __init__(self, lote=LOTE, intervalo=INTERVALO):
+        super().__init__(name='escritor-auditoria', daemon=True)
+        self.cola = queue.Queue(maxsize=CAPACIDAD_COLA)
+        self.lote = lote
+        self.intervalo = intervalo
+        # Al iniciar se adoptan los pendientes que hayan quedado de antes
+        self.hay_pendientes = True
+
+    def encolar(self, registro):
+        try:
+            self.cola.put_nowait(registro)
+        except queue.Full:
+            # Sin espacio: se escribe en el hilo actual antes que perderlo
+            self._escribir([registro])
+
+    def _reprocesar(self):
+        if self.hay_pendientes:
+            reprocesar_pendientes()
+            self.hay_pendientes = False
+
+    def _escribir(self, registros):
+        """
+        Guarda el lote (después de los pendientes, para conservar el
+        orden) con reintentos; si la base de datos sigue sin responder,
+        el lote se guarda en disco.
+        """
+        espera = ESPERA_REINTENTO
+        for intento in range(REINTENTOS):
+            try:
+                self._reprocesar()
+                _guardar(registros)
+                return
+            except Exception as error:
+                ultimo_error = error
+                connection.close_if_unusable_or_obsolete()
+                if intento + 1 < REINTENTOS:
+                    time.sleep(espera)
+                    espera *= 2
+
+        try:
+            ruta = derramar(registros)
+        except OSError:
+            logger.exception(f"No se pudieron guardar {len(registros)} registros de auditoría: {registros}")
+            return
+        self.hay_pendientes = True
+        logger.error(
+            f"Base de datos no disponible: {len(registros)} registros de auditoría guardados en {ruta} "
+            f"para reprocesar.",
+            exc_info=ultimo_error,
+        )
+
+    def run(self):
+        terminar = False
+        try:
+            while not terminar:
+                registros = []
+                limite = time.monotonic() + self.intervalo
+                while len(registros) < self.lote:
+                    espera = limite - time.monotonic()
+                    try:
+                        elemento = self.cola.get(timeout=max(espera, 0)) if espera > 0 else self.cola.get_nowait()
+                    except queue.Empty:
+                        break
+                    if elemento is _FIN:
+                        terminar = True
+                        break
+                    registros.append(elemento)
+                if registros:
+                    self._escribir(registros)
+                elif self.hay_pendientes:
+                    try:
+                        self._reprocesar()
+                    except Exception:
+                        connection.close_if_unusable_or_obsolete()
+        finally:
+            connection.close()
+
+    def detener(self, espera=10):
+        """Vacía la cola pendiente y termina el hilo."""
+        self.cola.put(_FIN)
+        self.join(espera)
+
+
+_escritor = None
+_candado = threading.Lock()
+
+
+def obtener_escritor():
+    """Escritor del proceso, iniciado la primera vez que se necesita."""
+    global _escritor
+    with _candado:
+        if _escritor is None or not _escritor.is_alive():
+            _escritor = EscritorAuditoria()
+            _escritor.start()
+        return _escritor
+
+
+@atexit.register
+def detener_escritor():
+    global _escritor
+    with _candado:
+        escritor, _escritor = _escritor, None
+    if escritor is not None and escritor.is_alive():
+        escritor.detener()
+
+
+def _encolar(registro):
+    if getattr(settings, 'AUDITORIA_ASINCRONA', True):
+        obtener_escritor().encolar(registro)
+    else:
+        _guardar([registro])
+
+
+def registrar_eliminacion(modelo, objeto_id, historia_id=None, descripcion=''):
+    """
+    Registra una eliminación cuando se confirme la transacción en curso
+    (las eliminaciones revertidas no se auditan).
+    """
+    registro = RegistroEliminacion(
+        modelo, objeto_id, historia_id, descripcion, usuario_actual.get(), timezone.now()
+    )
+    transaction.on_commit(partial(_encolar, registro))
+
+
+def registrar_cambios(modelo, objeto_id, historia_id, cambios):
+    """
+    Registra los campos modificados de un objeto ({campo: [antes, después]})
+    cuando se confirme la transacción en curso.
+    """
+    registro = RegistroCambio(
+        modelo, objeto_id, historia_id, cambios, usuario_actual.get(), timezone.now()
+    )
+    transaction.on_commit(partial(_encolar, registro))
+
+
+# =====================================================================
+# CONTROL DE CAMBIOS
+# =====================================================================
+# Versión | Fecha       | Autor / Responsable      | Descripción
+# 1.0     | 17/10/2026  | Prixma Software Projects | Escritor por lotes de eliminaciones
+# 1.1     | 17/10/2026  | Prixma Software Projects | Registros de cambios por campo (AuditoriaCambio)
+# 1.2     | 17/10/2026  | Prixma Software Projects | Eventos encadenados por hash; eslabón en cada línea del log
+# 1.3     | 17/10/2026  | Prixma Software Projects | Reintentos y lotes pendientes en disco si la base de datos falla
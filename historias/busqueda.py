@@ -0,0 +1,290 @@
+# =====================================================================
+# Proyecto: SOFT-MEDIC
+# Archivo: historias/busqueda.py
+# Versión: 1.2
+# Fecha: 17/10/2026
+# Elaborado por: Prixma Software Projects
+# Revisado por: Dirección Técnica de SOFT-MEDIC
+# =====================================================================
+#
+# Búsqueda de texto completo sobre la narrativa clínica.
+#
+# El backend se elige con settings.HISTORIAS_BUSQUEDA_BACKEND:
+#   - SQLiteFTS5Backend: índice FTS5 (tabla virtual historias_busqueda_fts)
+#     cuyo rowid es el id de la historia.
+#   - BackendNulo: sin índice; búsqueda por icontains (otros motores).
+#
+# El índice se mantiene de forma incremental con señales
+# (historias/signals/busqueda.py) y se reconstruye por lotes con
+# `python manage.py reconstruir_indice_busqueda`.
+#
+# En SQLite la reconstrucción no retiene el bloqueo de escritura: se
+# construye una tabla sombra con un lote por transacción (las escrituras
+# incrementales de ese intervalo van a ambas tablas) y al final se
+# sustituye la tabla vigente en una transacción corta.
+# ---------------------------------------------------------------------
+
+import re
+from abc import ABC, abstractmethod
+from collections import defaultdict
+from functools import lru_cache
+
+from django.conf import settings
+from django.core.exceptions import EmptyResultSet
+from django.db import connection, transaction
+from django.db.models import Q
+from django.utils.module_loading import import_string
+
+from .models import HistoriaClinica, Observacion
+
+# Campos de HistoriaClinica incluidos en el índice (en este orden)
+CAMPOS_INDEXADOS = (
+    'motivo_consulta',
+    'resumen_clinico',
+    'sintomas_principales',
+    'examen_fisico',
+    'plan_manejo',
+)
+
+BACKEND_POR_DEFECTO = 'historias.busqueda.SQLiteFTS5Backend'
+
+_TERMINO = re.compile(r'\w+', re.UNICODE)
+
+
+class BackendBusqueda(ABC):
+    """Interfaz común de los backends de búsqueda clínica."""
+
+    @abstractmethod
+    def indexar(self, historia_ids):
+        """(Re)indexa las historias indicadas; las inexistentes se retiran."""
+
+    @abstractmethod
+    def eliminar(self, historia_ids):
+        """Retira las historias indicadas del índice."""
+
+    @abstractmethod
+    def buscar(self, consulta, queryset, limite=20, desplazamiento=0):
+        """
+        Retorna [(historia_id, puntaje, fragmento)] ordenado por relevancia,
+        restringido a las historias de `queryset` (visibilidad del usuario).
+        """
+
+    @abstractmethod
+    def vaciar(self):
+        """Retira todas las historias del índice."""
+
+    def optimizar(self):
+        """Compacta el índice tras una reconstrucción (opcional)."""
+
+    def reconstruir(self, lotes):
+        """
+        Reindexa todas las historias a partir de `lotes` (listas de ids).
+        Por omisión vacía y recarga en una sola transacción, de modo que
+        las búsquedas nunca ven el índice vacío ni a medias.
+        """
+        with transaction.atomic():
+            self.vaciar()
+            for ids in lotes:
+                self.indexar(ids)
+        self.optimizar()
+
+
+class BackendNulo(BackendBusqueda):
+    """Sin índice: útil con motores que no soportan FTS5."""
+
+    def indexar(self, historia_ids):
+        pass
+
+    def eliminar(self, historia_ids):
+        pass
+
+    def vaciar(self):
+        pass
+
+    def buscar(self, consulta, queryset, limite=20, desplazamiento=0):
+        filtro = Q()
+        for termino in _TERMINO.findall(consulta):
+            coincide = Q(observaciones__detalle__icontains=termino)
+            for campo in CAMPOS_INDEXADOS:
+                coincide |= Q(**{f'{campo}__icontains': termino})
+            filtro &= coincide
+        if not filtro:
+            return []
+        ids = (
+            queryset.filter(filtro).distinct()
+            .order_by('-fecha_ingreso', '-id')
+            .values_list('pk', flat=True)[desplazamiento:desplazamiento + limite]
+        )
+        return [(pk, 0.0, '') for pk in ids]
+
+
+class SQLiteFTS5Backend(BackendBusqueda):
+    """Índice FTS5 de SQLite con ranking BM25."""
+
+    tabla = 'historias_busqueda_fts'
+    # Tabla que se llena durante una reconstrucción
+    sombra = 'historias_busqueda_fts_nueva'
+    columnas = CAMPOS_INDEXADOS + ('observaciones',)
+    tokenizador = 'unicode61 remove_diacritics 2'
+    # Peso BM25 por columna: el motivo de consulta pesa más
+    pesos = (2.0, 1.0, 1.0, 1.0, 1.0, 0.5)
+
+    @staticmethod
+    def expresion_match(consulta):
+        """
+        Convierte el texto del usuario en una expresión FTS5 segura:
+        cada término entre comillas y con prefijo (AND implícito).
+        """
+        terminos = _TERMINO.findall(consulta)
+        return ' '.join(f'"{termino}"*' for termino in terminos)
+
+    def _filas(self, historia_ids):
+        observaciones = defaultdict(list)
+        for historia_id, detalle in (
+            Observacion.objects.filter(historia_id__in=historia_ids)
+            .order_by('historia_id', 'id')
+            .values_list('historia_id', 'detalle')
+        ):
+            observaciones[historia_id].append(detalle or '')
+
+        for fila in HistoriaClinica.objects.filter(pk__in=historia_ids).order_by().values_list('pk', *CAMPOS_INDEXADOS):
+            pk, textos = fila[0], [texto or '' for texto in fila[1:]]
+            yield [pk, *textos, '\n'.join(observaciones.get(pk, []))]
+
+    def _tablas(self, cursor):
+        """Tabla del índice y, si hay una reconstrucción en curso, la sombra."""
+        cursor.execute("SELECT name FROM sqlite_master WHERE type = 'table' AND name = %s", [self.sombra])
+        return [self.tabla] + [fila[0] for fila in cursor.fetchall()]
+
+    def _escribir(self, cursor, tablas, historia_ids):
+        filas = list(self._filas(historia_ids))
+        marcadores = ', '.join(['%s'] * len(self.columnas))
+        for tabla in tablas:
+            self._eliminar(cursor, tabla, historia_ids)
+            cursor.executemany(
+                f"INSERT INTO {tabla} (rowid, {', '.join(self.columnas)}) VALUES (%s, {marcadores})", filas
+            )
+
+    def indexar(self, historia_ids):
+        historia_ids = list(historia_ids)
+        if not historia_ids:
+            return
+        with transaction.atomic(), connection.cursor() as cursor:
+            self._escribir(cursor, self._tablas(cursor), historia_ids)
+
+    def _eliminar(self, cursor, tabla, historia_ids):
+        marcadores = ', '.join(['%s'] * len(historia_ids))
+        cursor.execute(f"DELETE FROM {tabla} WHERE rowid IN ({marcadores})", historia_ids)
+
+    def eliminar(self, historia_ids):
+        historia_ids = list(historia_ids)
+        if historia_ids:
+            with transaction.atomic(), connection.cursor() as cursor:
+                for tabla in self._tablas(cursor):
+                    self._eliminar(cursor, tabla, historia_ids)
+
+    def vaciar(self):
+        with connection.cursor() as cursor:
+            cursor.execute(f"DELETE FROM {self.tabla}")
+
+    def optimizar(self, tabla=None):
+        tabla = tabla or self.tabla
+        with connection.cursor() as cursor:
+            cursor.execute(f"INSERT INTO {tabla} ({tabla}) VALUES ('optimize')")
+
+    def reconstruir(self, lotes):
+        """
+        Llena la tabla sombra con un lote por transacción y la pone en
+        lugar del índice vigente (DROP + RENAME) en una transacción
+        corta. Si algo falla se descarta la sombra y el índice queda
+        como estaba.
+        """
+        with connection.cursor() as cursor:
+            # Restos de una reconstrucción interrumpida
+            cursor.execute(f"DROP TABLE IF EXISTS {self.sombra}")
+            cursor.execute(
+                f"CREATE VIRTUAL TABLE {self.sombra} USING fts5("
+                f"{', '.join(self.columnas)}, tokenize='{self.tokenizador}')"
+            )
+        try:
+            for ids in lotes:
+                with transaction.atomic(), connection.cursor() as cursor:
+                    self._escribir(cursor, [self.sombra], ids)
+            self.optimizar(self.sombra)
+            with transaction.atomic(), connection.cursor() as cursor:
+                cursor.execute(f"DROP TABLE {self.tabla}")
+                cursor.execute(f"ALTER TABLE {self.sombra} RENAME TO {self.tabla}")
+        except BaseException:
+            with connection.cursor() as cursor:
+                cursor.execute(f"DROP TABLE IF EXISTS {self.sombra}")
+            raise
+
+    def buscar(self, consulta, queryset, limite=20, desplazamiento=0):
+        expresion = self.expresion_match(consulta)
+        if not expresion:
+            return []
+
+        sql = (
+            f"SELECT rowid, bm25({self.tabla}, {', '.join(str(p) for p in self.pesos)}) AS puntaje, "
+            f"snippet({self.tabla}, -1, '[', ']', '…', 16) "
+            f"FROM {self.tabla} WHERE {self.tabla} MATCH %s"
+        )
+        parametros = [expresion]
+
+        # Restricción de visibilidad: subconsulta con los ids permitidos
+        if queryset.query.where:
+            try:
+                sql_visibles, parametros_visibles = queryset.order_by().values('pk').query.sql_with_params()
+            except EmptyResultSet:
+                return []
+            sql += f" AND rowid IN ({sql_visibles})"
+            parametros.extend(parametros_visibles)
+
+        sql += " ORDER BY puntaje LIMIT %s OFFSET %s"
+        parametros.extend([limite, desplazamiento])
+
+        with connection.cursor() as cursor:
+            cursor.execute(sql, parametros)
+            return [(fila[0], fila[1], fila[2]) for fila in cursor.fetchall()]
+
+
+@lru_cache(maxsize=None)
+def _backend(ruta):
+    return import_string(ruta)()
+
+
+def obtener_backend():
+    """Instancia (compartida) del backend configurado."""
+    return _backend(getattr(settings, 'HISTORIAS_BUSQUEDA_BACKEND', BACKEND_POR_DEFECTO))
+
+
+def reconstruir_indice(lote=1000, progreso=None):
+    """
+    Reindexa todas las historias por lotes de `lote` ids, recorriendo
+    la tabla por clave primaria. `progreso(n)` recibe el total acumulado
+    después de indexar cada lote.
+
+    Las búsquedas concurrentes ven el índice anterior hasta el final,
+    nunca uno vacío o a medias, y un fallo a mitad de camino lo deja
+    como estaba (ver BackendBusqueda.reconstruir).
+    """
+    total = 0
+
+    def lotes():
+        nonlocal total
+        ultimo = 0
+        while True:
+            ids = list(
+                HistoriaClinica.objects.filter(pk__gt=ultimo)
+                .order_by('pk').values_list('pk', flat=True)[:lote]
+            )
+            if not ids:
+                return
+            yield ids
+            ultimo = ids[-1]
+            total += len(ids)
+            if progreso:
+                progreso(total)
+
+    obtener_backend().reconstruir(lotes())
+    return total
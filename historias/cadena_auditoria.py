@@ -0,0 +1,321 @@
+# =====================================================================
+# Proyecto: SOFT-MEDIC
+# Archivo: historias/cadena_auditoria.py
+# Versión: 1.2
+# Fecha: 17/10/2026
+# Elaborado por: Prixma Software Projects
+# Revisado por: Dirección Técnica de SOFT-MEDIC
+# =====================================================================
+#
+# Cadena de hashes de la auditoría (evidencia de manipulación).
+#
+# Cada evento que escribe el escritor de auditoría se agrega también
+# como un EslabonAuditoria:
+#
+#     hash_n = SHA-256(hash_{n-1} | n | contenido_n)
+#
+# Cada PUNTO_CONTROL_CADA eslabones se guarda un PuntoControlAuditoria
+# con el hash en esa secuencia, firmado con HMAC (SECRET_KEY). Sin la
+# clave no se puede rehacer la cadena y firmar puntos nuevos.
+#
+# Verificación (comando verificar_auditoria):
+#   - Incremental: desde el último punto de control ya verificado hasta
+#     el final. El costo depende de lo agregado, no del total.
+#   - Completa: cada tramo entre puntos de control empieza en un hash
+#     firmado conocido, así que los tramos se verifican en paralelo
+#     (solo si hay al menos VERIFICACION_PARALELA_DESDE eslabones).
+#   - Log: cada evento guarda en la cadena la línea que se escribió en
+#     logs/audit.log (" | Eslabón N" al final). verificar_log compara el
+#     archivo (vivo y segmentos archivados) con la cadena: líneas
+#     alteradas, líneas sin eslabón y eslabones sin su línea. Las demás
+#     líneas del logger 'audit' (errores, avisos) no están en la cadena y
+#     solo se cuentan. El log se recorre en orden junto con la cadena
+#     (por lotes de `secuencia`): en memoria solo queda una ventana de
+#     VENTANA_LOG secuencias para las líneas que los escritores
+#     concurrentes dejaron fuera de orden.
+#
+# Dos escritores pueden leer el mismo último eslabón (select_for_update
+# no bloquea en SQLite); el que llega segundo choca con la clave
+# `secuencia` y reintenta desde el nuevo final.
+# ---------------------------------------------------------------------
+
+import hashlib
+import hmac
+import json
+import re
+from collections import deque, namedtuple
+from concurrent.futures import ProcessPoolExecutor
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import IntegrityError, connections, transaction
+from django.utils import timezone
+from django.utils.crypto import salted_hmac
+
+GENESIS = '0' * 64
+PUNTO_CONTROL_CADA = getattr(settings, 'AUDITORIA_PUNTO_CONTROL_CADA', 1000)
+SAL_FIRMA = 'historias.cadena_auditoria.punto_control'
+REINTENTOS_ENCADENAR = 5
+VERIFICACION_PARALELA_DESDE = 100000
+# Secuencias que se leen del log por delante del eslabón que se compara
+VENTANA_LOG = 10000
+LOTE_VERIFICACION_LOG = 2000
+
+# Línea de un evento en el log: "<módulo> - [AUDITORÍA] ... | Eslabón N"
+LINEA_EVENTO = re.compile(r'^(?P<linea>\[AUDITORÍA\] .*) \| Eslabón (?P<secuencia>\d+)$')
+
+# Tramo de la cadena: eslabones (secuencia, contenido, hash) en (desde, hasta]
+Tramo = namedtuple('Tramo', ['desde', 'hasta', 'hash_inicial', 'eslabones'])
+
+
+def serializar(evento):
+    """Texto canónico de un evento (claves ordenadas)."""
+    return json.dumps(evento, cls=DjangoJSONEncoder, sort_keys=True, ensure_ascii=False)
+
+
+def calcular_hash(hash_anterior, secuencia, contenido):
+    return hashlib.sha256(f"{hash_anterior}|{secuencia}|{contenido}".encode('utf-8')).hexdigest()
+
+
+def firmar(secuencia, hash_):
+    return salted_hmac(SAL_FIRMA, f"{secuencia}:{hash_}", algorithm='sha256').hexdigest()
+
+
+def firma_valida(punto):
+    return hmac.compare_digest(punto.firma, firmar(punto.secuencia, punto.hash))
+
+
+def _ultimo_eslabon():
+    from .models import EslabonAuditoria
+
+    ultimo = (
+        EslabonAuditoria.objects.select_for_update()
+        .order_by('-secuencia').values_list('secuencia', 'hash').first()
+    )
+    return ultimo or (0, GENESIS)
+
+
+def encadenar(eventos):
+    """
+    Agrega los eventos (dicts) al final de la cadena y crea los puntos
+    de control que correspondan. Se llama dentro de la transacción del
+    escritor de auditoría; devuelve las secuencias asignadas. Si otro
+    escritor agregó eslabones entre la lectura y la inserción, se
+    reintenta (en un savepoint) desde el nuevo final.
+    """
+    for intento in range(REINTENTOS_ENCADENAR):
+        try:
+            with transaction.atomic():
+                return _agregar(eventos)
+        except IntegrityError:
+            if intento + 1 == REINTENTOS_ENCADENAR:
+                raise
+
+
+def _agregar(eventos):
+    from .models import EslabonAuditoria, PuntoControlAuditoria
+
+    secuencia, hash_ = _ultimo_eslabon()
+
+    eslabones, puntos = [], []
+    for evento in eventos:
+        secuencia += 1
+        contenido = serializar(evento)
+        hash_ = calcular_hash(hash_, secuencia, contenido)
+        eslabones.append(EslabonAuditoria(secuencia=secuencia, contenido=contenido, hash=hash_))
+        if secuencia % PUNTO_CONTROL_CADA == 0:
+            puntos.append(PuntoControlAuditoria(secuencia=secuencia, hash=hash_, firma=firmar(secuencia, hash_)))
+
+    EslabonAuditoria.objects.bulk_create(eslabones)
+    PuntoControlAuditoria.objects.bulk_create(puntos)
+    return [eslabon.secuencia for eslabon in eslabones]
+
+
+def verificar_tramo(tramo):
+    """
+    Recalcula los hashes de un tramo. Devuelve (hash final, errores).
+    Función pura: se puede ejecutar en otro proceso.
+    """
+    errores = []
+    esperada, hash_ = tramo.desde + 1, tramo.hash_inicial
+    for secuencia, contenido, guardado in tramo.eslabones:
+        if secuencia != esperada:
+            errores.append(f"Faltan los eslabones {esperada} a {secuencia - 1}.")
+        hash_ = calcular_hash(hash_, secuencia, contenido)
+        if not hmac.compare_digest(hash_, guardado):
+            errores.append(f"Eslabón {secuencia}: el hash no coincide.")
+            # Se continúa con el hash guardado para no repetir el error en todo el tramo
+            hash_ = guardado
+        esperada = secuencia + 1
+    if tramo.hasta is not None and esperada != tramo.hasta + 1:
+        errores.append(f"Faltan los eslabones {esperada} a {tramo.hasta}.")
+    return hash_, errores
+
+
+def _tramos(puntos, desde, hash_inicial):
+    """Tramos de la cadena a partir de `desde`, cortados en cada punto de control."""
+    from .models import EslabonAuditoria
+
+    limites = [(p.secuencia, p) for p in puntos if p.secuencia > desde] + [(None, None)]
+    for hasta, punto in limites:
+        consulta = EslabonAuditoria.objects.filter(secuencia__gt=desde)
+        if hasta is not None:
+            consulta = consulta.filter(secuencia__lte=hasta)
+        eslabones = list(consulta.order_by('secuencia').values_list('secuencia', 'contenido', 'hash'))
+        yield Tramo(desde, hasta, hash_inicial, eslabones), punto
+        if punto is not None:
+            desde, hash_inicial = punto.secuencia, punto.hash
+
+
+def _resultados(tramos, procesos):
+    """(tramo, punto, (hash final, errores)) de cada tramo, en orden."""
+    if procesos <= 1:
+        for tramo, punto in tramos:
+            yield tramo, punto, verificar_tramo(tramo)
+        return
+
+    # Los hijos solo calculan hashes: no heredan conexiones abiertas.
+    # Se mantienen pocos tramos en vuelo para acotar la memoria.
+    connections.close_all()
+    with ProcessPoolExecutor(max_workers=procesos) as ejecutor:
+        pendientes = deque()
+        for tramo, punto in tramos:
+            pendientes.append((tramo, punto, ejecutor.submit(verificar_tramo, tramo)))
+            if len(pendientes) >= procesos * 2:
+                tramo, punto, futuro = pendientes.popleft()
+                yield tramo, punto, futuro.result()
+        while pendientes:
+            tramo, punto, futuro = pendientes.popleft()
+            yield tramo, punto, futuro.result()
+
+
+def verificar(completa=False, procesos=1):
+    """
+    Verifica la cadena y marca como verificados los puntos de control
+    cubiertos. Por defecto parte del último punto verificado; con
+    `completa` revisa toda la cadena, en `procesos` procesos si es lo
+    bastante larga. Devuelve (eslabones revisados, errores).
+    """
+    from .models import EslabonAuditoria, PuntoControlAuditoria
+
+    puntos = list(PuntoControlAuditoria.objects.order_by('secuencia'))
+    errores = [f"Punto de control {p.secuencia}: firma inválida." for p in puntos if not firma_valida(p)]
+
+    desde, hash_inicial = 0, GENESIS
+    if not completa:
+        verificados = [p for p in puntos if p.verificado_en is not None and firma_valida(p)]
+        if verificados:
+            desde, hash_inicial = verificados[-1].secuencia, verificados[-1].hash
+
+    if not completa or procesos > 1 and (
+        EslabonAuditoria.objects.filter(secuencia__gt=desde).count() < VERIFICACION_PARALELA_DESDE
+    ):
+        # Arrancar un pool cuesta más que verificar pocos eslabones
+        procesos = 1
+
+    revisados, correctos = 0, []
+    for tramo, punto, (hash_final, errores_tramo) in _resultados(_tramos(puntos, desde, hash_inicial), procesos):
+        revisados += len(tramo.eslabones)
+        errores.extend(errores_tramo)
+        if punto is None:
+            continue
+        if not hmac.compare_digest(hash_final, punto.hash):
+            errores.append(f"Punto de control {punto.secuencia}: la cadena no llega a su hash.")
+        elif not errores_tramo and firma_valida(punto):
+            correctos.append(punto.pk)
+
+    if not errores and correctos:
+        PuntoControlAuditoria.objects.filter(pk__in=correctos).update(verificado_en=timezone.now())
+    return revisados, errores
+
+
+def verificar_log(ruta_log):
+    """
+    Compara las líneas de eventos de `ruta_log` (archivo vivo y
+    segmentos archivados) con la línea guardada en cada eslabón.
+    Devuelve (líneas de eventos revisadas, líneas sin eslabón, errores).
+    Los eventos anteriores a que la cadena guardara su línea no se
+    pueden comparar y se omiten. Una línea que aparece más de
+    VENTANA_LOG secuencias después de su lugar se informa como fuera
+    de orden.
+    """
+    from users.archivo_logs import buscar
+
+    from .models import EslabonAuditoria
+
+    errores, otras, revisadas = [], 0, 0
+    ventana = {}  # secuencia -> línea leída y aún no comparada
+    ultima, procesada, agotado = None, 0, False
+
+    def eventos():
+        nonlocal otras
+        for _, entrada in buscar(ruta_log, logger='audit'):
+            coincidencia = LINEA_EVENTO.match(entrada.mensaje.partition(' - ')[2])
+            if coincidencia is None:
+                otras += 1
+            else:
+                yield int(coincidencia['secuencia']), coincidencia['linea']
+
+    log = eventos()
+
+    def leer_hasta(limite):
+        """Lee el log hasta pasar la secuencia `limite` o agotarlo."""
+        nonlocal ultima, agotado, revisadas
+        while not agotado and (ultima is None or ultima <= limite):
+            evento = next(log, None)
+            if evento is None:
+                agotado = True
+                return
+            ultima, linea = evento
+            revisadas += 1
+            if ultima in ventana or ultima <= procesada:
+                errores.append(f"Eslabón {ultima}: la línea aparece repetida o fuera de orden en el log.")
+            else:
+                ventana[ultima] = linea
+
+    # La comparación empieza en la primera secuencia del log (los
+    # segmentos más antiguos pueden haberse eliminado)
+    leer_hasta(0)
+    if ultima is not None:
+        leer_hasta(ultima + VENTANA_LOG)
+    siguiente = min(ventana, default=0)
+
+    while True:
+        lote = list(
+            EslabonAuditoria.objects.filter(secuencia__gte=siguiente)
+            .order_by('secuencia').values_list('secuencia', 'contenido')[:LOTE_VERIFICACION_LOG]
+        )
+        if not lote:
+            break
+        for secuencia, contenido in lote:
+            leer_hasta(secuencia + VENTANA_LOG)
+            procesada = secuencia
+            linea = ventana.pop(secuencia, None)
+            esperada = json.loads(contenido).get('linea')
+            if esperada is None:
+                continue
+            if linea is None:
+                errores.append(f"Eslabón {secuencia}: falta su línea en el log.")
+            elif not hmac.compare_digest(linea.encode('utf-8'), esperada.encode('utf-8')):
+                errores.append(f"Eslabón {secuencia}: la línea del log fue alterada.")
+        siguiente = lote[-1][0] + 1
+
+    # Lo que queda del log está más allá del final de la cadena
+    for secuencia in sorted(ventana):
+        errores.append(f"Línea del log con el eslabón {secuencia}, que no existe en la cadena.")
+    for secuencia, _ in log:
+        revisadas += 1
+        if secuencia <= procesada:
+            errores.append(f"Eslabón {secuencia}: la línea aparece repetida o fuera de orden en el log.")
+        else:
+            errores.append(f"Línea del log con el eslabón {secuencia}, que no existe en la cadena.")
+    return revisadas, otras, errores
+
+
+# =====================================================================
+# CONTROL DE CAMBIOS
+# =====================================================================
+# Versión | Fecha       | Autor / Responsable      | Descripción
+# 1.0     | 17/10/2026  | Prixma Software Projects | Cadena de hashes y puntos de control firmados
+# 1.1     | 17/10/2026  | Prixma Software Projects | Verificación de logs/audit.log; reintento ante escritores concurrentes
+# 1.2     | 18/10/2026  | Prixma Software Projects | verificar_log compara el log con la cadena en streaming (ventana acotada)
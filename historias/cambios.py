@@ -0,0 +1,143 @@
+# =====================================================================
+# Proyecto: SOFT-MEDIC
+# Archivo: historias/cambios.py
+# Versión: 1.1
+# Fecha: 17/10/2026
+# Elaborado por: Prixma Software Projects
+# Revisado por: Dirección Técnica de SOFT-MEDIC
+# =====================================================================
+#
+# Auditoría de cambios por campo en la historia clínica y sus modelos
+# hijos.
+#
+# Al cargar una instancia desde la base de datos (from_db) se guarda
+# una instantánea de los valores leídos. Al guardar, la diferencia se
+# calcula en memoria contra esa instantánea, sin releer la fila, y solo
+# los campos modificados se registran en AuditoriaCambio a través del
+# escritor de auditoría (historias/auditoria.py).
+#
+# Las instancias recién creadas no tienen instantánea: la creación no
+# se registra como cambio. Tampoco QuerySet.update(), que no pasa por
+# las instancias.
+# ---------------------------------------------------------------------
+
+from copy import deepcopy
+
+from django.core.exceptions import ValidationError
+from django.db.models.fields.files import FieldFile
+
+from .auditoria import registrar_cambios
+
+
+def _normalizar(valor):
+    """Valor comparable y serializable de un atributo de la instancia."""
+    if isinstance(valor, FieldFile):
+        return valor.name or None
+    if valor == '':
+        return None
+    return valor
+
+
+def _comparable(campo, valor):
+    """
+    Valor convertido con field.to_python(), para comparar el mismo tipo
+    a ambos lados: save() asigna imc como float y la instantánea leída
+    de la base de datos lo tiene como Decimal.
+    """
+    if campo is None or valor is None:
+        return valor
+    try:
+        return campo.to_python(valor)
+    except ValidationError:
+        return valor
+
+
+def _copiar(valor):
+    # Los JSONField se pueden modificar en sitio: se copia su contenido
+    return deepcopy(valor) if isinstance(valor, (dict, list)) else valor
+
+
+class SeguimientoCambios:
+    """
+    Mixin de modelo que registra los campos modificados en cada save().
+
+    `auditoria_historia` es el atributo con el id de la historia a la
+    que pertenece la instancia; `campos_no_auditados`, los attname que
+    cambian en cada guardado y no aportan al registro.
+    """
+
+    auditoria_historia = 'historia_id'
+    campos_no_auditados = frozenset({'id', 'updated_at'})
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instancia = super().from_db(db, field_names, values)
+        instancia._instantanea = {
+            nombre: _normalizar(_copiar(valor)) for nombre, valor in zip(field_names, values)
+        }
+        return instancia
+
+    def refresh_from_db(self, using=None, fields=None, from_queryset=None):
+        super().refresh_from_db(using=using, fields=fields, from_queryset=from_queryset)
+        if '_instantanea' in self.__dict__:
+            self._instantanea.update(self._valores_actuales(fields))
+
+    def _attnames(self, campos):
+        return {self._meta.get_field(nombre).attname for nombre in campos}
+
+    def _valores_actuales(self, campos=None):
+        # Solo atributos ya cargados: leer un campo diferido dispararía una consulta
+        nombres = self._attnames(campos) if campos is not None else self._instantanea.keys()
+        return {
+            nombre: _normalizar(_copiar(self.__dict__[nombre]))
+            for nombre in nombres
+            if nombre in self.__dict__
+        }
+
+    def cambios_pendientes(self, campos=None):
+        """
+        {attname: [anterior, actual]} de los campos que difieren de la
+        instantánea. `campos` limita la comparación (como update_fields).
+        """
+        instantanea = self.__dict__.get('_instantanea')
+        if not instantanea:
+            return {}
+        nombres = self._attnames(campos) if campos is not None else instantanea.keys()
+        modelo = {campo.attname: campo for campo in self._meta.concrete_fields}
+        cambios = {}
+        for nombre in nombres:
+            if nombre in self.campos_no_auditados or nombre not in instantanea or nombre not in self.__dict__:
+                continue
+            campo = modelo.get(nombre)
+            anterior = _comparable(campo, instantanea[nombre])
+            actual = _comparable(campo, _normalizar(self.__dict__[nombre]))
+            if anterior != actual:
+                cambios[nombre] = [anterior, actual]
+        return cambios
+
+    def auditar_cambios(self, campos=None):
+        """
+        Registra los campos modificados desde la última carga o guardado
+        y actualiza la instantánea. Lo llama save(); las rutas que
+        guardan en lote (bulk_update) deben llamarlo explícitamente.
+        """
+        cambios = self.cambios_pendientes(campos)
+        if cambios:
+            registrar_cambios(
+                type(self).__name__, self.pk, getattr(self, self.auditoria_historia), cambios
+            )
+            for nombre, (_, actual) in cambios.items():
+                self._instantanea[nombre] = _copiar(actual)
+        return cambios
+
+    def save(self, *args, **kwargs):
+        super().save(*args, **kwargs)
+        self.auditar_cambios(kwargs.get('update_fields'))
+
+
+# =====================================================================
+# CONTROL DE CAMBIOS
+# =====================================================================
+# Versión | Fecha       | Autor / Responsable      | Descripción
+# 1.0     | 17/10/2026  | Prixma Software Projects | Auditoría de cambios por campo
+# 1.1     | 18/10/2026  | Prixma Software Projects | Comparación con field.to_python (sin cambios fantasma en imc)
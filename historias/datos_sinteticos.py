@@ -0,0 +1,455 @@
+# =====================================================================
+# Proyecto: SOFT-MEDIC
+# Archivo: historias/datos_sinteticos.py
+# Versión: 1.1
+# Fecha: 17/10/2026
+# Elaborado por: Prixma Software Projects
+# Revisado por: Dirección Técnica de SOFT-MEDIC
+# =====================================================================
+#
+# Generador de datos sintéticos para pruebas de rendimiento y
+# planeación de capacidad.
+#
+#   - Los pacientes se generan por bloques de índices consecutivos. El
+#     azar de cada bloque sale de Random(f"{semilla}:{inicio}"): la misma
+#     semilla produce los mismos datos sin importar cuántos procesos se
+#     usen ni en qué orden terminen.
+#   - Los bloques se arman en un pool de procesos que no toca la base de
+#     datos (solo tuplas y diccionarios) y se guardan en el proceso
+#     principal con bulk_create: pacientes, historias y sus registros
+#     hijos (diagnósticos, medicamentos, observaciones y citas).
+#   - bulk_create no emite señales: los tokens de búsqueda de pacientes
+#     se regeneran por bloque y, al terminar, se reconstruyen el índice
+#     de texto completo y los mapas de disponibilidad.
+#   - bulk_create tampoco pasa por validar_cita: el proceso principal
+#     lleva las franjas ocupadas de cada médico (Agendas) y corre a la
+#     siguiente franja libre toda cita que se cruzaría con otra, así las
+#     agendas cumplen la misma regla de no solapamiento que la app.
+#
+# Cada paciente tiene una historia clínica (regla de
+# HistoriaClinica.clean); el volumen clínico crece con los hijos.
+# Las identificaciones sintéticas son IDENTIFICACION_BASE + índice.
+# ---------------------------------------------------------------------
+
+import random
+import time
+from collections import deque, namedtuple
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+from zoneinfo import ZoneInfo
+
+BLOQUE = 5000
+LOTE = 2000
+MEDICOS = 200
+IDENTIFICACION_BASE = 1000000000
+DOMINIO_MEDICOS = 'sintetico.softmedic.co'
+
+# Cantidad de hijos por historia: (mínimo, máximo), uniforme
+HIJOS = {
+    'diagnosticos': (1, 3),
+    'medicamentos': (0, 4),
+    'observaciones': (0, 3),
+    'citas': (0, 4),
+}
+
+EPS_SINTETICAS = [
+    ('EPS010', 'EPS Sura'),
+    ('EPS037', 'Nueva EPS'),
+    ('EPS005', 'EPS Sanitas'),
+    ('EPS002', 'Salud Total'),
+    ('EPS017', 'Famisanar'),
+    ('EPS008', 'Compensar EPS'),
+    ('ESS024', 'Coosalud'),
+    ('ESS207', 'Mutual Ser'),
+]
+
+NOMBRES = [
+    'Ana', 'Andrés', 'Camila', 'Carlos', 'Daniela', 'David', 'Diana', 'Felipe', 'Gabriela', 'Jorge',
+    'José', 'Juan', 'Juliana', 'Laura', 'Luis', 'Manuela', 'María', 'Mateo', 'Natalia', 'Nicolás',
+    'Paola', 'Pedro', 'Sara', 'Santiago', 'Sebastián', 'Sofía', 'Tomás', 'Valentina', 'Valeria', 'Alejandro',
+]
+APELLIDOS = [
+    'Álvarez', 'Castro', 'Díaz', 'Gómez', 'González', 'Gutiérrez', 'Hernández', 'Jiménez', 'López', 'Martínez',
+    'Moreno', 'Muñoz', 'Ortiz', 'Pérez', 'Ramírez', 'Rodríguez', 'Rojas', 'Romero', 'Ruiz', 'Sánchez',
+    'Suárez', 'Torres', 'Vargas', 'Vásquez', 'Zapata', 'Cárdenas', 'Ospina', 'Restrepo', 'Quintero', 'Mejía',
+]
+MOTIVOS = [
+    'Dolor abdominal', 'Cefalea persistente', 'Fiebre y malestar general', 'Tos seca de varios días',
+    'Control de hipertensión', 'Control de diabetes', 'Dolor lumbar', 'Mareo', 'Dolor torácico atípico',
+    'Erupción cutánea', 'Dolor de garganta', 'Control prenatal', 'Ansiedad', 'Dolor articular',
+]
+SINTOMAS = [
+    'náuseas', 'vómito', 'diarrea', 'fiebre', 'escalofríos', 'astenia', 'adinamia', 'disnea', 'tos',
+    'odinofagia', 'prurito', 'artralgias', 'mialgias', 'cefalea', 'insomnio', 'dolor epigástrico',
+]
+HALLAZGOS = [
+    'Paciente alerta, orientado, hidratado.', 'Abdomen blando, depresible, doloroso a la palpación.',
+    'Ruidos cardiacos rítmicos sin soplos.', 'Murmullo vesicular conservado sin agregados.',
+    'Orofaringe eritematosa sin exudados.', 'Sin signos de irritación peritoneal.',
+    'Lesiones eritematosas en tronco.', 'Dolor a la palpación de región lumbar.',
+]
+PLANES = [
+    'Manejo ambulatorio y control en 8 días.', 'Se solicitan paraclínicos y control con resultados.',
+    'Hidratación oral, signos de alarma explicados.', 'Remisión a especialista.',
+    'Ajuste de dosis y control en 1 mes.', 'Reposo relativo y analgesia.',
+]
+DIAGNOSTICOS = [
+    ('I10', 'Hipertensión esencial (primaria)'), ('E11.9', 'Diabetes mellitus tipo 2 sin complicaciones'),
+    ('J06.9', 'Infección aguda de las vías respiratorias superiores'), ('K29.7', 'Gastritis, no especificada'),
+    ('M54.5', 'Lumbago no especificado'), ('R51', 'Cefalea'), ('A09', 'Diarrea y gastroenteritis'),
+    ('J02.9', 'Faringitis aguda, no especificada'), ('F41.1', 'Trastorno de ansiedad generalizada'),
+    ('L30.9', 'Dermatitis, no especificada'), ('N39.0', 'Infección de vías urinarias'),
+    ('Z34.9', 'Supervisión de embarazo normal'), ('M25.5', 'Dolor en articulación'),
+]
+MEDICAMENTOS = [
+    'Acetaminofén 500 mg', 'Ibuprofeno 400 mg', 'Losartán 50 mg', 'Metformina 850 mg', 'Omeprazol 20 mg',
+    'Amoxicilina 500 mg', 'Loratadina 10 mg', 'Enalapril 20 mg', 'Sertralina 50 mg', 'Naproxeno 250 mg',
+    'Hidroclorotiazida 25 mg', 'Atorvastatina 20 mg', 'Sales de rehidratación oral', 'Ácido fólico 1 mg',
+]
+OBSERVACIONES = [
+    'Paciente refiere mejoría parcial.', 'Se explican signos de alarma.', 'Adherencia adecuada al tratamiento.',
+    'Pendiente resultado de laboratorio.', 'Familiar acompañante informado.', 'Asiste puntual al control.',
+]
+MOTIVOS_CITA = ['Control', 'Lectura de exámenes', 'Primera vez', 'Seguimiento', 'Renovación de fórmula']
+
+# Bloque armado en un proceso del pool. Los índices de historia y de
+# paciente son relativos al bloque; EPS y médicos, posiciones en sus listas.
+Bloque = namedtuple('Bloque', ['inicio', 'pacientes', 'historias', 'diagnosticos', 'medicamentos', 'observaciones', 'citas'])
+Resumen = namedtuple('Resumen', ['pacientes', 'historias', 'hijos', 'segundos'])
+
+
+def identificacion(indice):
+    return str(IDENTIFICACION_BASE + indice)
+
+
+def _momento(azar, dia, zona, jornada):
+    """Inicio de una cita alineado a los intervalos de la jornada de `dia`."""
+    hora_inicio, hora_fin, intervalo, duracion, _ = jornada
+    minutos = azar.randrange(0, (hora_fin - hora_inicio) * 60 - duracion + 1, intervalo)
+    return datetime(dia.year, dia.month, dia.day, hora_inicio, tzinfo=zona) + timedelta(minutes=minutos)
+
+
+def generar_bloque(semilla, inicio, cantidad, hoy, zona, jornada, eps, medicos, hijos=HIJOS):
+    """
+    Bloque de `cantidad` pacientes desde el índice `inicio`; se ejecuta
+    en el pool. `jornada` es (hora inicio, hora fin, intervalo, duración
+    de la cita, días hábiles) en minutos salvo las horas y los días
+    (números de weekday()).
+    """
+    azar = random.Random(f"{semilla}:{inicio}")
+    zona = ZoneInfo(zona)
+    bloque = Bloque(inicio, [], [], [], [], [], [])
+
+    for n in range(cantidad):
+        nombre = f"{azar.choice(NOMBRES)} {azar.choice(APELLIDOS)} {azar.choice(APELLIDOS)}"
+        nacimiento = hoy - timedelta(days=azar.randint(0, 95 * 365))
+        contacto = f"3{azar.randint(0, 999999999):09d}" if azar.random() < 0.85 else None
+        bloque.pacientes.append((nombre, identificacion(inicio + n), nacimiento, contacto,
+                                 azar.randrange(eps) if azar.random() < 0.95 else None))
+
+        ingreso = hoy - timedelta(days=azar.randint(0, 3 * 365))
+        peso = Decimal(azar.randint(4500, 11000)) / 100
+        talla = Decimal(azar.randint(14500, 19500)) / 100
+        diagnosticos = azar.sample(DIAGNOSTICOS, azar.randint(*hijos['diagnosticos']))
+        medico = azar.randrange(medicos)
+        motivo = azar.choice(MOTIVOS)
+        bloque.historias.append((n, medico, {
+            'numero_historia': f"HC-{identificacion(inicio + n)}",
+            'fecha_ingreso': ingreso,
+            'tipo_historia': 'Consulta externa',
+            'motivo_consulta': motivo,
+            'puerta_entrada': 'Consulta externa',
+            'tiempo_evolucion': f"{azar.randint(1, 30)} días",
+            'sintomas_principales': ', '.join(azar.sample(SINTOMAS, 3)),
+            'examen_fisico': ' '.join(azar.sample(HALLAZGOS, 2)),
+            'resumen_clinico': f"{motivo} de {azar.randint(1, 30)} días de evolución. {azar.choice(HALLAZGOS)}",
+            'plan_manejo': azar.choice(PLANES),
+            'fc': azar.randint(55, 110),
+            'fr': azar.randint(12, 24),
+            'ta_sist': f"{azar.randint(95, 160)}/{azar.randint(60, 100)}",
+            'temperatura': Decimal(azar.randint(360, 392)) / 10,
+            'saturacion': Decimal(azar.randint(9000, 10000)) / 100,
+            'peso': peso,
+            'talla': talla,
+            'imc': round(peso / (talla / 100) ** 2, 2),
+            'diagnosticos': [{'codigo': codigo, 'descripcion': descripcion} for codigo, descripcion in diagnosticos],
+        }))
+
+        for codigo, descripcion in diagnosticos:
+            bloque.diagnosticos.append((n, {'codigo_cie10': codigo, 'descripcion': descripcion}))
+        for medicamento in azar.sample(MEDICAMENTOS, azar.randint(*hijos['medicamentos'])):
+            bloque.medicamentos.append((n, {'nombre': medicamento}))
+        for _ in range(azar.randint(*hijos['observaciones'])):
+            bloque.observaciones.append((n, {'detalle': azar.choice(OBSERVACIONES)}))
+        for _ in range(azar.randint(*hijos['citas'])):
+            # Citas en días hábiles entre el ingreso y dos meses después de hoy
+            dia = ingreso + timedelta(days=azar.randint(0, (hoy - ingreso).days + 60))
+            while dia.weekday() not in jornada[4]:
+                dia += timedelta(days=1)
+            fecha = _momento(azar, dia, zona, jornada)
+            bloque.citas.append((n, azar.randrange(medicos) if azar.random() < 0.3 else medico, {
+                'fecha': fecha,
+                'fin': fecha + timedelta(minutes=jornada[3]),
+                'motivo': azar.choice(MOTIVOS_CITA),
+                'estado': 'CANCELADA' if azar.random() < 0.1 else 'PROGRAMADA',
+            }))
+    return bloque
+
+
+class Agendas:
+    """
+    Franjas ocupadas de cada médico: por (médico, día), una máscara de
+    bits con un bit por intervalo de la jornada, como DisponibilidadDia.
+    Las citas canceladas no ocupan franja (igual que en validar_cita).
+    """
+
+    # Días hábiles que se recorren buscando franja antes de descartar la cita
+    MAX_DIAS = 366
+
+    def __init__(self, zona, jornada):
+        self.zona = ZoneInfo(zona)
+        self.hora_inicio, hora_fin, self.intervalo, duracion, self.dias_habiles = jornada
+        self.intervalos = (hora_fin - self.hora_inicio) * 60 // self.intervalo
+        self.largo = -(-duracion // self.intervalo)
+        self.duracion = timedelta(minutes=duracion)
+        self.ocupadas = {}
+
+    def _posicion(self, momento):
+        """(día local, intervalo de la jornada, sin acotar) de `momento`."""
+        local = momento.astimezone(self.zona)
+        minutos = (local.hour - self.hora_inicio) * 60 + local.minute
+        return local.date(), minutos // self.intervalo
+
+    def marcar(self, medico, inicio, fin):
+        """Ocupa [inicio, fin) en la agenda de `medico` (citas ya guardadas)."""
+        dia, desde = self._posicion(inicio)
+        fin_dia, hasta = self._posicion(fin - timedelta(microseconds=1))
+        hasta = hasta + 1 if fin_dia == dia else self.intervalos
+        desde, hasta = max(desde, 0), min(hasta, self.intervalos)
+        if desde < hasta:
+            bits = ((1 << (hasta - desde)) - 1) << desde
+            self.ocupadas[(medico, dia)] = self.ocupadas.get((medico, dia), 0) | bits
+
+    def reservar(self, medico, inicio):
+        """
+        Primera franja libre de `medico` desde `inicio` (el mismo día o
+        los siguientes días hábiles), ya marcada. None si no hay.
+        """
+        dia, desde = self._posicion(inicio)
+        cita = (1 << self.largo) - 1
+        for _ in range(self.MAX_DIAS):
+            if dia.weekday() in self.dias_habiles:
+                ocupadas = self.ocupadas.get((medico, dia), 0)
+                for posicion in range(max(desde, 0), self.intervalos - self.largo + 1):
+                    if not ocupadas & (cita << posicion):
+                        self.ocupadas[(medico, dia)] = ocupadas | (cita << posicion)
+                        return (
+                            datetime(dia.year, dia.month, dia.day, self.hora_inicio, tzinfo=self.zona)
+                            + timedelta(minutes=posicion * self.intervalo)
+                        )
+            dia, desde = dia + timedelta(days=1), 0
+        return None
+
+    def ubicar(self, citas, medico_ids):
+        """
+        Corrige en sitio las citas de un bloque (índices de médico en
+        `medico_ids`): las que se cruzan pasan a la siguiente franja
+        libre y las que no encuentran franja se descartan.
+        """
+        ubicadas = []
+        for n, medico, campos in citas:
+            if campos['estado'] != 'CANCELADA':
+                fecha = self.reservar(medico_ids[medico], campos['fecha'])
+                if fecha is None:
+                    continue
+                campos['fecha'], campos['fin'] = fecha, fecha + self.duracion
+            ubicadas.append((n, medico, campos))
+        citas[:] = ubicadas
+
+
+def _bloques(semilla, desde, pacientes, bloque, procesos, hoy, zona, jornada, eps, medicos):
+    """Bloques generados en orden de índice, con pocos en vuelo para acotar la memoria."""
+    argumentos = [
+        (semilla, inicio, min(bloque, desde + pacientes - inicio), hoy, zona, jornada, eps, medicos)
+        for inicio in range(desde, desde + pacientes, bloque)
+    ]
+    if procesos <= 1:
+        for args in argumentos:
+            yield generar_bloque(*args)
+        return
+
+    with ProcessPoolExecutor(max_workers=procesos) as ejecutor:
+        pendientes = deque()
+        for args in argumentos:
+            pendientes.append(ejecutor.submit(generar_bloque, *args))
+            if len(pendientes) >= procesos * 2:
+                yield pendientes.popleft().result()
+        while pendientes:
+            yield pendientes.popleft().result()
+
+
+def preparar_catalogos(medicos=MEDICOS, semilla=0):
+    """
+    ([pk de EPS], [pk de médicos]) sintéticos, creando los que falten.
+    Los médicos quedan sin contraseña utilizable.
+    """
+    from django.contrib.auth import get_user_model
+    from django.contrib.auth.hashers import make_password
+
+    from pacientes.models import EPS
+
+    eps_ids = []
+    for codigo, nombre in EPS_SINTETICAS:
+        eps = EPS.objects.filter(codigo=codigo).first()
+        if eps is None:
+            eps, _ = EPS.objects.get_or_create(nombre=nombre, defaults={'codigo': codigo})
+        eps_ids.append(eps.pk)
+
+    Usuario = get_user_model()
+    correos = [f"medico{i:05d}@{DOMINIO_MEDICOS}" for i in range(medicos)]
+    existentes = dict(Usuario.objects.filter(correo__in=correos).values_list('correo', 'pk'))
+    azar = random.Random(f"{semilla}:medicos")
+    contrasena = make_password(None)
+    Usuario.objects.bulk_create(
+        [
+            Usuario(
+                correo=correo,
+                nombre=f"Dr(a). {azar.choice(NOMBRES)} {azar.choice(APELLIDOS)}",
+                rol='MEDICO',
+                password=contrasena,
+            )
+            for correo in correos
+            if correo not in existentes
+        ],
+        batch_size=LOTE,
+    )
+    existentes = dict(Usuario.objects.filter(correo__in=correos).values_list('correo', 'pk'))
+    return eps_ids, [existentes[correo] for correo in correos]
+
+
+def guardar_bloque(bloque, eps_ids, medico_ids, lote=LOTE):
+    """Inserta un bloque con bulk_create en una transacción. Devuelve la cantidad de hijos."""
+    from django.db import transaction
+
+    from pacientes.busqueda import sincronizar_tokens_en_lote
+    from pacientes.models import Paciente
+
+    from .models import Cita, Diagnostico, HistoriaClinica, Medicamento, Observacion
+
+    with transaction.atomic():
+        pacientes = Paciente.objects.bulk_create(
+            [
+                Paciente(
+                    nombre_completo=nombre, identificacion=documento, fecha_nacimiento=nacimiento,
+                    contacto=contacto, eps_id=None if eps is None else eps_ids[eps],
+                )
+                for nombre, documento, nacimiento, contacto, eps in bloque.pacientes
+            ],
+            batch_size=lote,
+        )
+        historias = HistoriaClinica.objects.bulk_create(
+            [
+                HistoriaClinica(paciente_id=pacientes[n].pk, medico_responsable_id=medico_ids[medico], **campos)
+                for n, medico, campos in bloque.historias
+            ],
+            batch_size=lote,
+        )
+
+        hijos = 0
+        for modelo, filas in (
+            (Diagnostico, bloque.diagnosticos),
+            (Medicamento, bloque.medicamentos),
+            (Observacion, bloque.observaciones),
+        ):
+            modelo.objects.bulk_create(
+                [modelo(historia_id=historias[n].pk, **campos) for n, campos in filas], batch_size=lote
+            )
+            hijos += len(filas)
+        Cita.objects.bulk_create(
+            [
+                Cita(historia_id=historias[n].pk, medico_id=medico_ids[medico], **campos)
+                for n, medico, campos in bloque.citas
+            ],
+            batch_size=lote,
+        )
+        hijos += len(bloque.citas)
+
+        sincronizar_tokens_en_lote(pacientes, lote=lote)
+    return hijos
+
+
+def generar(pacientes, semilla=0, desde=0, procesos=1, bloque=BLOQUE, lote=LOTE, medicos=MEDICOS,
+            hoy=None, progreso=None):
+    """
+    Genera y carga `pacientes` pacientes sintéticos (con su historia y
+    registros hijos) a partir del índice `desde`. `progreso(resumen)`
+    se llama tras cada bloque. Lanza ValueError si el rango de
+    identificaciones ya existe.
+    """
+    from django.conf import settings
+    from django.db import connection, connections
+    from django.db.models.functions import Length
+
+    from pacientes.models import Paciente
+
+    from .agenda import DURACION_POR_DEFECTO
+    from .busqueda import reconstruir_indice
+    from .disponibilidad import DIAS_HABILES, FIN_JORNADA, INICIO_JORNADA, INTERVALO, reconstruir_disponibilidad
+    from .models import Cita
+
+    if desde < 0:
+        raise ValueError("El índice inicial (--desde) no puede ser negativo.")
+    # Las identificaciones sintéticas tienen ancho fijo: el rango de
+    # texto cubre todo el intervalo de índices y se resuelve con el índice
+    primera, ultima = identificacion(desde), identificacion(desde + pacientes - 1)
+    ocupadas = (
+        Paciente.objects
+        .filter(identificacion__gte=primera, identificacion__lte=ultima)
+        .annotate(largo=Length('identificacion'))
+        .filter(largo=len(primera))
+    )
+    if ocupadas.exists():
+        raise ValueError(
+            f"Ya existen pacientes sintéticos entre los índices {desde} y {desde + pacientes - 1}: use otro --desde."
+        )
+    if not connection.features.can_return_rows_from_bulk_insert:
+        raise ValueError("La base de datos no devuelve las claves de bulk_create (se requiere PostgreSQL o SQLite).")
+
+    eps_ids, medico_ids = preparar_catalogos(medicos, semilla)
+    if procesos > 1:
+        # Los procesos hijos no usan la base de datos: no heredan conexiones abiertas
+        connections.close_all()
+
+    hoy = hoy or date.today()
+    jornada = (
+        INICIO_JORNADA.hour, FIN_JORNADA.hour,
+        int(INTERVALO.total_seconds() // 60), int(DURACION_POR_DEFECTO.total_seconds() // 60),
+        tuple(sorted(DIAS_HABILES)),
+    )
+    # Citas de cargas anteriores con los mismos médicos sintéticos
+    agendas = Agendas(settings.TIME_ZONE, jornada)
+    for medico, fecha, fin in (
+        Cita.objects
+        .filter(medico_id__in=medico_ids)
+        .exclude(estado=Cita.ESTADO_CANCELADA)
+        .values_list('medico_id', 'fecha', 'fin')
+        .iterator(chunk_size=lote)
+    ):
+        agendas.marcar(medico, fecha, fin or fecha + DURACION_POR_DEFECTO)
+
+    inicio = time.monotonic()
+    total_pacientes = total_hijos = 0
+    for generado in _bloques(semilla, desde, pacientes, bloque, procesos, hoy, settings.TIME_ZONE, jornada,
+                             len(eps_ids), len(medico_ids)):
+        # En orden de índice: el resultado no depende del número de procesos
+        agendas.ubicar(generado.citas, medico_ids)
+        total_hijos += guardar_bloque(generado, eps_ids, medico_ids, lote)
+        total_pacientes += len(generado.pacientes)
+        if progreso is not None:
+            progreso(Resumen(total_pacientes, total_pacientes, total_hijos, time.monotonic() - inicio))
+
+    reconstruir_indice(lote=lote)
+    # Solo los días desde hoy, igual que el comando reconstruir_disponibilidad
+    reconstruir_disponibilidad(desde=hoy)
+    return Resumen(total_pacientes, total_pacientes, total_hijos, time.monotonic() - inicio)
@@ -0,0 +1,188 @@
+# =====================================================================
+# Proyecto: SOFT-MEDIC
+# Archivo: historias/disponibilidad.py
+# Versión: 1.1
+# Fecha: 17/10/2026
+# Elaborado por: Prixma Software Projects
+# Revisado por: Dirección Técnica de SOFT-MEDIC
+# =====================================================================
+#
+# Búsqueda de horarios libres.
+#
+# La jornada se divide en intervalos de AGENDA_INTERVALO_MINUTOS y la
+# ocupación de cada médico por día se guarda como mapa de bits en
+# DisponibilidadDia (bit i = intervalo i ocupado). Buscar huecos de k
+# intervalos es combinar bits: libre & libre>>1 & ... & libre>>(k-1).
+# Los mapas se leen por bloques de días con una consulta por bloque.
+#
+# El mapa de un día se recalcula al guardar, cancelar o eliminar una
+# cita (historias/signals/agenda.py); las cargas masivas deben llamar
+# a reconstruir_disponibilidad().
+# ---------------------------------------------------------------------
+
+import math
+from collections import defaultdict
+from datetime import datetime, time, timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from .agenda import citas_en_rango
+from .models import Cita, DisponibilidadDia
+
+INTERVALO = timedelta(minutes=getattr(settings, 'AGENDA_INTERVALO_MINUTOS', 15))
+INICIO_JORNADA = time(getattr(settings, 'AGENDA_HORA_INICIO', 7))
+FIN_JORNADA = time(getattr(settings, 'AGENDA_HORA_FIN', 19))
+DIAS_HABILES = frozenset(getattr(settings, 'AGENDA_DIAS_HABILES', (0, 1, 2, 3, 4)))
+
+INTERVALOS_DIA = int(
+    (datetime.combine(datetime.min, FIN_JORNADA) - datetime.combine(datetime.min, INICIO_JORNADA)) / INTERVALO
+)
+# El mapa debe caber en un BigIntegerField con signo
+assert 0 < INTERVALOS_DIA <= 63, "La jornada no cabe en el mapa de bits de 63 intervalos."
+
+JORNADA_COMPLETA = (1 << INTERVALOS_DIA) - 1
+
+DIAS_POR_BLOQUE = 14
+HORIZONTE_DIAS = 120
+
+
+def inicio_jornada(dia):
+    return timezone.make_aware(datetime.combine(dia, INICIO_JORNADA))
+
+
+def _intervalo_de(dia, momento):
+    """Índice (fraccionario) del momento dentro de la jornada del día."""
+    return (momento - inicio_jornada(dia)) / INTERVALO
+
+
+def mapa_ocupacion(citas, dia):
+    """Mapa de bits de los intervalos del día que tocan alguna cita."""
+    ocupado = 0
+    for fecha, fin in citas:
+        primero = max(math.floor(_intervalo_de(dia, fecha)), 0)
+        ultimo = min(math.ceil(_intervalo_de(dia, fin)), INTERVALOS_DIA)
+        for indice in range(primero, ultimo):
+            ocupado |= 1 << indice
+    return ocupado
+
+
+def recalcular_disponibilidad(medico_id, dia):
+    """Recalcula y guarda el mapa de un médico en un día."""
+    desde = timezone.make_aware(datetime.combine(dia, time.min))
+    citas = citas_en_rango(medico_id, desde, desde + timedelta(days=1)).values_list('fecha', 'fin')
+    ocupado = mapa_ocupacion(citas, dia)
+    if ocupado:
+        DisponibilidadDia.objects.update_or_create(
+            medico_id=medico_id, fecha=dia, defaults={'ocupado': ocupado}
+        )
+    else:
+        DisponibilidadDia.objects.filter(medico_id=medico_id, fecha=dia).delete()
+
+
+def dias_de_cita(fecha, fin):
+    """Días locales que toca el intervalo [fecha, fin)."""
+    dia = timezone.localtime(fecha).date()
+    ultimo = timezone.localtime(fin - timedelta(microseconds=1)).date() if fin and fin > fecha else dia
+    while dia <= ultimo:
+        yield dia
+        dia += timedelta(days=1)
+
+
+def reconstruir_disponibilidad(medico_ids=None, desde=None):
+    """
+    Regenera los mapas a partir de las citas (tras cargas masivas que
+    no emiten señales). Con `desde` solo se tocan los días >= desde:
+    una cita que empieza la víspera no reescribe el día anterior.
+    Borrado e inserción van en una transacción, así las búsquedas nunca
+    ven la agenda vacía. Retorna el número de días ocupados guardados.
+    """
+    citas = Cita.objects.exclude(estado=Cita.ESTADO_CANCELADA).filter(medico__isnull=False, fin__isnull=False)
+    mapas = DisponibilidadDia.objects.all()
+    if medico_ids is not None:
+        citas = citas.filter(medico_id__in=medico_ids)
+        mapas = mapas.filter(medico_id__in=medico_ids)
+    if desde is not None:
+        citas = citas.filter(fin__gt=inicio_jornada(desde))
+        mapas = mapas.filter(fecha__gte=desde)
+
+    por_dia = defaultdict(list)
+    for medico_id, fecha, fin in citas.values_list('medico_id', 'fecha', 'fin').iterator():
+        for dia in dias_de_cita(fecha, fin):
+            if desde is None or dia >= desde:
+                por_dia[(medico_id, dia)].append((fecha, fin))
+
+    nuevos = []
+    for (medico_id, dia), intervalos in por_dia.items():
+        ocupado = mapa_ocupacion(intervalos, dia)
+        if ocupado:
+            nuevos.append(DisponibilidadDia(medico_id=medico_id, fecha=dia, ocupado=ocupado))
+
+    with transaction.atomic():
+        mapas.delete()
+        DisponibilidadDia.objects.bulk_create(nuevos, batch_size=1000)
+    return len(nuevos)
+
+
+def _inicios_libres(ocupado, intervalos):
+    """Bits de los intervalos donde empiezan `intervalos` libres seguidos."""
+    libre = ~ocupado & JORNADA_COMPLETA
+    inicios = libre
+    for desplazamiento in range(1, intervalos):
+        inicios &= libre >> desplazamiento
+    return inicios
+
+
+def buscar_huecos(medico_ids, desde=None, cantidad=10, duracion=None, horizonte_dias=HORIZONTE_DIAS):
+    """
+    Los primeros `cantidad` horarios libres a partir de `desde` entre
+    los médicos indicados, como lista de (inicio, medico_id) ordenada
+    por hora y luego por médico.
+    """
+    desde = desde or timezone.now()
+    duracion = duracion or INTERVALO
+    intervalos = max(math.ceil(duracion / INTERVALO), 1)
+    medico_ids = sorted(set(medico_ids))
+    if not medico_ids or intervalos > INTERVALOS_DIA:
+        return []
+
+    huecos = []
+    primer_dia = timezone.localtime(desde).date()
+    ultimo_dia = primer_dia + timedelta(days=horizonte_dias)
+    bloque = primer_dia
+
+    while bloque <= ultimo_dia and len(huecos) < cantidad:
+        fin_bloque = min(bloque + timedelta(days=DIAS_POR_BLOQUE), ultimo_dia + timedelta(days=1))
+        ocupacion = {
+            (medico_id, fecha): ocupado
+            for medico_id, fecha, ocupado in DisponibilidadDia.objects.filter(
+                medico_id__in=medico_ids, fecha__gte=bloque, fecha__lt=fin_bloque
+            ).values_list('medico_id', 'fecha', 'ocupado')
+        }
+
+        dia = bloque
+        while dia < fin_bloque and len(huecos) < cantidad:
+            if dia.weekday() in DIAS_HABILES:
+                # Intervalos que ya empezaron no se ofrecen
+                minimo = max(math.ceil(_intervalo_de(dia, desde)), 0) if dia == primer_dia else 0
+                candidatos = []
+                restantes = cantidad - len(huecos)
+                for medico_id in medico_ids:
+                    inicios = _inicios_libres(ocupacion.get((medico_id, dia), 0), intervalos) >> minimo << minimo
+                    # Cada médico aporta como máximo los huecos que faltan
+                    for _ in range(restantes):
+                        if not inicios:
+                            break
+                        indice = (inicios & -inicios).bit_length() - 1
+                        candidatos.append((indice, medico_id))
+                        inicios &= inicios - 1
+                candidatos.sort()
+                base = inicio_jornada(dia)
+                for indice, medico_id in candidatos[:restantes]:
+                    huecos.append((base + indice * INTERVALO, medico_id))
+            dia += timedelta(days=1)
+
+        bloque = fin_bloque
+
+    return huecos
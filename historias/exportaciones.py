@@ -0,0 +1,278 @@
+# =====================================================================
+# Proyecto: SOFT-MEDIC
+# Archivo: historias/exportaciones.py
+# Versión: 1.1
+# Fecha: 17/10/2026
+# Elaborado por: Prixma Software Projects
+# Revisado por: Dirección Técnica de SOFT-MEDIC
+# =====================================================================
+#
+# Servicio de exportaciones en segundo plano.
+#
+#   encolar_exportacion()     → usado por la vista; reutiliza archivos
+#                               recientes con los mismos parámetros.
+#   tomar_siguiente_trabajo() → reclama un trabajo PENDIENTE de forma
+#                               atómica (varios procesos pueden competir).
+#   procesar_trabajo()        → genera el archivo y reporta el progreso.
+#   limpiar_exportaciones()   → borra los trabajos y archivos vencidos.
+#
+# El trabajador actualiza `latido_en` mientras avanza. Un trabajo
+# EN_PROCESO sin latido en VENCIMIENTO_SEGUNDOS (trabajador caído) vuelve
+# a PENDIENTE, o queda FALLIDO tras MAX_INTENTOS. `iniciado_en` identifica
+# el reclamo: un trabajador que perdió el suyo no puede cerrar el trabajo.
+#
+# Solo requiere la base de datos (SQLite) y el sistema de archivos.
+# ---------------------------------------------------------------------
+
+import glob
+import hashlib
+import json
+import logging
+import os
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.db.models import F
+from django.utils import timezone
+
+from .models import HistoriaClinica, TrabajoExportacion
+from .reportes import filas_pacientes_atendidos, csv_por_bloques
+
+logger = logging.getLogger('audit')
+
+# Segundos durante los cuales un archivo terminado se reutiliza
+CACHE_SEGUNDOS = getattr(settings, 'EXPORTACIONES_CACHE_SEGUNDOS', 3600)
+
+# Cada cuántas filas se actualiza el progreso en la base de datos
+INTERVALO_PROGRESO = 5000
+# Segundos máximos entre latidos mientras se genera el archivo
+INTERVALO_LATIDO = 30
+# Sin latido durante este tiempo, el trabajo se considera abandonado
+VENCIMIENTO_SEGUNDOS = getattr(settings, 'EXPORTACIONES_VENCIMIENTO_SEGUNDOS', 300)
+MAX_INTENTOS = 3
+# Tiempo que se conservan los trabajos terminados y sus archivos
+RETENCION_SEGUNDOS = getattr(settings, 'EXPORTACIONES_RETENCION_SEGUNDOS', 7 * 24 * 3600)
+
+PARAMETROS_VALIDOS = ('fecha_desde', 'fecha_hasta', 'medico', 'eps')
+
+
+def normalizar_parametros(parametros):
+    """Conserva solo los filtros conocidos y descarta los vacíos."""
+    return {
+        clave: parametros[clave]
+        for clave in PARAMETROS_VALIDOS
+        if parametros.get(clave) not in (None, '')
+    }
+
+
+def calcular_huella(tipo, parametros):
+    """Huella estable del tipo de reporte y sus filtros."""
+    datos = json.dumps({'tipo': tipo, 'parametros': parametros}, sort_keys=True, default=str)
+    return hashlib.sha256(datos.encode('utf-8')).hexdigest()
+
+
+def historias_para(parametros):
+    """Aplica los filtros de la exportación sobre HistoriaClinica."""
+    queryset = HistoriaClinica.objects.all()
+    if parametros.get('fecha_desde'):
+        queryset = queryset.filter(fecha_ingreso__gte=parametros['fecha_desde'])
+    if parametros.get('fecha_hasta'):
+        queryset = queryset.filter(fecha_ingreso__lte=parametros['fecha_hasta'])
+    if parametros.get('medico'):
+        queryset = queryset.filter(medico_responsable_id=parametros['medico'])
+    if parametros.get('eps'):
+        queryset = queryset.filter(paciente__eps_id=parametros['eps'])
+    return queryset
+
+
+def _archivo_disponible(trabajo):
+    return bool(trabajo.archivo) and os.path.exists(trabajo.archivo.path)
+
+
+class ReclamoPerdido(Exception):
+    """El trabajo fue reencolado o reclamado por otro trabajador."""
+
+
+def liberar_vencidos(queryset=None):
+    """
+    Devuelve a PENDIENTE los trabajos EN_PROCESO sin latido reciente y
+    marca FALLIDO los que ya agotaron MAX_INTENTOS. Retorna cuántos reencoló.
+    """
+    queryset = TrabajoExportacion.objects.all() if queryset is None else queryset
+    ahora = timezone.now()
+    vencidos = queryset.filter(
+        estado=TrabajoExportacion.EN_PROCESO, latido_en__lt=ahora - timedelta(seconds=VENCIMIENTO_SEGUNDOS)
+    )
+    vencidos.filter(intentos__gte=MAX_INTENTOS).update(
+        estado=TrabajoExportacion.FALLIDO,
+        mensaje_error=f"El trabajador se detuvo {MAX_INTENTOS} veces sin terminar la exportación.",
+        finalizado_en=ahora,
+    )
+    return vencidos.update(estado=TrabajoExportacion.PENDIENTE)
+
+
+def encolar_exportacion(parametros, usuario=None, tipo=TrabajoExportacion.TIPO_PACIENTES_ATENDIDOS):
+    """
+    Devuelve el trabajo que atenderá la solicitud:
+    - un trabajo COMPLETADO reciente con la misma huella y archivo vigente,
+    - un trabajo PENDIENTE/EN_PROCESO idéntico ya encolado, o
+    - un trabajo nuevo en estado PENDIENTE.
+    """
+    parametros = normalizar_parametros(parametros)
+    huella = calcular_huella(tipo, parametros)
+    liberar_vencidos(TrabajoExportacion.objects.filter(huella=huella))
+
+    limite = timezone.now() - timedelta(seconds=CACHE_SEGUNDOS)
+    terminado = (
+        TrabajoExportacion.objects
+        .filter(huella=huella, estado=TrabajoExportacion.COMPLETADO, finalizado_en__gte=limite)
+        .order_by('-finalizado_en')
+        .first()
+    )
+    if terminado and _archivo_disponible(terminado):
+        return terminado
+
+    en_curso = (
+        TrabajoExportacion.objects
+        .filter(huella=huella, estado__in=[TrabajoExportacion.PENDIENTE, TrabajoExportacion.EN_PROCESO])
+        .order_by('creado_en')
+        .first()
+    )
+    if en_curso:
+        return en_curso
+
+    return TrabajoExportacion.objects.create(
+        tipo=tipo,
+        parametros=parametros,
+        huella=huella,
+        solicitado_por=usuario if getattr(usuario, 'is_authenticated', False) else None,
+    )
+
+
+def tomar_siguiente_trabajo():
+    """
+    Reclama el trabajo pendiente más antiguo (incluidos los abandonados
+    por un trabajador caído). El UPDATE condicionado al estado garantiza
+    que solo un proceso obtenga cada trabajo.
+    """
+    liberar_vencidos()
+    while True:
+        candidato = (
+            TrabajoExportacion.objects
+            .filter(estado=TrabajoExportacion.PENDIENTE)
+            .order_by('creado_en')
+            .values_list('pk', flat=True)
+            .first()
+        )
+        if candidato is None:
+            return None
+
+        ahora = timezone.now()
+        reclamado = TrabajoExportacion.objects.filter(
+            pk=candidato, estado=TrabajoExportacion.PENDIENTE
+        ).update(
+            estado=TrabajoExportacion.EN_PROCESO, iniciado_en=ahora, latido_en=ahora,
+            intentos=F('intentos') + 1, filas_procesadas=0,
+        )
+        if reclamado:
+            return TrabajoExportacion.objects.get(pk=candidato)
+
+
+def procesar_trabajo(trabajo):
+    """Genera el archivo del trabajo y lo marca como COMPLETADO o FALLIDO."""
+    queryset = historias_para(trabajo.parametros)
+    nombre = os.path.join('exportaciones', f"{trabajo.tipo.lower()}_{trabajo.huella[:16]}_{trabajo.pk}.csv")
+    ruta = os.path.join(settings.MEDIA_ROOT, nombre)
+    # Temporal propio del reclamo: un trabajador anterior del mismo trabajo puede seguir vivo
+    temporal = f"{ruta}.{os.getpid()}.{trabajo.intentos}.tmp"
+    # Solo se actualiza mientras el reclamo siga siendo de este trabajador
+    propio = TrabajoExportacion.objects.filter(
+        pk=trabajo.pk, estado=TrabajoExportacion.EN_PROCESO, iniciado_en=trabajo.iniciado_en
+    )
+
+    def latir(**campos):
+        if not propio.update(latido_en=timezone.now(), **campos):
+            raise ReclamoPerdido(f"El trabajo {trabajo.pk} ya no pertenece a este trabajador.")
+
+    try:
+        os.makedirs(os.path.dirname(ruta), exist_ok=True)
+        latir(total_filas=queryset.count())
+
+        procesadas = 0
+        ultimo_latido = time.monotonic()
+
+        def contar(filas):
+            nonlocal procesadas, ultimo_latido
+            for i, fila in enumerate(filas):
+                if i:  # el encabezado no cuenta como fila
+                    procesadas += 1
+                    if procesadas % INTERVALO_PROGRESO == 0 or time.monotonic() - ultimo_latido > INTERVALO_LATIDO:
+                        latir(filas_procesadas=procesadas)
+                        ultimo_latido = time.monotonic()
+                yield fila
+
+        with open(temporal, 'w', encoding='utf-8', newline='') as destino:
+            for bloque in csv_por_bloques(contar(filas_pacientes_atendidos(queryset))):
+                destino.write(bloque)
+        os.replace(temporal, ruta)
+
+    except ReclamoPerdido:
+        if os.path.exists(temporal):
+            os.remove(temporal)
+        logger.warning(f"EXPORTACIÓN ABANDONADA: Trabajo {trabajo.pk} reclamado por otro trabajador")
+        trabajo.refresh_from_db()
+        return trabajo
+    except Exception as exc:
+        if os.path.exists(temporal):
+            os.remove(temporal)
+        propio.update(
+            estado=TrabajoExportacion.FALLIDO,
+            mensaje_error=str(exc),
+            finalizado_en=timezone.now(),
+        )
+        logger.exception(f"EXPORTACIÓN FALLIDA: Trabajo {trabajo.pk}")
+        trabajo.refresh_from_db()
+        return trabajo
+
+    propio.update(
+        estado=TrabajoExportacion.COMPLETADO,
+        filas_procesadas=procesadas,
+        archivo=nombre,
+        finalizado_en=timezone.now(),
+    )
+    logger.info(f"EXPORTACIÓN COMPLETADA: Trabajo {trabajo.pk} ({procesadas} filas)")
+    trabajo.refresh_from_db()
+    return trabajo
+
+
+def limpiar_exportaciones():
+    """
+    Borra los trabajos COMPLETADO/FALLIDO terminados hace más de
+    RETENCION_SEGUNDOS con sus archivos, y los temporales huérfanos de
+    trabajadores caídos. Retorna la cantidad de trabajos borrados.
+    """
+    limite = timezone.now() - timedelta(seconds=RETENCION_SEGUNDOS)
+    vencidos = TrabajoExportacion.objects.filter(
+        estado__in=[TrabajoExportacion.COMPLETADO, TrabajoExportacion.FALLIDO], finalizado_en__lt=limite
+    )
+    for trabajo in vencidos.exclude(archivo='').only('archivo').iterator():
+        trabajo.archivo.delete(save=False)
+    borrados, _ = vencidos.delete()
+
+    limite_temporal = time.time() - RETENCION_SEGUNDOS
+    for temporal in glob.glob(os.path.join(settings.MEDIA_ROOT, 'exportaciones', '*.tmp')):
+        try:
+            if os.path.getmtime(temporal) < limite_temporal:
+                os.remove(temporal)
+        except FileNotFoundError:
+            pass
+    return borrados
+
+
+# =====================================================================
+# CONTROL DE CAMBIOS
+# =====================================================================
+# Versión | Fecha       | Autor / Responsable      | Descripción
+# 1.0     | 17/10/2026  | Prixma Software Projects | Exportaciones en segundo plano con caché por huella
+# 1.1     | 17/10/2026  | Prixma Software Projects | Latido, reencolado de trabajos abandonados y limpieza de archivos vencidos
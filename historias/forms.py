@@ -1,15 +1,17 @@
 # -------------------------------------------------------------------
 # Proyecto: SOFT-MEDIC
 # Archivo: softmedic/historias/forms.py
-# Versión: 3.0
+# Versión: 3.4
 # Fecha: 04/12/2025
 # Elaborado por: Prixma Software Projects
 # Revisado por: Dirección Técnica de SOFT-MEDIC
 # -------------------------------------------------------------------
 
 from django import forms
-from django.forms import inlineformset_factory
+from django.core.exceptions import ValidationError
+from django.forms import BaseInlineFormSet, inlineformset_factory
 from .models import (
+    Cita,
     HistoriaClinica,
     Diagnostico,
     Medicamento,
@@ -17,6 +19,7 @@ from .models import (
     HistoriaAdjunto
 )
 from users.models import CustomUser
+from pacientes.widgets import PacienteAutocompleteWidget
 
 
 # ================================================================
@@ -55,6 +58,9 @@ class HistoriaClinicaForm(forms.ModelForm):
         ]
 
         widgets = {
+            # Solo carga el paciente seleccionado; el resto se busca por autocompletado
+            'paciente': PacienteAutocompleteWidget(),
+
             'motivo_consulta': forms.Textarea(attrs={'rows': 3, 'class': 'form-control'}),
             'resumen_clinico': forms.Textarea(attrs={'rows': 3, 'class': 'form-control', 'required': True}),
             'notas_adicionales': forms.Textarea(attrs={'rows': 3, 'class': 'form-control'}),
@@ -98,6 +104,44 @@ class HistoriaClinicaForm(forms.ModelForm):
         return instance
 
 
+# ================================================================
+# BASE DE LOS FORMSETS DE LA HISTORIA
+# ================================================================
+class IdFilaCargadaField(forms.ModelChoiceField):
+    """
+    Campo oculto de id que se resuelve contra las filas que el formset
+    ya cargó con get_queryset(), en lugar de un SELECT por fila.
+    """
+
+    def __init__(self, formset, **kwargs):
+        super().__init__(formset.get_queryset(), **kwargs)
+        self.formset = formset
+
+    def to_python(self, value):
+        if value in self.empty_values:
+            return None
+        try:
+            # Mismo diccionario que usa el formset para asignar form.instance
+            objeto = self.formset._existing_object(self.formset.model._meta.pk.to_python(value))
+        except ValidationError:
+            objeto = None
+        if objeto is None:
+            raise ValidationError(self.error_messages['invalid_choice'], code='invalid_choice')
+        return objeto
+
+
+class HistoriaInlineFormSet(BaseInlineFormSet):
+    """Inline formset que valida las filas existentes sin consultas adicionales."""
+
+    def add_fields(self, form, index):
+        super().add_fields(form, index)
+        campo = form.fields.get(self._pk_field.name)
+        if isinstance(campo, forms.ModelChoiceField):
+            form.fields[self._pk_field.name] = IdFilaCargadaField(
+                self, initial=campo.initial, required=False, widget=campo.widget
+            )
+
+
 # ================================================================
 # FORM ADJUNTOS
 # ================================================================
@@ -113,6 +157,7 @@ class HistoriaAdjuntoForm(forms.ModelForm):
 HistoriaAdjuntoFormSet = inlineformset_factory(
     HistoriaClinica,
     HistoriaAdjunto,
+    formset=HistoriaInlineFormSet,
     form=HistoriaAdjuntoForm,
     extra=1,
     can_delete=True
@@ -125,6 +170,7 @@ HistoriaAdjuntoFormSet = inlineformset_factory(
 DiagnosticoFormSet = inlineformset_factory(
     HistoriaClinica,
     Diagnostico,
+    formset=HistoriaInlineFormSet,
     fields=['descripcion', 'codigo_cie10'],
     extra=1,
     can_delete=True
@@ -133,6 +179,7 @@ DiagnosticoFormSet = inlineformset_factory(
 MedicamentoFormSet = inlineformset_factory(
     HistoriaClinica,
     Medicamento,
+    formset=HistoriaInlineFormSet,
     fields=['nombre'],
     extra=1,
     can_delete=True
@@ -141,14 +188,75 @@ MedicamentoFormSet = inlineformset_factory(
 ObservacionFormSet = inlineformset_factory(
     HistoriaClinica,
     Observacion,
+    formset=HistoriaInlineFormSet,
     fields=['detalle'],
     extra=1,
     can_delete=True
 )
 
 
+# ================================================================
+# FILTROS DE EXPORTACIÓN EN SEGUNDO PLANO
+# ================================================================
+class SolicitudExportacionForm(forms.Form):
+    fecha_desde = forms.DateField(required=False)
+    fecha_hasta = forms.DateField(required=False)
+    medico = forms.IntegerField(required=False, min_value=1)
+    eps = forms.IntegerField(required=False, min_value=1)
+
+    def clean(self):
+        cleaned_data = super().clean()
+        desde = cleaned_data.get('fecha_desde')
+        hasta = cleaned_data.get('fecha_hasta')
+        if desde and hasta and desde > hasta:
+            raise forms.ValidationError("La fecha inicial no puede ser posterior a la final.")
+        return cleaned_data
+
+    def parametros(self):
+        """Filtros listos para guardarse en TrabajoExportacion.parametros."""
+        datos = self.cleaned_data
+        return {
+            'fecha_desde': datos['fecha_desde'].isoformat() if datos.get('fecha_desde') else None,
+            'fecha_hasta': datos['fecha_hasta'].isoformat() if datos.get('fecha_hasta') else None,
+            'medico': datos.get('medico'),
+            'eps': datos.get('eps'),
+        }
+
+
+# ================================================================
+# AGENDA - Cita con médico e intervalo
+# ================================================================
+class CitaForm(forms.ModelForm):
+    """
+    Reserva de cita para una historia (fijada por la vista). La
+    validación de cruces la hace Cita.clean() (historias/agenda.py).
+    """
+
+    class Meta:
+        model = Cita
+        fields = ['medico', 'fecha', 'fin', 'motivo']
+        widgets = {
+            'medico': forms.Select(attrs={'class': 'form-select'}),
+            'fecha': forms.DateTimeInput(attrs={'type': 'datetime-local', 'class': 'form-control'}, format='%Y-%m-%dT%H:%M'),
+            'fin': forms.DateTimeInput(attrs={'type': 'datetime-local', 'class': 'form-control'}, format='%Y-%m-%dT%H:%M'),
+            'motivo': forms.TextInput(attrs={'class': 'form-control'}),
+        }
+
+    def __init__(self, *args, historia=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.instance.historia = historia
+        self.fields['medico'].required = True
+        self.fields['medico'].queryset = CustomUser.objects.filter(rol='MEDICO', is_active=True).order_by('nombre')
+        if historia is not None and not self.instance.medico_id:
+            self.initial.setdefault('medico', historia.medico_responsable_id)
+
+
 # ================================================================
 # CONTROL DE CAMBIOS
 # ================================================================
 # Versión | Fecha       | Autor / Responsable | Descripción
 # 3.0     | 04/12/2025  | Prixma Software Projects | Unificación completa con modelo clínico ampliado + adjuntos + widgets
+# 3.1     | 17/10/2026  | Prixma Software Projects | Formulario de filtros para exportaciones en segundo plano
+# 3.2     | 17/10/2026  | Prixma Software Projects | Selector de paciente con autocompletado
+# 3.3     | 17/10/2026  | Prixma Software Projects | Formulario de reserva de citas (agenda)
+# 3.4     | 18/10/2026  | Prixma Software Projects | Formsets de la historia sin un SELECT por fila existente
@@ -0,0 +1,76 @@
+# =====================================================================
+# Proyecto: SOFT-MEDIC
+# Archivo: historias/identidad.py
+# Versión: 1.0
+# Fecha: 17/10/2026
+# Elaborado por: Prixma Software Projects
+# Revisado por: Dirección Técnica de SOFT-MEDIC
+# =====================================================================
+#
+# Mapa de identidad por petición.
+#
+# Guarda en el request los objetos ya consultados, de modo que la
+# verificación de permisos en dispatch() y la vista genérica
+# compartan la misma instancia: cada objeto se carga una sola vez
+# por petición, con sus relaciones unidas en la misma consulta.
+# ---------------------------------------------------------------------
+
+from django.http import Http404
+
+from .models import HistoriaClinica
+
+# Relaciones que usan los permisos y las plantillas de la historia
+RELACIONES_HISTORIA = ('paciente', 'medico_responsable')
+
+
+class MapaIdentidad:
+    """Caché (modelo, pk) → instancia con vida limitada a una petición."""
+
+    def __init__(self):
+        self._objetos = {}
+
+    @staticmethod
+    def _clave(modelo, pk):
+        return (modelo._meta.label_lower, str(pk))
+
+    def obtener(self, modelo, pk, select_related=()):
+        """
+        Retorna la instancia de `modelo` con clave `pk`, consultándola
+        solo la primera vez. Propaga modelo.DoesNotExist.
+        """
+        clave = self._clave(modelo, pk)
+        if clave not in self._objetos:
+            queryset = modelo._default_manager.all()
+            if select_related:
+                queryset = queryset.select_related(*select_related)
+            self._objetos[clave] = queryset.get(pk=pk)
+        return self._objetos[clave]
+
+    def registrar(self, objeto):
+        self._objetos[self._clave(type(objeto), objeto.pk)] = objeto
+
+    def olvidar(self, modelo, pk):
+        self._objetos.pop(self._clave(modelo, pk), None)
+
+
+def mapa_identidad(request):
+    """Retorna (creándolo si hace falta) el mapa de identidad de la petición."""
+    mapa = getattr(request, '_mapa_identidad', None)
+    if mapa is None:
+        mapa = request._mapa_identidad = MapaIdentidad()
+    return mapa
+
+
+def obtener_historia(request, pk):
+    """HistoriaClinica con paciente y médico unidos, una vez por petición."""
+    try:
+        return mapa_identidad(request).obtener(HistoriaClinica, pk, select_related=RELACIONES_HISTORIA)
+    except (HistoriaClinica.DoesNotExist, ValueError):
+        raise Http404("La historia clínica no existe.")
+
+
+class HistoriaIdentidadMixin:
+    """Hace que get_object() de las vistas genéricas use el mapa de identidad."""
+
+    def get_object(self, queryset=None):
+        return obtener_historia(self.request, self.kwargs['pk'])
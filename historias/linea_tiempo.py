@@ -0,0 +1,115 @@
+# =====================================================================
+# Proyecto: SOFT-MEDIC
+# Archivo: historias/linea_tiempo.py
+# Versión: 1.0
+# Fecha: 17/10/2026
+# Elaborado por: Prixma Software Projects
+# Revisado por: Dirección Técnica de SOFT-MEDIC
+# =====================================================================
+#
+# Línea de tiempo de una historia o de un paciente.
+#
+# Los eventos de cada fuente (citas, observaciones, diagnósticos,
+# medicamentos y adjuntos) se leen por separado con un rango sobre el
+# índice (historia, momento, id), pidiendo a cada una como máximo una
+# página, y se intercalan en memoria con heapq.merge.
+#
+# Orden global: momento descendente, luego fuente (orden de FUENTES) y
+# luego id descendente. El cursor guarda (momento, fuente, id) del
+# último evento entregado.
+# ---------------------------------------------------------------------
+
+import heapq
+from collections import namedtuple
+
+from django.utils.dateparse import parse_datetime
+
+from .models import Cita, Diagnostico, HistoriaAdjunto, Medicamento, Observacion
+from .paginacion import PaginaCursor, codificar_cursor, decodificar_cursor, filtro_posterior
+
+Fuente = namedtuple('Fuente', ['tipo', 'modelo', 'campo_momento', 'campos', 'resumir'])
+
+Evento = namedtuple('Evento', ['momento', 'tipo', 'id', 'historia_id', 'resumen'])
+
+FUENTES = (
+    Fuente('cita', Cita, 'fecha', ('motivo', 'estado'),
+           lambda f: f"{f['motivo']} ({f['estado']})"),
+    Fuente('observacion', Observacion, 'creado_en', ('detalle',),
+           lambda f: f['detalle'][:200]),
+    Fuente('diagnostico', Diagnostico, 'creado_en', ('descripcion', 'codigo_cie10'),
+           lambda f: f"{f['descripcion']} ({f['codigo_cie10'] or 'sin código'})"),
+    Fuente('medicamento', Medicamento, 'creado_en', ('nombre',),
+           lambda f: f['nombre']),
+    Fuente('adjunto', HistoriaAdjunto, 'creado_en', ('descripcion', 'archivo'),
+           lambda f: f['descripcion'] or f['archivo']),
+)
+
+RANGO_FUENTE = {fuente.tipo: rango for rango, fuente in enumerate(FUENTES)}
+
+
+def _clave(evento):
+    # Con reverse=True: momento desc, rango de fuente asc, id desc
+    return (evento.momento, -RANGO_FUENTE[evento.tipo], evento.id)
+
+
+def _leer_cursor(token):
+    valores = decodificar_cursor(token)
+    if not valores or len(valores) != 3 or valores[1] not in RANGO_FUENTE:
+        return None
+    momento = parse_datetime(valores[0]) if isinstance(valores[0], str) else None
+    if momento is None or not isinstance(valores[2], int):
+        return None
+    return momento, valores[1], valores[2]
+
+
+def consulta_fuente(fuente, historia_id, cursor, limite):
+    """Queryset de hasta `limite` filas de una fuente y una historia, posteriores al cursor."""
+    campo = fuente.campo_momento
+    queryset = fuente.modelo.objects.filter(historia_id=historia_id)
+
+    if cursor:
+        momento, tipo, pk = cursor
+        if RANGO_FUENTE[fuente.tipo] > RANGO_FUENTE[tipo]:
+            queryset = queryset.filter(**{f'{campo}__lte': momento})
+        elif fuente.tipo == tipo:
+            queryset = queryset.filter(filtro_posterior((f'-{campo}', '-id'), [momento, pk]))
+        else:
+            queryset = queryset.filter(**{f'{campo}__lt': momento})
+
+    return queryset.order_by(f'-{campo}', '-id').values('id', campo, *fuente.campos)[:limite]
+
+
+def _eventos_fuente(fuente, historia_id, cursor, limite):
+    """Hasta `limite` eventos de una fuente y una historia, posteriores al cursor."""
+    campo = fuente.campo_momento
+    filas = consulta_fuente(fuente, historia_id, cursor, limite)
+    return [
+        Evento(fila[campo], fuente.tipo, fila['id'], historia_id, fuente.resumir(fila))
+        for fila in filas
+    ]
+
+
+def linea_tiempo(historia_ids, cursor=None, tamano=50):
+    """
+    PaginaCursor de eventos de las historias indicadas, más recientes
+    primero. Cada (fuente, historia) aporta a lo sumo tamano + 1 filas.
+    """
+    posicion = _leer_cursor(cursor)
+    listas = [
+        _eventos_fuente(fuente, historia_id, posicion, tamano + 1)
+        for historia_id in historia_ids
+        for fuente in FUENTES
+    ]
+
+    eventos = []
+    for evento in heapq.merge(*listas, key=_clave, reverse=True):
+        eventos.append(evento)
+        if len(eventos) > tamano:
+            break
+
+    siguiente = None
+    if len(eventos) > tamano:
+        eventos = eventos[:tamano]
+        ultimo = eventos[-1]
+        siguiente = codificar_cursor([ultimo.momento.isoformat(), ultimo.tipo, ultimo.id])
+    return PaginaCursor(eventos, siguiente)
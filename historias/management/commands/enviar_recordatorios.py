@@ -0,0 +1,66 @@
+# =====================================================================
+# Proyecto: SOFT-MEDIC
+# Archivo: historias/management/commands/enviar_recordatorios.py
+# Versión: 1.0
+# Fecha: 17/10/2026
+# Elaborado por: Prixma Software Projects
+# Revisado por: Dirección Técnica de SOFT-MEDIC
+# =====================================================================
+
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+from django.utils import timezone
+
+from historias.recordatorios import TRABAJADORES, enviar_pendientes, generar_recordatorios
+
+
+class Command(BaseCommand):
+    help = "Envía los recordatorios de la bandeja de salida con reintentos."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--continuo',
+            action='store_true',
+            help="Queda en ejecución: genera los recordatorios de mañana una vez al día y vacía la bandeja.",
+        )
+        parser.add_argument(
+            '--intervalo',
+            type=float,
+            default=30.0,
+            help="Segundos de espera cuando la bandeja está vacía (por defecto 30).",
+        )
+        parser.add_argument('--lote', type=int, default=100, help="Mensajes reservados por lote (por defecto 100).")
+        parser.add_argument(
+            '--trabajadores',
+            type=int,
+            default=TRABAJADORES,
+            help=f"Hilos de envío simultáneos (por defecto {TRABAJADORES}).",
+        )
+
+    def handle(self, *args, **options):
+        ultimo_dia_generado = None
+        total_enviados = total_fallidos = 0
+        try:
+            while True:
+                close_old_connections()
+
+                if options['continuo'] and ultimo_dia_generado != timezone.localdate():
+                    creados, _ = generar_recordatorios()
+                    ultimo_dia_generado = timezone.localdate()
+                    self.stdout.write(f"Recordatorios de mañana generados: {creados}.")
+
+                enviados, fallidos = enviar_pendientes(options['lote'], options['trabajadores'])
+                total_enviados += enviados
+                total_fallidos += fallidos
+
+                if not enviados and not fallidos:
+                    if not options['continuo']:
+                        break
+                    time.sleep(options['intervalo'])
+        except KeyboardInterrupt:
+            pass
+        self.stdout.write(self.style.SUCCESS(
+            f"Recordatorios enviados: {total_enviados}; con error: {total_fallidos}."
+        ))
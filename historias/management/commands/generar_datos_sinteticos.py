@@ -0,0 +1,70 @@
+# =====================================================================
+# Proyecto: SOFT-MEDIC
+# Archivo: historias/management/commands/generar_datos_sinteticos.py
+# Versión: 1.0
+# Fecha: 17/10/2026
+# Elaborado por: Prixma Software Projects
+# Revisado por: Dirección Técnica de SOFT-MEDIC
+# =====================================================================
+
+import os
+
+from django.core.management.base import BaseCommand, CommandError
+
+from historias.datos_sinteticos import BLOQUE, LOTE, MEDICOS, generar
+
+
+class Command(BaseCommand):
+    help = (
+        "Genera pacientes sintéticos con su historia clínica, diagnósticos, medicamentos, "
+        "observaciones y citas, para pruebas de rendimiento. La misma semilla produce los mismos datos."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--pacientes', type=int, default=1000000, help="Pacientes a generar (por defecto 1000000).")
+        parser.add_argument('--semilla', type=int, default=0, help="Semilla del generador (por defecto 0).")
+        parser.add_argument(
+            '--desde',
+            type=int,
+            default=0,
+            help="Índice del primer paciente; permite agregar datos a una carga anterior.",
+        )
+        parser.add_argument('--medicos', type=int, default=MEDICOS, help=f"Médicos sintéticos (por defecto {MEDICOS}).")
+        parser.add_argument(
+            '--procesos',
+            type=int,
+            default=os.cpu_count() or 1,
+            help="Procesos de generación (por defecto, uno por CPU).",
+        )
+        parser.add_argument('--bloque', type=int, default=BLOQUE, help=f"Pacientes por bloque (por defecto {BLOQUE}).")
+        parser.add_argument('--lote', type=int, default=LOTE, help=f"Filas por INSERT (por defecto {LOTE}).")
+
+    def handle(self, *args, **options):
+        if options['pacientes'] < 1 or options['medicos'] < 1:
+            raise CommandError("Se requiere al menos un paciente y un médico.")
+
+        def progreso(resumen):
+            self.stdout.write(
+                f"  {resumen.pacientes} pacientes, {resumen.hijos} registros clínicos "
+                f"({resumen.pacientes / max(resumen.segundos, 1e-6):.0f} pacientes/s)"
+            )
+
+        try:
+            resumen = generar(
+                options['pacientes'],
+                semilla=options['semilla'],
+                desde=options['desde'],
+                procesos=options['procesos'],
+                bloque=options['bloque'],
+                lote=options['lote'],
+                medicos=options['medicos'],
+                progreso=progreso,
+            )
+        except ValueError as error:
+            raise CommandError(str(error))
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Datos generados en {resumen.segundos:.1f} s: {resumen.pacientes} pacientes, "
+            f"{resumen.historias} historias y {resumen.hijos} registros clínicos. "
+            f"Índice de búsqueda y disponibilidad reconstruidos."
+        ))
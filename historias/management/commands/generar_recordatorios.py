@@ -0,0 +1,38 @@
+# =====================================================================
+# Proyecto: SOFT-MEDIC
+# Archivo: historias/management/commands/generar_recordatorios.py
+# Versión: 1.0
+# Fecha: 17/10/2026
+# Elaborado por: Prixma Software Projects
+# Revisado por: Dirección Técnica de SOFT-MEDIC
+# =====================================================================
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils.dateparse import parse_date
+
+from historias.recordatorios import generar_recordatorios
+
+
+class Command(BaseCommand):
+    help = "Escribe en la bandeja de salida los recordatorios de las citas de un día (por defecto mañana)."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--fecha', help="Día de las citas (AAAA-MM-DD).")
+        parser.add_argument(
+            '--lote',
+            type=int,
+            default=500,
+            help="Citas leídas por consulta (por defecto 500).",
+        )
+
+    def handle(self, *args, **options):
+        dia = None
+        if options['fecha']:
+            dia = parse_date(options['fecha'])
+            if dia is None:
+                raise CommandError("Fecha inválida; use AAAA-MM-DD.")
+
+        creados, sin_correo = generar_recordatorios(dia, lote=options['lote'])
+        self.stdout.write(self.style.SUCCESS(
+            f"Recordatorios generados: {creados} ({sin_correo} citas sin correo de contacto)."
+        ))
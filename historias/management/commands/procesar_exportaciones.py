@@ -0,0 +1,63 @@
+# =====================================================================
+# Proyecto: SOFT-MEDIC
+# Archivo: historias/management/commands/procesar_exportaciones.py
+# Versión: 1.1
+# Fecha: 17/10/2026
+# Elaborado por: Prixma Software Projects
+# Revisado por: Dirección Técnica de SOFT-MEDIC
+# =====================================================================
+
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+from historias.exportaciones import tomar_siguiente_trabajo, procesar_trabajo, limpiar_exportaciones
+
+# Cada cuánto se borran los trabajos y archivos vencidos
+INTERVALO_LIMPIEZA = 3600
+
+
+class Command(BaseCommand):
+    help = "Procesa los trabajos de exportación pendientes (proceso trabajador local)."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--una-vez',
+            action='store_true',
+            help="Procesa los trabajos pendientes y termina, en lugar de quedar a la espera.",
+        )
+        parser.add_argument(
+            '--intervalo',
+            type=float,
+            default=2.0,
+            help="Segundos de espera entre consultas cuando no hay trabajos (por defecto 2).",
+        )
+
+    def handle(self, *args, **options):
+        self.stdout.write("Trabajador de exportaciones iniciado.")
+        ultima_limpieza = None
+        try:
+            while True:
+                close_old_connections()
+                if ultima_limpieza is None or time.monotonic() - ultima_limpieza > INTERVALO_LIMPIEZA:
+                    borrados = limpiar_exportaciones()
+                    if borrados:
+                        self.stdout.write(f"Exportaciones vencidas eliminadas: {borrados}")
+                    ultima_limpieza = time.monotonic()
+                trabajo = tomar_siguiente_trabajo()
+
+                if trabajo is None:
+                    if options['una_vez']:
+                        break
+                    time.sleep(options['intervalo'])
+                    continue
+
+                self.stdout.write(f"Procesando exportación {trabajo.pk}...")
+                trabajo = procesar_trabajo(trabajo)
+                self.stdout.write(
+                    f"Exportación {trabajo.pk}: {trabajo.estado} ({trabajo.filas_procesadas} filas)"
+                )
+        except KeyboardInterrupt:
+            pass
+        self.stdout.write("Trabajador de exportaciones detenido.")
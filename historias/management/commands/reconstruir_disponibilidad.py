@@ -0,0 +1,29 @@
+# =====================================================================
+# Proyecto: SOFT-MEDIC
+# Archivo: historias/management/commands/reconstruir_disponibilidad.py
+# Versión: 1.0
+# Fecha: 17/10/2026
+# Elaborado por: Prixma Software Projects
+# Revisado por: Dirección Técnica de SOFT-MEDIC
+# =====================================================================
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from historias.disponibilidad import reconstruir_disponibilidad
+
+
+class Command(BaseCommand):
+    help = "Regenera los mapas de disponibilidad de los médicos a partir de las citas."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--todo',
+            action='store_true',
+            help="Incluye días pasados (por defecto solo desde hoy).",
+        )
+
+    def handle(self, *args, **options):
+        desde = None if options['todo'] else timezone.localdate()
+        total = reconstruir_disponibilidad(desde=desde)
+        self.stdout.write(self.style.SUCCESS(f"Disponibilidad reconstruida: {total} días con citas."))
@@ -0,0 +1,31 @@
+# =====================================================================
+# Proyecto: SOFT-MEDIC
+# Archivo: historias/management/commands/reconstruir_indice_busqueda.py
+# Versión: 1.0
+# Fecha: 17/10/2026
+# Elaborado por: Prixma Software Projects
+# Revisado por: Dirección Técnica de SOFT-MEDIC
+# =====================================================================
+
+from django.core.management.base import BaseCommand
+
+from historias.busqueda import reconstruir_indice
+
+
+class Command(BaseCommand):
+    help = "Reconstruye el índice de búsqueda de texto completo de las historias clínicas."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--lote',
+            type=int,
+            default=1000,
+            help="Historias indexadas por lote (por defecto 1000).",
+        )
+
+    def handle(self, *args, **options):
+        total = reconstruir_indice(
+            lote=options['lote'],
+            progreso=lambda n: self.stdout.write(f"  {n} historias indexadas..."),
+        )
+        self.stdout.write(self.style.SUCCESS(f"Índice reconstruido: {total} historias."))
@@ -0,0 +1,51 @@
+# =====================================================================
+# Proyecto: SOFT-MEDIC
+# Archivo: historias/management/commands/verificar_auditoria.py
+# Versión: 1.0
+# Fecha: 17/10/2026
+# Elaborado por: Prixma Software Projects
+# Revisado por: Dirección Técnica de SOFT-MEDIC
+# =====================================================================
+
+import os
+
+from django.core.management.base import BaseCommand, CommandError
+
+from historias.cadena_auditoria import verificar, verificar_log
+from users.visor_logs import ruta_log
+
+
+class Command(BaseCommand):
+    help = (
+        "Verifica la cadena de hashes de auditoría y que logs/audit.log coincida con ella. "
+        "Por defecto la cadena se revisa solo desde el último punto de control verificado."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--completo',
+            action='store_true',
+            help="Revisa toda la cadena, tramo por tramo entre puntos de control.",
+        )
+        parser.add_argument(
+            '--procesos',
+            type=int,
+            default=os.cpu_count() or 1,
+            help="Procesos para la revisión completa (por defecto, uno por CPU).",
+        )
+        parser.add_argument('--sin-log', action='store_true', help="No compara logs/audit.log con la cadena.")
+
+    def handle(self, *args, **options):
+        revisados, errores = verificar(completa=options['completo'], procesos=options['procesos'])
+        if not options['sin_log']:
+            lineas, otras, errores_log = verificar_log(ruta_log('audit'))
+            errores += errores_log
+            self.stdout.write(
+                f"logs/audit.log: {lineas} líneas de eventos comparadas; "
+                f"{otras} líneas sin eslabón (no cubiertas por la cadena)."
+            )
+        for error in errores:
+            self.stderr.write(error)
+        if errores:
+            raise CommandError(f"Cadena de auditoría alterada: {len(errores)} error(es) en {revisados} eslabones revisados.")
+        self.stdout.write(self.style.SUCCESS(f"Cadena de auditoría íntegra: {revisados} eslabones revisados."))
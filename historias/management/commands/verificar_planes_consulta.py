@@ -0,0 +1,38 @@
+# =====================================================================
+# Proyecto: SOFT-MEDIC
+# Archivo: historias/management/commands/verificar_planes_consulta.py
+# Versión: 1.0
+# Fecha: 17/10/2026
+# Elaborado por: Prixma Software Projects
+# Revisado por: Dirección Técnica de SOFT-MEDIC
+# =====================================================================
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+
+from historias.planes_consulta import verificar_planes
+
+
+class Command(BaseCommand):
+    help = "Verifica con EXPLAIN QUERY PLAN que las consultas principales usan índices."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--detalle', action='store_true', help="Muestra el plan completo de cada consulta.")
+
+    def handle(self, *args, **options):
+        if connection.vendor != 'sqlite':
+            self.stdout.write(self.style.WARNING("La verificación solo está disponible para SQLite."))
+            return
+
+        fallidas = []
+        for nombre, (plan, problemas) in verificar_planes().items():
+            if problemas:
+                fallidas.append(nombre)
+                self.stdout.write(self.style.ERROR(f"✗ {nombre}: {', '.join(problemas)}"))
+            else:
+                self.stdout.write(self.style.SUCCESS(f"✓ {nombre}"))
+            if options['detalle'] or problemas:
+                self.stdout.write(plan)
+
+        if fallidas:
+            raise CommandError(f"{len(fallidas)} consulta(s) sin índice adecuado: {', '.join(fallidas)}")
@@ -0,0 +1,21 @@
+# historias/middleware.py
+from .auditoria import usuario_actual
+
+
+class UsuarioAuditoriaMiddleware:
+    """
+    Expone el usuario autenticado de la petición a los receptores de
+    auditoría (historias/auditoria.py) mediante una variable de contexto.
+    Debe ir después de AuthenticationMiddleware.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        usuario = getattr(request, 'user', None)
+        marca = usuario_actual.set(usuario.pk if usuario is not None and usuario.is_authenticated else None)
+        try:
+            return self.get_response(request)
+        finally:
+            usuario_actual.reset(marca)
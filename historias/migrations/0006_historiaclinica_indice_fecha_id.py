@@ -0,0 +1,20 @@
+# Generated by Django 5.2.18 on 2026-10-17 22:49
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('historias', '0005_diagnostico_codigo_cie10_and_more'),
+        ('pacientes', '0002_eps_alter_paciente_eps'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='historiaclinica',
+            index=models.Index(fields=['-fecha_ingreso', '-id'], name='hc_fecha_id_idx'),
+        ),
+    ]
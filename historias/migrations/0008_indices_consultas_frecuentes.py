@@ -0,0 +1,28 @@
+# Generated by Django 5.2.18 on 2026-10-17 22:52
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('historias', '0007_trabajoexportacion'),
+        ('pacientes', '0003_indices_consultas_frecuentes'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='cita',
+            index=models.Index(fields=['historia', 'fecha'], name='cita_historia_fecha_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='cita',
+            index=models.Index(fields=['estado', 'fecha'], name='cita_estado_fecha_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='historiaclinica',
+            index=models.Index(fields=['medico_responsable', '-fecha_ingreso', '-id'], name='hc_medico_fecha_idx'),
+        ),
+    ]
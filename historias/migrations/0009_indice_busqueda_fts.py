@@ -0,0 +1,46 @@
+# Índice de texto completo (FTS5) sobre la narrativa clínica.
+#
+# El DDL va escrito aquí y no se toma de historias.busqueda: la
+# migración debe seguir produciendo esta tabla aunque el módulo cambie.
+
+from django.db import migrations
+
+TABLA = 'historias_busqueda_fts'
+COLUMNAS = 'motivo_consulta, resumen_clinico, sintomas_principales, examen_fisico, plan_manejo, observaciones'
+
+
+def crear_indice(apps, schema_editor):
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    schema_editor.execute(
+        f"CREATE VIRTUAL TABLE IF NOT EXISTS {TABLA} USING fts5("
+        f"{COLUMNAS}, tokenize='unicode61 remove_diacritics 2')"
+    )
+
+    # Carga inicial con las historias existentes
+    schema_editor.execute(
+        f"INSERT INTO {TABLA} (rowid, {COLUMNAS}) "
+        "SELECT h.id, COALESCE(h.motivo_consulta, ''), COALESCE(h.resumen_clinico, ''), "
+        "COALESCE(h.sintomas_principales, ''), COALESCE(h.examen_fisico, ''), "
+        "COALESCE(h.plan_manejo, ''), "
+        "COALESCE((SELECT group_concat(o.detalle, char(10)) FROM historias_observacion o "
+        "WHERE o.historia_id = h.id), '') "
+        "FROM historias_historiaclinica h"
+    )
+
+
+def eliminar_indice(apps, schema_editor):
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    schema_editor.execute(f"DROP TABLE IF EXISTS {TABLA}")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('historias', '0008_indices_consultas_frecuentes'),
+    ]
+
+    operations = [
+        migrations.RunPython(crear_indice, eliminar_indice),
+    ]
@@ -0,0 +1,58 @@
+# Generated by Django 5.2.18 on 2026-10-17 23:03
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+def fechar_registros_existentes(apps, schema_editor):
+    """
+    Los diagnósticos y medicamentos previos no tienen fecha propia:
+    se les asigna la fecha de creación de su historia.
+    """
+    HistoriaClinica = apps.get_model('historias', 'HistoriaClinica')
+    for nombre in ('Diagnostico', 'Medicamento'):
+        modelo = apps.get_model('historias', nombre)
+        modelo.objects.update(
+            creado_en=models.Subquery(
+                HistoriaClinica.objects.filter(pk=models.OuterRef('historia_id')).values('created_at')[:1]
+            )
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('historias', '0009_indice_busqueda_fts'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='diagnostico',
+            name='creado_en',
+            field=models.DateTimeField(auto_now_add=True, default=django.utils.timezone.now),
+            preserve_default=False,
+        ),
+        migrations.AddField(
+            model_name='medicamento',
+            name='creado_en',
+            field=models.DateTimeField(auto_now_add=True, default=django.utils.timezone.now),
+            preserve_default=False,
+        ),
+        migrations.RunPython(fechar_registros_existentes, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='diagnostico',
+            index=models.Index(fields=['historia', 'creado_en', 'id'], name='diag_historia_creado_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='historiaadjunto',
+            index=models.Index(fields=['historia', 'creado_en', 'id'], name='adjunto_historia_creado_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='medicamento',
+            index=models.Index(fields=['historia', 'creado_en', 'id'], name='med_historia_creado_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='observacion',
+            index=models.Index(fields=['historia', 'creado_en', 'id'], name='obs_historia_creado_idx'),
+        ),
+    ]
@@ -0,0 +1,51 @@
+# Generated by Django 5.2.18 on 2026-10-17 23:05
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.conf import settings
+from datetime import timedelta
+
+from django.db import migrations, models
+
+
+def completar_agenda(apps, schema_editor):
+    """Las citas existentes se asignan al médico de su historia y duran 30 minutos."""
+    Cita = apps.get_model('historias', 'Cita')
+    HistoriaClinica = apps.get_model('historias', 'HistoriaClinica')
+    Cita.objects.filter(medico__isnull=True).update(
+        medico_id=models.Subquery(
+            HistoriaClinica.objects.filter(pk=models.OuterRef('historia_id')).values('medico_responsable_id')[:1]
+        )
+    )
+    Cita.objects.filter(fin__isnull=True).update(fin=models.F('fecha') + timedelta(minutes=30))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('historias', '0010_linea_tiempo'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='cita',
+            name='fin',
+            field=models.DateTimeField(blank=True, null=True, verbose_name='Fin'),
+        ),
+        migrations.AddField(
+            model_name='cita',
+            name='medico',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='citas_agenda', to=settings.AUTH_USER_MODEL, verbose_name='Médico'),
+        ),
+        migrations.AlterField(
+            model_name='cita',
+            name='fecha',
+            field=models.DateTimeField(default=django.utils.timezone.now, verbose_name='Inicio'),
+        ),
+        migrations.RunPython(completar_agenda, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='cita',
+            index=models.Index(fields=['medico', 'fecha'], name='cita_medico_fecha_idx'),
+        ),
+    ]
@@ -0,0 +1,30 @@
+# Generated by Django 5.2.18 on 2026-10-17 23:07
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('historias', '0011_agenda_citas'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DisponibilidadDia',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('fecha', models.DateField()),
+                ('ocupado', models.BigIntegerField(default=0)),
+                ('medico', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='disponibilidad_dias', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': 'Disponibilidad diaria',
+                'verbose_name_plural': 'Disponibilidad diaria',
+                'constraints': [models.UniqueConstraint(fields=('medico', 'fecha'), name='disponibilidad_medico_fecha_unica')],
+            },
+        ),
+    ]
@@ -0,0 +1,36 @@
+# Generated by Django 5.2.18 on 2026-10-17 23:09
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('historias', '0012_disponibilidad_dia'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RecordatorioCita',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('destinatario', models.EmailField(max_length=254)),
+                ('asunto', models.CharField(max_length=255)),
+                ('cuerpo', models.TextField()),
+                ('estado', models.CharField(choices=[('PENDIENTE', 'Pendiente'), ('ENVIANDO', 'Enviando'), ('ENVIADO', 'Enviado'), ('FALLIDO', 'Fallido')], default='PENDIENTE', max_length=20)),
+                ('intentos', models.PositiveSmallIntegerField(default=0)),
+                ('proximo_intento', models.DateTimeField(default=django.utils.timezone.now)),
+                ('ultimo_error', models.TextField(blank=True)),
+                ('creado_en', models.DateTimeField(auto_now_add=True)),
+                ('enviado_en', models.DateTimeField(blank=True, null=True)),
+                ('cita', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='recordatorio', to='historias.cita')),
+            ],
+            options={
+                'verbose_name': 'Recordatorio de cita',
+                'verbose_name_plural': 'Recordatorios de citas',
+                'indexes': [models.Index(fields=['estado', 'proximo_intento'], name='recordatorio_cola_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,34 @@
+# Generated by Django 5.2.18 on 2026-10-17 23:10
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('historias', '0013_recordatorio_cita'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AuditoriaEliminacion',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('modelo_afectado', models.CharField(max_length=100)),
+                ('objeto_id', models.CharField(max_length=50)),
+                ('historia_id', models.BigIntegerField(blank=True, null=True)),
+                ('descripcion', models.TextField(blank=True, null=True)),
+                ('fecha', models.DateTimeField(default=django.utils.timezone.now)),
+                ('usuario', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='auditorias_eliminacion', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': 'Auditoría de eliminación',
+                'verbose_name_plural': 'Auditoría de eliminaciones',
+                'indexes': [models.Index(fields=['historia_id', 'fecha'], name='audit_elim_historia_idx'), models.Index(fields=['modelo_afectado', 'objeto_id'], name='audit_elim_objeto_idx'), models.Index(fields=['usuario', 'fecha'], name='audit_elim_usuario_idx'), models.Index(fields=['fecha'], name='audit_elim_fecha_idx')],
+            },
+        ),
+    ]
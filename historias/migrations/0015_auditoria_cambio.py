@@ -0,0 +1,36 @@
+# Generated by Django 5.2.18 on 2026-10-17 23:13
+
+import django.core.serializers.json
+import django.db.models.deletion
+import django.utils.timezone
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('historias', '0014_auditoria_eliminacion'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AuditoriaCambio',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('modelo_afectado', models.CharField(max_length=100)),
+                ('objeto_id', models.CharField(max_length=50)),
+                ('historia_id', models.BigIntegerField(blank=True, null=True)),
+                ('cambios', models.JSONField(encoder=django.core.serializers.json.DjangoJSONEncoder)),
+                ('fecha', models.DateTimeField(default=django.utils.timezone.now)),
+                ('usuario', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='auditorias_cambio', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': 'Auditoría de cambio',
+                'verbose_name_plural': 'Auditoría de cambios',
+                'ordering': ['-fecha', '-id'],
+                'indexes': [models.Index(fields=['historia_id', 'fecha'], name='audit_cambio_historia_idx'), models.Index(fields=['modelo_afectado', 'objeto_id'], name='audit_cambio_objeto_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,44 @@
+# Generated by Django 5.2.18 on 2026-10-17 23:15
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('historias', '0015_auditoria_cambio'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='EslabonAuditoria',
+            fields=[
+                ('secuencia', models.PositiveBigIntegerField(primary_key=True, serialize=False)),
+                ('contenido', models.TextField()),
+                ('hash', models.CharField(max_length=64)),
+                ('fecha', models.DateTimeField(default=django.utils.timezone.now)),
+            ],
+            options={
+                'verbose_name': 'Eslabón de auditoría',
+                'verbose_name_plural': 'Cadena de auditoría',
+                'ordering': ['secuencia'],
+            },
+        ),
+        migrations.CreateModel(
+            name='PuntoControlAuditoria',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('secuencia', models.PositiveBigIntegerField(unique=True)),
+                ('hash', models.CharField(max_length=64)),
+                ('firma', models.CharField(max_length=128)),
+                ('fecha', models.DateTimeField(default=django.utils.timezone.now)),
+                ('verificado_en', models.DateTimeField(blank=True, null=True)),
+            ],
+            options={
+                'verbose_name': 'Punto de control de auditoría',
+                'verbose_name_plural': 'Puntos de control de auditoría',
+                'ordering': ['secuencia'],
+            },
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.2.18 on 2026-10-17 23:46
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('historias', '0016_cadena_auditoria'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='trabajoexportacion',
+            name='intentos',
+            field=models.PositiveSmallIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='trabajoexportacion',
+            name='latido_en',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+    ]
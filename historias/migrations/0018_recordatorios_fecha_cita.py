@@ -0,0 +1,34 @@
+# Generated by Django 5.2.18 on 2026-10-17 23:48
+
+from django.db import migrations, models
+from django.db.models import OuterRef, Subquery
+
+
+def copiar_fecha_cita(apps, schema_editor):
+    # Los recordatorios ya generados toman el inicio actual de su cita
+    RecordatorioCita = apps.get_model('historias', 'RecordatorioCita')
+    Cita = apps.get_model('historias', 'Cita')
+    RecordatorioCita.objects.update(
+        fecha_cita=Subquery(Cita.objects.filter(pk=OuterRef('cita_id')).values('fecha')[:1])
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('historias', '0017_exportaciones_latido'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='recordatoriocita',
+            name='fecha_cita',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AlterField(
+            model_name='recordatoriocita',
+            name='estado',
+            field=models.CharField(choices=[('PENDIENTE', 'Pendiente'), ('ENVIANDO', 'Enviando'), ('ENVIADO', 'Enviado'), ('FALLIDO', 'Fallido'), ('CANCELADO', 'Cancelado')], default='PENDIENTE', max_length=20),
+        ),
+        migrations.RunPython(copiar_fecha_cita, migrations.RunPython.noop),
+    ]
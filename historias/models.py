@@ -10,6 +10,8 @@
 # ---------------------------------------------------------------------
 
 from django.db import models
+from django.db.models import Count, Exists, OuterRef, Subquery
+from django.db.models.functions import Coalesce
 from django.conf import settings
 from django.utils import timezone
 from django.core.exceptions import ValidationError
@@ -23,11 +25,55 @@ except AttributeError:
 
 from pacientes.models import Paciente
 
+from .cambios import SeguimientoCambios
+
+
+# Relaciones que impiden eliminar una historia clínica
+RELACIONES_DEPENDIENTES = ["diagnosticos_rel", "medicamentos_rel", "observaciones", "citas", "adjuntos"]
+
+
+class HistoriaClinicaQuerySet(models.QuerySet):
+    """Consultas de dependencias resueltas en una sola sentencia SQL."""
+
+    def _subconsultas_dependencias(self):
+        subconsultas = {}
+        for relacion in RELACIONES_DEPENDIENTES:
+            campo = self.model._meta.get_field(relacion)
+            fk = campo.field.name
+            subconsultas[relacion] = campo.related_model._default_manager.filter(**{fk: OuterRef('pk')}).order_by()
+        return subconsultas
+
+    def con_dependencias(self):
+        """Anota n_<relación> con el conteo de cada relación dependiente."""
+        anotaciones = {}
+        for relacion, subconsulta in self._subconsultas_dependencias().items():
+            fk = self.model._meta.get_field(relacion).field.name
+            conteo = subconsulta.values(fk).annotate(total=Count('pk')).values('total')
+            anotaciones[f"n_{relacion}"] = Coalesce(Subquery(conteo), 0)
+        return self.annotate(**anotaciones)
+
+    def resumen_dependencias(self):
+        """{pk: {relación: conteo}} de las historias del queryset."""
+        columnas = [f"n_{relacion}" for relacion in RELACIONES_DEPENDIENTES]
+        filas = self.order_by().con_dependencias().values('pk', *columnas)
+        return {
+            fila['pk']: {relacion: fila[f"n_{relacion}"] for relacion in RELACIONES_DEPENDIENTES}
+            for fila in filas
+        }
+
+    def eliminables(self):
+        """Historias del queryset sin ningún registro asociado."""
+        condiciones = [~Exists(subconsulta) for subconsulta in self._subconsultas_dependencias().values()]
+        return self.filter(*condiciones)
+
 
 # ============================================================
 # MODELO: Historia Clínica (UNIFICADO)
 # ============================================================
-class HistoriaClinica(models.Model):
+class HistoriaClinica(SeguimientoCambios, models.Model):
+    # Auditoría de cambios por campo (historias/cambios.py)
+    auditoria_historia = 'pk'
+
     # -------------------------
     # Información del Prestador
     # -------------------------
@@ -125,10 +171,18 @@ class HistoriaClinica(models.Model):
     updated_at = models.DateTimeField(auto_now=True)
     fecha_impresion = models.DateTimeField("Fecha de Impresión", default=timezone.now)
 
+    objects = HistoriaClinicaQuerySet.as_manager()
+
     class Meta:
         ordering = ['-fecha_ingreso']
         verbose_name = "Historia Clínica"
         verbose_name_plural = "Historias Clínicas"
+        indexes = [
+            # Paginación por cursor del listado general
+            models.Index(fields=['-fecha_ingreso', '-id'], name='hc_fecha_id_idx'),
+            # Historias de un médico, más recientes primero
+            models.Index(fields=['medico_responsable', '-fecha_ingreso', '-id'], name='hc_medico_fecha_idx'),
+        ]
 
     def __str__(self):
         try:
@@ -154,17 +208,18 @@ class HistoriaClinica(models.Model):
             pass
         super().save(*args, **kwargs)
 
+    # Conteo de registros asociados, en una sola consulta
+    def dependencias(self):
+        resumen = HistoriaClinica.objects.filter(pk=self.pk).resumen_dependencias()
+        return resumen.get(self.pk, dict.fromkeys(RELACIONES_DEPENDIENTES, 0))
+
     # Impedir eliminación si hay dependencias
     def delete(self, using=None, keep_parents=False):
-        dependencias = []
-
-        for campo in ["diagnosticos_rel", "medicamentos_rel", "observaciones", "citas", "adjuntos"]:
-            try:
-                count = getattr(self, campo).count()
-                if count > 0:
-                    dependencias.append(f"{campo} ({count})")
-            except Exception:
-                pass
+        dependencias = [
+            f"{campo} ({count})"
+            for campo, count in self.dependencias().items()
+            if count > 0
+        ]
 
         if dependencias:
             raise ValidationError(
@@ -178,7 +233,7 @@ class HistoriaClinica(models.Model):
 # ============================================================
 # MODELOS RELACIONADOS CORREGIDOS
 # ============================================================
-class Medicamento(models.Model):
+class Medicamento(SeguimientoCambios, models.Model):
     nombre = models.CharField(max_length=200)
     
     # 🔥 RELATED_NAME CORREGIDO
@@ -187,12 +242,18 @@ class Medicamento(models.Model):
         on_delete=models.CASCADE,
         related_name="medicamentos_rel"
     )
+    creado_en = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['historia', 'creado_en', 'id'], name='med_historia_creado_idx'),
+        ]
 
     def __str__(self):
         return self.nombre
 
 
-class Diagnostico(models.Model):
+class Diagnostico(SeguimientoCambios, models.Model):
     descripcion = models.CharField(max_length=255)
     codigo_cie10 = models.CharField("CIE-10", max_length=32, blank=True, null=True)
     historia = models.ForeignKey(
@@ -200,12 +261,18 @@ class Diagnostico(models.Model):
         on_delete=models.CASCADE,
         related_name="diagnosticos_rel"
     )
+    creado_en = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['historia', 'creado_en', 'id'], name='diag_historia_creado_idx'),
+        ]
 
     def __str__(self):
         return f"{self.descripcion} ({self.codigo_cie10 or 'sin código'})"
 
 
-class Observacion(models.Model):
+class Observacion(SeguimientoCambios, models.Model):
     detalle = models.TextField()
     historia = models.ForeignKey(
         HistoriaClinica,
@@ -214,19 +281,44 @@ class Observacion(models.Model):
     )
     creado_en = models.DateTimeField(auto_now_add=True)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['historia', 'creado_en', 'id'], name='obs_historia_creado_idx'),
+        ]
+
     def __str__(self):
         return f"Obs. {self.id}"
 
 
-class Cita(models.Model):
+class Cita(SeguimientoCambios, models.Model):
+    ESTADO_PROGRAMADA = "PROGRAMADA"
+    ESTADO_CANCELADA = "CANCELADA"
+
     historia = models.ForeignKey(
         HistoriaClinica,
         on_delete=models.CASCADE,
         related_name='citas'
     )
-    fecha = models.DateTimeField(default=timezone.now)
+    # Agenda: médico que atiende e intervalo [fecha, fin)
+    medico = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='citas_agenda',
+        verbose_name="Médico"
+    )
+    fecha = models.DateTimeField("Inicio", default=timezone.now)
+    fin = models.DateTimeField("Fin", null=True, blank=True)
     motivo = models.CharField(max_length=255)
-    estado = models.CharField(max_length=50, default="PROGRAMADA")
+    estado = models.CharField(max_length=50, default=ESTADO_PROGRAMADA)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['historia', 'fecha'], name='cita_historia_fecha_idx'),
+            models.Index(fields=['estado', 'fecha'], name='cita_estado_fecha_idx'),
+            models.Index(fields=['medico', 'fecha'], name='cita_medico_fecha_idx'),
+        ]
 
     def __str__(self):
         try:
@@ -235,8 +327,18 @@ class Cita(models.Model):
             paciente_str = "Paciente"
         return f"Cita {self.id} - {paciente_str}"
 
+    def clean(self):
+        from .agenda import validar_cita
+        validar_cita(self)
+
+    def save(self, *args, **kwargs):
+        if self.fin is None and self.fecha is not None:
+            from .agenda import DURACION_POR_DEFECTO
+            self.fin = self.fecha + DURACION_POR_DEFECTO
+        super().save(*args, **kwargs)
+
 
-class HistoriaAdjunto(models.Model):
+class HistoriaAdjunto(SeguimientoCambios, models.Model):
     historia = models.ForeignKey(
         HistoriaClinica,
         on_delete=models.CASCADE,
@@ -246,13 +348,38 @@ class HistoriaAdjunto(models.Model):
     descripcion = models.CharField(max_length=255, blank=True)
     creado_en = models.DateTimeField(auto_now_add=True)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['historia', 'creado_en', 'id'], name='adjunto_historia_creado_idx'),
+        ]
+
     def __str__(self):
         return f"Adjunto {self.archivo.name} ({self.historia})"
 
 
+# Modelos definidos en módulos propios de la app
+from .models_exportaciones import TrabajoExportacion  # noqa: E402,F401
+from .models_disponibilidad import DisponibilidadDia  # noqa: E402,F401
+from .models_recordatorios import RecordatorioCita  # noqa: E402,F401
+from .models_auditoria import (  # noqa: E402,F401
+    AuditoriaEliminacion, AuditoriaCambio, EslabonAuditoria, PuntoControlAuditoria
+)
+
+
 # ============================================================
 # CONTROL DE CAMBIOS
 # ============================================================
 # Versión | Fecha       | Autor / Responsable           | Descripción
 # 1.1     | 04/12/2025  | Prixma Software Projects       | Unificación Modelo HCE + secciones clínicas
 # 1.2     | 04/12/2025  | Prixma Software Projects       | Corrección de conflicto related_name 'medicamentos'
+# 1.3     | 17/10/2026  | Prixma Software Projects       | Índice (fecha_ingreso, id) para paginación por cursor
+# 1.4     | 17/10/2026  | Prixma Software Projects       | Registro del modelo TrabajoExportacion
+# 1.5     | 17/10/2026  | Prixma Software Projects       | Índices compuestos para médico/fecha y citas
+# 1.6     | 17/10/2026  | Prixma Software Projects       | Resumen de dependencias en una sola consulta
+# 1.7     | 17/10/2026  | Prixma Software Projects       | creado_en en diagnósticos/medicamentos e índices para la línea de tiempo
+# 1.8     | 17/10/2026  | Prixma Software Projects       | Agenda: médico, fin e índice (médico, fecha) en Cita
+# 1.9     | 17/10/2026  | Prixma Software Projects       | Registro del modelo DisponibilidadDia
+# 2.0     | 17/10/2026  | Prixma Software Projects       | Registro del modelo RecordatorioCita
+# 2.1     | 17/10/2026  | Prixma Software Projects       | Registro del modelo AuditoriaEliminacion
+# 2.2     | 17/10/2026  | Prixma Software Projects       | Auditoría de cambios por campo (SeguimientoCambios, AuditoriaCambio)
+# 2.3     | 17/10/2026  | Prixma Software Projects       | Registro de la cadena de auditoría y sus puntos de control
@@ -1,9 +1,25 @@
+# =====================================================================
+# Proyecto: SOFT-MEDIC
+# Archivo: historias/models_auditoria.py
+# Versión: 1.3
+# Fecha: 17/10/2026
+# Elaborado por: Prixma Software Projects
+# Revisado por: Dirección Técnica de SOFT-MEDIC
+# =====================================================================
+
+from django.core.serializers.json import DjangoJSONEncoder
 from django.db import models
 from django.conf import settings
+from django.core.exceptions import ValidationError
 from django.utils import timezone
 
 
 class AuditoriaEliminacion(models.Model):
+    """
+    Registro de eliminaciones. Lo escribe por lotes el escritor de
+    auditoría (historias/auditoria.py), fuera del ciclo de la petición.
+    """
+
     usuario = models.ForeignKey(
         settings.AUTH_USER_MODEL,
         null=True,
@@ -14,9 +30,117 @@ class AuditoriaEliminacion(models.Model):
 
     modelo_afectado = models.CharField(max_length=100)
     objeto_id = models.CharField(max_length=50)
+    # Historia a la que pertenecía el objeto (sin FK: la historia puede no existir ya)
+    historia_id = models.BigIntegerField(null=True, blank=True)
     descripcion = models.TextField(blank=True, null=True)
 
     fecha = models.DateTimeField(default=timezone.now)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['historia_id', 'fecha'], name='audit_elim_historia_idx'),
+            models.Index(fields=['modelo_afectado', 'objeto_id'], name='audit_elim_objeto_idx'),
+            models.Index(fields=['usuario', 'fecha'], name='audit_elim_usuario_idx'),
+            models.Index(fields=['fecha'], name='audit_elim_fecha_idx'),
+        ]
+        verbose_name = "Auditoría de eliminación"
+        verbose_name_plural = "Auditoría de eliminaciones"
+
     def __str__(self):
         return f"{self.modelo_afectado} eliminado (ID {self.objeto_id})"
+
+
+class AuditoriaCambio(models.Model):
+    """
+    Campos modificados de una historia clínica o de sus registros hijos.
+    `cambios` guarda {campo: [valor anterior, valor nuevo]}; lo calcula en
+    memoria el mixin SeguimientoCambios (historias/cambios.py).
+    """
+
+    usuario = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        null=True,
+        blank=True,
+        on_delete=models.SET_NULL,
+        related_name="auditorias_cambio"
+    )
+
+    modelo_afectado = models.CharField(max_length=100)
+    objeto_id = models.CharField(max_length=50)
+    historia_id = models.BigIntegerField(null=True, blank=True)
+    cambios = models.JSONField(encoder=DjangoJSONEncoder)
+
+    fecha = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        ordering = ['-fecha', '-id']
+        indexes = [
+            models.Index(fields=['historia_id', 'fecha'], name='audit_cambio_historia_idx'),
+            models.Index(fields=['modelo_afectado', 'objeto_id'], name='audit_cambio_objeto_idx'),
+        ]
+        verbose_name = "Auditoría de cambio"
+        verbose_name_plural = "Auditoría de cambios"
+
+    def __str__(self):
+        return f"{self.modelo_afectado} {self.objeto_id} modificado ({', '.join(self.cambios)})"
+
+
+class EslabonAuditoria(models.Model):
+    """
+    Cadena de hashes de los eventos de auditoría, solo de inserción.
+    hash = SHA-256(hash anterior, secuencia, contenido); alterar,
+    insertar o borrar un eslabón rompe todos los siguientes
+    (historias/cadena_auditoria.py).
+    """
+
+    secuencia = models.PositiveBigIntegerField(primary_key=True)
+    contenido = models.TextField()
+    hash = models.CharField(max_length=64)
+    fecha = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        ordering = ['secuencia']
+        verbose_name = "Eslabón de auditoría"
+        verbose_name_plural = "Cadena de auditoría"
+
+    def __str__(self):
+        return f"Eslabón {self.secuencia} ({self.hash[:12]})"
+
+    def save(self, *args, **kwargs):
+        if not self._state.adding:
+            raise ValidationError("La cadena de auditoría no admite modificaciones.")
+        super().save(*args, **kwargs)
+
+    def delete(self, using=None, keep_parents=False):
+        raise ValidationError("La cadena de auditoría no admite eliminaciones.")
+
+
+class PuntoControlAuditoria(models.Model):
+    """
+    Punto de control firmado (HMAC con SECRET_KEY) del hash de la cadena
+    en una secuencia. La verificación incremental parte del último punto
+    verificado.
+    """
+
+    secuencia = models.PositiveBigIntegerField(unique=True)
+    hash = models.CharField(max_length=64)
+    firma = models.CharField(max_length=128)
+    fecha = models.DateTimeField(default=timezone.now)
+    verificado_en = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ['secuencia']
+        verbose_name = "Punto de control de auditoría"
+        verbose_name_plural = "Puntos de control de auditoría"
+
+    def __str__(self):
+        return f"Punto de control {self.secuencia}"
+
+
+# =====================================================================
+# CONTROL DE CAMBIOS
+# =====================================================================
+# Versión | Fecha       | Autor / Responsable      | Descripción
+# 1.1     | 17/10/2026  | Prixma Software Projects | Registro del modelo, historia_id e índices; escritura por lotes
+# 1.2     | 17/10/2026  | Prixma Software Projects | Modelo AuditoriaCambio (cambios por campo)
+# 1.3     | 17/10/2026  | Prixma Software Projects | Cadena de hashes y puntos de control firmados
@@ -0,0 +1,39 @@
+# =====================================================================
+# Proyecto: SOFT-MEDIC
+# Archivo: historias/models_disponibilidad.py
+# Versión: 1.0
+# Fecha: 17/10/2026
+# Elaborado por: Prixma Software Projects
+# Revisado por: Dirección Técnica de SOFT-MEDIC
+# =====================================================================
+
+from django.db import models
+from django.conf import settings
+
+
+class DisponibilidadDia(models.Model):
+    """
+    Ocupación de un médico en un día, como mapa de bits.
+
+    El bit i indica que el intervalo i de la jornada (ver
+    historias/disponibilidad.py) está ocupado por alguna cita. Se
+    recalcula al guardar o eliminar citas; un día sin fila está libre.
+    """
+
+    medico = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name='disponibilidad_dias'
+    )
+    fecha = models.DateField()
+    ocupado = models.BigIntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['medico', 'fecha'], name='disponibilidad_medico_fecha_unica'),
+        ]
+        verbose_name = "Disponibilidad diaria"
+        verbose_name_plural = "Disponibilidad diaria"
+
+    def __str__(self):
+        return f"{self.medico_id} {self.fecha:%Y-%m-%d} {self.ocupado:b}"
@@ -0,0 +1,83 @@
+# =====================================================================
+# Proyecto: SOFT-MEDIC
+# Archivo: historias/models_exportaciones.py
+# Versión: 1.1
+# Fecha: 17/10/2026
+# Elaborado por: Prixma Software Projects
+# Revisado por: Dirección Técnica de SOFT-MEDIC
+# =====================================================================
+
+from django.db import models
+from django.conf import settings
+from django.utils import timezone
+
+
+class TrabajoExportacion(models.Model):
+    """
+    Exportación de reportes ejecutada fuera del ciclo de la petición.
+
+    La petición solo encola el trabajo; el proceso
+    `manage.py procesar_exportaciones` genera el archivo y actualiza el
+    progreso. La huella identifica trabajos con parámetros idénticos
+    para reutilizar archivos ya generados.
+    """
+
+    TIPO_PACIENTES_ATENDIDOS = 'PACIENTES_ATENDIDOS'
+    TIPOS = [
+        (TIPO_PACIENTES_ATENDIDOS, 'Pacientes atendidos (CSV)'),
+    ]
+
+    PENDIENTE = 'PENDIENTE'
+    EN_PROCESO = 'EN_PROCESO'
+    COMPLETADO = 'COMPLETADO'
+    FALLIDO = 'FALLIDO'
+    ESTADOS = [
+        (PENDIENTE, 'Pendiente'),
+        (EN_PROCESO, 'En proceso'),
+        (COMPLETADO, 'Completado'),
+        (FALLIDO, 'Fallido'),
+    ]
+
+    tipo = models.CharField(max_length=40, choices=TIPOS, default=TIPO_PACIENTES_ATENDIDOS)
+    parametros = models.JSONField(default=dict, blank=True)
+    huella = models.CharField(max_length=64)
+    estado = models.CharField(max_length=20, choices=ESTADOS, default=PENDIENTE)
+
+    total_filas = models.PositiveIntegerField(default=0)
+    filas_procesadas = models.PositiveIntegerField(default=0)
+    archivo = models.FileField(upload_to='exportaciones/', blank=True)
+    mensaje_error = models.TextField(blank=True)
+
+    solicitado_por = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        null=True,
+        blank=True,
+        on_delete=models.SET_NULL,
+        related_name='exportaciones'
+    )
+    creado_en = models.DateTimeField(default=timezone.now)
+    iniciado_en = models.DateTimeField(blank=True, null=True)
+    finalizado_en = models.DateTimeField(blank=True, null=True)
+    # Señal de vida del trabajador: un EN_PROCESO sin latido reciente se reencola
+    latido_en = models.DateTimeField(blank=True, null=True)
+    intentos = models.PositiveSmallIntegerField(default=0)
+
+    class Meta:
+        verbose_name = "Trabajo de exportación"
+        verbose_name_plural = "Trabajos de exportación"
+        indexes = [
+            models.Index(fields=['huella', 'estado'], name='exp_huella_estado_idx'),
+            models.Index(fields=['estado', 'creado_en'], name='exp_estado_creado_idx'),
+        ]
+
+    def __str__(self):
+        return f"Exportación {self.id} ({self.get_estado_display()})"
+
+    @property
+    def progreso(self):
+        """Porcentaje de avance (0-100)."""
+        if self.estado == self.COMPLETADO:
+            return 100
+        if not self.total_filas:
+            return 0
+        return min(99, int(self.filas_procesadas * 100 / self.total_filas))
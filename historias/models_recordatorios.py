@@ -0,0 +1,65 @@
+# =====================================================================
+# Proyecto: SOFT-MEDIC
+# Archivo: historias/models_recordatorios.py
+# Versión: 1.1
+# Fecha: 17/10/2026
+# Elaborado por: Prixma Software Projects
+# Revisado por: Dirección Técnica de SOFT-MEDIC
+# =====================================================================
+
+from django.db import models
+from django.utils import timezone
+
+
+class RecordatorioCita(models.Model):
+    """
+    Bandeja de salida de recordatorios de citas.
+
+    `manage.py generar_recordatorios` escribe aquí el mensaje ya
+    renderizado y `manage.py enviar_recordatorios` lo entrega con
+    reintentos. `proximo_intento` ordena la cola y, mientras un
+    proceso envía, sirve de plazo de reserva (ENVIANDO). `fecha_cita`
+    es el inicio con el que se renderizó el mensaje: si la cita se
+    mueve, el recordatorio se descarta y se genera de nuevo.
+    """
+
+    PENDIENTE = 'PENDIENTE'
+    ENVIANDO = 'ENVIANDO'
+    ENVIADO = 'ENVIADO'
+    FALLIDO = 'FALLIDO'
+    CANCELADO = 'CANCELADO'
+    ESTADOS = [
+        (PENDIENTE, 'Pendiente'),
+        (ENVIANDO, 'Enviando'),
+        (ENVIADO, 'Enviado'),
+        (FALLIDO, 'Fallido'),
+        (CANCELADO, 'Cancelado'),
+    ]
+
+    cita = models.OneToOneField(
+        'historias.Cita',
+        on_delete=models.CASCADE,
+        related_name='recordatorio'
+    )
+    destinatario = models.EmailField()
+    asunto = models.CharField(max_length=255)
+    cuerpo = models.TextField()
+    fecha_cita = models.DateTimeField(null=True, blank=True)
+
+    estado = models.CharField(max_length=20, choices=ESTADOS, default=PENDIENTE)
+    intentos = models.PositiveSmallIntegerField(default=0)
+    proximo_intento = models.DateTimeField(default=timezone.now)
+    ultimo_error = models.TextField(blank=True)
+
+    creado_en = models.DateTimeField(auto_now_add=True)
+    enviado_en = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['estado', 'proximo_intento'], name='recordatorio_cola_idx'),
+        ]
+        verbose_name = "Recordatorio de cita"
+        verbose_name_plural = "Recordatorios de citas"
+
+    def __str__(self):
+        return f"Recordatorio {self.pk} - Cita {self.cita_id} ({self.estado})"
@@ -0,0 +1,123 @@
+# =====================================================================
+# Proyecto: SOFT-MEDIC
+# Archivo: historias/paginacion.py
+# Versión: 1.0
+# Fecha: 17/10/2026
+# Elaborado por: Prixma Software Projects
+# Revisado por: Dirección Técnica de SOFT-MEDIC
+# =====================================================================
+#
+# Paginación por cursor (keyset) para listados grandes.
+# El cursor guarda los valores de la última fila entregada según el
+# orden del listado, de modo que la siguiente página se obtiene con un
+# rango sobre el índice en lugar de un OFFSET que recorre las filas
+# anteriores.
+# ---------------------------------------------------------------------
+
+import base64
+import binascii
+import json
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import Q
+
+
+def codificar_cursor(valores):
+    """Serializa una lista de valores en un token seguro para URL."""
+    datos = json.dumps(list(valores), cls=DjangoJSONEncoder, separators=(',', ':'))
+    return base64.urlsafe_b64encode(datos.encode('utf-8')).decode('ascii').rstrip('=')
+
+
+def decodificar_cursor(token):
+    """
+    Devuelve la lista de valores de un cursor, o None si el token
+    está vacío o no es válido.
+    """
+    if not token:
+        return None
+    try:
+        relleno = '=' * (-len(token) % 4)
+        valores = json.loads(base64.urlsafe_b64decode(token + relleno).decode('utf-8'))
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        return None
+    return valores if isinstance(valores, list) else None
+
+
+def filtro_posterior(orden, valores):
+    """
+    Construye la condición "fila posterior al cursor" para un orden
+    compuesto, p. ej. ('-fecha_ingreso', '-id'):
+
+        fecha_ingreso <= f AND (fecha_ingreso < f OR (fecha_ingreso = f AND id < i))
+
+    La cota sobre el primer campo permite al motor iniciar el recorrido
+    del índice directamente en la posición del cursor.
+    """
+    condicion = Q()
+    igualdad = {}
+    for campo, valor in zip(orden, valores):
+        nombre = campo.lstrip('-')
+        lookup = 'lt' if campo.startswith('-') else 'gt'
+        condicion |= Q(**igualdad, **{f'{nombre}__{lookup}': valor})
+        igualdad[nombre] = valor
+
+    primero = orden[0]
+    cota = 'lte' if primero.startswith('-') else 'gte'
+    return Q(**{f'{primero.lstrip("-")}__{cota}': valores[0]}) & condicion
+
+
+def valores_orden(objeto, orden):
+    """Extrae de una fila los valores de los campos de orden."""
+    valores = []
+    for campo in orden:
+        valor = objeto
+        for parte in campo.lstrip('-').split('__'):
+            valor = valor[parte] if isinstance(valor, dict) else getattr(valor, parte)
+        valores.append(valor)
+    return valores
+
+
+class PaginaCursor:
+    """Resultado de una página: filas y cursor hacia la siguiente."""
+
+    def __init__(self, elementos, siguiente_cursor):
+        self.elementos = elementos
+        self.siguiente_cursor = siguiente_cursor
+
+    @property
+    def hay_siguiente(self):
+        return self.siguiente_cursor is not None
+
+    def __iter__(self):
+        return iter(self.elementos)
+
+    def __len__(self):
+        return len(self.elementos)
+
+
+def consulta_pagina(queryset, orden, cursor=None, tamano=50):
+    """
+    Queryset de la página: `tamano` + 1 filas de `queryset` ordenado por
+    `orden` a partir del cursor (la fila extra indica si hay siguiente).
+    """
+    queryset = queryset.order_by(*orden)
+    valores = decodificar_cursor(cursor)
+    if valores is not None and len(valores) == len(orden):
+        queryset = queryset.filter(filtro_posterior(orden, valores))
+    return queryset[:tamano + 1]
+
+
+def paginar_por_cursor(queryset, orden, cursor=None, tamano=50):
+    """
+    Devuelve una PaginaCursor con hasta `tamano` filas de `queryset`
+    ordenado por `orden`, a partir del cursor indicado.
+
+    El último campo de `orden` debe ser único (normalmente 'id' o '-id')
+    para que el orden sea total y ninguna fila se repita entre páginas.
+    """
+    filas = list(consulta_pagina(queryset, orden, cursor, tamano))
+    siguiente = None
+    if len(filas) > tamano:
+        filas = filas[:tamano]
+        siguiente = codificar_cursor(valores_orden(filas[-1], orden))
+    return PaginaCursor(filas, siguiente)
@@ -1,17 +1,23 @@
 # =====================================================================
 # Proyecto: SOFT-MEDIC
 # Archivo: historias/permisos.py
-# Versión: 1.0
-# Fecha: 05/12/2025
+# Versión: 1.2
+# Fecha: 17/10/2026
 # Elaborado por: Prixma Software Projects
 # Revisado por: Dirección Técnica de SOFT-MEDIC
 # =====================================================================
 
 from django.http import HttpResponseForbidden
 
+from .models import HistoriaClinica
+
+
+# Las comparaciones usan medico_responsable_id para no disparar la carga
+# perezosa del médico; las vistas obtienen la historia del mapa de
+# identidad de la petición (historias/identidad.py).
 
 def puede_ver_historia(user, historia):
-    if user.rol == "MEDICO" and historia.medico_responsable == user:
+    if user.rol == "MEDICO" and historia.medico_responsable_id == user.pk:
         return True
     if user.rol in ["ADMIN", "RECEPCIONISTA"]:
         return True
@@ -19,8 +25,17 @@ def puede_ver_historia(user, historia):
 
 
 def puede_editar_historia(user, historia):
-    return user.rol == "MEDICO" and historia.medico_responsable == user
+    return user.rol == "MEDICO" and historia.medico_responsable_id == user.pk
 
 
 def puede_eliminar_historia(user):
     return user.rol == "ADMIN"
+
+
+def historias_visibles(user):
+    """Queryset de las historias que el usuario puede consultar."""
+    if user.rol == "MEDICO":
+        return HistoriaClinica.objects.filter(medico_responsable_id=user.pk)
+    if user.rol in ["ADMIN", "RECEPCIONISTA"]:
+        return HistoriaClinica.objects.all()
+    return HistoriaClinica.objects.none()
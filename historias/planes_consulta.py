@@ -0,0 +1,109 @@
+# =====================================================================
+# Proyecto: SOFT-MEDIC
+# Archivo: historias/planes_consulta.py
+# Versión: 1.1
+# Fecha: 17/10/2026
+# Elaborado por: Prixma Software Projects
+# Revisado por: Dirección Técnica de SOFT-MEDIC
+# =====================================================================
+#
+# Verificación de planes de consulta (EXPLAIN QUERY PLAN, SQLite).
+#
+# Cada entrada de CONSULTAS_VIGILADAS construye la consulta con la
+# misma función que usa la vista, así un cambio en la vista se refleja
+# aquí sin tocar este archivo. La verificación falla si alguna recorre una
+# tabla completa (SCAN sin índice) o, en los listados paginados,
+# si necesita ordenar sin índice.
+# Se ejecuta con `python manage.py verificar_planes_consulta` y desde
+# la suite de pruebas.
+# ---------------------------------------------------------------------
+
+import re
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.utils import timezone
+
+from pacientes.views import PACIENTES_POR_PAGINA, consulta_pacientes
+from .linea_tiempo import FUENTES, consulta_fuente
+from .paginacion import consulta_pagina
+from .recordatorios import citas_por_recordar
+from .views import HistoriaClinicaListView, TAMANO_LINEA_TIEMPO, consulta_listado_historias, historias_de_paciente
+from .views_agenda import consulta_agenda
+
+# Las consultas se construyen con las mismas funciones que usan las
+# vistas; solo los parámetros (usuario, ids, fechas) son de ejemplo.
+
+
+def _usuario(rol, pk=1):
+    return get_user_model()(pk=pk, rol=rol)
+
+
+def _listado_historias(usuario):
+    def construir():
+        vista = HistoriaClinicaListView
+        return consulta_pagina(consulta_listado_historias(usuario), vista.orden_cursor, tamano=vista.tamano_pagina)
+    return construir
+
+
+def _linea_tiempo(fuente):
+    return lambda: consulta_fuente(fuente, 1, None, TAMANO_LINEA_TIEMPO + 1)
+
+
+def _agenda_medico():
+    desde = timezone.now()
+    return consulta_agenda(1, desde, desde + timedelta(days=7))
+
+
+# nombre → (constructor del queryset, ¿el orden debe resolverse con índice?)
+# El orden se exige en los listados paginados de toda la tabla; ordenar
+# en memoria las filas de un paciente o de un médico es aceptable.
+CONSULTAS_VIGILADAS = {
+    'listado_historias': (_listado_historias(_usuario('ADMIN')), True),
+    'listado_historias_medico': (_listado_historias(_usuario('MEDICO')), True),
+    'historias_de_paciente': (lambda: historias_de_paciente(_usuario('ADMIN'), 1), False),
+    'pacientes_por_nombre': (lambda: consulta_pacientes()[:PACIENTES_POR_PAGINA], True),
+    'paciente_por_identificacion': (lambda: consulta_pacientes(documento='0'), False),
+    'pacientes_por_nombre_normalizado': (lambda: consulta_pacientes(nombre='perez ju'), False),
+    'pacientes_por_medico': (lambda: consulta_pacientes(medico_id='1')[:PACIENTES_POR_PAGINA], False),
+    **{
+        f'linea_tiempo_{fuente.tipo}': (_linea_tiempo(fuente), True)
+        for fuente in FUENTES
+    },
+    'citas_por_recordar': (lambda: citas_por_recordar(timezone.localdate()), True),
+    'agenda_medico': (_agenda_medico, True),
+}
+
+# "SCAN tabla" sin "USING ... INDEX" indica un recorrido completo
+_RECORRIDO_COMPLETO = re.compile(r'\bSCAN (?!.*\bUSING\b.*\bINDEX\b)(?P<tabla>\S+)')
+_ORDEN_SIN_INDICE = re.compile(r'USE TEMP B-TREE FOR (ORDER BY|GROUP BY)')
+
+
+def analizar_plan(plan, exigir_orden=True):
+    """Devuelve la lista de problemas encontrados en un plan de SQLite."""
+    problemas = []
+    for linea in plan.splitlines():
+        recorrido = _RECORRIDO_COMPLETO.search(linea)
+        if recorrido:
+            problemas.append(f"recorrido completo de {recorrido.group('tabla')}")
+        if exigir_orden and _ORDEN_SIN_INDICE.search(linea):
+            problemas.append("ordenamiento sin índice")
+    return problemas
+
+
+def verificar_planes(consultas=None):
+    """
+    Ejecuta EXPLAIN sobre cada consulta vigilada.
+
+    Retorna un diccionario {nombre: (plan, problemas)}. Solo aplica a
+    SQLite; con otros motores retorna un diccionario vacío.
+    """
+    if connection.vendor != 'sqlite':
+        return {}
+
+    resultados = {}
+    for nombre, (construir, exigir_orden) in (consultas or CONSULTAS_VIGILADAS).items():
+        plan = construir().explain()
+        resultados[nombre] = (plan, analizar_plan(plan, exigir_orden))
+    return resultados
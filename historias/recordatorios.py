@@ -0,0 +1,267 @@
+# =====================================================================
+# Proyecto: SOFT-MEDIC
+# Archivo: historias/recordatorios.py
+# Versión: 1.1
+# Fecha: 17/10/2026
+# Elaborado por: Prixma Software Projects
+# Revisado por: Dirección Técnica de SOFT-MEDIC
+# =====================================================================
+#
+# Recordatorios de citas con bandeja de salida.
+#
+# 1. generar_recordatorios(): recorre las citas del día por lotes con
+#    paginación por cursor sobre el índice (estado, fecha), renderiza
+#    cada mensaje con la plantilla compilada una sola vez y lo guarda
+#    en RecordatorioCita con bulk_create.
+# 2. enviar_pendientes(): reserva un lote de la bandeja con un solo
+#    UPDATE condicionado, descarta los recordatorios de citas canceladas
+#    o movidas, reparte el resto entre un grupo acotado de hilos (una
+#    conexión SMTP por hilo, sin acceso a la base de datos) y el hilo
+#    principal registra los resultados. Los fallos se reintentan con
+#    espera exponencial.
+#
+# signals/recordatorios.py descarta los recordatorios pendientes en
+# cuanto la cita cambia; la verificación al enviar cubre los cambios
+# hechos con QuerySet.update(), que no emiten señales.
+# ---------------------------------------------------------------------
+
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, time, timedelta
+from functools import lru_cache
+
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.core.mail import EmailMessage, get_connection
+from django.core.validators import validate_email
+from django.template.loader import get_template
+from django.utils import timezone
+
+from .models import Cita, RecordatorioCita
+from .paginacion import filtro_posterior
+
+logger = logging.getLogger('audit')
+
+PLANTILLA = 'historias/correos/recordatorio_cita.txt'
+ASUNTO = "Recordatorio de su cita médica"
+
+TRABAJADORES = getattr(settings, 'RECORDATORIOS_TRABAJADORES', 4)
+MAX_INTENTOS = getattr(settings, 'RECORDATORIOS_MAX_INTENTOS', 5)
+ESPERA_BASE = timedelta(seconds=getattr(settings, 'RECORDATORIOS_ESPERA_BASE_SEGUNDOS', 60))
+
+# Tiempo que un lote queda reservado por un proceso; si el proceso cae,
+# los recordatorios vuelven a la cola al vencer
+PLAZO_RESERVA = timedelta(minutes=10)
+
+# Recordatorios que aún pueden enviarse y deben seguir a su cita
+ESTADOS_ABIERTOS = (RecordatorioCita.PENDIENTE, RecordatorioCita.ENVIANDO)
+
+ORDEN_CITAS = ('fecha', 'id')
+
+
+@lru_cache(maxsize=None)
+def plantilla_recordatorio():
+    """Plantilla compilada una vez por proceso."""
+    return get_template(PLANTILLA)
+
+
+def _correo_valido(valor):
+    try:
+        validate_email(valor)
+    except ValidationError:
+        return False
+    return True
+
+
+def citas_por_recordar(dia):
+    """Citas PROGRAMADAS del día sin recordatorio, ordenadas por (fecha, id)."""
+    desde = timezone.make_aware(datetime.combine(dia, time.min))
+    return (
+        Cita.objects
+        .filter(estado=Cita.ESTADO_PROGRAMADA, fecha__gte=desde, fecha__lt=desde + timedelta(days=1))
+        .exclude(recordatorio__isnull=False)
+        .select_related('historia__paciente', 'medico')
+        .only('id', 'fecha', 'motivo', 'historia', 'medico',
+              'historia__paciente__nombre_completo', 'historia__paciente__contacto', 'medico__nombre')
+        .order_by(*ORDEN_CITAS)
+    )
+
+
+def lotes_de_citas(dia, lote=500):
+    """Citas por recordar del día en lotes de `lote` filas paginados por (fecha, id)."""
+    base = citas_por_recordar(dia)
+    ultimo = None
+    while True:
+        queryset = base if ultimo is None else base.filter(filtro_posterior(ORDEN_CITAS, ultimo))
+        citas = list(queryset[:lote])
+        if not citas:
+            return
+        yield citas
+        ultimo = [citas[-1].fecha, citas[-1].id]
+
+
+def generar_recordatorios(dia=None, lote=500):
+    """
+    Escribe en la bandeja los recordatorios de las citas de `dia`
+    (por defecto mañana). Retorna (creados, sin_correo).
+    """
+    dia = dia or timezone.localdate() + timedelta(days=1)
+    plantilla = plantilla_recordatorio()
+    creados = sin_correo = 0
+
+    for citas in lotes_de_citas(dia, lote):
+        recordatorios = []
+        for cita in citas:
+            paciente = cita.historia.paciente
+            destinatario = (paciente.contacto or '').strip()
+            if not _correo_valido(destinatario):
+                sin_correo += 1
+                continue
+            cuerpo = plantilla.render({
+                'paciente': paciente.nombre_completo,
+                'inicio': timezone.localtime(cita.fecha),
+                'medico': cita.medico.nombre if cita.medico else '',
+                'motivo': cita.motivo,
+            })
+            recordatorios.append(RecordatorioCita(
+                cita=cita, destinatario=destinatario, asunto=ASUNTO, cuerpo=cuerpo, fecha_cita=cita.fecha
+            ))
+        if not recordatorios:
+            continue
+        # Generar dos veces es inofensivo: la cita es única en la bandeja.
+        # bulk_create devuelve también las filas omitidas por conflicto,
+        # así que se cuentan las filas del lote antes y después.
+        del_lote = RecordatorioCita.objects.filter(cita_id__in=[r.cita_id for r in recordatorios])
+        existentes = del_lote.count()
+        RecordatorioCita.objects.bulk_create(recordatorios, ignore_conflicts=True)
+        creados += del_lote.count() - existentes
+
+    logger.info(f"RECORDATORIOS GENERADOS: {creados} para {dia:%d/%m/%Y} ({sin_correo} sin correo)")
+    return creados, sin_correo
+
+
+def reservar_lote(lote=100):
+    """
+    Reserva hasta `lote` recordatorios vencidos (pendientes o con la
+    reserva expirada) con un solo UPDATE. La condición de vencimiento se
+    repite en el UPDATE: lo que otro proceso reservó entre la lectura y
+    la escritura ya tiene un plazo futuro y no se toma. El plazo escrito
+    identifica las filas propias.
+    """
+    ahora = timezone.now()
+    vencidos = RecordatorioCita.objects.filter(estado__in=ESTADOS_ABIERTOS, proximo_intento__lte=ahora)
+    candidatos = list(vencidos.order_by('proximo_intento', 'id').values_list('pk', flat=True)[:lote])
+    if not candidatos:
+        return []
+    plazo = ahora + PLAZO_RESERVA
+    vencidos.filter(pk__in=candidatos).update(estado=RecordatorioCita.ENVIANDO, proximo_intento=plazo)
+    return list(
+        RecordatorioCita.objects
+        .filter(pk__in=candidatos, estado=RecordatorioCita.ENVIANDO, proximo_intento=plazo)
+        .select_related('cita')
+        .only('id', 'destinatario', 'asunto', 'cuerpo', 'estado', 'intentos', 'proximo_intento',
+              'ultimo_error', 'enviado_en', 'fecha_cita', 'cita__estado', 'cita__fecha')
+        .order_by('id')
+    )
+
+
+def descartar_obsoletos(recordatorios):
+    """
+    Separa los recordatorios cuya cita ya no es la que anuncian: los de
+    citas canceladas quedan CANCELADO y los de citas movidas se borran
+    para que generar_recordatorios() los vuelva a crear con el nuevo
+    horario. Retorna los recordatorios vigentes.
+    """
+    vigentes, cancelados, movidos = [], [], []
+    for recordatorio in recordatorios:
+        cita = recordatorio.cita
+        if cita.estado != Cita.ESTADO_PROGRAMADA:
+            cancelados.append(recordatorio.pk)
+        elif recordatorio.fecha_cita is not None and recordatorio.fecha_cita != cita.fecha:
+            movidos.append(recordatorio.pk)
+        else:
+            vigentes.append(recordatorio)
+    if cancelados:
+        RecordatorioCita.objects.filter(pk__in=cancelados).update(estado=RecordatorioCita.CANCELADO)
+    if movidos:
+        RecordatorioCita.objects.filter(pk__in=movidos).delete()
+    if cancelados or movidos:
+        logger.info(f"RECORDATORIOS DESCARTADOS: {len(cancelados)} de citas canceladas, {len(movidos)} de citas movidas")
+    return vigentes
+
+
+def _repartir(elementos, partes):
+    """Divide `elementos` en hasta `partes` grupos de tamaño parecido."""
+    partes = max(1, min(partes, len(elementos)))
+    return [elementos[i::partes] for i in range(partes)]
+
+
+def _descripcion(error):
+    return f"{type(error).__name__}: {error}"
+
+
+def _enviar(trabajos):
+    """
+    Se ejecuta en un hilo del grupo: solo SMTP/backend, sin base de
+    datos. Abre una conexión para todos los mensajes del hilo y retorna
+    [(pk, error)] con error None si el mensaje salió.
+    """
+    resultados = []
+    try:
+        with get_connection() as conexion:
+            for pk, destinatario, asunto, cuerpo in trabajos:
+                try:
+                    conexion.send_messages([EmailMessage(asunto, cuerpo, to=[destinatario])])
+                except Exception as error:  # noqa: BLE001 - cualquier fallo se reintenta
+                    resultados.append((pk, _descripcion(error)))
+                else:
+                    resultados.append((pk, None))
+    except Exception as error:  # noqa: BLE001 - no se pudo abrir o cerrar la conexión
+        enviados = {pk for pk, fallo in resultados if fallo is None}
+        resultados = [(t[0], None if t[0] in enviados else _descripcion(error)) for t in trabajos]
+    return resultados
+
+
+def enviar_pendientes(lote=100, trabajadores=TRABAJADORES):
+    """
+    Envía un lote de la bandeja. Retorna (enviados, fallidos).
+    """
+    # Un lote formado solo por obsoletos no debe parecer una bandeja vacía
+    recordatorios = None
+    while not recordatorios:
+        reservados = reservar_lote(lote)
+        if not reservados:
+            return 0, 0
+        recordatorios = {r.pk: r for r in descartar_obsoletos(reservados)}
+
+    trabajos = [(r.pk, r.destinatario, r.asunto, r.cuerpo) for r in recordatorios.values()]
+    grupos = _repartir(trabajos, trabajadores)
+    with ThreadPoolExecutor(max_workers=len(grupos)) as grupo:
+        resultados = [resultado for parte in grupo.map(_enviar, grupos) for resultado in parte]
+
+    ahora = timezone.now()
+    enviados = fallidos = 0
+    for pk, error in resultados:
+        recordatorio = recordatorios[pk]
+        recordatorio.intentos += 1
+        if error is None:
+            recordatorio.estado = RecordatorioCita.ENVIADO
+            recordatorio.enviado_en = ahora
+            recordatorio.ultimo_error = ''
+            enviados += 1
+        else:
+            recordatorio.ultimo_error = error
+            fallidos += 1
+            if recordatorio.intentos >= MAX_INTENTOS:
+                recordatorio.estado = RecordatorioCita.FALLIDO
+            else:
+                recordatorio.estado = RecordatorioCita.PENDIENTE
+                recordatorio.proximo_intento = ahora + ESPERA_BASE * (2 ** (recordatorio.intentos - 1))
+
+    RecordatorioCita.objects.bulk_update(
+        recordatorios.values(),
+        ['estado', 'intentos', 'proximo_intento', 'ultimo_error', 'enviado_en'],
+    )
+    if fallidos:
+        logger.warning(f"RECORDATORIOS: {enviados} enviados, {fallidos} con error")
+    return enviados, fallidos
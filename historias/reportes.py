@@ -0,0 +1,113 @@
+# =============================================================
+# Proyecto: SOFT-MEDIC
+# Archivo: historias/reportes.py
+# Versión: 1.0
+# Fecha: 17/10/2026
+# Elaborado por: Prixma Software Projects
+# Revisado por: Dirección Técnica SOFT-MEDIC
+#
+# Descripción:
+# Generación de filas de los reportes de historias clínicas.
+# Compartido por la descarga directa (views_reportes.py) y por
+# las exportaciones en segundo plano (exportaciones.py).
+# =============================================================
+
+import csv
+
+from django.utils import timezone
+
+from .models import HistoriaClinica
+
+
+ENCABEZADO_PACIENTES_ATENDIDOS = [
+    "ID Historia",
+    "Paciente",
+    "Documento",
+    "Sexo",
+    "Médico Responsable",
+    "Fecha Atención",
+    "Motivo Consulta",
+    "Diagnósticos"
+]
+
+# Columnas estrictamente necesarias para el reporte
+COLUMNAS_PACIENTES_ATENDIDOS = (
+    "id",
+    "paciente__nombre_completo",
+    "paciente__identificacion",
+    "medico_responsable__nombre",
+    "created_at",
+    "motivo_consulta",
+    "diagnosticos",
+)
+
+# Filas leídas por viaje a la base de datos y filas por bloque enviado
+TAMANO_LOTE_CONSULTA = 2000
+FILAS_POR_BLOQUE = 500
+
+
+class Echo:
+    """Pseudo-buffer: csv.writer escribe y se devuelve la línea tal cual."""
+
+    def write(self, value):
+        return value
+
+
+def filas_pacientes_atendidos(queryset=None):
+    """
+    Genera las filas (encabezado incluido) del reporte de pacientes
+    atendidos recorriendo la consulta con un cursor del servidor.
+    """
+    if queryset is None:
+        queryset = HistoriaClinica.objects.all()
+
+    filas = (
+        queryset
+        .order_by()
+        .values_list(*COLUMNAS_PACIENTES_ATENDIDOS)
+        .iterator(chunk_size=TAMANO_LOTE_CONSULTA)
+    )
+
+    yield ENCABEZADO_PACIENTES_ATENDIDOS
+
+    for id_historia, paciente, documento, medico, creado, motivo, diagnosticos in filas:
+
+        # Diagnósticos desde JSONField → lista de descripciones
+        diag_list = []
+        if isinstance(diagnosticos, list):
+            for d in diagnosticos:
+                if isinstance(d, dict):
+                    diag_list.append(d.get("descripcion", ""))
+
+        yield [
+            id_historia,
+            paciente or "",
+            documento or "",
+            "",  # El modelo Paciente no registra sexo
+            medico or "",
+            timezone.localtime(creado).strftime("%Y-%m-%d %H:%M") if creado else "",
+            motivo or "",
+            ", ".join(diag_list)
+        ]
+
+
+def csv_por_bloques(filas, filas_por_bloque=FILAS_POR_BLOQUE):
+    """
+    Convierte filas en bloques de texto CSV de tamaño acotado.
+    La primera fila (encabezado) se entrega sola para que el cliente
+    reciba el primer byte sin esperar a la consulta.
+    """
+    writer = csv.writer(Echo())
+    filas = iter(filas)
+    for fila in filas:
+        yield writer.writerow(fila)
+        break
+
+    bloque = []
+    for fila in filas:
+        bloque.append(writer.writerow(fila))
+        if len(bloque) >= filas_por_bloque:
+            yield "".join(bloque)
+            bloque = []
+    if bloque:
+        yield "".join(bloque)
@@ -3,3 +3,6 @@
 # Importa todas las señales automáticamente al cargar la app
 from .auditoria import *
 from . import auditoria
+from . import busqueda
+from . import agenda
+from . import recordatorios
@@ -0,0 +1,38 @@
+# historias/signals/agenda.py
+
+from django.db.models.signals import pre_save, post_save, post_delete
+from django.dispatch import receiver
+
+from historias.disponibilidad import dias_de_cita, recalcular_disponibilidad
+from historias.models import Cita
+
+# Mantiene los mapas de DisponibilidadDia de los días que toca cada
+# cita, antes y después del cambio (p. ej. al mover o cancelar).
+
+
+def _dias_afectados(medico_id, fecha, fin):
+    if not medico_id or fecha is None:
+        return set()
+    return {(medico_id, dia) for dia in dias_de_cita(fecha, fin)}
+
+
+@receiver(pre_save, sender=Cita)
+def recordar_horario_anterior(sender, instance, **kwargs):
+    anterior = None
+    if instance.pk:
+        anterior = Cita.objects.filter(pk=instance.pk).values_list('medico_id', 'fecha', 'fin').first()
+    instance._dias_agenda_anteriores = _dias_afectados(*anterior) if anterior else set()
+
+
+@receiver(post_save, sender=Cita)
+def actualizar_disponibilidad(sender, instance, **kwargs):
+    dias = _dias_afectados(instance.medico_id, instance.fecha, instance.fin)
+    dias |= getattr(instance, '_dias_agenda_anteriores', set())
+    for medico_id, dia in dias:
+        recalcular_disponibilidad(medico_id, dia)
+
+
+@receiver(post_delete, sender=Cita)
+def liberar_disponibilidad(sender, instance, **kwargs):
+    for medico_id, dia in _dias_afectados(instance.medico_id, instance.fecha, instance.fin):
+        recalcular_disponibilidad(medico_id, dia)
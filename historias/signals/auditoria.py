@@ -2,68 +2,40 @@
 
 from django.db.models.signals import post_delete
 from django.dispatch import receiver
-from django.utils import timezone
-import logging
 
 # Importación absoluta de los modelos de la app
+from historias.auditoria import registrar_eliminacion
 from historias.models import HistoriaClinica, Diagnostico, Medicamento, Observacion, Cita
 
-# Configuración del logger de auditoría
-audit_logger = logging.getLogger("audit")
-
-# Utilidad para obtener usuario si está disponible
-def get_user_from_request(instance):
-    try:
-        request = getattr(instance, "_request", None)
-        if request and hasattr(request, "user"):
-            return request.user
-    except:
-        pass
-    return None
+# Los receptores solo encolan un registro compacto; la escritura en
+# AuditoriaEliminacion y en logs/audit.log la hace el escritor de
+# auditoría fuera de la petición (historias/auditoria.py).
 
 # ===================== AUDITORÍA DE ELIMINACIÓN =====================
 
 @receiver(post_delete, sender=Diagnostico)
 def audit_delete_diagnostico(sender, instance, **kwargs):
-    usuario = get_user_from_request(instance)
-    audit_logger.info(
-        f"[AUDITORÍA] Diagnóstico eliminado | ID {instance.id} | Historia {instance.historia_id} | "
-        f"Descripción: {instance.descripcion} | "
-        f"Usuario: {usuario if usuario else 'Desconocido'} | Fecha: {timezone.now()}"
-    )
+    registrar_eliminacion('Diagnóstico', instance.id, instance.historia_id,
+                          f"Descripción: {instance.descripcion}")
 
 @receiver(post_delete, sender=Medicamento)
 def audit_delete_medicamento(sender, instance, **kwargs):
-    usuario = get_user_from_request(instance)
-    audit_logger.info(
-        f"[AUDITORÍA] Medicamento eliminado | ID {instance.id} | Historia {instance.historia_id} | "
-        f"Nombre: {instance.nombre} | "
-        f"Usuario: {usuario if usuario else 'Desconocido'} | Fecha: {timezone.now()}"
-    )
+    registrar_eliminacion('Medicamento', instance.id, instance.historia_id,
+                          f"Nombre: {instance.nombre}")
 
 @receiver(post_delete, sender=Observacion)
 def audit_delete_observacion(sender, instance, **kwargs):
-    usuario = get_user_from_request(instance)
-    audit_logger.info(
-        f"[AUDITORÍA] Observación eliminada | ID {instance.id} | Historia {instance.historia_id} | "
-        f"Detalle: {instance.detalle[:120]}... | "
-        f"Usuario: {usuario if usuario else 'Desconocido'} | Fecha: {timezone.now()}"
-    )
+    registrar_eliminacion('Observación', instance.id, instance.historia_id,
+                          f"Detalle: {instance.detalle[:120]}")
 
 @receiver(post_delete, sender=Cita)
 def audit_delete_cita(sender, instance, **kwargs):
-    usuario = get_user_from_request(instance)
-    audit_logger.info(
-        f"[AUDITORÍA] Cita eliminada | ID {instance.id} | Historia {instance.historia_id} | "
-        f"Motivo: {instance.motivo} | Estado: {instance.estado} | "
-        f"Usuario: {usuario if usuario else 'Desconocido'} | Fecha: {timezone.now()}"
-    )
+    registrar_eliminacion('Cita', instance.id, instance.historia_id,
+                          f"Motivo: {instance.motivo} | Estado: {instance.estado}")
 
 @receiver(post_delete, sender=HistoriaClinica)
 def audit_delete_historia(sender, instance, **kwargs):
-    usuario = get_user_from_request(instance)
-    audit_logger.info(
-        f"[AUDITORÍA] Historia Clínica eliminada | ID {instance.id} | "
-        f"Paciente: {instance.paciente.nombre_completo} | "
-        f"Usuario: {usuario if usuario else 'Desconocido'} | Fecha: {timezone.now()}"
-    )
+    # Solo se usa el nombre si el paciente ya está cargado (sin consulta extra)
+    paciente = instance._state.fields_cache.get('paciente')
+    nombre = paciente.nombre_completo if paciente is not None else f"ID {instance.paciente_id}"
+    registrar_eliminacion('Historia Clínica', instance.id, instance.id, f"Paciente: {nombre}")
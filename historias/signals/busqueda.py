@@ -0,0 +1,33 @@
+# historias/signals/busqueda.py
+
+from functools import partial
+
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from historias.busqueda import obtener_backend
+from historias.models import HistoriaClinica, Observacion
+
+# La indexación se difiere al commit: así se lee el estado final de la
+# historia y de sus observaciones, incluidas las guardadas en lote.
+
+
+def _programar_indexacion(historia_id):
+    transaction.on_commit(partial(obtener_backend().indexar, [historia_id]))
+
+
+@receiver(post_save, sender=HistoriaClinica)
+def indexar_historia(sender, instance, **kwargs):
+    _programar_indexacion(instance.pk)
+
+
+@receiver(post_delete, sender=HistoriaClinica)
+def retirar_historia(sender, instance, **kwargs):
+    transaction.on_commit(partial(obtener_backend().eliminar, [instance.pk]))
+
+
+@receiver(post_save, sender=Observacion)
+@receiver(post_delete, sender=Observacion)
+def indexar_observacion(sender, instance, **kwargs):
+    _programar_indexacion(instance.historia_id)
@@ -0,0 +1,26 @@
+# historias/signals/recordatorios.py
+
+from django.db.models import Q
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+
+from historias.models import Cita, RecordatorioCita
+from historias.recordatorios import ESTADOS_ABIERTOS
+
+# Un recordatorio pendiente anuncia la cita tal como estaba al generarlo.
+# Si se cancela, el recordatorio queda CANCELADO; si se mueve (o vuelve a
+# programarse), se borra y generar_recordatorios() lo crea de nuevo.
+
+
+@receiver(post_save, sender=Cita)
+def descartar_recordatorio_obsoleto(sender, instance, created, **kwargs):
+    if created:
+        return
+    recordatorios = RecordatorioCita.objects.filter(cita_id=instance.pk)
+    if instance.estado != Cita.ESTADO_PROGRAMADA:
+        recordatorios.filter(estado__in=ESTADOS_ABIERTOS).update(estado=RecordatorioCita.CANCELADO)
+    else:
+        recordatorios.filter(
+            Q(estado=RecordatorioCita.CANCELADO)
+            | Q(estado__in=ESTADOS_ABIERTOS, fecha_cita__isnull=False) & ~Q(fecha_cita=instance.fecha)
+        ).delete()
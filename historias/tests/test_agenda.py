@@ -0,0 +1,103 @@
+# =============================================================================
+# Proyecto: SOFT-MEDIC
+# Archivo: historias/tests/test_agenda.py
+# Versión: 1.0
+# Fecha: 17/10/2026
+# Elaborado por: Prixma Software Projects
+# Revisado por: Dirección Técnica de SOFT-MEDIC
+# =============================================================================
+
+from datetime import date, datetime, timedelta
+
+from django.contrib.auth import get_user_model
+from django.core.exceptions import ValidationError
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from pacientes.models import Paciente, EPS
+from historias.agenda import agendar_cita, cancelar_cita, citas_en_rango
+from historias.models import HistoriaClinica, Cita
+
+User = get_user_model()
+
+
+class AgendaTest(TestCase):
+    """
+    Pruebas de la agenda por médico y de la detección de cruces.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.medico = User.objects.create_user(
+            correo='medico.agenda@test.com', nombre='Medico Agenda', rol='MEDICO', password='123456'
+        )
+        cls.otro = User.objects.create_user(
+            correo='otro.agenda@test.com', nombre='Otro Agenda', rol='MEDICO', password='123456'
+        )
+        eps = EPS.objects.create(nombre="EPS Agenda", codigo="EPSAG")
+        paciente = Paciente.objects.create(
+            nombre_completo="Paciente Agenda", identificacion="40001",
+            fecha_nacimiento=date(1990, 1, 1), eps=eps
+        )
+        cls.historia = HistoriaClinica.objects.create(paciente=paciente, medico_responsable=cls.medico)
+        cls.lunes = timezone.make_aware(datetime(2026, 11, 2, 9, 0))
+
+    def agendar(self, inicio, minutos=30, medico=None):
+        return agendar_cita(
+            self.historia, medico or self.medico, inicio, inicio + timedelta(minutes=minutos), "Control"
+        )
+
+    # -------------------------------------------------------------------------
+    def test_cruce_rechazado_y_citas_contiguas_permitidas(self):
+        self.agendar(self.lunes, minutos=60)
+
+        with self.assertRaises(ValidationError):
+            self.agendar(self.lunes + timedelta(minutes=30))
+        with self.assertRaises(ValidationError):
+            self.agendar(self.lunes - timedelta(minutes=15))
+
+        self.agendar(self.lunes + timedelta(minutes=60))
+        self.agendar(self.lunes - timedelta(minutes=30))
+        self.agendar(self.lunes, medico=self.otro)
+        self.assertEqual(Cita.objects.count(), 4)
+
+    def test_cancelada_libera_el_horario(self):
+        cita = self.agendar(self.lunes)
+        cancelar_cita(cita)
+        self.agendar(self.lunes)
+
+    def test_duracion_maxima(self):
+        with self.assertRaises(ValidationError):
+            self.agendar(self.lunes, minutos=5 * 60)
+
+    def test_rango_incluye_cita_que_empieza_antes(self):
+        cita = self.agendar(self.lunes, minutos=120)
+        desde = self.lunes + timedelta(hours=1)
+        self.assertEqual(list(citas_en_rango(self.medico.pk, desde, desde + timedelta(hours=1))), [cita])
+
+    def test_vista_semanal_en_una_consulta(self):
+        for dia in range(5):
+            self.agendar(self.lunes + timedelta(days=dia))
+        self.client.force_login(self.medico)
+        respuesta = self.client.get(
+            reverse('historias:agenda_medico'), {'vista': 'semana', 'fecha': '2026-11-04'}
+        )
+        self.assertEqual(respuesta.status_code, 200)
+        self.assertEqual(len(respuesta.context['dias']), 5)
+
+    def test_reserva_desde_formulario(self):
+        self.agendar(self.lunes)
+        self.client.force_login(self.medico)
+        url = reverse('historias:agendar_cita', args=[self.historia.pk])
+        datos = {'medico': self.medico.pk, 'motivo': 'Control',
+                 'fecha': '2026-11-02T09:15', 'fin': '2026-11-02T09:45'}
+
+        respuesta = self.client.post(url, datos)
+        self.assertEqual(respuesta.status_code, 200)
+        self.assertTrue(respuesta.context['form'].errors)
+
+        datos.update(fecha='2026-11-02T09:30', fin='2026-11-02T10:00')
+        respuesta = self.client.post(url, datos)
+        self.assertEqual(respuesta.status_code, 302)
+        self.assertEqual(Cita.objects.filter(medico=self.medico).count(), 2)
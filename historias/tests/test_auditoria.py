@@ -0,0 +1,178 @@
+# =============================================================================
+# Proyecto: SOFT-MEDIC
+# Archivo: historias/tests/test_auditoria.py
+# Versión: 1.2
+# Fecha: 17/10/2026
+# Elaborado por: Prixma Software Projects
+# Revisado por: Dirección Técnica de SOFT-MEDIC
+# =============================================================================
+
+import os
+import tempfile
+from datetime import date
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.db import OperationalError, transaction
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from pacientes.models import Paciente, EPS
+from historias.auditoria import EscritorAuditoria, RegistroEliminacion
+from historias.models import HistoriaClinica, Observacion, AuditoriaEliminacion, AuditoriaCambio, EslabonAuditoria
+
+User = get_user_model()
+
+
+def crear_historia(medico, identificacion):
+    eps, _ = EPS.objects.get_or_create(nombre="EPS Auditoría", codigo="EPSAU")
+    paciente = Paciente.objects.create(
+        nombre_completo="Paciente Auditoría", identificacion=identificacion,
+        fecha_nacimiento=date(1980, 1, 1), eps=eps
+    )
+    return HistoriaClinica.objects.create(paciente=paciente, medico_responsable=medico)
+
+
+class AuditoriaEliminacionTest(TestCase):
+    """
+    Pruebas de los registros de eliminación (modo síncrono de pruebas).
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create_user(
+            correo='admin.auditoria@test.com', nombre='Admin Auditoria', rol='ADMIN', password='123456'
+        )
+        cls.medico = User.objects.create_user(
+            correo='medico.auditoria@test.com', nombre='Medico Auditoria', rol='MEDICO', password='123456'
+        )
+
+    def test_registra_usuario_de_la_peticion(self):
+        historia = crear_historia(self.medico, "10001")
+        self.client.force_login(self.admin)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post(reverse('historias:eliminar_historia', args=[historia.pk]))
+
+        registro = AuditoriaEliminacion.objects.get(modelo_afectado='Historia Clínica')
+        self.assertEqual(registro.usuario, self.admin)
+        self.assertEqual(registro.historia_id, historia.pk)
+
+    def test_eliminacion_revertida_no_se_audita(self):
+        historia = crear_historia(self.medico, "10002")
+        observacion = Observacion.objects.create(historia=historia, detalle="Temporal")
+        with self.captureOnCommitCallbacks(execute=False) as callbacks:
+            with self.assertRaises(RuntimeError), transaction.atomic():
+                observacion.delete()
+                raise RuntimeError("revertir")
+        self.assertEqual(callbacks, [])
+        self.assertFalse(AuditoriaEliminacion.objects.exists())
+
+    def test_fuera_de_peticion_no_hay_usuario(self):
+        historia = crear_historia(self.medico, "10003")
+        observacion = Observacion.objects.create(historia=historia, detalle="Temporal")
+        with self.captureOnCommitCallbacks(execute=True):
+            observacion.delete()
+
+        registro = AuditoriaEliminacion.objects.get()
+        self.assertEqual(registro.descripcion, "Detalle: Temporal")
+        self.assertIsNone(registro.usuario_id)
+
+
+class AuditoriaCambioTest(TestCase):
+    """
+    Pruebas de la auditoría de cambios por campo (historias/cambios.py).
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.medico = User.objects.create_user(
+            correo='medico.cambios@test.com', nombre='Medico Cambios', rol='MEDICO', password='123456'
+        )
+        cls.historia_id = crear_historia(cls.medico, "20001").pk
+
+    def test_registra_solo_campos_modificados_sin_releer(self):
+        historia = HistoriaClinica.objects.get(pk=self.historia_id)
+        historia.motivo_consulta = "Dolor torácico"
+        historia.peso, historia.talla = 70, 175
+
+        with self.captureOnCommitCallbacks(execute=True):
+            with self.assertNumQueries(1):  # solo el UPDATE
+                historia.save()
+
+        cambio = AuditoriaCambio.objects.get()
+        self.assertEqual(cambio.historia_id, historia.pk)
+        self.assertEqual(set(cambio.cambios), {'motivo_consulta', 'peso', 'talla', 'imc'})
+        self.assertEqual(cambio.cambios['motivo_consulta'], [None, "Dolor torácico"])
+
+    def test_guardar_sin_cambios_no_registra(self):
+        historia = HistoriaClinica.objects.get(pk=self.historia_id)
+        with self.captureOnCommitCallbacks(execute=True):
+            historia.save()
+            historia.motivo_consulta = "Control"
+            historia.save(update_fields=['resumen_clinico'])
+        self.assertFalse(AuditoriaCambio.objects.exists())
+
+    def test_imc_recalculado_sin_cambios_no_registra(self):
+        # save() asigna imc como float; la fila leída lo trae como Decimal
+        HistoriaClinica.objects.filter(pk=self.historia_id).update(peso=70, talla=170, imc='24.22')
+        historia = HistoriaClinica.objects.get(pk=self.historia_id)
+        eslabones = EslabonAuditoria.objects.count()
+
+        with self.captureOnCommitCallbacks(execute=True):
+            historia.save()
+
+        self.assertEqual(historia.imc, 24.22)
+        self.assertFalse(AuditoriaCambio.objects.exists())
+        self.assertEqual(EslabonAuditoria.objects.count(), eslabones)
+
+    def test_hijos_y_guardados_sucesivos(self):
+        historia = HistoriaClinica.objects.get(pk=self.historia_id)
+        Observacion.objects.create(historia=historia, detalle="Inicial")
+        observacion = Observacion.objects.get(historia=historia)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            observacion.detalle = "Corregida"
+            observacion.save()
+            observacion.detalle = "Definitiva"
+            observacion.save()
+
+        cambios = [c.cambios['detalle'] for c in AuditoriaCambio.objects.order_by('id')]
+        self.assertEqual(cambios, [["Inicial", "Corregida"], ["Corregida", "Definitiva"]])
+
+
+class EscritorAuditoriaTest(TransactionTestCase):
+    """
+    El escritor en segundo plano agrupa los registros y vacía la cola al detenerse.
+    """
+
+    def test_escribe_por_lotes_y_vacia_al_detenerse(self):
+        escritor = EscritorAuditoria(lote=2, intervalo=5)
+        escritor.start()
+        for i in range(5):
+            escritor.encolar(RegistroEliminacion('Cita', i, None, '', None, timezone.now()))
+        escritor.detener()
+
+        self.assertFalse(escritor.is_alive())
+        self.assertEqual(AuditoriaEliminacion.objects.count(), 5)
+
+    @mock.patch('historias.auditoria.ESPERA_REINTENTO', 0)
+    def test_lote_fallido_se_guarda_en_disco_y_se_reprocesa(self):
+        directorio = tempfile.mkdtemp()
+        self.addCleanup(os.rmdir, directorio)
+        registro = lambda i: RegistroEliminacion('Cita', i, None, '', None, timezone.now())
+        escritor = EscritorAuditoria()
+
+        with override_settings(AUDITORIA_PENDIENTES_DIR=directorio):
+            with mock.patch('historias.auditoria._guardar', side_effect=OperationalError("database is locked")):
+                escritor._escribir([registro(1), registro(2)])
+            self.assertEqual(len(os.listdir(directorio)), 1)
+            self.assertFalse(AuditoriaEliminacion.objects.exists())
+
+            # El siguiente lote guarda primero los pendientes
+            escritor._escribir([registro(3)])
+
+        self.assertEqual(os.listdir(directorio), [])
+        self.assertEqual(
+            list(AuditoriaEliminacion.objects.order_by('id').values_list('objeto_id', flat=True)), ['1', '2', '3']
+        )
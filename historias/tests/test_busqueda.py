@@ -0,0 +1,123 @@
+# =============================================================================
+# Proyecto: SOFT-MEDIC
+# Archivo: historias/tests/test_busqueda.py
+# Versión: 1.2
+# Fecha: 17/10/2026
+# Elaborado por: Prixma Software Projects
+# Revisado por: Dirección Técnica de SOFT-MEDIC
+# =============================================================================
+
+from datetime import date
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import TestCase
+from django.urls import reverse
+
+from pacientes.models import Paciente, EPS
+from historias.busqueda import BackendBusqueda, obtener_backend, reconstruir_indice
+from historias.models import HistoriaClinica, Observacion
+from historias.permisos import historias_visibles
+
+User = get_user_model()
+
+
+class BusquedaTextoCompletoTest(TestCase):
+    """
+    Pruebas del índice de texto completo sobre la narrativa clínica.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.medico = User.objects.create_user(
+            correo='medico.busqueda@test.com', nombre='Medico Busqueda', rol='MEDICO', password='123456'
+        )
+        cls.otro_medico = User.objects.create_user(
+            correo='otro.busqueda@test.com', nombre='Otro Medico', rol='MEDICO', password='123456'
+        )
+        eps = EPS.objects.create(nombre="EPS Búsqueda", codigo="EPSB")
+        paciente = Paciente.objects.create(
+            nombre_completo="Paciente Búsqueda", identificacion="70001",
+            fecha_nacimiento=date(1985, 5, 5), eps=eps
+        )
+        cls.propia = HistoriaClinica.objects.create(
+            paciente=paciente, medico_responsable=cls.medico,
+            motivo_consulta="Cefalea intensa", resumen_clinico="Dolor de cabeza persistente"
+        )
+        cls.ajena = HistoriaClinica.objects.create(
+            paciente=paciente, medico_responsable=cls.otro_medico,
+            motivo_consulta="Cefalea tensional"
+        )
+
+    def setUp(self):
+        # Las señales indexan al confirmar la transacción; en TestCase
+        # nunca hay commit, así que se parte de un índice reconstruido.
+        reconstruir_indice()
+
+    def buscar(self, consulta, usuario):
+        return [pk for pk, _, _ in obtener_backend().buscar(consulta, historias_visibles(usuario))]
+
+    # -------------------------------------------------------------------------
+    def test_ignora_tildes_y_acepta_prefijos(self):
+        self.assertEqual(self.buscar("CEFAL", self.medico), [self.propia.pk])
+        self.assertEqual(self.buscar("cabéza", self.medico), [self.propia.pk])
+
+    def test_restringe_por_visibilidad(self):
+        self.assertEqual(self.buscar("cefalea", self.otro_medico), [self.ajena.pk])
+
+    def test_senales_mantienen_el_indice(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            Observacion.objects.create(historia=self.propia, detalle="Refiere fotofobia")
+        self.assertEqual(self.buscar("fotofobia", self.medico), [self.propia.pk])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.ajena.delete()
+        self.assertEqual(self.buscar("cefalea", self.otro_medico), [])
+
+    def tablas_fts(self):
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT name FROM sqlite_master WHERE name IN ('historias_busqueda_fts', 'historias_busqueda_fts_nueva')"
+            )
+            return {fila[0] for fila in cursor.fetchall()}
+
+    def test_reconstruccion_fallida_conserva_el_indice(self):
+        backend = obtener_backend()
+        with mock.patch.object(type(backend), '_filas', side_effect=RuntimeError("fallo")):
+            with self.assertRaises(RuntimeError):
+                reconstruir_indice(lote=1)
+        self.assertEqual(self.buscar("cefalea", self.medico), [self.propia.pk])
+        self.assertEqual(self.tablas_fts(), {'historias_busqueda_fts'})
+
+    def test_reconstruccion_recibe_cambios_concurrentes(self):
+        # Durante la reconstrucción una escritura incremental llega a la
+        # tabla vigente y a la sombra; al sustituirla no se pierde.
+        def editar_durante(total):
+            if total == 1:
+                HistoriaClinica.objects.filter(pk=self.propia.pk).update(motivo_consulta="Migraña con aura")
+                obtener_backend().indexar([self.propia.pk])
+                self.assertEqual(self.buscar("migraña", self.medico), [self.propia.pk])
+
+        self.assertEqual(reconstruir_indice(lote=1, progreso=editar_durante), 2)
+        self.assertEqual(self.buscar("migraña", self.medico), [self.propia.pk])
+        self.assertEqual(self.buscar("cefalea", self.otro_medico), [self.ajena.pk])
+        self.assertEqual(self.tablas_fts(), {'historias_busqueda_fts'})
+
+    def test_backend_incompleto_no_se_instancia(self):
+        class SinBuscar(BackendBusqueda):
+            def indexar(self, historia_ids):
+                pass
+
+        with self.assertRaises(TypeError):
+            SinBuscar()
+
+    def test_consulta_con_sintaxis_fts_no_falla(self):
+        self.assertEqual(self.buscar('cefalea" * (', self.medico), [self.propia.pk])
+
+    def test_endpoint_json(self):
+        self.client.force_login(self.medico)
+        respuesta = self.client.get(reverse('historias:buscar_historias'), {'q': 'cefalea'})
+        datos = respuesta.json()
+        self.assertEqual([r['id'] for r in datos['resultados']], [self.propia.pk])
+        self.assertIn('[Cefalea]', datos['resultados'][0]['fragmento'])
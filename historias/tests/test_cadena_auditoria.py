@@ -0,0 +1,153 @@
+# =============================================================================
+# Proyecto: SOFT-MEDIC
+# Archivo: historias/tests/test_cadena_auditoria.py
+# Versión: 1.2
+# Fecha: 17/10/2026
+# Elaborado por: Prixma Software Projects
+# Revisado por: Dirección Técnica de SOFT-MEDIC
+# =============================================================================
+
+import json
+import os
+import tempfile
+from unittest import mock
+
+from django.core.exceptions import ValidationError
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import TestCase
+
+from historias.auditoria import registrar_eliminacion
+from historias import cadena_auditoria
+from historias.cadena_auditoria import GENESIS, encadenar, verificar, verificar_log
+from historias.models import EslabonAuditoria, PuntoControlAuditoria
+
+
+@mock.patch('historias.cadena_auditoria.PUNTO_CONTROL_CADA', 3)
+class CadenaAuditoriaTest(TestCase):
+    """
+    Pruebas de la cadena de hashes y de su verificación.
+    """
+
+    def agregar(self, cantidad):
+        return encadenar([{'evento': i} for i in range(cantidad)])
+
+    def test_eventos_del_escritor_quedan_encadenados(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            registrar_eliminacion('Cita', 7, 3, "Motivo: control")
+        eslabon = EslabonAuditoria.objects.get()
+        self.assertEqual(eslabon.secuencia, 1)
+        self.assertEqual(json.loads(eslabon.contenido)['tipo'], 'RegistroEliminacion')
+
+    def test_verificacion_incremental_parte_del_ultimo_punto(self):
+        self.assertEqual(self.agregar(7), list(range(1, 8)))
+        self.assertEqual(list(PuntoControlAuditoria.objects.values_list('secuencia', flat=True)), [3, 6])
+
+        self.assertEqual(verificar(), (7, []))
+        self.assertFalse(PuntoControlAuditoria.objects.filter(verificado_en__isnull=True).exists())
+
+        self.agregar(2)
+        # Solo se revisa lo posterior al punto 6
+        self.assertEqual(verificar(), (3, []))
+
+    def test_detecta_contenido_alterado(self):
+        self.agregar(7)
+        verificar()
+        EslabonAuditoria.objects.filter(secuencia=2).update(contenido='{"evento": 99}')
+
+        revisados, errores = verificar(completa=True)
+        self.assertEqual(revisados, 7)
+        self.assertEqual(errores, ["Eslabón 2: el hash no coincide."])
+
+    def test_detecta_eslabon_borrado_y_firma_falsa(self):
+        self.agregar(7)
+        EslabonAuditoria.objects.filter(secuencia=5).delete()
+        PuntoControlAuditoria.objects.filter(secuencia=3).update(firma='0' * 64)
+
+        _, errores = verificar(completa=True)
+        self.assertIn("Punto de control 3: firma inválida.", errores)
+        self.assertIn("Faltan los eslabones 5 a 5.", errores)
+        self.assertFalse(PuntoControlAuditoria.objects.filter(verificado_en__isnull=False).exists())
+
+    def test_no_admite_modificar_ni_borrar(self):
+        self.agregar(1)
+        eslabon = EslabonAuditoria.objects.get()
+        eslabon.contenido = "{}"
+        with self.assertRaises(ValidationError):
+            eslabon.save()
+        with self.assertRaises(ValidationError):
+            eslabon.delete()
+
+    @mock.patch('historias.cadena_auditoria.VERIFICACION_PARALELA_DESDE', 0)
+    def test_comando_completo_en_paralelo(self):
+        self.agregar(10)
+        call_command('verificar_auditoria', '--completo', '--procesos', '2', '--sin-log', stdout=mock.MagicMock())
+
+        EslabonAuditoria.objects.filter(secuencia=8).update(hash='f' * 64)
+        with self.assertRaises(CommandError):
+            call_command('verificar_auditoria', '--completo', '--procesos', '2', '--sin-log',
+                         stdout=mock.MagicMock(), stderr=mock.MagicMock())
+
+    def test_incremental_no_usa_procesos(self):
+        self.agregar(4)
+        with mock.patch('historias.cadena_auditoria.ProcessPoolExecutor') as pool:
+            self.assertEqual(verificar(procesos=4), (4, []))
+            self.assertEqual(verificar(completa=True, procesos=4), (4, []))
+        pool.assert_not_called()
+
+    def test_escritor_concurrente_reintenta_desde_el_nuevo_final(self):
+        self.agregar(2)
+        real = cadena_auditoria._ultimo_eslabon
+        # La primera lectura ve el final que tenía otro escritor antes de confirmar
+        lecturas = iter([(1, EslabonAuditoria.objects.get(secuencia=1).hash)])
+        with mock.patch('historias.cadena_auditoria._ultimo_eslabon', side_effect=lambda: next(lecturas, None) or real()):
+            self.assertEqual(encadenar([{'evento': 'nuevo'}]), [3])
+        self.assertEqual(verificar(completa=True), (3, []))
+
+    def test_verifica_las_lineas_del_log(self):
+        lineas = [f"[AUDITORÍA] Cita eliminado | ID {i}" for i in range(4)]
+        encadenar([{'evento': i, 'linea': linea} for i, linea in enumerate(lineas)])
+        escritas = [f"{linea} | Eslabón {i + 1}" for i, linea in enumerate(lineas)]
+        escritas[1] = escritas[1].replace("ID 1", "ID 9")   # alterada
+        del escritas[2]                                      # borrada
+        escritas.append("Base de datos no disponible")       # sin eslabón
+        escritas.append("[AUDITORÍA] Falsa | Eslabón 40")    # inventada
+
+        descriptor, ruta = tempfile.mkstemp(suffix='.log')
+        self.addCleanup(os.remove, ruta)
+        with os.fdopen(descriptor, 'w', encoding='utf-8') as archivo:
+            for linea in escritas:
+                archivo.write(f"INFO 2026-10-17 10:00:00,000 [audit] auditoria - {linea}\n")
+
+        revisadas, otras, errores = verificar_log(ruta)
+        self.assertEqual((revisadas, otras), (4, 1))
+        self.assertEqual(errores, [
+            "Eslabón 2: la línea del log fue alterada.",
+            "Eslabón 3: falta su línea en el log.",
+            "Línea del log con el eslabón 40, que no existe en la cadena.",
+        ])
+
+    @mock.patch('historias.cadena_auditoria.LOTE_VERIFICACION_LOG', 3)
+    @mock.patch('historias.cadena_auditoria.VENTANA_LOG', 3)
+    def test_log_se_compara_en_streaming_con_ventana(self):
+        lineas = [f"[AUDITORÍA] Observación eliminado | ID {i}" for i in range(12)]
+        encadenar([{'evento': i, 'linea': linea} for i, linea in enumerate(lineas)])
+        escritas = [(i + 1, f"{linea} | Eslabón {i + 1}") for i, linea in enumerate(lineas)]
+        # Un escritor concurrente dejó el 5 detrás del 7 (dentro de la
+        # ventana); el 2 llega después del 9 (fuera de ella) y el 11, dos veces
+        orden = [1, 3, 4, 6, 7, 5, 8, 9, 2, 10, 11, 11, 12]
+        contenido = {secuencia: linea for secuencia, linea in escritas}
+
+        descriptor, ruta = tempfile.mkstemp(suffix='.log')
+        self.addCleanup(os.remove, ruta)
+        with os.fdopen(descriptor, 'w', encoding='utf-8') as archivo:
+            for secuencia in orden:
+                archivo.write(f"INFO 2026-10-17 10:00:00,000 [audit] auditoria - {contenido[secuencia]}\n")
+
+        revisadas, otras, errores = verificar_log(ruta)
+        self.assertEqual((revisadas, otras), (13, 0))
+        self.assertEqual(errores, [
+            "Eslabón 2: falta su línea en el log.",
+            "Eslabón 2: la línea aparece repetida o fuera de orden en el log.",
+            "Eslabón 11: la línea aparece repetida o fuera de orden en el log.",
+        ])
@@ -0,0 +1,116 @@
+# =============================================================================
+# Proyecto: SOFT-MEDIC
+# Archivo: historias/tests/test_datos_sinteticos.py
+# Versión: 1.2
+# Fecha: 17/10/2026
+# Elaborado por: Prixma Software Projects
+# Revisado por: Dirección Técnica de SOFT-MEDIC
+# =============================================================================
+
+from datetime import date, datetime, timedelta
+from zoneinfo import ZoneInfo
+from io import StringIO
+
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import TestCase
+
+from historias.busqueda import obtener_backend
+from historias.datos_sinteticos import Agendas, _bloques, generar, identificacion
+from historias.disponibilidad import DIAS_HABILES
+from historias.models import Cita, Diagnostico, DisponibilidadDia, HistoriaClinica, Medicamento, Observacion
+from pacientes.busqueda import buscar
+from pacientes.models import Paciente
+
+HOY = date(2026, 10, 14)
+JORNADA = (7, 19, 15, 30, (0, 1, 2, 3, 4))
+ZONA = 'America/Bogota'
+
+
+class DatosSinteticosTest(TestCase):
+    """
+    Pruebas del generador de datos sintéticos.
+    """
+
+    def test_misma_semilla_mismos_datos_con_cualquier_numero_de_procesos(self):
+        argumentos = (7, 0, 25, 10, HOY, ZONA, JORNADA, 4, 3)
+        secuencial = list(_bloques(*argumentos[:4], 1, *argumentos[4:]))
+        paralelo = list(_bloques(*argumentos[:4], 2, *argumentos[4:]))
+        self.assertEqual(secuencial, paralelo)
+        self.assertEqual([len(bloque.pacientes) for bloque in secuencial], [10, 10, 5])
+
+        otra_semilla = list(_bloques(8, *argumentos[1:4], 1, *argumentos[4:]))
+        self.assertNotEqual(secuencial[0].pacientes, otra_semilla[0].pacientes)
+
+    def assertAgendasSinCruces(self):
+        anterior = {}
+        for cita in Cita.objects.exclude(estado=Cita.ESTADO_CANCELADA).order_by('medico_id', 'fecha'):
+            self.assertIn(cita.fecha.astimezone(ZoneInfo(ZONA)).weekday(), DIAS_HABILES)
+            previa = anterior.get(cita.medico_id)
+            if previa is not None:
+                self.assertLessEqual(previa.fin, cita.fecha, f"Cruce entre las citas {previa.pk} y {cita.pk}")
+            anterior[cita.medico_id] = cita
+
+    def test_agendas_corren_las_citas_que_se_cruzan(self):
+        agendas = Agendas(ZONA, JORNADA)
+        lunes = datetime(2026, 10, 12, 9, 0, tzinfo=ZoneInfo(ZONA))
+        agendas.marcar(7, lunes, lunes + timedelta(minutes=45))
+        # Cruce con la cita guardada: pasa al primer intervalo libre
+        self.assertEqual(agendas.reservar(7, lunes + timedelta(minutes=15)), lunes + timedelta(minutes=45))
+        self.assertEqual(agendas.reservar(7, lunes + timedelta(minutes=45)), lunes + timedelta(minutes=75))
+        # Otro médico no se ve afectado
+        self.assertEqual(agendas.reservar(8, lunes), lunes)
+        # Sin franja al final del viernes: el lunes siguiente a primera hora
+        viernes = datetime(2026, 10, 16, 18, 30, tzinfo=ZoneInfo(ZONA))
+        agendas.marcar(7, viernes, viernes + timedelta(minutes=30))
+        self.assertEqual(agendas.reservar(7, viernes), datetime(2026, 10, 19, 7, 0, tzinfo=ZoneInfo(ZONA)))
+
+        citas = [(0, 0, {'fecha': lunes, 'fin': None, 'estado': 'PROGRAMADA'}),
+                 (1, 0, {'fecha': lunes, 'fin': None, 'estado': 'CANCELADA'})]
+        agendas.ubicar(citas, [7])
+        self.assertEqual(citas[0][2]['fecha'], lunes + timedelta(minutes=105))
+        self.assertEqual(citas[1][2]['fecha'], lunes)
+
+    def test_carga_completa_con_indices_reconstruidos(self):
+        resumen = generar(30, semilla=1, bloque=12, medicos=3, hoy=HOY)
+
+        self.assertEqual((resumen.pacientes, resumen.historias), (30, 30))
+        self.assertEqual(Paciente.objects.count(), 30)
+        self.assertEqual(HistoriaClinica.objects.count(), 30)
+        self.assertEqual(
+            resumen.hijos,
+            sum(modelo.objects.count() for modelo in (Diagnostico, Medicamento, Observacion, Cita)),
+        )
+
+        # Tokens de búsqueda, índice de texto completo y disponibilidad
+        paciente = Paciente.objects.get(identificacion=identificacion(0))
+        self.assertIn(paciente, buscar(paciente.nombre_completo.split()[1]))
+        historia = paciente.historias_clinicas.get()
+        resultados = obtener_backend().buscar(historia.motivo_consulta, HistoriaClinica.objects.filter(pk=historia.pk))
+        self.assertEqual([fila[0] for fila in resultados], [historia.pk])
+        self.assertTrue(Cita.objects.filter(fecha__date__gte=HOY).exclude(estado=Cita.ESTADO_CANCELADA).exists())
+        self.assertTrue(DisponibilidadDia.objects.filter(fecha__gte=HOY).exists())
+
+        with self.assertRaises(ValueError):
+            generar(5, semilla=1, desde=25, medicos=3, hoy=HOY)
+        # Solapamiento solo en el interior del rango
+        Paciente.objects.create(
+            nombre_completo="Paciente Intermedio", identificacion=identificacion(100), fecha_nacimiento=HOY
+        )
+        with self.assertRaises(ValueError):
+            generar(10, semilla=1, desde=95, medicos=3, hoy=HOY)
+        generar(5, semilla=1, desde=30, medicos=3, hoy=HOY)
+        self.assertEqual(Paciente.objects.count(), 36)
+        self.assertAgendasSinCruces()
+
+    def test_un_medico_sin_citas_cruzadas(self):
+        generar(200, semilla=3, bloque=50, medicos=1, hoy=HOY)
+        self.assertGreater(Cita.objects.count(), 200)
+        self.assertAgendasSinCruces()
+
+    def test_comando(self):
+        salida = StringIO()
+        call_command('generar_datos_sinteticos', '--pacientes', '8', '--medicos', '2', '--procesos', '1', stdout=salida)
+        self.assertIn("8 pacientes, 8 historias", salida.getvalue())
+        with self.assertRaises(CommandError):
+            call_command('generar_datos_sinteticos', '--pacientes', '8', '--medicos', '2', '--procesos', '1')
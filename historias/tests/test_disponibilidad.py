@@ -0,0 +1,115 @@
+# =============================================================================
+# Proyecto: SOFT-MEDIC
+# Archivo: historias/tests/test_disponibilidad.py
+# Versión: 1.1
+# Fecha: 17/10/2026
+# Elaborado por: Prixma Software Projects
+# Revisado por: Dirección Técnica de SOFT-MEDIC
+# =============================================================================
+
+from datetime import date, datetime, timedelta
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from pacientes.models import Paciente, EPS
+from historias.agenda import agendar_cita, cancelar_cita
+from historias.disponibilidad import buscar_huecos, reconstruir_disponibilidad
+from historias.models import HistoriaClinica, Cita, DisponibilidadDia
+
+User = get_user_model()
+
+
+def local(*args):
+    return timezone.make_aware(datetime(*args))
+
+
+class DisponibilidadTest(TestCase):
+    """
+    Pruebas de los mapas de ocupación y de la búsqueda de huecos.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.medico_a = User.objects.create_user(
+            correo='a.huecos@test.com', nombre='Medico A', rol='MEDICO', password='123456'
+        )
+        cls.medico_b = User.objects.create_user(
+            correo='b.huecos@test.com', nombre='Medico B', rol='MEDICO', password='123456'
+        )
+        eps = EPS.objects.create(nombre="EPS Huecos", codigo="EPSH")
+        paciente = Paciente.objects.create(
+            nombre_completo="Paciente Huecos", identificacion="30001",
+            fecha_nacimiento=date(1990, 1, 1), eps=eps
+        )
+        cls.historia = HistoriaClinica.objects.create(paciente=paciente, medico_responsable=cls.medico_a)
+        # Lunes 2 de noviembre de 2026, antes de la jornada
+        cls.lunes = local(2026, 11, 2, 6, 0)
+
+    def agendar(self, medico, inicio, minutos):
+        return agendar_cita(self.historia, medico, inicio, inicio + timedelta(minutes=minutos), "Control")
+
+    # -------------------------------------------------------------------------
+    def test_huecos_entre_varios_medicos(self):
+        self.agendar(self.medico_a, local(2026, 11, 2, 7, 0), 60)
+        huecos = buscar_huecos([self.medico_a.pk, self.medico_b.pk], desde=self.lunes, cantidad=3)
+        self.assertEqual(huecos, [
+            (local(2026, 11, 2, 7, 0), self.medico_b.pk),
+            (local(2026, 11, 2, 7, 15), self.medico_b.pk),
+            (local(2026, 11, 2, 7, 30), self.medico_b.pk),
+        ])
+
+    def test_duracion_requiere_intervalos_seguidos(self):
+        self.agendar(self.medico_a, local(2026, 11, 2, 7, 30), 30)
+        huecos = buscar_huecos([self.medico_a.pk], desde=self.lunes, cantidad=1, duracion=timedelta(hours=1))
+        self.assertEqual(huecos, [(local(2026, 11, 2, 8, 0), self.medico_a.pk)])
+
+    def test_salta_fin_de_semana_y_horas_pasadas(self):
+        viernes_tarde = local(2026, 11, 6, 18, 50)
+        huecos = buscar_huecos([self.medico_a.pk], desde=viernes_tarde, cantidad=1)
+        self.assertEqual(huecos, [(local(2026, 11, 9, 7, 0), self.medico_a.pk)])
+
+    def test_cancelar_y_mover_actualizan_el_mapa(self):
+        cita = self.agendar(self.medico_a, local(2026, 11, 2, 7, 0), 30)
+        self.assertEqual(DisponibilidadDia.objects.get(medico=self.medico_a).ocupado, 0b11)
+
+        cita.fecha, cita.fin = local(2026, 11, 3, 7, 0), local(2026, 11, 3, 7, 15)
+        cita.save()
+        self.assertEqual(
+            list(DisponibilidadDia.objects.values_list('fecha', 'ocupado')), [(date(2026, 11, 3), 0b1)]
+        )
+
+        cancelar_cita(cita)
+        self.assertFalse(DisponibilidadDia.objects.exists())
+
+    def test_reconstruccion_coincide_con_incremental(self):
+        for hora in (7, 9, 12):
+            self.agendar(self.medico_a, local(2026, 11, 2, hora, 0), 45)
+        self.agendar(self.medico_b, local(2026, 11, 4, 8, 0), 30)
+        incremental = set(DisponibilidadDia.objects.values_list('medico_id', 'fecha', 'ocupado'))
+
+        reconstruir_disponibilidad()
+        self.assertEqual(set(DisponibilidadDia.objects.values_list('medico_id', 'fecha', 'ocupado')), incremental)
+
+    def test_reconstruccion_desde_con_cita_que_cruza_medianoche(self):
+        # Carga masiva (sin validación de duración ni señales)
+        Cita.objects.bulk_create([Cita(
+            historia=self.historia, medico=self.medico_a, motivo="Turno",
+            fecha=local(2026, 11, 2, 18, 30), fin=local(2026, 11, 3, 9, 30),
+        )])
+        reconstruir_disponibilidad()
+        completo = set(DisponibilidadDia.objects.values_list('medico_id', 'fecha', 'ocupado'))
+        self.assertEqual({fecha for _, fecha, _ in completo}, {date(2026, 11, 2), date(2026, 11, 3)})
+
+        # El día anterior a `desde` no se borra ni se vuelve a insertar
+        self.assertEqual(reconstruir_disponibilidad(desde=date(2026, 11, 3)), 1)
+        self.assertEqual(set(DisponibilidadDia.objects.values_list('medico_id', 'fecha', 'ocupado')), completo)
+
+    def test_endpoint_json(self):
+        self.client.force_login(self.medico_a)
+        datos = self.client.get(reverse('historias:huecos_disponibles'), {
+            'medicos': f'{self.medico_b.pk}', 'desde': '2026-11-02T06:00:00', 'cantidad': 2,
+        }).json()
+        self.assertEqual([h['medico_nombre'] for h in datos['huecos']], ['Medico B', 'Medico B'])
@@ -0,0 +1,182 @@
+# =============================================================================
+# Proyecto: SOFT-MEDIC
+# Archivo: historias/tests/test_formsets.py
+# Versión: 1.2
+# Fecha: 17/10/2026
+# Elaborado por: Prixma Software Projects
+# Revisado por: Dirección Técnica de SOFT-MEDIC
+# =============================================================================
+
+from datetime import date
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from pacientes.models import Paciente
+from historias.models import HistoriaClinica, Diagnostico, Medicamento, Observacion, AuditoriaCambio
+
+User = get_user_model()
+
+
+def datos_formset(prefijo, filas, iniciales=0):
+    """Arma los datos POST (management form + filas) de un inline formset."""
+    datos = {
+        f'{prefijo}-TOTAL_FORMS': str(len(filas)),
+        f'{prefijo}-INITIAL_FORMS': str(iniciales),
+        f'{prefijo}-MIN_NUM_FORMS': '0',
+        f'{prefijo}-MAX_NUM_FORMS': '1000',
+    }
+    for i, fila in enumerate(filas):
+        for campo, valor in fila.items():
+            datos[f'{prefijo}-{i}-{campo}'] = valor
+    return datos
+
+
+class GuardadoHistoriaFormsetsTest(TestCase):
+    """
+    Pruebas del guardado atómico en lote de la historia y sus formsets.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.medico = User.objects.create_user(
+            correo='medico.formsets@test.com',
+            nombre='Medico Formsets',
+            rol='MEDICO',
+            password='123456'
+        )
+        cls.paciente = Paciente.objects.create(
+            nombre_completo="Paciente Formsets",
+            identificacion="90001",
+            fecha_nacimiento=date(1975, 6, 1)
+        )
+
+    def setUp(self):
+        self.client.force_login(self.medico)
+
+    def _post(self, url, diagnosticos, medicamentos=(), observaciones=(), iniciales=None, paciente=None):
+        iniciales = iniciales or {}
+        datos = {'paciente': (paciente or self.paciente).pk, 'resumen_clinico': 'Control'}
+        datos.update(datos_formset('diagnosticos_rel', diagnosticos, iniciales.get('diagnosticos_rel', 0)))
+        datos.update(datos_formset('medicamentos_rel', medicamentos, iniciales.get('medicamentos_rel', 0)))
+        datos.update(datos_formset('observaciones', observaciones, iniciales.get('observaciones', 0)))
+        datos.update(datos_formset('adjuntos', []))
+        return self.client.post(url, datos)
+
+    # -------------------------------------------------------------------------
+    def test_crear_historia_con_hijos(self):
+        respuesta = self._post(
+            reverse('historias:crear_historia'),
+            diagnosticos=[{'descripcion': 'Hipertensión', 'codigo_cie10': 'I10'},
+                          {'descripcion': 'Diabetes', 'codigo_cie10': 'E11'}],
+            medicamentos=[{'nombre': 'Losartán'}],
+            observaciones=[{'detalle': 'Paciente estable'}],
+        )
+        self.assertRedirects(respuesta, reverse('historias:listar_historias'))
+
+        historia = HistoriaClinica.objects.get(paciente=self.paciente)
+        self.assertEqual(historia.medico_responsable, self.medico)
+        self.assertEqual(historia.diagnosticos_rel.count(), 2)
+        self.assertEqual(historia.medicamentos_rel.count(), 1)
+        self.assertEqual(historia.observaciones.count(), 1)
+
+    # -------------------------------------------------------------------------
+    def test_editar_inserta_actualiza_y_elimina_en_lote(self):
+        historia = HistoriaClinica.objects.create(paciente=self.paciente, medico_responsable=self.medico)
+        conservar = Diagnostico.objects.create(historia=historia, descripcion='Gripa')
+        borrar = Diagnostico.objects.create(historia=historia, descripcion='Error de digitación')
+        Medicamento.objects.create(historia=historia, nombre='Acetaminofén')
+
+        with self.captureOnCommitCallbacks(execute=True):
+            respuesta = self._post(
+                reverse('historias:editar_historia', args=[historia.pk]),
+                diagnosticos=[
+                    {'id': conservar.pk, 'descripcion': 'Gripa complicada', 'codigo_cie10': 'J11'},
+                    {'id': borrar.pk, 'descripcion': borrar.descripcion, 'DELETE': 'on'},
+                    {'descripcion': 'Sinusitis', 'codigo_cie10': 'J32'},
+                ],
+                iniciales={'diagnosticos_rel': 2},
+            )
+        self.assertRedirects(respuesta, reverse('historias:listar_historias'))
+
+        conservar.refresh_from_db()
+        self.assertEqual(conservar.descripcion, 'Gripa complicada')
+        self.assertEqual(conservar.codigo_cie10, 'J11')
+        self.assertFalse(Diagnostico.objects.filter(pk=borrar.pk).exists())
+        self.assertTrue(Diagnostico.objects.filter(historia=historia, descripcion='Sinusitis').exists())
+        self.assertEqual(Medicamento.objects.filter(historia=historia).count(), 1)
+
+        # La fila actualizada en lote también queda auditada
+        cambio = AuditoriaCambio.objects.get(modelo_afectado='Diagnostico')
+        self.assertEqual(cambio.objeto_id, str(conservar.pk))
+        self.assertEqual(cambio.usuario, self.medico)
+        self.assertEqual(cambio.cambios, {
+            'descripcion': ['Gripa', 'Gripa complicada'],
+            'codigo_cie10': [None, 'J11'],
+        })
+
+    # -------------------------------------------------------------------------
+    def test_formset_invalido_no_guarda_nada(self):
+        respuesta = self._post(
+            reverse('historias:crear_historia'),
+            diagnosticos=[{'descripcion': 'x' * 300}],
+            observaciones=[{'detalle': 'No debe guardarse'}],
+        )
+        self.assertEqual(respuesta.status_code, 200)
+        self.assertFalse(HistoriaClinica.objects.exists())
+        self.assertFalse(Observacion.objects.exists())
+
+    # -------------------------------------------------------------------------
+    def _consultas(self, *args, **kwargs):
+        with CaptureQueriesContext(connection) as consultas:
+            respuesta = self._post(*args, **kwargs)
+        self.assertEqual(respuesta.status_code, 302)
+        return len(consultas)
+
+    def _otro_paciente(self, identificacion):
+        return Paciente.objects.create(
+            nombre_completo=f"Paciente {identificacion}",
+            identificacion=identificacion,
+            fecha_nacimiento=date(1980, 1, 1)
+        )
+
+    def test_consultas_constantes_al_crear(self):
+        def hijos(n):
+            return {
+                'paciente': self._otro_paciente(f'9100{n}'),
+                'diagnosticos': [{'descripcion': f'Diagnóstico {i}'} for i in range(n)],
+                'medicamentos': [{'nombre': f'Medicamento {i}'} for i in range(n)],
+                'observaciones': [{'detalle': f'Observación {i}'} for i in range(n)],
+            }
+
+        base = self._consultas(reverse('historias:crear_historia'), **hijos(1))
+        datos = hijos(15)
+        with self.assertNumQueries(base):
+            self._post(reverse('historias:crear_historia'), **datos)
+        self.assertEqual(Diagnostico.objects.count(), 16)
+
+    # -------------------------------------------------------------------------
+    def test_consultas_constantes_al_editar(self):
+        def editar(n):
+            paciente = self._otro_paciente(f'9200{n}')
+            historia = HistoriaClinica.objects.create(paciente=paciente, medico_responsable=self.medico)
+            existentes = Diagnostico.objects.bulk_create(
+                Diagnostico(historia=historia, descripcion=f'Diagnóstico {i}') for i in range(2 * n)
+            )
+            # La mitad se actualiza, la otra mitad se elimina y se agregan n nuevos
+            filas = [{'id': d.pk, 'descripcion': f'{d.descripcion} corregido'} for d in existentes[:n]]
+            filas += [{'id': d.pk, 'descripcion': d.descripcion, 'DELETE': 'on'} for d in existentes[n:]]
+            filas += [{'descripcion': f'Nuevo {i}'} for i in range(n)]
+            return (reverse('historias:editar_historia', args=[historia.pk]),), {
+                'diagnosticos': filas, 'iniciales': {'diagnosticos_rel': 2 * n}, 'paciente': paciente,
+            }
+
+        args, kwargs = editar(1)
+        base = self._consultas(*args, **kwargs)
+        args, kwargs = editar(15)
+        with self.assertNumQueries(base):
+            self._post(*args, **kwargs)
+        self.assertEqual(Diagnostico.objects.filter(descripcion__endswith='corregido').count(), 16)
@@ -1,19 +1,23 @@
 # =============================================================================
 # Proyecto: SOFT-MEDIC
 # Archivo: historias/tests.py
-# Versión: 1.5
+# Versión: 1.7
 # Fecha: 02/12/2025
 # Elaborado por: Prixma Software Projects
 # Revisado por: Dirección Técnica de SOFT-MEDIC
 # =============================================================================
 
+from unittest import mock
+
 from django.test import TestCase
+from django.urls import reverse
+from django.core.exceptions import ValidationError
 from django.db.utils import IntegrityError
 from django.contrib.auth import get_user_model
 from datetime import date
 
 from pacientes.models import Paciente, EPS
-from historias.models import HistoriaClinica
+from historias.models import HistoriaClinica, Diagnostico, Medicamento, Observacion
 
 User = get_user_model()  # Tu CustomUser
 
@@ -80,6 +84,67 @@ class IntegridadReferencialTest(TestCase):
                 resumen_clinico="Historia sin paciente"
             )
 
+    # -------------------------------------------------------------------------
+
+    def test_resumen_dependencias_en_una_consulta(self):
+        """El resumen de registros asociados se calcula con una sola consulta."""
+        Diagnostico.objects.create(historia=self.historia, descripcion="Gastritis")
+        Diagnostico.objects.create(historia=self.historia, descripcion="Colitis")
+        Observacion.objects.create(historia=self.historia, detalle="Dolor leve")
+
+        with self.assertNumQueries(1):
+            dependencias = self.historia.dependencias()
+
+        self.assertEqual(dependencias["diagnosticos_rel"], 2)
+        self.assertEqual(dependencias["observaciones"], 1)
+        self.assertEqual(dependencias["citas"], 0)
+
+        with self.assertRaises(ValidationError):
+            self.historia.delete()
+
+    # -------------------------------------------------------------------------
+
+    def test_eliminables_en_lote(self):
+        """Solo las historias sin registros asociados son eliminables."""
+        otro = Paciente.objects.create(
+            nombre_completo="Ana Ruiz",
+            identificacion="222333444",
+            fecha_nacimiento=date(1992, 3, 4),
+            eps=self.eps
+        )
+        libre = HistoriaClinica.objects.create(paciente=otro, medico_responsable=self.medico)
+        Medicamento.objects.create(historia=self.historia, nombre="Omeprazol")
+
+        with self.assertNumQueries(1):
+            eliminables = list(HistoriaClinica.objects.eliminables().values_list('pk', flat=True))
+        self.assertEqual(eliminables, [libre.pk])
+
+        libre.delete()
+        self.assertFalse(HistoriaClinica.objects.filter(pk=libre.pk).exists())
+
+    # -------------------------------------------------------------------------
+
+    def test_vista_eliminar_verifica_dependencias_una_vez(self):
+        """La vista delega en delete() y muestra qué registros lo impiden."""
+        admin = User.objects.create_user(
+            correo='admin.integridad@test.com', nombre='Admin', rol='ADMIN', password='12345'
+        )
+        Diagnostico.objects.create(historia=self.historia, descripcion="Gastritis")
+        self.client.force_login(admin)
+
+        with mock.patch.object(
+            HistoriaClinica, 'dependencias', autospec=True, side_effect=HistoriaClinica.dependencias
+        ) as dependencias:
+            respuesta = self.client.post(
+                reverse('historias:eliminar_historia', args=[self.historia.pk]), follow=True
+            )
+
+        self.assertEqual(dependencias.call_count, 1)
+        self.assertTrue(HistoriaClinica.objects.filter(pk=self.historia.pk).exists())
+        mensajes = [str(m) for m in respuesta.context['messages']]
+        self.assertTrue(any("registros asociados: diagnosticos_rel (1)" in m for m in mensajes), mensajes)
+
+
 # =============================================================================
 # CONTROL DE CAMBIOS
 # ----------------------------------------------------------------------------- 
@@ -90,4 +155,6 @@ class IntegridadReferencialTest(TestCase):
 # 1.3     | 02/12/2025  | Prixma Software Projects     | Eliminación de 'username' y compatibilidad total con CustomUser
 # 1.4     | 02/12/2025  | Prixma Software Projects     | Eliminación de 'apellido' para compatibilidad con CustomUser
 # 1.5     | 02/12/2025  | Prixma Software Projects     | Creación de EPS de prueba y asignación correcta al paciente
+# 1.6     | 17/10/2026  | Prixma Software Projects     | Pruebas del resumen de dependencias en una sola consulta
+# 1.7     | 17/10/2026  | Prixma Software Projects     | Vista de eliminación con una sola verificación de dependencias
 # =============================================================================
@@ -0,0 +1,91 @@
+# =============================================================================
+# Proyecto: SOFT-MEDIC
+# Archivo: historias/tests/test_linea_tiempo.py
+# Versión: 1.0
+# Fecha: 17/10/2026
+# Elaborado por: Prixma Software Projects
+# Revisado por: Dirección Técnica de SOFT-MEDIC
+# =============================================================================
+
+from datetime import date, datetime, timedelta, timezone as dt_timezone
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.urls import reverse
+
+from pacientes.models import Paciente, EPS
+from historias.linea_tiempo import linea_tiempo
+from historias.models import HistoriaClinica, Cita, Observacion, Diagnostico, Medicamento
+
+User = get_user_model()
+
+BASE = datetime(2026, 3, 1, 8, 0, tzinfo=dt_timezone.utc)
+
+
+class LineaTiempoTest(TestCase):
+    """
+    Pruebas de la línea de tiempo paginada por cursor.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.medico = User.objects.create_user(
+            correo='medico.linea@test.com', nombre='Medico Linea', rol='MEDICO', password='123456'
+        )
+        cls.otro = User.objects.create_user(
+            correo='otro.linea@test.com', nombre='Otro Linea', rol='MEDICO', password='123456'
+        )
+        eps = EPS.objects.create(nombre="EPS Línea", codigo="EPSLT")
+        cls.paciente = Paciente.objects.create(
+            nombre_completo="Paciente Línea", identificacion="60001",
+            fecha_nacimiento=date(1970, 1, 1), eps=eps
+        )
+        cls.historia = HistoriaClinica.objects.create(paciente=cls.paciente, medico_responsable=cls.medico)
+        cls.ajena = HistoriaClinica.objects.create(paciente=cls.paciente, medico_responsable=cls.otro)
+
+        # Varios eventos comparten momento para ejercitar los desempates
+        for i in range(4):
+            momento = BASE + timedelta(hours=i // 2)
+            Cita.objects.create(historia=cls.historia, fecha=momento, motivo=f"Control {i}")
+            obs = Observacion.objects.create(historia=cls.historia, detalle=f"Obs {i}")
+            diag = Diagnostico.objects.create(historia=cls.historia, descripcion=f"Dx {i}")
+            med = Medicamento.objects.create(historia=cls.ajena, nombre=f"Med {i}")
+            for modelo, objeto in ((Observacion, obs), (Diagnostico, diag), (Medicamento, med)):
+                modelo.objects.filter(pk=objeto.pk).update(creado_en=momento)
+
+    def recorrer(self, historia_ids, tamano):
+        vistos, cursor = [], None
+        while True:
+            pagina = linea_tiempo(historia_ids, cursor=cursor, tamano=tamano)
+            self.assertLessEqual(len(pagina), tamano)
+            vistos.extend(pagina)
+            if not pagina.hay_siguiente:
+                return vistos
+            cursor = pagina.siguiente_cursor
+
+    # -------------------------------------------------------------------------
+    def test_paginas_en_orden_sin_repetidos(self):
+        ids = [self.historia.pk, self.ajena.pk]
+        completo = linea_tiempo(ids, tamano=100).elementos
+        self.assertEqual(len(completo), 16)
+        self.assertEqual(
+            [e.momento for e in completo], sorted((e.momento for e in completo), reverse=True)
+        )
+        for tamano in (1, 3, 5):
+            self.assertEqual(self.recorrer(ids, tamano), completo)
+
+    def test_consultas_por_pagina_acotadas(self):
+        # Una consulta por fuente e historia, sin importar el volumen
+        with self.assertNumQueries(5):
+            linea_tiempo([self.historia.pk], tamano=2)
+
+    def test_endpoint_paciente_respeta_visibilidad(self):
+        self.client.force_login(self.medico)
+        datos = self.client.get(
+            reverse('historias:linea_tiempo_paciente', args=[self.paciente.pk]), {'tamano': 100}
+        ).json()
+        self.assertEqual({e['historia'] for e in datos['eventos']}, {self.historia.pk})
+        self.assertIsNone(datos['siguiente_cursor'])
+
+        respuesta = self.client.get(reverse('historias:linea_tiempo_historia', args=[self.ajena.pk]))
+        self.assertEqual(respuesta.status_code, 403)
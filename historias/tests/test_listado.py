@@ -0,0 +1,140 @@
+# =============================================================================
+# Proyecto: SOFT-MEDIC
+# Archivo: historias/tests/test_listado.py
+# Versión: 1.0
+# Fecha: 17/10/2026
+# Elaborado por: Prixma Software Projects
+# Revisado por: Dirección Técnica de SOFT-MEDIC
+# =============================================================================
+
+from datetime import date
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from pacientes.models import Paciente, EPS
+from historias.models import HistoriaClinica
+from historias.paginacion import paginar_por_cursor
+from historias.views import HistoriaClinicaListView
+
+User = get_user_model()
+
+
+class ListadoPorCursorTest(TestCase):
+    """
+    Pruebas del listado de historias paginado por cursor.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.medico = User.objects.create_user(
+            correo='medico.listado@test.com',
+            nombre='Medico Listado',
+            rol='MEDICO',
+            password='123456'
+        )
+        cls.admin = User.objects.create_user(
+            correo='admin.listado@test.com',
+            nombre='Admin Listado',
+            rol='ADMIN',
+            password='123456'
+        )
+        eps = EPS.objects.create(nombre="EPS Listado", codigo="EPSL")
+        for i, fecha in enumerate([date(2026, 1, 1), date(2026, 1, 2), date(2026, 1, 2), date(2026, 1, 3)]):
+            paciente = Paciente.objects.create(
+                nombre_completo=f"Paciente {i}",
+                identificacion=f"5000{i}",
+                fecha_nacimiento=date(1990, 1, 1),
+                eps=eps
+            )
+            HistoriaClinica.objects.create(
+                paciente=paciente,
+                medico_responsable=cls.medico,
+                resumen_clinico="x" * 200,
+                fecha_ingreso=fecha
+            )
+
+    # -------------------------------------------------------------------------
+    def test_paginas_sin_repetidos_ni_omitidos(self):
+        """Recorrer todas las páginas devuelve cada historia una sola vez, en orden."""
+        orden = ('-fecha_ingreso', '-id')
+        esperado = list(HistoriaClinica.objects.order_by(*orden).values_list('id', flat=True))
+
+        vistos, cursor = [], None
+        while True:
+            pagina = paginar_por_cursor(HistoriaClinica.objects.all(), orden, cursor=cursor, tamano=3)
+            vistos.extend(h.id for h in pagina)
+            if not pagina.hay_siguiente:
+                break
+            cursor = pagina.siguiente_cursor
+
+        self.assertEqual(vistos, esperado)
+
+    # -------------------------------------------------------------------------
+    def test_vista_usa_cursor_y_proyeccion(self):
+        """La vista entrega una página con el resumen recortado y el cursor siguiente."""
+        self.client.force_login(self.admin)
+        tamano = HistoriaClinicaListView.tamano_pagina
+        HistoriaClinicaListView.tamano_pagina = 3
+        try:
+            respuesta = self.client.get(reverse('historias:listar_historias'))
+            pagina = respuesta.context['pagina']
+            self.assertEqual(len(respuesta.context['historias']), 3)
+            self.assertTrue(pagina.hay_siguiente)
+            self.assertLessEqual(len(respuesta.context['historias'][0].resumen_corto), 61)
+
+            respuesta = self.client.get(
+                reverse('historias:listar_historias'), {'cursor': pagina.siguiente_cursor}
+            )
+            self.assertEqual(len(respuesta.context['historias']), 1)
+            self.assertFalse(respuesta.context['pagina'].hay_siguiente)
+        finally:
+            HistoriaClinicaListView.tamano_pagina = tamano
+
+    # -------------------------------------------------------------------------
+    def test_cursor_invalido_reinicia_listado(self):
+        """Un cursor manipulado no produce error: se muestra la primera página."""
+        self.client.force_login(self.admin)
+        respuesta = self.client.get(reverse('historias:listar_historias'), {'cursor': '%%%'})
+        self.assertEqual(respuesta.status_code, 200)
+        self.assertEqual(len(respuesta.context['historias']), 4)
+
+
+class MapaIdentidadTest(TestCase):
+    """
+    La historia se consulta una sola vez por petición, con paciente y
+    médico unidos, aunque dispatch() y la vista la soliciten por separado.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.medico = User.objects.create_user(
+            correo='medico.identidad@test.com',
+            nombre='Medico Identidad',
+            rol='MEDICO',
+            password='123456'
+        )
+        paciente = Paciente.objects.create(
+            nombre_completo="Paciente Identidad",
+            identificacion="60001",
+            fecha_nacimiento=date(1990, 1, 1)
+        )
+        cls.historia = HistoriaClinica.objects.create(paciente=paciente, medico_responsable=cls.medico)
+
+    def test_detalle_consulta_historia_una_vez(self):
+        self.client.force_login(self.medico)
+        with CaptureQueriesContext(connection) as consultas:
+            respuesta = self.client.get(reverse('historias:ver_historia', args=[self.historia.pk]))
+        self.assertEqual(respuesta.status_code, 200)
+
+        sobre_historia = [q['sql'] for q in consultas if 'FROM "historias_historiaclinica"' in q['sql']]
+        self.assertEqual(len(sobre_historia), 1)
+        self.assertIn('INNER JOIN "paciente"', sobre_historia[0])
+
+    def test_historia_inexistente_responde_404(self):
+        self.client.force_login(self.medico)
+        respuesta = self.client.get(reverse('historias:ver_historia', args=[999999]))
+        self.assertEqual(respuesta.status_code, 404)
@@ -0,0 +1,34 @@
+# =============================================================================
+# Proyecto: SOFT-MEDIC
+# Archivo: historias/tests/test_planes_consulta.py
+# Versión: 1.0
+# Fecha: 17/10/2026
+# Elaborado por: Prixma Software Projects
+# Revisado por: Dirección Técnica de SOFT-MEDIC
+# =============================================================================
+
+from unittest import skipUnless
+
+from django.db import connection
+from django.test import TestCase
+
+from historias.planes_consulta import verificar_planes, analizar_plan
+
+
+class PlanesConsultaTest(TestCase):
+    """
+    Regresión de planes de consulta: ninguna consulta principal debe
+    recorrer una tabla completa.
+    """
+
+    def test_analizar_plan_detecta_recorridos(self):
+        self.assertEqual(analizar_plan("2 0 0 SCAN paciente"), ["recorrido completo de paciente"])
+        self.assertEqual(analizar_plan("2 0 0 SCAN paciente USING INDEX paciente_nombre_idx"), [])
+        self.assertEqual(analizar_plan("9 0 0 USE TEMP B-TREE FOR ORDER BY"), ["ordenamiento sin índice"])
+        self.assertEqual(analizar_plan("9 0 0 USE TEMP B-TREE FOR ORDER BY", exigir_orden=False), [])
+
+    @skipUnless(connection.vendor == 'sqlite', "EXPLAIN QUERY PLAN de SQLite")
+    def test_consultas_principales_usan_indices(self):
+        for nombre, (plan, problemas) in verificar_planes().items():
+            with self.subTest(consulta=nombre):
+                self.assertEqual(problemas, [], plan)
@@ -0,0 +1,152 @@
+# =============================================================================
+# Proyecto: SOFT-MEDIC
+# Archivo: historias/tests/test_recordatorios.py
+# Versión: 1.1
+# Fecha: 17/10/2026
+# Elaborado por: Prixma Software Projects
+# Revisado por: Dirección Técnica de SOFT-MEDIC
+# =============================================================================
+
+from datetime import date, datetime, timedelta
+from unittest.mock import patch
+
+from django.contrib.auth import get_user_model
+from django.core import mail
+from django.core.mail import get_connection
+from django.core.mail.backends.locmem import EmailBackend
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from pacientes.models import Paciente, EPS
+from historias.models import HistoriaClinica, Cita, RecordatorioCita
+from historias.recordatorios import generar_recordatorios, enviar_pendientes, reservar_lote
+
+User = get_user_model()
+
+DIA = date(2026, 11, 3)
+
+
+class BackendConFallos(EmailBackend):
+    """Backend de prueba que rechaza los destinatarios de dominio 'falla.test'."""
+
+    def send_messages(self, messages):
+        for mensaje in messages:
+            if any(d.endswith('@falla.test') for d in mensaje.to):
+                raise ConnectionError("servidor no disponible")
+        return super().send_messages(messages)
+
+
+class RecordatoriosTest(TestCase):
+    """
+    Pruebas de la generación y el envío de recordatorios de citas.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        medico = User.objects.create_user(
+            correo='medico.recordatorio@test.com', nombre='Dra. Recordatorio', rol='MEDICO', password='123456'
+        )
+        eps = EPS.objects.create(nombre="EPS Recordatorios", codigo="EPSR")
+        contactos = ['ana@test.com', 'luis@falla.test', '3001234567', 'eva@test.com']
+        for i, contacto in enumerate(contactos):
+            paciente = Paciente.objects.create(
+                nombre_completo=f"Paciente {i}", identificacion=f"2000{i}",
+                fecha_nacimiento=date(1990, 1, 1), contacto=contacto, eps=eps
+            )
+            historia = HistoriaClinica.objects.create(paciente=paciente, medico_responsable=medico)
+            Cita.objects.create(
+                historia=historia, medico=medico, motivo="Control",
+                fecha=timezone.make_aware(datetime(2026, 11, 3, 8 + i, 0)),
+                estado=Cita.ESTADO_CANCELADA if i == 3 else Cita.ESTADO_PROGRAMADA,
+            )
+
+    # -------------------------------------------------------------------------
+    def test_generacion_por_lotes_e_idempotente(self):
+        self.assertEqual(generar_recordatorios(DIA, lote=1), (2, 1))
+        self.assertEqual(generar_recordatorios(DIA, lote=1), (0, 1))
+
+        recordatorio = RecordatorioCita.objects.get(destinatario='ana@test.com')
+        self.assertIn("Paciente 0", recordatorio.cuerpo)
+        self.assertIn("08:00", recordatorio.cuerpo)
+        self.assertIn("Dra. Recordatorio", recordatorio.cuerpo)
+
+    @override_settings(EMAIL_BACKEND='historias.tests.test_recordatorios.BackendConFallos')
+    def test_envio_con_reintentos(self):
+        generar_recordatorios(DIA)
+
+        self.assertEqual(enviar_pendientes(trabajadores=2), (1, 1))
+        self.assertEqual([m.to for m in mail.outbox], [['ana@test.com']])
+
+        fallido = RecordatorioCita.objects.get(destinatario='luis@falla.test')
+        self.assertEqual(fallido.estado, RecordatorioCita.PENDIENTE)
+        self.assertEqual(fallido.intentos, 1)
+        self.assertGreater(fallido.proximo_intento, timezone.now())
+        self.assertIn("servidor no disponible", fallido.ultimo_error)
+
+        # Sin recordatorios vencidos no se envía nada más
+        self.assertEqual(enviar_pendientes(), (0, 0))
+
+        RecordatorioCita.objects.filter(pk=fallido.pk).update(
+            proximo_intento=timezone.now() - timedelta(seconds=1), intentos=4
+        )
+        self.assertEqual(enviar_pendientes(), (0, 1))
+        self.assertEqual(RecordatorioCita.objects.get(pk=fallido.pk).estado, RecordatorioCita.FALLIDO)
+
+    def test_reserva_vencida_vuelve_a_la_cola(self):
+        generar_recordatorios(DIA)
+        RecordatorioCita.objects.update(
+            estado=RecordatorioCita.ENVIANDO, proximo_intento=timezone.now() - timedelta(minutes=1)
+        )
+        enviados, _ = enviar_pendientes()
+        self.assertEqual(enviados, 2)
+
+    def test_generacion_cuenta_solo_filas_nuevas(self):
+        generar_recordatorios(DIA)
+        RecordatorioCita.objects.filter(destinatario='ana@test.com').delete()
+        # Lote leído antes de que otro proceso generara los recordatorios
+        citas = list(Cita.objects.filter(estado=Cita.ESTADO_PROGRAMADA).select_related('historia__paciente', 'medico'))
+        with patch('historias.recordatorios.lotes_de_citas', return_value=iter([citas])):
+            self.assertEqual(generar_recordatorios(DIA), (1, 1))
+
+    def test_reserva_en_un_solo_update(self):
+        generar_recordatorios(DIA)
+        # Lectura de candidatos, UPDATE de reserva y lectura de lo reservado
+        with self.assertNumQueries(3):
+            reservados = reservar_lote()
+        self.assertEqual(len(reservados), 2)
+        self.assertEqual(reservar_lote(), [])
+
+    def test_cita_cancelada_o_movida_no_se_envia(self):
+        generar_recordatorios(DIA)
+        cancelada = Cita.objects.get(historia__paciente__contacto='ana@test.com')
+        movida = Cita.objects.get(historia__paciente__contacto='luis@falla.test')
+        # QuerySet.update() no emite señales: lo detecta la verificación al enviar
+        Cita.objects.filter(pk=cancelada.pk).update(estado=Cita.ESTADO_CANCELADA)
+        Cita.objects.filter(pk=movida.pk).update(fecha=movida.fecha + timedelta(days=1))
+
+        self.assertEqual(enviar_pendientes(), (0, 0))
+        self.assertEqual(mail.outbox, [])
+        self.assertEqual(RecordatorioCita.objects.get(cita=cancelada).estado, RecordatorioCita.CANCELADO)
+        self.assertFalse(RecordatorioCita.objects.filter(cita=movida).exists())
+
+        # La cita movida recibe un recordatorio nuevo el día que corresponde
+        self.assertEqual(generar_recordatorios(DIA + timedelta(days=1)), (1, 0))
+        self.assertIn("09:00", RecordatorioCita.objects.get(cita=movida).cuerpo)
+
+    def test_cambio_de_cita_descarta_el_recordatorio(self):
+        generar_recordatorios(DIA)
+        cita = Cita.objects.get(historia__paciente__contacto='ana@test.com')
+        cita.fecha += timedelta(hours=1)
+        cita.save()
+        self.assertFalse(RecordatorioCita.objects.filter(cita=cita).exists())
+
+        generar_recordatorios(DIA)
+        cita.estado = Cita.ESTADO_CANCELADA
+        cita.save()
+        self.assertEqual(RecordatorioCita.objects.get(cita=cita).estado, RecordatorioCita.CANCELADO)
+
+    def test_una_conexion_por_hilo(self):
+        generar_recordatorios(DIA)
+        with patch('historias.recordatorios.get_connection', wraps=get_connection) as conexiones:
+            self.assertEqual(enviar_pendientes(trabajadores=1), (2, 0))
+        self.assertEqual(conexiones.call_count, 1)
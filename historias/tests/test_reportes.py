@@ -0,0 +1,193 @@
+# =============================================================================
+# Proyecto: SOFT-MEDIC
+# Archivo: historias/tests/test_reportes.py
+# Versión: 1.1
+# Fecha: 17/10/2026
+# Elaborado por: Prixma Software Projects
+# Revisado por: Dirección Técnica de SOFT-MEDIC
+# =============================================================================
+
+import csv
+import io
+import os
+import shutil
+import tempfile
+from datetime import date, timedelta
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from pacientes.models import Paciente, EPS
+from historias.exportaciones import (
+    encolar_exportacion, limpiar_exportaciones, procesar_trabajo, tomar_siguiente_trabajo,
+    MAX_INTENTOS, RETENCION_SEGUNDOS, VENCIMIENTO_SEGUNDOS,
+)
+from historias.models import HistoriaClinica, TrabajoExportacion
+from historias.reportes import csv_por_bloques
+
+User = get_user_model()
+
+
+class ReportePacientesAtendidosTest(TestCase):
+    """
+    Pruebas del reporte CSV transmitido por bloques.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.medico = User.objects.create_user(
+            correo='medico.reporte@test.com',
+            nombre='Medico Reporte',
+            rol='MEDICO',
+            password='123456'
+        )
+        eps = EPS.objects.create(nombre="EPS Reporte", codigo="EPSR")
+        for i in range(3):
+            paciente = Paciente.objects.create(
+                nombre_completo=f"Paciente {i}",
+                identificacion=f"7000{i}",
+                fecha_nacimiento=date(1990, 1, 1),
+                eps=eps
+            )
+            HistoriaClinica.objects.create(
+                paciente=paciente,
+                medico_responsable=cls.medico,
+                motivo_consulta="Control",
+                diagnosticos=[{"descripcion": "Hipertensión"}, {"descripcion": "Diabetes"}]
+            )
+
+    # -------------------------------------------------------------------------
+    def test_reporte_transmitido(self):
+        """El reporte es una respuesta transmitida con una fila por historia."""
+        respuesta = self.client.get(reverse('historias:reporte_pacientes_atendidos'))
+        self.assertTrue(respuesta.streaming)
+
+        contenido = b"".join(respuesta.streaming_content).decode('utf-8')
+        filas = list(csv.reader(io.StringIO(contenido)))
+        self.assertEqual(filas[0][0], "ID Historia")
+        self.assertEqual(len(filas), 4)
+        self.assertEqual(filas[1][4], "Medico Reporte")
+        self.assertEqual(filas[1][7], "Hipertensión, Diabetes")
+
+    # -------------------------------------------------------------------------
+    def test_bloques_acotados(self):
+        """Los bloques nunca superan el número de filas configurado."""
+        filas = [["encabezado"]] + [[i] for i in range(10)]
+        bloques = list(csv_por_bloques(filas, filas_por_bloque=4))
+        self.assertEqual(bloques[0], "encabezado\r\n")
+        self.assertEqual([b.count("\r\n") for b in bloques[1:]], [4, 4, 2])
+
+
+class ExportacionesSegundoPlanoTest(TestCase):
+    """
+    Pruebas del ciclo encolar → procesar → descargar de las exportaciones.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create_user(
+            correo='admin.exportacion@test.com',
+            nombre='Admin Exportacion',
+            rol='ADMIN',
+            password='123456'
+        )
+        medico = User.objects.create_user(
+            correo='medico.exportacion@test.com',
+            nombre='Medico Exportacion',
+            rol='MEDICO',
+            password='123456'
+        )
+        paciente = Paciente.objects.create(
+            nombre_completo="Paciente Exportado",
+            identificacion="80001",
+            fecha_nacimiento=date(1980, 1, 1)
+        )
+        HistoriaClinica.objects.create(paciente=paciente, medico_responsable=medico, fecha_ingreso=date(2026, 3, 1))
+
+    def setUp(self):
+        self.media = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.media, ignore_errors=True)
+        ajustes = override_settings(MEDIA_ROOT=self.media)
+        ajustes.enable()
+        self.addCleanup(ajustes.disable)
+
+    # -------------------------------------------------------------------------
+    def test_ciclo_completo_y_cache(self):
+        """El trabajo se procesa, se descarga y se reutiliza con los mismos filtros."""
+        self.client.force_login(self.admin)
+        filtros = {'fecha_desde': '2026-01-01', 'fecha_hasta': '2026-12-31'}
+
+        respuesta = self.client.post(reverse('historias:solicitar_exportacion'), filtros)
+        self.assertEqual(respuesta.status_code, 202)
+        self.assertEqual(respuesta.json()['estado'], TrabajoExportacion.PENDIENTE)
+
+        trabajo = tomar_siguiente_trabajo()
+        self.assertIsNotNone(trabajo)
+        self.assertIsNone(tomar_siguiente_trabajo())
+        procesar_trabajo(trabajo)
+
+        estado = self.client.get(reverse('historias:estado_exportacion', args=[trabajo.pk])).json()
+        self.assertEqual(estado['estado'], TrabajoExportacion.COMPLETADO)
+        self.assertEqual(estado['progreso'], 100)
+
+        descarga = self.client.get(estado['url_descarga'])
+        contenido = b"".join(descarga.streaming_content).decode('utf-8')
+        self.assertIn("Paciente Exportado", contenido)
+
+        repetida = self.client.post(reverse('historias:solicitar_exportacion'), filtros).json()
+        self.assertEqual(repetida['id'], trabajo.pk)
+        self.assertEqual(repetida['estado'], TrabajoExportacion.COMPLETADO)
+        self.assertEqual(TrabajoExportacion.objects.count(), 1)
+
+    def test_trabajo_abandonado_se_reencola(self):
+        """Un trabajo EN_PROCESO sin latido vuelve a la cola y el trabajador perdido no lo cierra."""
+        filtros = {'fecha_desde': '2026-01-01', 'fecha_hasta': '2026-12-31'}
+        encolar_exportacion(filtros)
+        caido = tomar_siguiente_trabajo()
+        TrabajoExportacion.objects.filter(pk=caido.pk).update(
+            latido_en=timezone.now() - timedelta(seconds=VENCIMIENTO_SEGUNDOS + 1)
+        )
+
+        self.assertEqual(encolar_exportacion(filtros).estado, TrabajoExportacion.PENDIENTE)
+        nuevo = tomar_siguiente_trabajo()
+        self.assertEqual(nuevo.pk, caido.pk)
+        self.assertEqual(nuevo.intentos, 2)
+
+        # El trabajador anterior despierta: su reclamo ya no es válido
+        procesar_trabajo(caido)
+        self.assertEqual(TrabajoExportacion.objects.get(pk=caido.pk).estado, TrabajoExportacion.EN_PROCESO)
+
+        procesar_trabajo(nuevo)
+        self.assertEqual(TrabajoExportacion.objects.get(pk=caido.pk).estado, TrabajoExportacion.COMPLETADO)
+        self.assertEqual(os.listdir(os.path.join(self.media, 'exportaciones')), [os.path.basename(nuevo.archivo.name)])
+
+    def test_trabajo_falla_tras_maximo_de_intentos(self):
+        trabajo = encolar_exportacion({'fecha_desde': '2026-01-01'})
+        TrabajoExportacion.objects.filter(pk=trabajo.pk).update(
+            estado=TrabajoExportacion.EN_PROCESO, intentos=MAX_INTENTOS,
+            latido_en=timezone.now() - timedelta(seconds=VENCIMIENTO_SEGUNDOS + 1),
+        )
+
+        self.assertIsNone(tomar_siguiente_trabajo())
+        self.assertEqual(TrabajoExportacion.objects.get(pk=trabajo.pk).estado, TrabajoExportacion.FALLIDO)
+
+    def test_limpieza_de_exportaciones_vencidas(self):
+        trabajo = encolar_exportacion({'fecha_desde': '2026-01-01'})
+        trabajo = procesar_trabajo(tomar_siguiente_trabajo())
+        ruta = trabajo.archivo.path
+        huerfano = os.path.join(self.media, 'exportaciones', 'huerfano.csv.1.1.tmp')
+        open(huerfano, 'w').close()
+
+        self.assertEqual(limpiar_exportaciones(), 0)
+        self.assertTrue(os.path.exists(ruta))
+
+        viejo = timezone.now() - timedelta(seconds=RETENCION_SEGUNDOS + 1)
+        TrabajoExportacion.objects.filter(pk=trabajo.pk).update(finalizado_en=viejo)
+        os.utime(huerfano, (viejo.timestamp(), viejo.timestamp()))
+
+        self.assertEqual(limpiar_exportaciones(), 1)
+        self.assertFalse(os.path.exists(ruta))
+        self.assertFalse(os.path.exists(huerfano))
+        self.assertFalse(TrabajoExportacion.objects.exists())
@@ -4,9 +4,18 @@ from .views import (
     HistoriaClinicaUpdateView,
     HistoriaClinicaListView,
     HistoriaClinicaDetailView,
-    HistoriaClinicaDeleteView
+    HistoriaClinicaDeleteView,
+    buscar_historias,
+    linea_tiempo_historia,
+    linea_tiempo_paciente
+)
+from .views_agenda import agenda_medico, agendar_cita_historia, huecos_disponibles
+from .views_reportes import (
+    reporte_pacientes_atendidos_csv,
+    solicitar_exportacion,
+    estado_exportacion,
+    descargar_exportacion
 )
-from .views_reportes import reporte_pacientes_atendidos_csv
 
 app_name = 'historias'
 
@@ -16,6 +25,16 @@ urlpatterns = [
     path('editar/<int:pk>/', HistoriaClinicaUpdateView.as_view(), name='editar_historia'),
     path('<int:pk>/', HistoriaClinicaDetailView.as_view(), name='ver_historia'),
     path('eliminar/<int:pk>/', HistoriaClinicaDeleteView.as_view(), name='eliminar_historia'),
+    path('buscar/', buscar_historias, name='buscar_historias'),
+    path('<int:pk>/linea-tiempo/', linea_tiempo_historia, name='linea_tiempo_historia'),
+    path('paciente/<int:paciente_id>/linea-tiempo/', linea_tiempo_paciente, name='linea_tiempo_paciente'),
+
+    # ======================================================
+    # 📌 AGENDA DE CITAS
+    # ======================================================
+    path('agenda/', agenda_medico, name='agenda_medico'),
+    path('agenda/huecos/', huecos_disponibles, name='huecos_disponibles'),
+    path('<int:pk>/agendar-cita/', agendar_cita_historia, name='agendar_cita'),
 
     # ======================================================
     # 📌 REPORTE CSV — Pacientes atendidos
@@ -25,4 +44,11 @@ urlpatterns = [
         reporte_pacientes_atendidos_csv,
         name='reporte_pacientes_atendidos'
     ),
+
+    # ======================================================
+    # 📌 EXPORTACIONES EN SEGUNDO PLANO
+    # ======================================================
+    path('exportaciones/solicitar/', solicitar_exportacion, name='solicitar_exportacion'),
+    path('exportaciones/<int:pk>/', estado_exportacion, name='estado_exportacion'),
+    path('exportaciones/<int:pk>/descargar/', descargar_exportacion, name='descargar_exportacion'),
 ]
@@ -0,0 +1,55 @@
+# =====================================================================
+# Proyecto: SOFT-MEDIC
+# Archivo: historias/utils.py
+# Versión: 1.1
+# Fecha: 17/10/2026
+# Elaborado por: Prixma Software Projects
+# Revisado por: Dirección Técnica de SOFT-MEDIC
+# =====================================================================
+
+
+def guardar_formset_en_lote(formset, instancia):
+    """
+    Guarda un inline formset ya validado con operaciones en lote:
+    un INSERT para las filas nuevas, un UPDATE para las modificadas
+    y un DELETE para las marcadas, en lugar de una consulta por fila.
+
+    Debe llamarse dentro de una transacción, después de guardar
+    `instancia` (la historia padre).
+    """
+    formset.instance = instancia
+    formset.save(commit=False)  # Clasifica filas sin tocar la base de datos
+
+    modelo = formset.model
+    campos_modelo = {campo.name: campo for campo in modelo._meta.concrete_fields}
+
+    if formset.new_objects:
+        modelo.objects.bulk_create(formset.new_objects)
+
+    if formset.changed_objects:
+        modificados, campos = [], set()
+        for objeto, cambios in formset.changed_objects:
+            for nombre in cambios:
+                campo = campos_modelo.get(nombre)
+                if campo is None or campo.primary_key:
+                    continue
+                # pre_save confirma archivos subidos (FileField) y fechas automáticas
+                setattr(objeto, campo.attname, campo.pre_save(objeto, add=False))
+                campos.add(nombre)
+            modificados.append(objeto)
+        if campos:
+            modelo.objects.bulk_update(modificados, sorted(campos))
+            # bulk_update no pasa por save(): la auditoría de cambios se pide aquí
+            for objeto in modificados:
+                objeto.auditar_cambios()
+
+    if formset.deleted_objects:
+        modelo.objects.filter(pk__in=[objeto.pk for objeto in formset.deleted_objects]).delete()
+
+
+# =====================================================================
+# CONTROL DE CAMBIOS
+# =====================================================================
+# Versión | Fecha       | Autor / Responsable      | Descripción
+# 1.0     | 17/10/2026  | Prixma Software Projects | Guardado de formsets en lote
+# 1.1     | 17/10/2026  | Prixma Software Projects | Auditoría de cambios en las filas actualizadas
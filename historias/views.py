@@ -7,15 +7,23 @@
 # Revisado por: Dirección Técnica de SOFT-MEDIC
 # =============================================================================
 
+from django.core.exceptions import ValidationError
 from django.urls import reverse_lazy
 from django.views.generic import CreateView, UpdateView, ListView, DetailView
 from django.views import View
 from django.contrib.auth.mixins import LoginRequiredMixin
 from django.shortcuts import redirect
 from django.contrib import messages
-from django.http import HttpResponseForbidden
+from django.http import HttpResponseForbidden, HttpResponseRedirect, JsonResponse
+from django.contrib.auth.decorators import login_required
+from django.urls import reverse
+from django.db import transaction
+from django.db.models.functions import Substr
 
 from .models import HistoriaClinica
+from .identidad import HistoriaIdentidadMixin, obtener_historia
+from .paginacion import paginar_por_cursor
+from .utils import guardar_formset_en_lote
 from .forms import (
     HistoriaClinicaForm,
     DiagnosticoFormSet,
@@ -27,100 +35,251 @@ from .forms import (
 from .permisos import (
     puede_ver_historia,
     puede_editar_historia,
-    puede_eliminar_historia
+    puede_eliminar_historia,
+    historias_visibles
 )
+from .busqueda import obtener_backend
+from .linea_tiempo import linea_tiempo
 
 
 # ---------------------------------------------------------------------------
 # LISTAR HISTORIAS
 # ---------------------------------------------------------------------------
+def consulta_listado_historias(usuario):
+    """
+    Historias visibles para el usuario con solo las columnas que pinta
+    el listado. La usa la vista y la vigila historias/planes_consulta.py.
+    """
+    return (
+        historias_visibles(usuario)
+        .select_related('paciente', 'medico_responsable')
+        .only(
+            'id',
+            'fecha_ingreso',
+            'paciente',
+            'medico_responsable',
+            'paciente__nombre_completo',
+            'medico_responsable__nombre',
+        )
+        .annotate(resumen_corto=Substr('resumen_clinico', 1, 61))
+    )
+
+
 class HistoriaClinicaListView(LoginRequiredMixin, ListView):
+    """
+    Listado paginado por cursor sobre (fecha_ingreso, id).
+
+    Solo se consultan las columnas que pinta la tabla; paciente y médico
+    se obtienen en la misma consulta y el resumen clínico se recorta en
+    la base de datos.
+    """
     model = HistoriaClinica
     template_name = 'historias/historia_list.html'
     context_object_name = 'historias'
+    orden_cursor = ('-fecha_ingreso', '-id')
+    tamano_pagina = 50
 
     def get_queryset(self):
-        user = self.request.user
+        return consulta_listado_historias(self.request.user)
 
-        if user.rol == 'MEDICO':
-            return HistoriaClinica.objects.filter(medico_responsable=user)
+    def get_context_data(self, **kwargs):
+        self.pagina = paginar_por_cursor(
+            self.object_list,
+            self.orden_cursor,
+            cursor=self.request.GET.get('cursor'),
+            tamano=self.tamano_pagina,
+        )
+        kwargs['object_list'] = self.pagina.elementos
+        data = super().get_context_data(**kwargs)
+        data['pagina'] = self.pagina
+        data['es_primera_pagina'] = not self.request.GET.get('cursor')
+        return data
 
-        if user.rol in ['RECEPCIONISTA', 'ADMIN']:
-            return HistoriaClinica.objects.all()
 
-        return HistoriaClinica.objects.none()
+# ---------------------------------------------------------------------------
+# BÚSQUEDA DE TEXTO COMPLETO
+# ---------------------------------------------------------------------------
+RESULTADOS_POR_PAGINA = 20
+
+
+@login_required
+def buscar_historias(request):
+    """
+    Busca en la narrativa clínica (motivo, resumen, síntomas, examen,
+    plan y observaciones) y retorna JSON ordenado por relevancia.
+    Solo incluye historias visibles para el usuario.
+    """
+    consulta = request.GET.get('q', '').strip()
+    try:
+        pagina = max(int(request.GET.get('pagina', 1)), 1)
+    except ValueError:
+        pagina = 1
+
+    coincidencias = obtener_backend().buscar(
+        consulta,
+        historias_visibles(request.user),
+        limite=RESULTADOS_POR_PAGINA + 1,
+        desplazamiento=(pagina - 1) * RESULTADOS_POR_PAGINA,
+    )
+    hay_siguiente = len(coincidencias) > RESULTADOS_POR_PAGINA
+    coincidencias = coincidencias[:RESULTADOS_POR_PAGINA]
+
+    historias = HistoriaClinica.objects.select_related('paciente').only(
+        'id', 'fecha_ingreso', 'paciente', 'paciente__nombre_completo'
+    ).in_bulk([pk for pk, _, _ in coincidencias])
+
+    resultados = []
+    for pk, puntaje, fragmento in coincidencias:
+        historia = historias.get(pk)
+        if historia is None:
+            continue
+        resultados.append({
+            'id': pk,
+            'paciente': historia.paciente.nombre_completo,
+            'fecha_ingreso': historia.fecha_ingreso.isoformat() if historia.fecha_ingreso else None,
+            'fragmento': fragmento,
+            'puntaje': puntaje,
+            'url': reverse('historias:ver_historia', args=[pk]),
+        })
+
+    return JsonResponse({
+        'consulta': consulta,
+        'pagina': pagina,
+        'hay_siguiente': hay_siguiente,
+        'resultados': resultados,
+    })
 
 
 # ---------------------------------------------------------------------------
-# CREAR HISTORIA - SOLO MÉDICO
+# LÍNEA DE TIEMPO (JSON)
 # ---------------------------------------------------------------------------
-class HistoriaClinicaCreateView(LoginRequiredMixin, CreateView):
-    model = HistoriaClinica
-    form_class = HistoriaClinicaForm
-    template_name = 'historias/editar_hce.html'
-    success_url = reverse_lazy('historias:listar_historias')
+TAMANO_LINEA_TIEMPO = 50
+
+
+def _respuesta_linea_tiempo(request, historia_ids):
+    try:
+        tamano = min(max(int(request.GET.get('tamano', TAMANO_LINEA_TIEMPO)), 1), 200)
+    except ValueError:
+        tamano = TAMANO_LINEA_TIEMPO
+
+    pagina = linea_tiempo(historia_ids, cursor=request.GET.get('cursor'), tamano=tamano)
+    return JsonResponse({
+        'eventos': [
+            {
+                'tipo': evento.tipo,
+                'id': evento.id,
+                'historia': evento.historia_id,
+                'momento': evento.momento.isoformat(),
+                'resumen': evento.resumen,
+            }
+            for evento in pagina
+        ],
+        'siguiente_cursor': pagina.siguiente_cursor,
+    })
+
+
+@login_required
+def linea_tiempo_historia(request, pk):
+    """Eventos de una historia clínica, paginados por cursor."""
+    historia = obtener_historia(request, pk)
+    if not puede_ver_historia(request.user, historia):
+        return HttpResponseForbidden("No tienes permisos para ver esta historia clínica.")
+    return _respuesta_linea_tiempo(request, [historia.pk])
+
+
+@login_required
+def linea_tiempo_paciente(request, paciente_id):
+    """Eventos de todas las historias visibles de un paciente."""
+    historia_ids = list(historias_de_paciente(request.user, paciente_id))
+    return _respuesta_linea_tiempo(request, historia_ids)
 
-    def dispatch(self, request, *args, **kwargs):
-        if request.user.rol != 'MEDICO':
-            return HttpResponseForbidden("Solo un médico puede crear historias clínicas.")
-        return super().dispatch(request, *args, **kwargs)
+
+def historias_de_paciente(usuario, paciente_id):
+    """Ids de las historias de un paciente visibles para el usuario."""
+    return historias_visibles(usuario).filter(paciente_id=paciente_id).values_list('pk', flat=True)
+
+
+# ---------------------------------------------------------------------------
+# FORMULARIO + FORMSETS: construcción única y guardado atómico en lote
+# ---------------------------------------------------------------------------
+class HistoriaFormsetsMixin:
+    """
+    Construye y valida una sola vez por petición los cuatro formsets
+    de la historia, y guarda padre e hijos en una única transacción
+    con operaciones en lote (ver historias/utils.py).
+    """
+    formsets_historia = (
+        ('diag_formset', DiagnosticoFormSet),
+        ('med_formset', MedicamentoFormSet),
+        ('obs_formset', ObservacionFormSet),
+        ('adj_formset', HistoriaAdjuntoFormSet),
+    )
+    mensaje_exito = "✅ Historia clínica guardada correctamente."
+    mensaje_error = "⚠ Revisa los datos ingresados."
 
     def get_form_kwargs(self):
         kwargs = super().get_form_kwargs()
         kwargs['user'] = self.request.user
         return kwargs
 
+    def get_formsets(self):
+        if not hasattr(self, '_formsets'):
+            argumentos = (self.request.POST, self.request.FILES) if self.request.method == 'POST' else ()
+            self._formsets = {
+                nombre: clase(*argumentos, instance=self.object)
+                for nombre, clase in self.formsets_historia
+            }
+        return self._formsets
+
     def get_context_data(self, **kwargs):
         data = super().get_context_data(**kwargs)
-
-        if self.request.POST:
-            data['diag_formset'] = DiagnosticoFormSet(self.request.POST)
-            data['med_formset'] = MedicamentoFormSet(self.request.POST)
-            data['obs_formset'] = ObservacionFormSet(self.request.POST)
-            data['adj_formset'] = HistoriaAdjuntoFormSet(self.request.POST, self.request.FILES)
-        else:
-            data['diag_formset'] = DiagnosticoFormSet()
-            data['med_formset'] = MedicamentoFormSet()
-            data['obs_formset'] = ObservacionFormSet()
-            data['adj_formset'] = HistoriaAdjuntoFormSet()
-
+        data.update(self.get_formsets())
         return data
 
     def form_valid(self, form):
-        context = self.get_context_data()
-        diag_formset = context['diag_formset']
-        med_formset = context['med_formset']
-        obs_formset = context['obs_formset']
-        adj_formset = context['adj_formset']
-
-        if not (diag_formset.is_valid() and med_formset.is_valid() and obs_formset.is_valid() and adj_formset.is_valid()):
-            messages.error(self.request, "⚠ Revisa los datos. Algunos campos no son válidos.")
+        formsets = self.get_formsets()
+
+        # Se validan todos para mostrar los errores de cada sección
+        if not all([formset.is_valid() for formset in formsets.values()]):
+            messages.error(self.request, self.mensaje_error)
             return self.form_invalid(form)
 
-        self.object = form.save()
+        with transaction.atomic():
+            self.object = form.save()
+            for formset in formsets.values():
+                guardar_formset_en_lote(formset, self.object)
+
+        messages.success(self.request, self.mensaje_exito)
+        return HttpResponseRedirect(self.get_success_url())
 
-        diag_formset.instance = self.object
-        med_formset.instance = self.object
-        obs_formset.instance = self.object
-        adj_formset.instance = self.object
 
-        diag_formset.save()
-        med_formset.save()
-        obs_formset.save()
-        adj_formset.save()
+# ---------------------------------------------------------------------------
+# CREAR HISTORIA - SOLO MÉDICO
+# ---------------------------------------------------------------------------
+class HistoriaClinicaCreateView(LoginRequiredMixin, HistoriaFormsetsMixin, CreateView):
+    model = HistoriaClinica
+    form_class = HistoriaClinicaForm
+    template_name = 'historias/editar_hce.html'
+    success_url = reverse_lazy('historias:listar_historias')
+    mensaje_exito = "✅ Historia clínica creada correctamente."
+    mensaje_error = "⚠ Revisa los datos. Algunos campos no son válidos."
 
-        messages.success(self.request, "✅ Historia clínica creada correctamente.")
-        return super().form_valid(form)
+    def dispatch(self, request, *args, **kwargs):
+        if request.user.rol != 'MEDICO':
+            return HttpResponseForbidden("Solo un médico puede crear historias clínicas.")
+        return super().dispatch(request, *args, **kwargs)
 
 
 # ---------------------------------------------------------------------------
 # EDITAR HISTORIA - SOLO MÉDICO PROPIETARIO
 # ---------------------------------------------------------------------------
-class HistoriaClinicaUpdateView(LoginRequiredMixin, UpdateView):
+class HistoriaClinicaUpdateView(LoginRequiredMixin, HistoriaIdentidadMixin, HistoriaFormsetsMixin, UpdateView):
     model = HistoriaClinica
     form_class = HistoriaClinicaForm
     template_name = 'historias/editar_hce.html'
     success_url = reverse_lazy('historias:listar_historias')
+    mensaje_exito = "✅ Historia clínica actualizada correctamente."
+    mensaje_error = "⚠ Revisa los datos ingresados."
 
     def dispatch(self, request, *args, **kwargs):
         historia = self.get_object()
@@ -130,58 +289,11 @@ class HistoriaClinicaUpdateView(LoginRequiredMixin, UpdateView):
 
         return super().dispatch(request, *args, **kwargs)
 
-    def get_form_kwargs(self):
-        kwargs = super().get_form_kwargs()
-        kwargs['user'] = self.request.user
-        return kwargs
-
-    def get_context_data(self, **kwargs):
-        data = super().get_context_data(**kwargs)
-
-        if self.request.POST:
-            data['diag_formset'] = DiagnosticoFormSet(self.request.POST, instance=self.object)
-            data['med_formset'] = MedicamentoFormSet(self.request.POST, instance=self.object)
-            data['obs_formset'] = ObservacionFormSet(self.request.POST, instance=self.object)
-            data['adj_formset'] = HistoriaAdjuntoFormSet(self.request.POST, self.request.FILES, instance=self.object)
-        else:
-            data['diag_formset'] = DiagnosticoFormSet(instance=self.object)
-            data['med_formset'] = MedicamentoFormSet(instance=self.object)
-            data['obs_formset'] = ObservacionFormSet(instance=self.object)
-            data['adj_formset'] = HistoriaAdjuntoFormSet(instance=self.object)
-
-        return data
-
-    def form_valid(self, form):
-        context = self.get_context_data()
-        diag_formset = context['diag_formset']
-        med_formset = context['med_formset']
-        obs_formset = context['obs_formset']
-        adj_formset = context['adj_formset']
-
-        if not (diag_formset.is_valid() and med_formset.is_valid() and obs_formset.is_valid() and adj_formset.is_valid()):
-            messages.error(self.request, "⚠ Revisa los datos ingresados.")
-            return self.form_invalid(form)
-
-        self.object = form.save()
-
-        diag_formset.instance = self.object
-        med_formset.instance = self.object
-        obs_formset.instance = self.object
-        adj_formset.instance = self.object
-
-        diag_formset.save()
-        med_formset.save()
-        obs_formset.save()
-        adj_formset.save()
-
-        messages.success(self.request, "✅ Historia clínica actualizada correctamente.")
-        return super().form_valid(form)
-
 
 # ---------------------------------------------------------------------------
 # DETALLE
 # ---------------------------------------------------------------------------
-class HistoriaClinicaDetailView(LoginRequiredMixin, DetailView):
+class HistoriaClinicaDetailView(LoginRequiredMixin, HistoriaIdentidadMixin, DetailView):
     model = HistoriaClinica
     template_name = 'historias/historia_detail.html'
     context_object_name = 'historia'
@@ -201,25 +313,18 @@ class HistoriaClinicaDetailView(LoginRequiredMixin, DetailView):
 class HistoriaClinicaDeleteView(LoginRequiredMixin, View):
 
     def post(self, request, *args, **kwargs):
-        historia = HistoriaClinica.objects.get(pk=kwargs['pk'])
+        historia = obtener_historia(request, kwargs['pk'])
 
         if not puede_eliminar_historia(request.user):
             return HttpResponseForbidden("No tienes permiso para eliminar historias clínicas.")
 
-        tiene_diag = historia.diagnosticos_rel.exists()
-        tiene_med = historia.medicamentos_rel.exists()
-        tiene_obs = historia.observaciones.exists()
-        tiene_citas = historia.citas.exists()
-        tiene_adj = historia.adjuntos.exists()
-
-        if any([tiene_diag, tiene_med, tiene_obs, tiene_citas, tiene_adj]):
-            messages.error(
-                request,
-                "❌ No se puede eliminar la Historia Clínica porque tiene datos asociados."
-            )
+        # delete() verifica las dependencias y explica cuáles impiden eliminar
+        try:
+            historia.delete()
+        except ValidationError as error:
+            messages.error(request, "❌ " + " ".join(error.messages))
             return redirect('historias:ver_historia', pk=historia.pk)
 
-        historia.delete()
         messages.success(request, "🗑 Historia clínica eliminada correctamente.")
         return redirect('historias:listar_historias')
 
@@ -227,4 +332,12 @@ class HistoriaClinicaDeleteView(LoginRequiredMixin, View):
 # =============================================================================
 # CONTROL DE CAMBIOS
 # 4.0 | 05/12/2025 | PS Projects | Reescritura completa de permisos + arquitectura centralizada
+# 4.1 | 17/10/2026 | PS Projects | Listado paginado por cursor con proyección de columnas
+# 4.2 | 17/10/2026 | PS Projects | Formsets construidos una vez y guardado atómico en lote
+# 4.3 | 17/10/2026 | PS Projects | Mapa de identidad por petición para permisos y get_object
+# 4.4 | 17/10/2026 | PS Projects | Verificación de dependencias en una sola consulta
+# 4.5 | 17/10/2026 | PS Projects | Búsqueda de texto completo en la narrativa clínica
+# 4.6 | 17/10/2026 | PS Projects | Línea de tiempo por historia y por paciente
+# 4.7 | 17/10/2026 | PS Projects | Consultas del listado compartidas con planes_consulta
+# 4.8 | 17/10/2026 | PS Projects | Eliminación con una sola verificación de dependencias
 # =============================================================================
@@ -0,0 +1,157 @@
+# =============================================================
+# Proyecto: SOFT-MEDIC
+# Archivo: historias/views_agenda.py
+# Versión: 1.0
+# Fecha: 17/10/2026
+# Elaborado por: Prixma Software Projects
+# Revisado por: Dirección Técnica SOFT-MEDIC
+#
+# Descripción:
+# Agenda diaria y semanal por médico y reserva de citas con
+# detección de cruces (ver historias/agenda.py). Cada vista de
+# calendario es una sola consulta por rango sobre el índice
+# (medico, fecha).
+# =============================================================
+
+from datetime import datetime, time, timedelta
+from itertools import groupby
+from urllib.parse import urlencode
+
+from django.contrib import messages
+from django.contrib.auth.decorators import login_required
+from django.core.exceptions import ValidationError
+from django.http import HttpResponseForbidden, JsonResponse
+from django.shortcuts import render, redirect
+from django.urls import reverse
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
+
+from users.directorio import medicos as directorio_medicos
+from .agenda import citas_en_rango, agendar_cita
+from .disponibilidad import buscar_huecos
+from .decorators import rol_requerido
+from .forms import CitaForm
+from .identidad import obtener_historia
+from .permisos import puede_ver_historia
+
+ROLES_AGENDA = ["ADMIN", "MEDICO", "RECEPCIONISTA"]
+
+
+def _rango_agenda(vista, dia):
+    """Inicio y fin (con zona horaria) del día o de la semana de `dia`."""
+    if vista == 'semana':
+        dia = dia - timedelta(days=dia.weekday())
+        dias = 7
+    else:
+        dias = 1
+    desde = timezone.make_aware(datetime.combine(dia, time.min))
+    return desde, desde + timedelta(days=dias)
+
+
+def consulta_agenda(medico_id, desde, hasta):
+    """Citas del médico en [desde, hasta) con lo que pinta la agenda."""
+    return (
+        citas_en_rango(medico_id, desde, hasta)
+        .select_related('historia__paciente')
+        .only('id', 'fecha', 'fin', 'motivo', 'estado', 'historia', 'historia__paciente__nombre_completo')
+    )
+
+
+@login_required
+@rol_requerido(ROLES_AGENDA)
+def agenda_medico(request):
+    """
+    Agenda de un médico por día (?vista=dia) o semana (?vista=semana).
+    El médico ve la suya; administración y recepción eligen ?medico=.
+    """
+    vista = 'semana' if request.GET.get('vista') == 'semana' else 'dia'
+    dia = parse_date(request.GET.get('fecha', '') or '') or timezone.localdate()
+
+    if request.user.rol == 'MEDICO':
+        medico_id = request.user.pk
+    else:
+        try:
+            medico_id = int(request.GET.get('medico', ''))
+        except ValueError:
+            medico_id = None
+
+    desde, hasta = _rango_agenda(vista, dia)
+    citas = []
+    if medico_id:
+        citas = list(consulta_agenda(medico_id, desde, hasta))
+
+    dias = [
+        (fecha, list(grupo))
+        for fecha, grupo in groupby(citas, key=lambda cita: timezone.localtime(cita.fecha).date())
+    ]
+    paso = timedelta(days=7 if vista == 'semana' else 1)
+
+    return render(request, 'historias/agenda.html', {
+        'vista': vista,
+        'desde': desde,
+        'hasta': hasta - timedelta(days=1),
+        'anterior': (desde - paso).date(),
+        'siguiente': (desde + paso).date(),
+        'dias': dias,
+        'medico_id': medico_id,
+        'medicos': directorio_medicos() if request.user.rol != 'MEDICO' else [],
+    })
+
+
+@login_required
+@rol_requerido(ROLES_AGENDA)
+def agendar_cita_historia(request, pk):
+    """Reserva una cita para la historia indicada."""
+    historia = obtener_historia(request, pk)
+    if not puede_ver_historia(request.user, historia):
+        return HttpResponseForbidden("No tienes permisos para agendar citas en esta historia clínica.")
+
+    form = CitaForm(request.POST or None, historia=historia)
+    if request.method == 'POST' and form.is_valid():
+        datos = form.cleaned_data
+        try:
+            cita = agendar_cita(historia, datos['medico'], datos['fecha'], datos['fin'], datos['motivo'])
+        except ValidationError as error:
+            form.add_error(None, error)
+        else:
+            messages.success(request, f"Cita agendada para el {timezone.localtime(cita.fecha):%d/%m/%Y %H:%M}.")
+            consulta = urlencode({'medico': cita.medico_id, 'fecha': timezone.localtime(cita.fecha).date()})
+            return redirect(f"{reverse('historias:agenda_medico')}?{consulta}")
+
+    return render(request, 'historias/agendar_cita.html', {'form': form, 'historia': historia})
+
+
+@login_required
+@rol_requerido(ROLES_AGENDA)
+def huecos_disponibles(request):
+    """
+    Próximos horarios libres (JSON) entre los médicos de ?medicos=1,2,...
+    (por defecto todos), desde ?desde= (ISO) y de ?duracion= minutos.
+    """
+    try:
+        medico_ids = [int(valor) for valor in request.GET.get('medicos', '').split(',') if valor.strip()]
+        cantidad = min(max(int(request.GET.get('cantidad', 10)), 1), 100)
+        duracion = timedelta(minutes=int(request.GET.get('duracion', 0))) or None
+    except ValueError:
+        return JsonResponse({'error': "Parámetros inválidos."}, status=400)
+
+    desde = parse_datetime(request.GET.get('desde', '') or '')
+    if desde is not None and timezone.is_naive(desde):
+        desde = timezone.make_aware(desde)
+    desde = max(desde or timezone.now(), timezone.now())
+
+    nombres = {medico.id: medico.nombre for medico in directorio_medicos()}
+    if not medico_ids:
+        medico_ids = list(nombres)
+
+    huecos = buscar_huecos(medico_ids, desde=desde, cantidad=cantidad, duracion=duracion)
+    return JsonResponse({
+        'huecos': [
+            {
+                'inicio': timezone.localtime(inicio).isoformat(),
+                'medico': medico_id,
+                'medico_nombre': nombres.get(medico_id, ''),
+            }
+            for inicio, medico_id in huecos
+        ]
+    })
@@ -1,8 +1,8 @@
 # =============================================================
 # Proyecto: SOFT-MEDIC
 # Archivo: historias/views_reportes.py
-# Versión: 1.0
-# Fecha: 07/12/2025
+# Versión: 1.2
+# Fecha: 17/10/2026
 # Elaborado por: Prixma Software Projects
 # Revisado por: Dirección Técnica SOFT-MEDIC
 #
@@ -10,11 +10,24 @@
 # Exporta un reporte CSV de pacientes atendidos usando los campos
 # reales del modelo HistoriaClinica. Corregido: 'fecha_creacion'
 # no existe — ahora se usa 'created_at'.
+#
+# El reporte se transmite por bloques desde un iterador del lado
+# del servidor sobre una proyección reducida de columnas, de modo
+# que la memoria usada no depende del número de filas (ver
+# historias/reportes.py).
 # =============================================================
 
-from django.http import HttpResponse
-from .models import HistoriaClinica
-import csv
+from django.http import StreamingHttpResponse, JsonResponse, FileResponse, Http404, HttpResponseForbidden
+from django.contrib.auth.decorators import login_required
+from django.shortcuts import get_object_or_404
+from django.urls import reverse
+from django.views.decorators.http import require_POST
+from .decorators import medico_o_admin
+from .forms import SolicitudExportacionForm
+from .exportaciones import encolar_exportacion
+from .models import TrabajoExportacion
+from .reportes import filas_pacientes_atendidos, csv_por_bloques
+import os
 from datetime import datetime
 
 
@@ -27,52 +40,85 @@ def reporte_pacientes_atendidos_csv(request):
     fecha_str = datetime.now().strftime("%Y%m%d-%H%M%S")
     filename = f"reporte_pacientes_atendidos_{fecha_str}.csv"
 
-    # Respuesta HTTP tipo archivo CSV
-    response = HttpResponse(content_type='text/csv')
+    # Respuesta HTTP transmitida: el encabezado sale de inmediato
+    response = StreamingHttpResponse(
+        csv_por_bloques(filas_pacientes_atendidos()),
+        content_type='text/csv'
+    )
     response['Content-Disposition'] = f'attachment; filename="{filename}"'
+    return response
 
-    writer = csv.writer(response)
-
-    # Encabezado del CSV
-    writer.writerow([
-        "ID Historia",
-        "Paciente",
-        "Documento",
-        "Sexo",
-        "Médico Responsable",
-        "Fecha Atención",
-        "Motivo Consulta",
-        "Diagnósticos"
-    ])
-
-    # Consulta optimizada
-    historias = HistoriaClinica.objects.select_related(
-        "paciente",
-        "medico_responsable"
-    ).all()
-
-    # Filas del archivo
-    for h in historias:
-
-        # Diagnósticos desde JSONField → lista de descripciones
-        diag_list = []
-        if isinstance(h.diagnosticos, list):
-            for d in h.diagnosticos:
-                diag_list.append(d.get("descripcion", ""))
-        diagnosticos_text = ", ".join(diag_list)
-
-        writer.writerow([
-            h.id,
-            h.paciente.nombre_completo if hasattr(h.paciente, "nombre_completo") else str(h.paciente),
-            getattr(h.paciente, "documento", ""),
-            getattr(h.paciente, "sexo", ""),
-            h.medico_responsable.nombre if hasattr(h.medico_responsable, "nombre") else h.medico_responsable.get_full_name(),
-            h.created_at.strftime("%Y-%m-%d %H:%M"),
-            h.motivo_consulta or "",
-            diagnosticos_text
-        ])
 
-    return response
+# =============================================================
+# EXPORTACIONES EN SEGUNDO PLANO
+# =============================================================
+def _puede_consultar_exportacion(user, trabajo):
+    if user.rol == 'ADMIN' or trabajo.solicitado_por_id == user.id:
+        return True
+    return user.rol == 'MEDICO' and trabajo.parametros.get('medico') == user.id
+
+
+def _estado_exportacion_json(trabajo):
+    return {
+        'id': trabajo.id,
+        'estado': trabajo.estado,
+        'progreso': trabajo.progreso,
+        'filas_procesadas': trabajo.filas_procesadas,
+        'total_filas': trabajo.total_filas,
+        'error': trabajo.mensaje_error or None,
+        'url_estado': reverse('historias:estado_exportacion', args=[trabajo.id]),
+        'url_descarga': (
+            reverse('historias:descargar_exportacion', args=[trabajo.id])
+            if trabajo.estado == TrabajoExportacion.COMPLETADO else None
+        ),
+    }
+
+
+@login_required
+@require_POST
+@medico_o_admin
+def solicitar_exportacion(request):
+    """
+    Encola la exportación de pacientes atendidos con los filtros
+    recibidos (fecha_desde, fecha_hasta, medico, eps).
+    Un médico solo puede exportar sus propias historias.
+    """
+    form = SolicitudExportacionForm(request.POST)
+    if not form.is_valid():
+        return JsonResponse({'errores': form.errors}, status=400)
+
+    parametros = form.parametros()
+    if request.user.rol == 'MEDICO':
+        parametros['medico'] = request.user.id
+
+    trabajo = encolar_exportacion(parametros, usuario=request.user)
+    return JsonResponse(_estado_exportacion_json(trabajo), status=202)
+
+
+@login_required
+@medico_o_admin
+def estado_exportacion(request, pk):
+    """Progreso del trabajo para consulta periódica desde el cliente."""
+    trabajo = get_object_or_404(TrabajoExportacion, pk=pk)
+    if not _puede_consultar_exportacion(request.user, trabajo):
+        return HttpResponseForbidden("No tienes permiso para consultar esta exportación.")
+    return JsonResponse(_estado_exportacion_json(trabajo))
+
+
+@login_required
+@medico_o_admin
+def descargar_exportacion(request, pk):
+    """Entrega el archivo de un trabajo COMPLETADO."""
+    trabajo = get_object_or_404(TrabajoExportacion, pk=pk)
+    if not _puede_consultar_exportacion(request.user, trabajo):
+        return HttpResponseForbidden("No tienes permiso para descargar esta exportación.")
+    if trabajo.estado != TrabajoExportacion.COMPLETADO or not trabajo.archivo:
+        raise Http404("La exportación aún no está disponible.")
+    try:
+        archivo = trabajo.archivo.open('rb')
+    except FileNotFoundError:
+        raise Http404("El archivo de la exportación ya no existe.")
+    return FileResponse(archivo, as_attachment=True, filename=os.path.basename(trabajo.archivo.name))
 
 
 # =============================================================
@@ -80,4 +126,6 @@ def reporte_pacientes_atendidos_csv(request):
 # -------------------------------------------------------------
 # Versión | Fecha       | Responsable                  | Descripción
 # 1.0     | 07/12/2025  | Prixma Software Projects      | Versión inicial del reporte CSV
+# 1.1     | 17/10/2026  | Prixma Software Projects      | Reporte transmitido por bloques con proyección de columnas
+# 1.2     | 17/10/2026  | Prixma Software Projects      | Exportaciones en segundo plano con progreso y descarga
 # =============================================================
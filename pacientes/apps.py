@@ -4,3 +4,10 @@ from django.apps import AppConfig
 class PacientesConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'pacientes'
+
+    def ready(self):
+        """
+        Carga las señales que mantienen la clave de búsqueda
+        normalizada del nombre del paciente.
+        """
+        import pacientes.signals
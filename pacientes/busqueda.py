@@ -0,0 +1,109 @@
+# -------------------------------------------------------------------
+# Proyecto: SOFT-MEDIC
+# Archivo: softmedic/pacientes/busqueda.py
+# Versión: 1.0
+# Fecha: 17/10/2026
+# Elaborado por: Prixma Software Projects
+# Revisado por: Dirección Técnica de SOFT-MEDIC
+# -------------------------------------------------------------------
+# Descripción: Búsqueda de pacientes por nombre, insensible a tildes
+# y mayúsculas. Cada palabra del nombre se guarda normalizada en
+# PacienteToken; una búsqueda es una intersección de rangos de
+# prefijo sobre el índice (token, paciente).
+# -------------------------------------------------------------------
+
+import re
+import unicodedata
+
+from django.db.models import Count, Q
+
+from .models import Paciente, PacienteToken
+
+LONGITUD_TOKEN = 64
+
+# Límite superior del rango de prefijo: token >= p AND token < p + FIN_PREFIJO
+FIN_PREFIJO = '\uffff'
+
+_PALABRA = re.compile(r'\w+', re.UNICODE)
+
+
+def normalizar(texto):
+    """Minúsculas y sin diacríticos: 'Pérez' -> 'perez'."""
+    descompuesto = unicodedata.normalize('NFKD', texto or '')
+    return ''.join(c for c in descompuesto if not unicodedata.combining(c)).lower()
+
+
+def tokenizar(texto):
+    """Palabras normalizadas y únicas, en el orden en que aparecen."""
+    vistos = []
+    for palabra in _PALABRA.findall(normalizar(texto)):
+        palabra = palabra[:LONGITUD_TOKEN]
+        if palabra not in vistos:
+            vistos.append(palabra)
+    return vistos
+
+
+def sincronizar_tokens(paciente):
+    """Actualiza los tokens del paciente aplicando solo la diferencia."""
+    nuevos = set(tokenizar(paciente.nombre_completo))
+    actuales = set(
+        PacienteToken.objects.filter(paciente_id=paciente.pk).values_list('token', flat=True)
+    )
+    if actuales - nuevos:
+        PacienteToken.objects.filter(paciente_id=paciente.pk, token__in=actuales - nuevos).delete()
+    if nuevos - actuales:
+        PacienteToken.objects.bulk_create(
+            [PacienteToken(paciente_id=paciente.pk, token=t) for t in nuevos - actuales]
+        )
+
+
+def sincronizar_tokens_en_lote(pacientes, lote=1000):
+    """
+    Regenera los tokens de varios pacientes (cargas masivas, donde
+    bulk_create no emite post_save).
+    """
+    pacientes = list(pacientes)
+    PacienteToken.objects.filter(paciente_id__in=[p.pk for p in pacientes]).delete()
+    PacienteToken.objects.bulk_create(
+        [
+            PacienteToken(paciente_id=p.pk, token=t)
+            for p in pacientes
+            for t in tokenizar(p.nombre_completo)
+        ],
+        batch_size=lote,
+    )
+
+
+def _rango_prefijo(prefijo):
+    return Q(token__gte=prefijo, token__lt=prefijo + FIN_PREFIJO)
+
+
+def buscar(consulta, queryset=None):
+    """
+    Pacientes cuyo nombre contiene una palabra que empieza por cada
+    término de la consulta. Se ordenan por número de términos que
+    coinciden con una palabra completa y luego por nombre.
+    """
+    if queryset is None:
+        queryset = Paciente.objects.all()
+
+    terminos = tokenizar(consulta)
+    if not terminos:
+        return queryset.none()
+
+    # El término más largo suele ser el más selectivo: abre la intersección
+    terminos_orden = sorted(terminos, key=len, reverse=True)
+    candidatos = PacienteToken.objects.filter(_rango_prefijo(terminos_orden[0]))
+    for termino in terminos_orden[1:]:
+        candidatos = candidatos.filter(
+            paciente_id__in=PacienteToken.objects.filter(_rango_prefijo(termino)).values('paciente_id')
+        )
+
+    return (
+        queryset
+        .filter(pk__in=candidatos.values('paciente_id'))
+        .annotate(coincidencias_exactas=Count(
+            'tokens_busqueda', filter=Q(tokens_busqueda__token__in=terminos)
+        ))
+        .order_by('-coincidencias_exactas', 'nombre_completo', 'pk')
+    )
@@ -0,0 +1,234 @@
+# -------------------------------------------------------------------
+# Proyecto: SOFT-MEDIC
+# Archivo: softmedic/pacientes/conciliacion.py
+# Versión: 1.0
+# Fecha: 17/10/2026
+# Elaborado por: Prixma Software Projects
+# Revisado por: Dirección Técnica de SOFT-MEDIC
+# -------------------------------------------------------------------
+# Descripción: Conciliación de los archivos de afiliación de las EPS
+# contra la tabla de pacientes.
+#
+#   1. El archivo se ordena por identificación con un ordenamiento
+#      externo: tramos de BLOQUE_ORDEN filas ordenados en memoria y
+#      guardados en archivos temporales, luego mezclados con heapq.merge.
+#   2. Los pacientes se leen en el mismo orden por páginas de clave
+#      (identificacion > última), apoyadas en su índice único.
+#   3. Un recorrido de mezcla compara la huella (hash) de eps/contacto
+#      de cada par y solo los cambios reales se escriben, con
+#      bulk_update por lotes.
+#
+# La memoria queda acotada por BLOQUE_ORDEN y el tamaño de página, sin
+# importar el tamaño del archivo ni de la tabla.
+# -------------------------------------------------------------------
+
+import csv
+import hashlib
+import heapq
+import os
+import tempfile
+import time
+from collections import namedtuple
+from itertools import islice
+
+from django.db import connection, transaction
+from django.db.models import F
+from django.db.models.functions import Collate
+from django.utils import timezone
+
+from .models import EPS, Paciente
+
+BLOQUE_ORDEN = 200000
+PAGINA_PACIENTES = 5000
+LOTE_ACTUALIZACION = 1000
+LONGITUD_CONTACTO = Paciente._meta.get_field('contacto').max_length
+
+# Fila del archivo ya normalizada; `linea` desempata repetidos (gana la última)
+Afiliacion = namedtuple('Afiliacion', ['identificacion', 'linea', 'eps_id', 'contacto'])
+Resumen = namedtuple(
+    'Resumen',
+    ['leidas', 'rechazadas', 'actualizados', 'sin_cambios', 'no_encontrados', 'desafiliados', 'segundos'],
+)
+
+
+def huella(eps_id, contacto):
+    """Hash del contenido conciliable de una fila."""
+    return hashlib.blake2b(f"{eps_id or ''}\x1f{contacto or ''}".encode('utf-8'), digest_size=16).digest()
+
+
+# ------------------------------------------------------------
+# Lado del archivo: normalización y ordenamiento externo
+# ------------------------------------------------------------
+
+class _LectorAfiliaciones:
+    """Afiliaciones válidas del CSV en el orden del archivo; cuenta leídas y rechazadas."""
+
+    def __init__(self, lector, mapa_eps, eps_por_defecto):
+        self.lector, self.mapa_eps, self.eps_por_defecto = lector, mapa_eps, eps_por_defecto
+        self.leidas = self.rechazadas = 0
+
+    def __iter__(self):
+        for fila in self.lector:
+            self.leidas += 1
+            identificacion = (fila.get('identificacion') or '').strip()
+            codigo = (fila.get('eps') or '').strip().upper()
+            eps_id = self.mapa_eps.get(codigo) if codigo else self.eps_por_defecto
+            contacto = (fila.get('contacto') or '').strip() or None
+            if not identificacion or eps_id is None or len(contacto or '') > LONGITUD_CONTACTO:
+                self.rechazadas += 1
+                continue
+            yield Afiliacion(identificacion, self.lector.line_num, eps_id, contacto)
+
+
+def _leer_tramo(ruta):
+    with open(ruta, newline='', encoding='utf-8') as archivo:
+        for identificacion, linea, eps_id, contacto in csv.reader(archivo):
+            yield Afiliacion(identificacion, int(linea), int(eps_id), contacto or None)
+
+
+def ordenar_externo(afiliaciones, directorio, bloque=BLOQUE_ORDEN):
+    """Afiliaciones ordenadas por (identificacion, linea) con memoria acotada por `bloque`."""
+    afiliaciones = iter(afiliaciones)
+    rutas = []
+    while True:
+        tramo = sorted(islice(afiliaciones, bloque))
+        if len(tramo) < bloque and not rutas:
+            return iter(tramo)  # El archivo cabe en un solo tramo
+        if not tramo:
+            break
+        ruta = os.path.join(directorio, f"tramo_{len(rutas)}.csv")
+        with open(ruta, 'w', newline='', encoding='utf-8') as archivo:
+            csv.writer(archivo).writerows((a.identificacion, a.linea, a.eps_id, a.contacto or '') for a in tramo)
+        rutas.append(ruta)
+        if len(tramo) < bloque:
+            break
+    return heapq.merge(*[_leer_tramo(ruta) for ruta in rutas])
+
+
+def _sin_repetidos(ordenadas):
+    """Conserva la última fila de cada identificación (la de mayor línea)."""
+    anterior = None
+    for afiliacion in ordenadas:
+        if anterior is not None and afiliacion.identificacion != anterior.identificacion:
+            yield anterior
+        anterior = afiliacion
+    if anterior is not None:
+        yield anterior
+
+
+# ------------------------------------------------------------
+# Lado de la base de datos: pacientes en orden de identificación
+# ------------------------------------------------------------
+
+def _clave_identificacion():
+    # PostgreSQL ordena según la collation de la base; "C" coincide con el orden de Python
+    if connection.vendor == 'postgresql':
+        return Collate(F('identificacion'), 'C')
+    return F('identificacion')
+
+
+def pacientes_ordenados(pagina=PAGINA_PACIENTES):
+    """(pk, identificacion, eps_id, contacto) de todos los pacientes, paginando por clave."""
+    consulta = Paciente.objects.annotate(clave=_clave_identificacion()).order_by('clave')
+    ultima = None
+    while True:
+        filas = consulta if ultima is None else consulta.filter(clave__gt=ultima)
+        filas = list(filas.values_list('pk', 'identificacion', 'eps_id', 'contacto')[:pagina])
+        yield from filas
+        if len(filas) < pagina:
+            return
+        ultima = filas[-1][1]
+
+
+# ------------------------------------------------------------
+# Conciliación
+# ------------------------------------------------------------
+
+class _Actualizaciones:
+    """Acumula los cambios y los escribe con bulk_update por lotes."""
+
+    def __init__(self, lote, simular):
+        self.lote, self.simular = lote, simular
+        self.pendientes = []
+        self.total = 0
+
+    def agregar(self, pk, eps_id, contacto):
+        self.total += 1
+        if self.simular:
+            return
+        self.pendientes.append(Paciente(pk=pk, eps_id=eps_id, contacto=contacto, updated_at=timezone.now()))
+        if len(self.pendientes) >= self.lote:
+            self.escribir()
+
+    def escribir(self):
+        if self.pendientes:
+            with transaction.atomic():
+                Paciente.objects.bulk_update(self.pendientes, ['eps', 'contacto', 'updated_at'])
+            self.pendientes = []
+
+
+def conciliar(archivo, eps=None, desafiliar=False, simular=False, no_encontrados=None,
+              bloque_orden=BLOQUE_ORDEN, lote=LOTE_ACTUALIZACION):
+    """
+    Concilia el CSV `archivo` (columnas identificacion, eps, contacto)
+    con los pacientes.
+
+      - eps: EPS del archivo; se usa cuando la fila no trae código.
+      - desafiliar: los pacientes de `eps` que no están en el archivo
+        quedan sin EPS.
+      - simular: solo cuenta los cambios, no escribe.
+      - no_encontrados: archivo de texto donde anotar las
+        identificaciones del archivo que no existen como pacientes.
+
+    Un contacto vacío en el archivo no borra el registrado.
+    """
+    inicio = time.monotonic()
+    mapa_eps = {codigo.upper(): pk for pk, codigo in EPS.objects.values_list('pk', 'codigo')}
+    lector = csv.DictReader(archivo)
+    if 'identificacion' not in (lector.fieldnames or []):
+        raise ValueError("Falta la columna identificacion en el archivo.")
+    if eps is None and 'eps' not in lector.fieldnames:
+        raise ValueError("El archivo no trae la columna eps: indique la EPS del archivo.")
+    if desafiliar and eps is None:
+        raise ValueError("Para desafiliar se debe indicar la EPS del archivo.")
+
+    afiliaciones = _LectorAfiliaciones(lector, mapa_eps, eps.pk if eps else None)
+    actualizaciones = _Actualizaciones(lote, simular)
+    sin_cambios = faltantes = desafiliados = 0
+
+    with tempfile.TemporaryDirectory(prefix='conciliacion_eps_') as directorio:
+        del_archivo = _sin_repetidos(ordenar_externo(afiliaciones, directorio, bloque_orden))
+        de_la_base = pacientes_ordenados()
+        afiliacion, paciente = next(del_archivo, None), next(de_la_base, None)
+
+        while afiliacion is not None or paciente is not None:
+            if paciente is None or (afiliacion is not None and afiliacion.identificacion < paciente[1]):
+                # Identificación del archivo que no es paciente
+                faltantes += 1
+                if no_encontrados is not None:
+                    no_encontrados.write(f"{afiliacion.identificacion}\n")
+                afiliacion = next(del_archivo, None)
+                continue
+
+            pk, identificacion, eps_id, contacto = paciente
+            if afiliacion is None or identificacion < afiliacion.identificacion:
+                # Paciente ausente del archivo
+                if desafiliar and eps_id == eps.pk:
+                    desafiliados += 1
+                    actualizaciones.agregar(pk, None, contacto)
+                paciente = next(de_la_base, None)
+                continue
+
+            nuevo_contacto = afiliacion.contacto or contacto
+            if huella(afiliacion.eps_id, nuevo_contacto) == huella(eps_id, contacto):
+                sin_cambios += 1
+            else:
+                actualizaciones.agregar(pk, afiliacion.eps_id, nuevo_contacto)
+            afiliacion, paciente = next(del_archivo, None), next(de_la_base, None)
+
+        actualizaciones.escribir()
+
+    return Resumen(
+        afiliaciones.leidas, afiliaciones.rechazadas, actualizaciones.total - desafiliados, sin_cambios,
+        faltantes, desafiliados, time.monotonic() - inicio,
+    )
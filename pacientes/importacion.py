@@ -0,0 +1,226 @@
+# -------------------------------------------------------------------
+# Proyecto: SOFT-MEDIC
+# Archivo: softmedic/pacientes/importacion.py
+# Versión: 1.1
+# Fecha: 17/10/2026
+# Elaborado por: Prixma Software Projects
+# Revisado por: Dirección Técnica de SOFT-MEDIC
+# -------------------------------------------------------------------
+# Descripción: Importación masiva de pacientes desde CSV.
+#
+# El archivo se lee en streaming por bloques de filas. Cada bloque se
+# valida en un proceso del pool (formato, longitudes, reglas de edad de
+# validar_fecha_nacimiento y EPS por código contra un mapa en memoria);
+# si una identificación se repite dentro del bloque queda la última
+# fila y las anteriores se rechazan, de modo que leídas = creadas +
+# actualizadas + rechazadas. Las filas válidas se insertan o
+# actualizan por `identificacion` con
+# un único bulk_create(update_conflicts=True) por bloque, dentro de una
+# transacción que también regenera los tokens de búsqueda.
+#
+# Columnas: nombre_completo, identificacion, fecha_nacimiento
+# (AAAA-MM-DD o DD/MM/AAAA), contacto y eps (código de la EPS).
+# -------------------------------------------------------------------
+
+import csv
+import time
+from collections import deque, namedtuple
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date, datetime
+from itertools import islice
+
+from django.core.exceptions import ValidationError
+
+from .validaciones import validar_fecha_nacimiento
+
+COLUMNAS = ('nombre_completo', 'identificacion', 'fecha_nacimiento', 'contacto', 'eps')
+OBLIGATORIAS = ('nombre_completo', 'identificacion', 'fecha_nacimiento')
+LONGITUDES = {'nombre_completo': 150, 'identificacion': 20, 'contacto': 100}
+FORMATOS_FECHA = ('%Y-%m-%d', '%d/%m/%Y')
+CAMPOS_ACTUALIZABLES = ['nombre_completo', 'fecha_nacimiento', 'contacto', 'eps', 'updated_at']
+
+LOTE = 5000
+
+# Fila válida lista para el modelo, y fila rechazada con su motivo
+FilaValida = namedtuple('FilaValida', ['linea', 'nombre_completo', 'identificacion', 'fecha_nacimiento', 'contacto', 'eps_id'])
+FilaRechazada = namedtuple('FilaRechazada', ['linea', 'fila', 'error'])
+Resumen = namedtuple('Resumen', ['leidas', 'creadas', 'actualizadas', 'rechazadas', 'segundos'])
+
+# Estado de cada proceso del pool (ver _inicializar)
+_mapa_eps = {}
+_hoy = None
+
+
+def _inicializar(mapa_eps, hoy):
+    global _mapa_eps, _hoy
+    _mapa_eps, _hoy = mapa_eps, hoy
+
+
+def _fecha(valor):
+    for formato in FORMATOS_FECHA:
+        try:
+            return datetime.strptime(valor, formato).date()
+        except ValueError:
+            continue
+    raise ValidationError(f"Fecha de nacimiento inválida: '{valor}'.")
+
+
+def validar_fila(linea, fila, mapa_eps, hoy):
+    """FilaValida o FilaRechazada de una fila del CSV (sin acceso a la base de datos)."""
+    valores = {columna: (fila.get(columna) or '').strip() for columna in COLUMNAS}
+    try:
+        for columna in OBLIGATORIAS:
+            if not valores[columna]:
+                raise ValidationError(f"Falta {columna}.")
+        for columna, maximo in LONGITUDES.items():
+            if len(valores[columna]) > maximo:
+                raise ValidationError(f"{columna} supera {maximo} caracteres.")
+        fecha = validar_fecha_nacimiento(_fecha(valores['fecha_nacimiento']), hoy)
+        eps_id = None
+        if valores['eps']:
+            eps_id = mapa_eps.get(valores['eps'].upper())
+            if eps_id is None:
+                raise ValidationError(f"EPS desconocida: '{valores['eps']}'.")
+    except ValidationError as error:
+        return FilaRechazada(linea, fila, ' '.join(error.messages))
+    return FilaValida(
+        linea, valores['nombre_completo'], valores['identificacion'], fecha, valores['contacto'] or None, eps_id
+    )
+
+
+def validar_bloque(bloque):
+    """
+    ([FilaValida], [FilaRechazada]) de un bloque [(línea, fila)]; se
+    ejecuta en el pool. Una identificación repetida en el bloque
+    conserva su última fila y rechaza las anteriores.
+    """
+    validas, rechazadas = [], []
+    for linea, fila in bloque:
+        resultado = validar_fila(linea, fila, _mapa_eps, _hoy)
+        (validas if isinstance(resultado, FilaValida) else rechazadas).append(resultado)
+
+    ultima_linea = {fila.identificacion: fila.linea for fila in validas}
+    if len(ultima_linea) < len(validas):
+        originales = dict(bloque)
+        repetidas = [fila for fila in validas if ultima_linea[fila.identificacion] != fila.linea]
+        rechazadas.extend(
+            FilaRechazada(
+                fila.linea, originales[fila.linea],
+                f"Identificación repetida (línea {ultima_linea[fila.identificacion]})."
+            )
+            for fila in repetidas
+        )
+        validas = [fila for fila in validas if ultima_linea[fila.identificacion] == fila.linea]
+        rechazadas.sort(key=lambda rechazo: rechazo.linea)
+    return validas, rechazadas
+
+
+def bloques_csv(archivo, lote=LOTE, delimitador=','):
+    """Bloques [(línea, fila)] del CSV, sin cargar el archivo completo."""
+    lector = csv.DictReader(archivo, delimiter=delimitador)
+    faltantes = [columna for columna in OBLIGATORIAS if columna not in (lector.fieldnames or [])]
+    if faltantes:
+        raise ValueError(f"Faltan columnas en el archivo: {', '.join(faltantes)}.")
+    # La fila 1 es el encabezado
+    filas = ((lector.line_num, fila) for fila in lector)
+    while True:
+        bloque = list(islice(filas, lote))
+        if not bloque:
+            return
+        yield bloque
+
+
+def _validados(bloques, procesos, mapa_eps, hoy):
+    """Resultado de validar_bloque de cada bloque, en el orden del archivo."""
+    if procesos <= 1:
+        _inicializar(mapa_eps, hoy)
+        for bloque in bloques:
+            yield validar_bloque(bloque)
+        return
+
+    # Se mantienen pocos bloques en vuelo para acotar la memoria
+    with ProcessPoolExecutor(max_workers=procesos, initializer=_inicializar, initargs=(mapa_eps, hoy)) as ejecutor:
+        pendientes = deque()
+        for bloque in bloques:
+            pendientes.append(ejecutor.submit(validar_bloque, bloque))
+            if len(pendientes) >= procesos * 2:
+                yield pendientes.popleft().result()
+        while pendientes:
+            yield pendientes.popleft().result()
+
+
+def guardar_bloque(validas):
+    """
+    Inserta o actualiza por identificacion las filas válidas de un bloque.
+    Devuelve (creadas, actualizadas).
+    """
+    from django.db import transaction
+
+    from .busqueda import sincronizar_tokens_en_lote
+    from .models import Paciente
+
+    # validar_bloque ya dejó una sola fila por identificación
+    identificaciones = [fila.identificacion for fila in validas]
+
+    with transaction.atomic():
+        existentes = set(
+            Paciente.objects.filter(identificacion__in=identificaciones).values_list('identificacion', flat=True)
+        )
+        Paciente.objects.bulk_create(
+            [
+                Paciente(
+                    nombre_completo=fila.nombre_completo,
+                    identificacion=fila.identificacion,
+                    fecha_nacimiento=fila.fecha_nacimiento,
+                    contacto=fila.contacto,
+                    eps_id=fila.eps_id,
+                )
+                for fila in validas
+            ],
+            update_conflicts=True,
+            unique_fields=['identificacion'],
+            update_fields=CAMPOS_ACTUALIZABLES,
+        )
+        # bulk_create no emite post_save: los tokens de búsqueda se regeneran aquí
+        sincronizar_tokens_en_lote(
+            Paciente.objects.filter(identificacion__in=identificaciones).only('id', 'nombre_completo')
+        )
+    return len(identificaciones) - len(existentes), len(existentes)
+
+
+def importar(archivo, rechazos=None, procesos=1, lote=LOTE, delimitador=',', hoy=None, progreso=None):
+    """
+    Importa los pacientes del CSV `archivo` (abierto en modo texto).
+    Las filas rechazadas se escriben en el CSV `rechazos` (con las
+    columnas linea y error). `progreso(resumen)` se llama tras cada bloque.
+    """
+    from django.db import connections
+
+    from .models import EPS
+
+    mapa_eps = {codigo.upper(): pk for pk, codigo in EPS.objects.values_list('pk', 'codigo')}
+    escritor = None
+    if rechazos is not None:
+        escritor = csv.DictWriter(rechazos, fieldnames=('linea', 'error') + COLUMNAS, extrasaction='ignore')
+        escritor.writeheader()
+
+    if procesos > 1:
+        # Los procesos hijos no usan la base de datos: no heredan conexiones abiertas
+        connections.close_all()
+
+    inicio = time.monotonic()
+    leidas = creadas = actualizadas = rechazadas = 0
+    for validas, descartadas in _validados(bloques_csv(archivo, lote, delimitador), procesos, mapa_eps, hoy or date.today()):
+        if validas:
+            nuevas, existentes = guardar_bloque(validas)
+            creadas += nuevas
+            actualizadas += existentes
+        if escritor is not None:
+            for rechazo in descartadas:
+                escritor.writerow({**rechazo.fila, 'linea': rechazo.linea, 'error': rechazo.error})
+        leidas += len(validas) + len(descartadas)
+        rechazadas += len(descartadas)
+        if progreso is not None:
+            progreso(Resumen(leidas, creadas, actualizadas, rechazadas, time.monotonic() - inicio))
+
+    return Resumen(leidas, creadas, actualizadas, rechazadas, time.monotonic() - inicio)
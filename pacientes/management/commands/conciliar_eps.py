@@ -0,0 +1,79 @@
+# -------------------------------------------------------------------
+# Proyecto: SOFT-MEDIC
+# Archivo: softmedic/pacientes/management/commands/conciliar_eps.py
+# Versión: 1.0
+# Fecha: 17/10/2026
+# Elaborado por: Prixma Software Projects
+# Revisado por: Dirección Técnica de SOFT-MEDIC
+# -------------------------------------------------------------------
+
+import os
+from contextlib import nullcontext
+
+from django.core.management.base import BaseCommand, CommandError
+
+from pacientes.conciliacion import BLOQUE_ORDEN, LOTE_ACTUALIZACION, conciliar
+from pacientes.models import EPS
+
+
+class Command(BaseCommand):
+    help = (
+        "Concilia un archivo de afiliación de EPS (identificacion, eps, contacto) con los "
+        "pacientes y actualiza solo los que cambiaron."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('archivo', help="Ruta del CSV (UTF-8, con encabezado).")
+        parser.add_argument('--eps', help="Código de la EPS del archivo (si las filas no lo traen).")
+        parser.add_argument(
+            '--desafiliar',
+            action='store_true',
+            help="Deja sin EPS a los pacientes de --eps que no aparecen en el archivo.",
+        )
+        parser.add_argument('--simular', action='store_true', help="Solo informa los cambios, sin guardarlos.")
+        parser.add_argument('--no-encontrados', help="Archivo donde anotar las identificaciones que no son pacientes.")
+        parser.add_argument(
+            '--bloque-orden',
+            type=int,
+            default=BLOQUE_ORDEN,
+            help=f"Filas ordenadas en memoria por tramo (por defecto {BLOQUE_ORDEN}).",
+        )
+        parser.add_argument(
+            '--lote',
+            type=int,
+            default=LOTE_ACTUALIZACION,
+            help=f"Pacientes por UPDATE en lote (por defecto {LOTE_ACTUALIZACION}).",
+        )
+
+    def handle(self, *args, **options):
+        if not os.path.exists(options['archivo']):
+            raise CommandError(f"No existe el archivo {options['archivo']}.")
+        eps = None
+        if options['eps']:
+            eps = EPS.objects.filter(codigo__iexact=options['eps']).first()
+            if eps is None:
+                raise CommandError(f"No existe la EPS con código {options['eps']}.")
+
+        ruta_faltantes = options['no_encontrados']
+        try:
+            with open(options['archivo'], newline='', encoding='utf-8-sig') as archivo, \
+                    (open(ruta_faltantes, 'w', encoding='utf-8') if ruta_faltantes else nullcontext()) as faltantes:
+                resumen = conciliar(
+                    archivo,
+                    eps=eps,
+                    desafiliar=options['desafiliar'],
+                    simular=options['simular'],
+                    no_encontrados=faltantes,
+                    bloque_orden=options['bloque_orden'],
+                    lote=options['lote'],
+                )
+        except ValueError as error:
+            raise CommandError(str(error))
+
+        prefijo = "Simulación: " if options['simular'] else ""
+        self.stdout.write(self.style.SUCCESS(
+            f"{prefijo}{resumen.leidas} filas en {resumen.segundos:.1f} s. "
+            f"Actualizados: {resumen.actualizados}; sin cambios: {resumen.sin_cambios}; "
+            f"no encontrados: {resumen.no_encontrados}; desafiliados: {resumen.desafiliados}; "
+            f"rechazadas: {resumen.rechazadas}."
+        ))
@@ -0,0 +1,72 @@
+# -------------------------------------------------------------------
+# Proyecto: SOFT-MEDIC
+# Archivo: softmedic/pacientes/management/commands/importar_pacientes.py
+# Versión: 1.0
+# Fecha: 17/10/2026
+# Elaborado por: Prixma Software Projects
+# Revisado por: Dirección Técnica de SOFT-MEDIC
+# -------------------------------------------------------------------
+
+import os
+
+from django.core.management.base import BaseCommand, CommandError
+
+from pacientes.importacion import LOTE, importar
+
+
+class Command(BaseCommand):
+    help = (
+        "Importa pacientes desde un CSV (nombre_completo, identificacion, fecha_nacimiento, "
+        "contacto, eps). Inserta o actualiza por identificación y deja las filas con error "
+        "en un archivo de rechazos."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('archivo', help="Ruta del CSV (UTF-8, con encabezado).")
+        parser.add_argument(
+            '--rechazos',
+            help="CSV de filas rechazadas (por defecto <archivo>.rechazados.csv).",
+        )
+        parser.add_argument('--lote', type=int, default=LOTE, help=f"Filas por lote (por defecto {LOTE}).")
+        parser.add_argument(
+            '--procesos',
+            type=int,
+            default=os.cpu_count() or 1,
+            help="Procesos de validación (por defecto, uno por CPU).",
+        )
+        parser.add_argument('--delimitador', default=',', help="Separador de columnas (por defecto ',').")
+
+    def handle(self, *args, **options):
+        ruta = options['archivo']
+        ruta_rechazos = options['rechazos'] or f"{os.path.splitext(ruta)[0]}.rechazados.csv"
+        if not os.path.exists(ruta):
+            raise CommandError(f"No existe el archivo {ruta}.")
+
+        def progreso(resumen):
+            self.stdout.write(
+                f"  {resumen.leidas} filas ({resumen.leidas / max(resumen.segundos, 1e-6):.0f} filas/s)"
+            )
+
+        try:
+            with open(ruta, newline='', encoding='utf-8-sig') as archivo, \
+                    open(ruta_rechazos, 'w', newline='', encoding='utf-8') as rechazos:
+                resumen = importar(
+                    archivo,
+                    rechazos=rechazos,
+                    procesos=options['procesos'],
+                    lote=options['lote'],
+                    delimitador=options['delimitador'],
+                    progreso=progreso,
+                )
+        except ValueError as error:
+            raise CommandError(str(error))
+
+        velocidad = resumen.leidas / max(resumen.segundos, 1e-6)
+        self.stdout.write(self.style.SUCCESS(
+            f"Importación terminada en {resumen.segundos:.1f} s ({velocidad:.0f} filas/s): "
+            f"{resumen.creadas} creados, {resumen.actualizadas} actualizados, {resumen.rechazadas} rechazados."
+        ))
+        if resumen.rechazadas:
+            self.stdout.write(f"Filas rechazadas en {ruta_rechazos}.")
+        else:
+            os.remove(ruta_rechazos)
@@ -0,0 +1,58 @@
+# Generated by Django 5.2.18 on 2026-10-17 22:59
+
+import re
+import unicodedata
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+# Copia fija de pacientes.busqueda.tokenizar: la migración no debe
+# cambiar de comportamiento si el módulo evoluciona.
+LONGITUD_TOKEN = 64
+_PALABRA = re.compile(r'\w+', re.UNICODE)
+
+
+def tokenizar(texto):
+    descompuesto = unicodedata.normalize('NFKD', texto or '')
+    normalizado = ''.join(c for c in descompuesto if not unicodedata.combining(c)).lower()
+    vistos = []
+    for palabra in _PALABRA.findall(normalizado):
+        palabra = palabra[:LONGITUD_TOKEN]
+        if palabra not in vistos:
+            vistos.append(palabra)
+    return vistos
+
+
+def poblar_tokens(apps, schema_editor):
+    Paciente = apps.get_model('pacientes', 'Paciente')
+    PacienteToken = apps.get_model('pacientes', 'PacienteToken')
+    tokens = [
+        PacienteToken(paciente_id=pk, token=token)
+        for pk, nombre in Paciente.objects.values_list('pk', 'nombre_completo').iterator()
+        for token in tokenizar(nombre)
+    ]
+    PacienteToken.objects.bulk_create(tokens, batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('pacientes', '0003_indices_consultas_frecuentes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PacienteToken',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('token', models.CharField(max_length=64)),
+                ('paciente', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='tokens_busqueda', to='pacientes.paciente')),
+            ],
+            options={
+                'db_table': 'paciente_token',
+                'indexes': [models.Index(fields=['token', 'paciente'], name='paciente_token_idx')],
+                'constraints': [models.UniqueConstraint(fields=('paciente', 'token'), name='paciente_token_unico')],
+            },
+        ),
+        migrations.RunPython(poblar_tokens, migrations.RunPython.noop),
+    ]
@@ -1,7 +1,7 @@
 # archivo: softmedic/pacientes/models.py
 # ------------------------------------------------------------
 # Proyecto: SOFT-MEDIC
-# Versión: 1.1
+# Versión: 1.4
 # Fecha: 09/11/2025
 # Elaborado por: Prixma Software Projects
 # Revisado por: Dirección Técnica de SOFT-MEDIC
@@ -13,7 +13,8 @@
 
 from django.db import models
 from django import forms
-from datetime import date
+
+from .validaciones import validar_fecha_nacimiento
 
 # ============================================================
 # MODELO: EPS (Entidad Promotora de Salud)
@@ -56,11 +57,40 @@ class Paciente(models.Model):
         ordering = ["nombre_completo"]
         verbose_name = "Paciente"
         verbose_name_plural = "Pacientes"
+        indexes = [
+            models.Index(fields=["nombre_completo"], name="paciente_nombre_idx"),
+        ]
 
     def __str__(self):
         return f"{self.nombre_completo} ({self.identificacion})"
 
 
+# ============================================================
+# MODELO: PacienteToken (clave de búsqueda normalizada)
+# ============================================================
+
+class PacienteToken(models.Model):
+    """
+    Palabra del nombre del paciente sin tildes y en minúsculas.
+    El índice (token, paciente) permite búsquedas por prefijo con
+    rangos sobre el índice (ver pacientes/busqueda.py).
+    """
+    paciente = models.ForeignKey(Paciente, on_delete=models.CASCADE, related_name="tokens_busqueda")
+    token = models.CharField(max_length=64)
+
+    class Meta:
+        db_table = "paciente_token"
+        constraints = [
+            models.UniqueConstraint(fields=["paciente", "token"], name="paciente_token_unico"),
+        ]
+        indexes = [
+            models.Index(fields=["token", "paciente"], name="paciente_token_idx"),
+        ]
+
+    def __str__(self):
+        return self.token
+
+
 # ============================================================
 # FORMULARIO: PacienteForm
 # ============================================================
@@ -83,15 +113,8 @@ class PacienteForm(forms.ModelForm):
         }
 
     def clean_fecha_nacimiento(self):
-        fecha = self.cleaned_data.get('fecha_nacimiento')
-        edad = (date.today() - fecha).days // 365
-
-        if edad < 0:
-            raise forms.ValidationError("La fecha de nacimiento no puede ser futura.")
-        if edad > 120:
-            raise forms.ValidationError("Edad no válida (mayor a 120 años).")
-
-        return fecha
+        # Regla compartida con la importación masiva (pacientes/importacion.py)
+        return validar_fecha_nacimiento(self.cleaned_data.get('fecha_nacimiento'))
 
 
 # ============================================================
@@ -102,3 +125,6 @@ class PacienteForm(forms.ModelForm):
 # |----------|-------------|--------------------------------------------|------------------------|
 # | 1.0      | 03/11/2025  | Equipo de Arquitectura y Análisis Técnico Soft-Medic | Consolidación y validación del diseño técnico completo del sistema. |
 # | 1.1      | 09/11/2025  | Equipo de Arquitectura y Análisis Técnico Soft-Medic | Integración del modelo "EPS" y relación foránea en el modelo "Paciente". |
+# | 1.2      | 17/10/2026  | Prixma Software Projects                   | Índice sobre nombre_completo para búsquedas y listados. |
+# | 1.3      | 17/10/2026  | Prixma Software Projects                   | Modelo "PacienteToken" para búsqueda por nombre sin tildes. |
+# | 1.4      | 17/10/2026  | Prixma Software Projects                   | Validación de fecha de nacimiento extraída a pacientes/validaciones.py. |
@@ -0,0 +1,14 @@
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+
+from .busqueda import sincronizar_tokens
+from .models import Paciente
+
+
+@receiver(post_save, sender=Paciente)
+def actualizar_tokens_busqueda(sender, instance, **kwargs):
+    """
+    Mantiene la clave de búsqueda normalizada del nombre del paciente
+    (también al cargar fixtures, para que queden buscables).
+    """
+    sincronizar_tokens(instance)
@@ -0,0 +1,114 @@
+# -------------------------------------------------------------------
+# Proyecto: SOFT-MEDIC
+# Archivo: softmedic/pacientes/test/test_busqueda.py
+# Versión: 1.0
+# Fecha: 17/10/2026
+# Elaborado por: Prixma Software Projects
+# Revisado por: Dirección Técnica de SOFT-MEDIC
+# -------------------------------------------------------------------
+
+from datetime import date
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.urls import reverse
+
+from pacientes.busqueda import buscar, normalizar
+from pacientes.models import Paciente, PacienteToken
+
+User = get_user_model()
+
+
+class BusquedaPacientesTest(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        nombres = ["Juan Pérez Gómez", "Juana Perea", "María López Pérez", "Pedro Álvarez"]
+        cls.pacientes = {
+            nombre: Paciente.objects.create(
+                nombre_completo=nombre,
+                identificacion=f"9000{i}",
+                fecha_nacimiento=date(1980, 1, 1),
+            )
+            for i, nombre in enumerate(nombres)
+        }
+
+    def nombres(self, consulta):
+        return [p.nombre_completo for p in buscar(consulta)]
+
+    def test_normalizar(self):
+        self.assertEqual(normalizar("ÁLVAREZ Núñez"), "alvarez nunez")
+
+    def test_tokens_se_sincronizan_al_guardar(self):
+        paciente = self.pacientes["Pedro Álvarez"]
+        self.assertEqual(
+            set(paciente.tokens_busqueda.values_list('token', flat=True)), {"pedro", "alvarez"}
+        )
+        paciente.nombre_completo = "Pedro Ruiz"
+        paciente.save()
+        self.assertEqual(
+            set(PacienteToken.objects.filter(paciente=paciente).values_list('token', flat=True)),
+            {"pedro", "ruiz"}
+        )
+
+    def test_insensible_a_tildes_y_por_prefijo(self):
+        self.assertEqual(self.nombres("alvar"), ["Pedro Álvarez"])
+        self.assertEqual(self.nombres("PEREZ"), ["Juan Pérez Gómez", "María López Pérez"])
+
+    def test_todos_los_terminos_y_ranking(self):
+        # "juan" coincide completa con Juan y como prefijo con Juana
+        self.assertEqual(self.nombres("juan pe"), ["Juan Pérez Gómez", "Juana Perea"])
+        self.assertEqual(self.nombres("juan lopez"), [])
+
+    def test_vista_paginada(self):
+        usuario = User.objects.create_user(
+            correo='recepcion.busqueda@test.com', nombre='Recepcion', rol='RECEPCIONISTA', password='123456'
+        )
+        self.client.force_login(usuario)
+        respuesta = self.client.get(reverse('pacientes:buscar_pacientes'), {'nombre': 'perez'})
+        self.assertEqual(respuesta.status_code, 200)
+        self.assertEqual(
+            [p.nombre_completo for p in respuesta.context['pacientes']],
+            ["Juan Pérez Gómez", "María López Pérez"]
+        )
+
+
+class AutocompletadoPacientesTest(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.medico = User.objects.create_user(
+            correo='medico.autocompletar@test.com', nombre='Medico', rol='MEDICO', password='123456'
+        )
+        cls.pacientes = [
+            Paciente.objects.create(
+                nombre_completo=f"Paciente Núñez {i}",
+                identificacion=f"8100{i}",
+                fecha_nacimiento=date(1980, 1, 1),
+            )
+            for i in range(5)
+        ]
+
+    def test_endpoint_por_nombre_y_documento(self):
+        self.client.force_login(self.medico)
+        url = reverse('pacientes:autocompletar_pacientes')
+
+        por_nombre = self.client.get(url, {'q': 'nunez'}).json()['resultados']
+        self.assertEqual(len(por_nombre), 5)
+
+        por_documento = self.client.get(url, {'q': '81003'}).json()['resultados']
+        self.assertEqual([r['id'] for r in por_documento], [self.pacientes[3].pk])
+
+    def test_formulario_solo_carga_el_paciente_seleccionado(self):
+        from historias.forms import HistoriaClinicaForm
+        from historias.models import HistoriaClinica
+
+        historia = HistoriaClinica(paciente=self.pacientes[2], medico_responsable=self.medico)
+        form = HistoriaClinicaForm(instance=historia, user=self.medico)
+
+        with self.assertNumQueries(1):
+            html = str(form['paciente'])
+
+        self.assertEqual(html.count('<option'), 2)
+        self.assertIn(f'value="{self.pacientes[2].pk}" selected', html)
+        self.assertIn('data-autocompletar-url="/pacientes/autocompletar/"', html)
@@ -0,0 +1,92 @@
+# -------------------------------------------------------------------
+# Proyecto: SOFT-MEDIC
+# Archivo: softmedic/pacientes/test/test_conciliacion.py
+# Versión: 1.0
+# Fecha: 17/10/2026
+# Elaborado por: Prixma Software Projects
+# Revisado por: Dirección Técnica de SOFT-MEDIC
+# -------------------------------------------------------------------
+
+import os
+import tempfile
+from datetime import date
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import TestCase
+
+from pacientes.conciliacion import conciliar, ordenar_externo, Afiliacion
+from pacientes.models import EPS, Paciente
+
+ARCHIVO = """identificacion,eps,contacto
+300,SURA,3000000000
+100,SURA,
+500,SURA,nuevo@test.com
+200,,
+999,SURA,
+100,SURA,ana@test.com
+"""
+
+
+class ConciliacionEPSTest(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.sura = EPS.objects.create(nombre="Sura", codigo="SURA")
+        cls.nueva = EPS.objects.create(nombre="Nueva EPS", codigo="NUEVA")
+        for identificacion, eps, contacto in [
+            ("100", cls.nueva, "ana@viejo.com"),   # cambia EPS y contacto
+            ("200", cls.sura, "luis@test.com"),    # igual (contacto vacío no borra)
+            ("300", cls.sura, "3000000000"),       # igual
+            ("400", cls.sura, None),               # de Sura, ausente del archivo
+            ("500", None, None),                   # se afilia
+        ]:
+            Paciente.objects.create(
+                nombre_completo=f"Paciente {identificacion}", identificacion=identificacion,
+                fecha_nacimiento=date(1980, 1, 1), eps=eps, contacto=contacto,
+            )
+
+    def test_ordenamiento_externo_por_tramos(self):
+        filas = [Afiliacion(str(i % 7), i, 1, None) for i in range(20)]
+        with tempfile.TemporaryDirectory() as directorio:
+            ordenadas = list(ordenar_externo(iter(filas), directorio, bloque=3))
+            self.assertEqual(len(os.listdir(directorio)), 7)
+        self.assertEqual(ordenadas, sorted(filas))
+
+    def test_actualiza_solo_cambios_reales(self):
+        faltantes = StringIO()
+        resumen = conciliar(StringIO(ARCHIVO), eps=self.sura, no_encontrados=faltantes, bloque_orden=2, lote=1)
+
+        self.assertEqual(
+            (resumen.leidas, resumen.actualizados, resumen.sin_cambios, resumen.no_encontrados, resumen.desafiliados),
+            (6, 2, 2, 1, 0),
+        )
+        self.assertEqual(faltantes.getvalue(), "999\n")
+
+        ana = Paciente.objects.get(identificacion="100")
+        self.assertEqual((ana.eps, ana.contacto), (self.sura, "ana@test.com"))
+        self.assertEqual(Paciente.objects.get(identificacion="200").contacto, "luis@test.com")
+        self.assertEqual(Paciente.objects.get(identificacion="500").eps, self.sura)
+        self.assertEqual(Paciente.objects.get(identificacion="400").eps, self.sura)
+
+    def test_desafiliar_y_simular(self):
+        resumen = conciliar(StringIO(ARCHIVO), eps=self.sura, desafiliar=True, simular=True)
+        self.assertEqual((resumen.actualizados, resumen.desafiliados), (2, 1))
+        self.assertEqual(Paciente.objects.get(identificacion="400").eps, self.sura)
+
+        conciliar(StringIO(ARCHIVO), eps=self.sura, desafiliar=True)
+        self.assertIsNone(Paciente.objects.get(identificacion="400").eps)
+
+        # Una segunda pasada ya no encuentra diferencias
+        resumen = conciliar(StringIO(ARCHIVO), eps=self.sura, desafiliar=True)
+        self.assertEqual((resumen.actualizados, resumen.desafiliados, resumen.sin_cambios), (0, 0, 4))
+
+    def test_comando(self):
+        descriptor, ruta = tempfile.mkstemp(suffix='.csv')
+        with os.fdopen(descriptor, 'w', encoding='utf-8') as archivo:
+            archivo.write(ARCHIVO)
+        self.addCleanup(os.remove, ruta)
+
+        salida = StringIO()
+        call_command('conciliar_eps', ruta, '--eps', 'sura', stdout=salida)
+        self.assertIn("Actualizados: 2; sin cambios: 2; no encontrados: 1", salida.getvalue())
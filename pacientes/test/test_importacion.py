@@ -0,0 +1,86 @@
+# -------------------------------------------------------------------
+# Proyecto: SOFT-MEDIC
+# Archivo: softmedic/pacientes/test/test_importacion.py
+# Versión: 1.1
+# Fecha: 17/10/2026
+# Elaborado por: Prixma Software Projects
+# Revisado por: Dirección Técnica de SOFT-MEDIC
+# -------------------------------------------------------------------
+
+import csv
+import os
+import tempfile
+from datetime import date
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import TestCase
+
+from pacientes.busqueda import buscar
+from pacientes.importacion import importar
+from pacientes.models import EPS, Paciente
+
+CSV = """nombre_completo,identificacion,fecha_nacimiento,contacto,eps
+Ana Pérez,1001,1980-05-01,3001234567,sura
+Luis Gómez,1002,15/03/1990,,
+Sin Fecha,1003,,,
+Futuro Nacido,1004,2030-01-01,,
+Carlos Ruiz,1005,1975-01-01,,NOEXISTE
+Ana María Pérez,1001,1980-05-01,ana@test.com,SURA
+"""
+
+
+class ImportacionPacientesTest(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.sura = EPS.objects.create(nombre="Sura", codigo="SURA")
+        Paciente.objects.create(nombre_completo="Luis Viejo", identificacion="1002", fecha_nacimiento=date(1990, 3, 15))
+
+    def test_inserta_actualiza_y_rechaza(self):
+        rechazos = StringIO()
+        resumen = importar(StringIO(CSV), rechazos=rechazos, lote=3, hoy=date(2026, 10, 17))
+
+        self.assertEqual((resumen.leidas, resumen.creadas, resumen.actualizadas, resumen.rechazadas), (6, 1, 2, 3))
+
+        # La identificación repetida (en otro lote) conserva la última fila
+        ana = Paciente.objects.get(identificacion="1001")
+        self.assertEqual((ana.nombre_completo, ana.contacto, ana.eps), ("Ana María Pérez", "ana@test.com", self.sura))
+        self.assertEqual(Paciente.objects.get(identificacion="1002").nombre_completo, "Luis Gómez")
+
+        rechazadas = list(csv.DictReader(StringIO(rechazos.getvalue())))
+        self.assertEqual([fila['linea'] for fila in rechazadas], ['4', '5', '6'])
+        self.assertIn("futura", rechazadas[1]['error'])
+        self.assertIn("EPS desconocida", rechazadas[2]['error'])
+
+        # Los tokens de búsqueda quedan al día sin post_save
+        self.assertEqual([p.identificacion for p in buscar("gomez")], ["1002"])
+        self.assertFalse(buscar("viejo").exists())
+
+    def test_comando_con_pool_de_procesos(self):
+        descriptor, ruta = tempfile.mkstemp(suffix='.csv')
+        with os.fdopen(descriptor, 'w', encoding='utf-8') as archivo:
+            archivo.write(CSV)
+        self.addCleanup(os.remove, ruta)
+        ruta_rechazos = f"{os.path.splitext(ruta)[0]}.rechazados.csv"
+        self.addCleanup(lambda: os.path.exists(ruta_rechazos) and os.remove(ruta_rechazos))
+
+        salida = StringIO()
+        call_command('importar_pacientes', ruta, '--procesos', '2', '--lote', '2', stdout=salida)
+
+        self.assertIn("1 creados, 2 actualizados, 3 rechazados", salida.getvalue())
+        self.assertIn("filas/s", salida.getvalue())
+        with open(ruta_rechazos, encoding='utf-8') as archivo:
+            self.assertEqual(len(archivo.read().splitlines()), 4)
+
+    def test_identificacion_repetida_en_el_mismo_lote(self):
+        rechazos = StringIO()
+        resumen = importar(StringIO(CSV), rechazos=rechazos, hoy=date(2026, 10, 17))
+        self.assertEqual((resumen.leidas, resumen.creadas, resumen.actualizadas, resumen.rechazadas), (6, 1, 1, 4))
+        self.assertEqual(resumen.leidas, resumen.creadas + resumen.actualizadas + resumen.rechazadas)
+        self.assertEqual(Paciente.objects.get(identificacion="1001").nombre_completo, "Ana María Pérez")
+
+        rechazadas = list(csv.DictReader(StringIO(rechazos.getvalue())))
+        self.assertEqual([fila['linea'] for fila in rechazadas], ['2', '4', '5', '6'])
+        self.assertEqual(rechazadas[0]['error'], "Identificación repetida (línea 7).")
+        self.assertEqual(rechazadas[0]['nombre_completo'], "Ana Pérez")
@@ -1,7 +1,7 @@
 # -------------------------------------------------------------------
 # Proyecto: SOFT-MEDIC
 # Archivo: softmedic/pacientes/urls.py
-# Versión: 1.1
+# Versión: 1.2
 # Fecha: 02/12/2025
 # Elaborado por: Prixma Software Projects
 # Revisado por: Dirección Técnica de SOFT-MEDIC
@@ -31,6 +31,7 @@ urlpatterns = [
     path("registrar/", views.registrar_paciente, name="registrar_paciente"),
     path("editar/<int:pk>/", views.editar_paciente, name="editar_paciente"),
     path("buscar/", views.buscar_pacientes, name="buscar_pacientes"),  # Nueva ruta de búsqueda
+    path("autocompletar/", views.autocompletar_pacientes, name="autocompletar_pacientes"),
 ]
 
 # -------------------------------------------------------------------
@@ -40,3 +41,4 @@ urlpatterns = [
 # |---------|------------|--------------------------------------------------------|----------------------------------------------------------------|
 # | 1.0     | 13/11/2025 | Equipo de Arquitectura y Análisis Técnico Soft-Medic  | Definición base de rutas con estructura estándar de proyecto. |
 # | 1.1     | 02/12/2025 | Prixma Software Projects                                | Añadida ruta para búsqueda y filtrado de pacientes           |
+# | 1.2     | 17/10/2026 | Prixma Software Projects                                | Ruta JSON de autocompletado de pacientes                     |
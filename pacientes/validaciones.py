@@ -0,0 +1,30 @@
+# -------------------------------------------------------------------
+# Proyecto: SOFT-MEDIC
+# Archivo: softmedic/pacientes/validaciones.py
+# Versión: 1.0
+# Fecha: 17/10/2026
+# Elaborado por: Prixma Software Projects
+# Revisado por: Dirección Técnica de SOFT-MEDIC
+# -------------------------------------------------------------------
+# Descripción: Reglas de validación de pacientes compartidas por los
+# formularios y la importación masiva. No importa modelos, de modo que
+# se puede usar en procesos hijos sin inicializar Django.
+# -------------------------------------------------------------------
+
+from datetime import date
+
+from django.core.exceptions import ValidationError
+
+EDAD_MAXIMA = 120
+
+
+def validar_fecha_nacimiento(fecha, hoy=None):
+    """Rechaza fechas futuras y edades mayores a EDAD_MAXIMA años."""
+    edad = ((hoy or date.today()) - fecha).days // 365
+
+    if edad < 0:
+        raise ValidationError("La fecha de nacimiento no puede ser futura.")
+    if edad > EDAD_MAXIMA:
+        raise ValidationError(f"Edad no válida (mayor a {EDAD_MAXIMA} años).")
+
+    return fecha
@@ -1,7 +1,7 @@
 # -------------------------------------------------------------------
 # Proyecto: SOFT-MEDIC
 # Archivo: softmedic/pacientes/views.py
-# Versión: 1.6
+# Versión: 2.0
 # Fecha: 02/12/2025
 # Elaborado por: Prixma Software Projects
 # Revisado por: Dirección Técnica de SOFT-MEDIC
@@ -14,14 +14,15 @@ from django.urls import reverse_lazy
 from django.views.generic import CreateView, UpdateView, ListView
 from django.contrib.auth.mixins import LoginRequiredMixin, UserPassesTestMixin
 from django.db.models import Q
-from django.contrib.auth import get_user_model
+from django.core.paginator import Paginator
+from django.http import JsonResponse
 
 from .models import Paciente
 from .forms import PacienteForm
+from .busqueda import buscar as buscar_por_nombre, FIN_PREFIJO
+from users.directorio import medicos as directorio_medicos
 from historias.models import HistoriaClinica
 
-User = get_user_model()
-
 
 # -------------------------------------------------------------------
 # Validación de rol
@@ -192,6 +193,35 @@ def ver_paciente(request, id):
 # NUEVA VISTA: Búsqueda y filtrado de pacientes
 # -------------------------------------------------------------------
 
+PACIENTES_POR_PAGINA = 25
+
+
+def consulta_pacientes(nombre='', documento='', medico_id=''):
+    """
+    Queryset del buscador de pacientes con los filtros aplicados. La usa
+    la vista y la vigila historias/planes_consulta.py.
+    """
+    pacientes = Paciente.objects.select_related('eps')
+
+    # Filtro por documento (exacto)
+    if documento:
+        pacientes = pacientes.filter(identificacion__iexact=documento)
+
+    # Filtro por médico tratante a través de historias clínicas
+    # (subconsulta en lugar de JOIN + DISTINCT para no alterar el ranking)
+    if medico_id:
+        pacientes = pacientes.filter(
+            pk__in=HistoriaClinica.objects.filter(
+                medico_responsable_id=medico_id
+            ).values('paciente_id')
+        )
+
+    # Filtro por nombre: prefijos de palabra, sin tildes, ordenado por relevancia
+    if nombre:
+        return buscar_por_nombre(nombre, pacientes)
+    return pacientes.order_by('nombre_completo', 'pk')
+
+
 @login_required
 @user_passes_test(es_personal_autorizado)
 def buscar_pacientes(request):
@@ -200,31 +230,26 @@ def buscar_pacientes(request):
     - Nombre
     - Documento
     - Médico tratante
+    El nombre se busca por prefijos de palabra sin tildes
+    (pacientes/busqueda.py) y el resultado se pagina.
     """
     nombre = request.GET.get('nombre', '').strip()
     documento = request.GET.get('documento', '').strip()
     medico_id = request.GET.get('medico', '').strip()
 
-    pacientes = Paciente.objects.all()
+    pacientes = consulta_pacientes(nombre, documento, medico_id)
+    pagina = Paginator(pacientes, PACIENTES_POR_PAGINA).get_page(request.GET.get('pagina'))
 
-    # Filtro por nombre (parcial)
-    if nombre:
-        pacientes = pacientes.filter(nombre_completo__icontains=nombre)
+    # Parámetros de búsqueda para conservarlos en los enlaces de paginación
+    parametros = request.GET.copy()
+    parametros.pop('pagina', None)
 
-    # Filtro por documento (exacto)
-    if documento:
-        pacientes = pacientes.filter(identificacion__iexact=documento)
-
-    # Filtro por médico tratante a través de historias clínicas
-    if medico_id:
-        pacientes = pacientes.filter(
-            historias_clinicas__medico_responsable_id=medico_id
-        ).distinct()
-
-    medicos = User.objects.filter(is_staff=True)
+    medicos = directorio_medicos()
 
     return render(request, 'pacientes/listar_pacientes.html', {
-        'pacientes': pacientes,
+        'pacientes': pagina.object_list,
+        'pagina': pagina,
+        'parametros': parametros.urlencode(),
         'nombre': nombre,
         'documento': documento,
         'medico_id': medico_id,
@@ -232,6 +257,41 @@ def buscar_pacientes(request):
     })
 
 
+# -------------------------------------------------------------------
+# Autocompletado de pacientes (JSON)
+# -------------------------------------------------------------------
+
+RESULTADOS_AUTOCOMPLETADO = 10
+
+
+@login_required
+@user_passes_test(es_personal_autorizado)
+def autocompletar_pacientes(request):
+    """
+    Sugerencias de pacientes para PacienteAutocompleteWidget.
+    Consultas numéricas buscan por prefijo de identificación; el
+    resto, por nombre (pacientes/busqueda.py). Ambas usan índice.
+    """
+    consulta = request.GET.get('q', '').strip()
+    pacientes = Paciente.objects.only('id', 'nombre_completo', 'identificacion')
+
+    if len(consulta) < 2:
+        pacientes = pacientes.none()
+    elif consulta.isdigit():
+        pacientes = pacientes.filter(
+            identificacion__gte=consulta, identificacion__lt=consulta + FIN_PREFIJO
+        ).order_by('identificacion')
+    else:
+        pacientes = buscar_por_nombre(consulta, pacientes)
+
+    return JsonResponse({
+        'resultados': [
+            {'id': p.pk, 'texto': str(p)}
+            for p in pacientes[:RESULTADOS_AUTOCOMPLETADO]
+        ]
+    })
+
+
 # -------------------------------------------------------------------
 # Control de cambios
 # -------------------------------------------------------------------
@@ -239,3 +299,7 @@ def buscar_pacientes(request):
 # |--------|------------|---------------------------------|----------------------------------------------------------|
 # | 1.5    | 23/11/2025 | Prixma Software Projects        | Corrección total de rutas y plantilla unificada sin errores|
 # | 1.6    | 02/12/2025 | Prixma Software Projects        | Implementación de búsqueda y filtrado de pacientes       |
+# | 1.7    | 17/10/2026 | Prixma Software Projects        | Búsqueda por nombre indexada, sin tildes y paginada      |
+# | 1.8    | 17/10/2026 | Prixma Software Projects        | Endpoint JSON de autocompletado de pacientes             |
+# | 1.9    | 17/10/2026 | Prixma Software Projects        | Filtro de médicos desde el directorio en caché           |
+# | 2.0    | 17/10/2026 | Prixma Software Projects        | Consulta del buscador compartida con planes_consulta     |
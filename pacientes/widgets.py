@@ -0,0 +1,41 @@
+# -------------------------------------------------------------------
+# Proyecto: SOFT-MEDIC
+# Archivo: softmedic/pacientes/widgets.py
+# Versión: 1.0
+# Fecha: 17/10/2026
+# Elaborado por: Prixma Software Projects
+# Revisado por: Dirección Técnica de SOFT-MEDIC
+# -------------------------------------------------------------------
+# Descripción: Selector de paciente con autocompletado. Solo se
+# renderiza la opción seleccionada; las demás se consultan al
+# endpoint pacientes:autocompletar_pacientes mientras se escribe.
+# -------------------------------------------------------------------
+
+from django import forms
+from django.urls import reverse
+
+
+class PacienteAutocompleteWidget(forms.Select):
+
+    class Media:
+        js = ('js/autocompletar_paciente.js',)
+
+    def get_context(self, name, value, attrs):
+        context = super().get_context(name, value, attrs)
+        context['widget']['attrs']['data-autocompletar-url'] = reverse('pacientes:autocompletar_pacientes')
+        return context
+
+    def optgroups(self, name, value, attrs=None):
+        """
+        Construye solo la opción vacía y la seleccionada, en lugar de
+        recorrer todo el queryset del campo.
+        """
+        grupos = [(None, [self.create_option(name, '', '---------', not any(value), 0)], 0)]
+
+        seleccionados = [v for v in value if v]
+        queryset = getattr(self.choices, 'queryset', None)
+        if seleccionados and queryset is not None:
+            for indice, paciente in enumerate(queryset.filter(pk__in=seleccionados), start=1):
+                opcion = self.create_option(name, paciente.pk, str(paciente), True, indice)
+                grupos.append((None, [opcion], indice))
+        return grupos
@@ -1,12 +1,14 @@
 # Archivo: scripts/crear_datos_iniciales.py
 import os
+from datetime import date
+
 import django
-from django.utils import timezone
 
 # Configurar Django si se ejecuta fuera del manage.py shell
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "softmedic.settings")
 django.setup()
 
+from django.utils import timezone
 from django.contrib.auth import get_user_model
 from pacientes.models import Paciente
 from historias.models import HistoriaClinica
@@ -16,59 +18,63 @@ User = get_user_model()
 # ------------------------
 # 1. Crear superusuario
 # ------------------------
-if not User.objects.filter(username='admin').exists():
+if not User.objects.filter(correo='admin@softmedic.com').exists():
     admin = User.objects.create_superuser(
-        username='admin',
-        email='admin@softmedic.com',
+        correo='admin@softmedic.com',
+        nombre='Administrador',
         password='Admin1234'
     )
-    print("Superusuario 'admin' creado.")
+    print("Superusuario 'admin@softmedic.com' creado.")
 else:
-    print("Superusuario 'admin' ya existe.")
+    print("Superusuario 'admin@softmedic.com' ya existe.")
 
 # ------------------------
 # 2. Crear médico
 # ------------------------
-if not User.objects.filter(username='medico1').exists():
+if not User.objects.filter(correo='medico1@softmedic.com').exists():
     medico = User.objects.create_user(
-        username='medico1',
-        email='medico1@softmedic.com',
+        correo='medico1@softmedic.com',
+        nombre='Médico de Prueba',
         password='Medico1234',
-        rol='MEDICO'  # Asegúrate de que tu modelo User tenga el campo 'rol'
+        rol='MEDICO'
     )
-    print("Usuario médico 'medico1' creado.")
+    print("Usuario médico 'medico1@softmedic.com' creado.")
 else:
-    medico = User.objects.get(username='medico1')
-    print("Usuario médico 'medico1' ya existe.")
+    medico = User.objects.get(correo='medico1@softmedic.com')
+    print("Usuario médico 'medico1@softmedic.com' ya existe.")
 
 # ------------------------
 # 3. Crear recepcionista
 # ------------------------
-if not User.objects.filter(username='recepcionista1').exists():
+if not User.objects.filter(correo='recepcionista1@softmedic.com').exists():
     recepcionista = User.objects.create_user(
-        username='recepcionista1',
-        email='recepcionista1@softmedic.com',
+        correo='recepcionista1@softmedic.com',
+        nombre='Recepcionista de Prueba',
         password='Recep1234',
-        rol='RECEPCIONISTA'  # Campo rol en User
+        rol='RECEPCIONISTA'
     )
-    print("Usuario recepcionista 'recepcionista1' creado.")
+    print("Usuario recepcionista 'recepcionista1@softmedic.com' creado.")
 else:
-    recepcionista = User.objects.get(username='recepcionista1')
-    print("Usuario recepcionista 'recepcionista1' ya existe.")
+    recepcionista = User.objects.get(correo='recepcionista1@softmedic.com')
+    print("Usuario recepcionista 'recepcionista1@softmedic.com' ya existe.")
 
 # ------------------------
 # 4. Crear pacientes de prueba
+# (volúmenes grandes: manage.py generar_datos_sinteticos)
 # ------------------------
 pacientes_data = [
-    {"nombre_completo": "Juan Perez", "identificacion": "12345678"},
-    {"nombre_completo": "Maria Gomez", "identificacion": "87654321"},
-    {"nombre_completo": "Luis Ramirez", "identificacion": "11223344"},
+    {"nombre_completo": "Juan Perez", "identificacion": "12345678", "fecha_nacimiento": date(1985, 5, 10)},
+    {"nombre_completo": "Maria Gomez", "identificacion": "87654321", "fecha_nacimiento": date(1990, 8, 22)},
+    {"nombre_completo": "Luis Ramirez", "identificacion": "11223344", "fecha_nacimiento": date(1978, 1, 3)},
 ]
 
 for p_data in pacientes_data:
     paciente, created = Paciente.objects.get_or_create(
         identificacion=p_data["identificacion"],
-        defaults={"nombre_completo": p_data["nombre_completo"]}
+        defaults={
+            "nombre_completo": p_data["nombre_completo"],
+            "fecha_nacimiento": p_data["fecha_nacimiento"],
+        }
     )
     if created:
         print(f"Paciente '{paciente.nombre_completo}' creado.")
@@ -78,8 +84,8 @@ for p_data in pacientes_data:
 # ------------------------
 # 5. Crear Historia Clínica de prueba
 # ------------------------
-paciente = Paciente.objects.first()
-if paciente and not HistoriaClinica.objects.filter(paciente=paciente, medico_responsable=medico).exists():
+paciente = Paciente.objects.get(identificacion="12345678")
+if not HistoriaClinica.objects.filter(paciente=paciente).exists():
     historia = HistoriaClinica.objects.create(
         paciente=paciente,
         medico_responsable=medico,
@@ -87,9 +93,8 @@ if paciente and not HistoriaClinica.objects.filter(paciente=paciente, medico_res
         puerta_entrada="Consultorio externo",
         resumen_clinico="Resumen clínico de prueba",
         numero_historia="HC-001",
-        fecha_ingreso=timezone.now(),
-        hora_ingreso=timezone.now().time(),
+        fecha_ingreso=timezone.localdate(),
     )
-    print(f"Historia Clínica de prueba creada para {paciente.nombre_completo} y médico {medico.username}.")
+    print(f"Historia Clínica de prueba creada para {paciente.nombre_completo} y médico {medico.nombre}.")
 else:
     print("Historia Clínica de prueba ya existe.")
@@ -0,0 +1,68 @@
+# =====================================================================
+# Proyecto: SOFT-MEDIC
+# Archivo: softmedic/pruebas.py
+# Versión: 1.1
+# Fecha: 17/10/2026
+# Elaborado por: Prixma Software Projects
+# Revisado por: Dirección Técnica de SOFT-MEDIC
+# =====================================================================
+#
+# Ejecutor de pruebas (TEST_RUNNER): ajustes propios del entorno de
+# pruebas sin condicionar settings.py a la línea de comandos.
+#
+# Los handlers de archivo se reconfiguran hacia un directorio temporal:
+# las pruebas no escriben en logs/ (versionado) ni encadenan eventos de
+# prueba en el audit.log real.
+# ---------------------------------------------------------------------
+
+import copy
+import logging.config
+import os
+import shutil
+import tempfile
+from pathlib import Path
+
+from django.conf import settings
+from django.test import override_settings
+from django.test.runner import DiscoverRunner
+
+
+def logging_en_directorio(configuracion, directorio):
+    """Copia de `configuracion` con los archivos de log dentro de `directorio`."""
+    configuracion = copy.deepcopy(configuracion)
+    for handler in configuracion.get('handlers', {}).values():
+        if 'filename' in handler:
+            handler['filename'] = os.path.join(directorio, os.path.basename(handler['filename']))
+    return configuracion
+
+
+class EjecutorPruebas(DiscoverRunner):
+    """DiscoverRunner con la auditoría en modo síncrono y logs temporales."""
+
+    def setup_test_environment(self, **kwargs):
+        super().setup_test_environment(**kwargs)
+        self._directorio_logs = Path(tempfile.mkdtemp(prefix='softmedic-logs-'))
+        self._logging_original = settings.LOGGING
+        logging_pruebas = logging_en_directorio(settings.LOGGING, self._directorio_logs)
+        self._ajustes = override_settings(
+            AUDITORIA_ASINCRONA=False,
+            LOG_DIR=self._directorio_logs,
+            LOGGING=logging_pruebas,
+            AUDITORIA_PENDIENTES_DIR=self._directorio_logs / 'auditoria_pendientes',
+        )
+        self._ajustes.enable()
+        logging.config.dictConfig(logging_pruebas)
+
+    def teardown_test_environment(self, **kwargs):
+        self._ajustes.disable()
+        logging.config.dictConfig(self._logging_original)
+        shutil.rmtree(self._directorio_logs, ignore_errors=True)
+        super().teardown_test_environment(**kwargs)
+
+
+# =====================================================================
+# CONTROL DE CAMBIOS
+# =====================================================================
+# Versión | Fecha       | Autor / Responsable      | Descripción
+# 1.0     | 17/10/2026  | Prixma Software Projects | Auditoría síncrona en pruebas
+# 1.1     | 18/10/2026  | Prixma Software Projects | Logs de prueba en un directorio temporal
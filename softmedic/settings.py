@@ -59,6 +59,9 @@ MIDDLEWARE = [
 
     # Middleware personalizado: una sesión activa por usuario
     'users.middleware.OneSessionPerUserMiddleware',
+
+    # Usuario que actúa, para los registros de auditoría
+    'historias.middleware.UsuarioAuditoriaMiddleware',
 ]
 
 # -------------------------------------------------------------------
@@ -127,6 +130,49 @@ STATIC_ROOT = BASE_DIR / 'staticfiles'
 MEDIA_URL = '/media/'
 MEDIA_ROOT = BASE_DIR / 'media'
 
+# -------------------------------------------------------------------
+# EXPORTACIONES EN SEGUNDO PLANO
+# -------------------------------------------------------------------
+# Los archivos se generan en MEDIA_ROOT/exportaciones con
+# `python manage.py procesar_exportaciones` y se reutilizan durante
+# este tiempo para solicitudes con los mismos filtros.
+EXPORTACIONES_CACHE_SEGUNDOS = 3600
+# Un trabajo EN_PROCESO sin latido durante este tiempo se reencola
+# (trabajador caído); los terminados se borran, con su archivo, tras
+# la retención.
+EXPORTACIONES_VENCIMIENTO_SEGUNDOS = 300
+EXPORTACIONES_RETENCION_SEGUNDOS = 7 * 24 * 3600
+
+# -------------------------------------------------------------------
+# BÚSQUEDA DE TEXTO COMPLETO (HISTORIAS)
+# -------------------------------------------------------------------
+# SQLiteFTS5Backend usa un índice FTS5; con otros motores de base de
+# datos usar 'historias.busqueda.BackendNulo'. Reconstrucción:
+# `python manage.py reconstruir_indice_busqueda`.
+HISTORIAS_BUSQUEDA_BACKEND = 'historias.busqueda.SQLiteFTS5Backend'
+
+# -------------------------------------------------------------------
+# DIRECTORIO DE MÉDICOS EN CACHÉ
+# -------------------------------------------------------------------
+# Se invalida por versión al guardar o eliminar un usuario. Con varios
+# procesos configurar en CACHES una caché compartida (Redis/Memcached).
+DIRECTORIO_MEDICOS_SEGUNDOS = 86400
+
+# -------------------------------------------------------------------
+# AGENDA DE CITAS
+# -------------------------------------------------------------------
+# La duración máxima acota la consulta de cruces de horario
+# (historias/agenda.py); no se admiten citas más largas.
+AGENDA_DURACION_POR_DEFECTO_MINUTOS = 30
+AGENDA_DURACION_MAXIMA_MINUTOS = 240
+
+# Jornada para la búsqueda de horarios libres (historias/disponibilidad.py).
+# (fin - inicio) / intervalo no puede superar 63 intervalos por día.
+AGENDA_INTERVALO_MINUTOS = 15
+AGENDA_HORA_INICIO = 7
+AGENDA_HORA_FIN = 19
+AGENDA_DIAS_HABILES = (0, 1, 2, 3, 4)
+
 # -------------------------------------------------------------------
 # DEFAULT PRIMARY KEY TYPE
 # -------------------------------------------------------------------
@@ -137,19 +183,51 @@ DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 # -------------------------------------------------------------------
 AUTH_USER_MODEL = 'users.CustomUser'
 
+# -------------------------------------------------------------------
+# AUDITORÍA
+# -------------------------------------------------------------------
+# Los registros se escriben por lotes en un hilo aparte
+# (historias/auditoria.py). En las pruebas se escriben en el acto
+# (softmedic/pruebas.py).
+AUDITORIA_ASINCRONA = True
+AUDITORIA_LOTE = 200
+AUDITORIA_INTERVALO_SEGUNDOS = 1.0
+# Lotes que no se pudieron guardar tras los reintentos; se reprocesan
+# en el siguiente vaciado
+AUDITORIA_PENDIENTES_DIR = BASE_DIR / 'logs' / 'auditoria_pendientes'
+# Eslabones de la cadena de hashes entre puntos de control firmados
+AUDITORIA_PUNTO_CONTROL_CADA = 1000
+
 # -------------------------------------------------------------------
 # EMAIL CONFIGURATION PARA DESARROLLO
 # -------------------------------------------------------------------
 EMAIL_BACKEND = 'django.core.mail.backends.console.EmailBackend'
 DEFAULT_FROM_EMAIL = 'Soft-Medic <no-reply@softmedic.com>'
 
+# Recordatorios de citas (bandeja de salida, historias/recordatorios.py).
+# Con el backend de consola o 'django.core.mail.backends.filebased.EmailBackend'
+# los mensajes se escriben en lugar de enviarse.
+RECORDATORIOS_TRABAJADORES = 4
+RECORDATORIOS_MAX_INTENTOS = 5
+RECORDATORIOS_ESPERA_BASE_SEGUNDOS = 60
+
 # -------------------------------------------------------------------
 # LOGGING CONFIGURATION
 # -------------------------------------------------------------------
 LOG_DIR = BASE_DIR / 'logs'
 LOG_DIR.mkdir(exist_ok=True)
 
-LOGGING = {
+# Con el colector, los logs rotan en segmentos comprimidos con índice
+# (logs/archivo/); buscar_logs consulta solo los segmentos que pueden
+# coincidir.
+LOG_SEGMENTO_BYTES = 10 * 1024 * 1024
+
+# Con varios workers, LOG_COLECTOR ('host:puerto') envía los registros a
+# un solo proceso escritor (manage.py colector_logs), que es el único que
+# abre y rota los archivos con LOGGING_ARCHIVOS.
+LOG_COLECTOR = os.environ.get('SOFTMEDIC_LOG_COLECTOR', '')
+
+LOGGING_ARCHIVOS = {
     'version': 1,
     'disable_existing_loggers': False,
 
@@ -167,26 +245,30 @@ LOGGING = {
         },
         'file_users': {
             'level': 'INFO',
-            'class': 'logging.FileHandler',
+            'class': 'users.archivo_logs.SegmentosComprimidosHandler',
             'filename': os.path.join(LOG_DIR, 'users.log'),
+            'maxBytes': LOG_SEGMENTO_BYTES,
             'formatter': 'verbose',
         },
         'file_security': {
             'level': 'WARNING',
-            'class': 'logging.FileHandler',
+            'class': 'users.archivo_logs.SegmentosComprimidosHandler',
             'filename': os.path.join(LOG_DIR, 'security.log'),
+            'maxBytes': LOG_SEGMENTO_BYTES,
             'formatter': 'verbose',
         },
         'file_audit': {
             'level': 'INFO',
-            'class': 'logging.FileHandler',
+            'class': 'users.archivo_logs.SegmentosComprimidosHandler',
             'filename': os.path.join(LOG_DIR, 'audit.log'),
+            'maxBytes': LOG_SEGMENTO_BYTES,
             'formatter': 'verbose',
         },
         'file_errors': {
             'level': 'ERROR',
-            'class': 'logging.FileHandler',
+            'class': 'users.archivo_logs.SegmentosComprimidosHandler',
             'filename': os.path.join(LOG_DIR, 'errors.log'),
+            'maxBytes': LOG_SEGMENTO_BYTES,
             'formatter': 'verbose',
         },
     },
@@ -215,6 +297,37 @@ LOGGING = {
     },
 }
 
+if LOG_COLECTOR:
+    LOGGING = {
+        **LOGGING_ARCHIVOS,
+        'handlers': {
+            'colector': {
+                'class': 'users.colector_logs.ColectorHandler',
+                'direccion': LOG_COLECTOR,
+            },
+        },
+        'loggers': {
+            nombre: {**configuracion, 'handlers': ['colector']}
+            for nombre, configuracion in LOGGING_ARCHIVOS['loggers'].items()
+        },
+    }
+else:
+    # Sin colector cada proceso abre los archivos y solo agrega al final
+    # (maxBytes=0): rotar mientras otros procesos escriben en el archivo
+    # movido perdería sus líneas.
+    LOGGING = {
+        **LOGGING_ARCHIVOS,
+        'handlers': {
+            nombre: {**handler, 'maxBytes': 0} if 'maxBytes' in handler else handler
+            for nombre, handler in LOGGING_ARCHIVOS['handlers'].items()
+        },
+    }
+
+# -------------------------------------------------------------------
+# PRUEBAS
+# -------------------------------------------------------------------
+TEST_RUNNER = 'softmedic.pruebas.EjecutorPruebas'
+
 # -------------------------------------------------------------------
 # AUTENTICACIÓN Y REDIRECCIONES
 # -------------------------------------------------------------------
@@ -0,0 +1,70 @@
+/* -------------------------------------------------------------------
+   Proyecto: SOFT-MEDIC
+   Archivo: static/js/autocompletar_paciente.js
+   Versión: 1.0
+   Fecha: 17/10/2026
+   Elaborado por: Prixma Software Projects
+   Revisado por: Dirección Técnica de SOFT-MEDIC
+   -------------------------------------------------------------------
+   Autocompletado para los <select data-autocompletar-url>: añade un
+   campo de texto y reemplaza las opciones con los resultados del
+   endpoint JSON (nombre o documento).
+------------------------------------------------------------------- */
+(function () {
+    "use strict";
+
+    var ESPERA_MS = 250;
+    var MINIMO_CARACTERES = 2;
+
+    function inicializar(select) {
+        var entrada = document.createElement("input");
+        entrada.type = "search";
+        entrada.className = "form-control mb-1";
+        entrada.placeholder = "Buscar paciente por nombre o documento…";
+        entrada.autocomplete = "off";
+        select.parentNode.insertBefore(entrada, select);
+
+        var temporizador = null;
+        var ultimaConsulta = "";
+
+        entrada.addEventListener("input", function () {
+            clearTimeout(temporizador);
+            temporizador = setTimeout(function () {
+                var consulta = entrada.value.trim();
+                if (consulta.length < MINIMO_CARACTERES || consulta === ultimaConsulta) {
+                    return;
+                }
+                ultimaConsulta = consulta;
+                var url = select.dataset.autocompletarUrl + "?q=" + encodeURIComponent(consulta);
+                fetch(url, { headers: { "X-Requested-With": "XMLHttpRequest" } })
+                    .then(function (respuesta) { return respuesta.json(); })
+                    .then(function (datos) {
+                        if (consulta === ultimaConsulta) {
+                            mostrarResultados(select, datos.resultados);
+                        }
+                    });
+            }, ESPERA_MS);
+        });
+    }
+
+    function mostrarResultados(select, resultados) {
+        var seleccionado = select.options[select.selectedIndex];
+        // Conserva la opción vacía y la seleccionada actualmente
+        Array.prototype.slice.call(select.options).forEach(function (opcion) {
+            if (opcion.value && opcion !== seleccionado) {
+                select.removeChild(opcion);
+            }
+        });
+        resultados.forEach(function (resultado) {
+            if (seleccionado && String(resultado.id) === seleccionado.value) {
+                return;
+            }
+            select.appendChild(new Option(resultado.texto, resultado.id));
+        });
+        select.size = Math.min(resultados.length + 1, 8);
+    }
+
+    document.addEventListener("DOMContentLoaded", function () {
+        document.querySelectorAll("select[data-autocompletar-url]").forEach(inicializar);
+    });
+})();
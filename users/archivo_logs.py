@@ -0,0 +1,321 @@
+# =====================================================================
+# Proyecto: SOFT-MEDIC
+# Archivo: users/archivo_logs.py
+# Versión: 1.3
+# Fecha: 17/10/2026
+# Elaborado por: Prixma Software Projects
+# Revisado por: Dirección Técnica de SOFT-MEDIC
+# =====================================================================
+#
+# Rotación de los logs en segmentos comprimidos con índice.
+#
+# SegmentosComprimidosHandler rota el archivo al llegar a maxBytes: el
+# contenido pasa a logs/archivo/<log>.<AAAAMMDD-HHMMSS-µs>.gz y junto a él
+# se escribe un índice JSON (<segmento>.json) con el rango de fechas,
+# los niveles, los loggers y los correos que aparecen en el segmento.
+#
+# buscar() consulta primero los índices y solo descomprime los
+# segmentos que pueden contener resultados; el archivo vivo se recorre
+# siempre (su tamaño está acotado por la rotación).
+#
+# leer_historial() pagina hacia atrás por el archivo vivo y después por
+# los segmentos, del más reciente al más antiguo. Su cursor nombra el
+# archivo: 'seg:<segmento>:<byte>' o 'vivo:<último segmento>:<byte>'.
+# Un segmento no cambia nunca; el cursor del archivo vivo guarda el
+# último segmento que existía, así que si entre tanto se rotó, el
+# contenido al que apunta es el segmento siguiente a ese.
+# ---------------------------------------------------------------------
+
+import glob
+import gzip
+import io
+import json
+import logging
+import logging.handlers
+import os
+import re
+import time
+from datetime import datetime
+
+from .visor_logs import CABECERA, LIMITE_ESCANEO, NIVELES, Pagina, coincide, coincidencias_inverso, entradas_en_orden
+
+DIRECTORIO_ARCHIVO = 'archivo'
+VIVO, SEGMENTO = 'vivo', 'seg'
+CORREO = re.compile(rb'[\w.+-]+@[\w-]+(?:\.[\w-]+)+')
+
+
+def directorio_archivo(ruta_log):
+    return os.path.join(os.path.dirname(ruta_log), DIRECTORIO_ARCHIVO)
+
+
+class IndiceSegmento:
+    """Resumen de un segmento que se arma línea a línea mientras se comprime."""
+
+    def __init__(self, archivo):
+        self.archivo = archivo
+        self.desde = self.hasta = None
+        self.niveles = {}
+        self.loggers = set()
+        self.correos = set()
+
+    def agregar(self, linea):
+        coincidencia = CABECERA.match(linea.rstrip(b'\r\n'))
+        if coincidencia is not None:
+            nivel, fecha, nombre, _ = coincidencia.groups()
+            fecha = fecha.decode()
+            self.desde = self.desde or fecha
+            self.hasta = fecha
+            nivel = nivel.decode()
+            self.niveles[nivel] = self.niveles.get(nivel, 0) + 1
+            self.loggers.add(nombre.decode('utf-8', errors='replace'))
+        for correo in CORREO.findall(linea):
+            self.correos.add(correo.decode('utf-8', errors='replace').lower())
+
+    def como_dict(self):
+        return {
+            'archivo': self.archivo,
+            'desde': self.desde,
+            'hasta': self.hasta,
+            'niveles': self.niveles,
+            'loggers': sorted(self.loggers),
+            'correos': sorted(self.correos),
+        }
+
+
+def archivar(ruta_log):
+    """
+    Mueve el contenido actual del log a un segmento comprimido con su
+    índice. Devuelve la ruta del segmento.
+    """
+    directorio = directorio_archivo(ruta_log)
+    os.makedirs(directorio, exist_ok=True)
+    base = os.path.basename(ruta_log)
+
+    nombre = f"{base}.{datetime.now():%Y%m%d-%H%M%S-%f}"
+    destino, n = os.path.join(directorio, f"{nombre}.gz"), 1
+    while os.path.exists(destino):
+        destino, n = os.path.join(directorio, f"{nombre}-{n}.gz"), n + 1
+
+    # Primero se libera el archivo vivo; la compresión trabaja sobre la copia movida
+    temporal = f"{destino}.tmp"
+    os.replace(ruta_log, temporal)
+
+    indice = IndiceSegmento(base)
+    with open(temporal, 'rb') as origen, gzip.open(f"{destino}.part", 'wb') as comprimido:
+        for linea in origen:
+            comprimido.write(linea)
+            indice.agregar(linea)
+    os.replace(f"{destino}.part", destino)
+
+    with open(f"{destino}.json.part", 'w', encoding='utf-8') as archivo_indice:
+        json.dump(indice.como_dict(), archivo_indice, ensure_ascii=False)
+    os.replace(f"{destino}.json.part", f"{destino}.json")
+
+    os.remove(temporal)
+    return destino
+
+
+def segmentos(ruta_log):
+    """[(ruta del segmento, índice o None)] del log, del más antiguo al más reciente."""
+    patron = os.path.join(directorio_archivo(ruta_log), f"{glob.escape(os.path.basename(ruta_log))}.*.gz")
+    resultado = []
+    for ruta in sorted(glob.glob(patron)):
+        try:
+            with open(f"{ruta}.json", encoding='utf-8') as archivo_indice:
+                indice = json.load(archivo_indice)
+        except (OSError, ValueError):
+            indice = None  # Sin índice: se recorre siempre
+        resultado.append((ruta, indice))
+    return resultado
+
+
+def puede_coincidir(indice, desde=None, hasta=None, nivel=None, logger=None, correo=None):
+    """Indica, solo con el índice, si el segmento puede tener entradas de la consulta."""
+    if indice is None:
+        return True
+    if indice['desde'] is None:
+        return False
+    # Las fechas del log empiezan por AAAA-MM-DD: se comparan como texto
+    if desde and indice['hasta'][:10] < desde.isoformat():
+        return False
+    if hasta and indice['desde'][:10] > hasta.isoformat():
+        return False
+    if nivel in NIVELES and not any(
+        logging.getLevelName(n) >= logging.getLevelName(nivel) for n in indice['niveles']
+    ):
+        return False
+    if logger and not any(n == logger or n.startswith(f"{logger}.") for n in indice['loggers']):
+        return False
+    if correo and correo.lower() not in indice['correos']:
+        return False
+    return True
+
+
+def buscar(ruta_log, desde=None, hasta=None, nivel=None, logger=None, correo=None, texto=None):
+    """
+    (origen, Entrada) de las entradas que cumplen la consulta, de la más
+    antigua a la más reciente: primero los segmentos archivados que
+    pueden coincidir y al final el archivo vivo.
+    """
+    fuentes = [
+        (ruta, gzip.open)
+        for ruta, indice in segmentos(ruta_log)
+        if puede_coincidir(indice, desde, hasta, nivel, logger, correo)
+    ]
+    if os.path.exists(ruta_log):
+        fuentes.append((ruta_log, open))
+
+    for ruta, abrir in fuentes:
+        with abrir(ruta, 'rb') as archivo:
+            for entrada in entradas_en_orden(archivo):
+                dia = entrada.fecha[:10]
+                if desde and dia < desde.isoformat() or hasta and dia > hasta.isoformat():
+                    continue
+                if correo and correo.lower() not in f"{entrada.mensaje}\n{entrada.detalle}".lower():
+                    continue
+                if coincide(entrada, nivel, logger, texto):
+                    yield os.path.basename(ruta), entrada
+
+
+def _cursor(tipo, nombre, offset=None):
+    return f"{tipo}:{nombre}:{'' if offset is None else offset}"
+
+
+def _leer_cursor(cursor):
+    """(tipo, nombre, byte o None = final del archivo); None si el cursor no es válido."""
+    try:
+        tipo, nombre, offset = cursor.split(':', 2)
+        offset = int(offset) if offset else None
+    except (AttributeError, ValueError):
+        return None
+    return (tipo, nombre, offset) if tipo in (VIVO, SEGMENTO) else None
+
+
+def _abrir(ruta_log, tipo, nombre):
+    """Archivo binario con seek() de una fuente, o None si ya no existe."""
+    try:
+        if tipo == VIVO:
+            return open(ruta_log, 'rb')
+        # La lectura inversa retrocede por bloques: el segmento (acotado
+        # por maxBytes) se descomprime una vez en memoria
+        with gzip.open(os.path.join(directorio_archivo(ruta_log), nombre), 'rb') as segmento:
+            return io.BytesIO(segmento.read())
+    except FileNotFoundError:
+        return None
+
+
+def leer_historial(ruta_log, cursor=None, tamano=50, nivel=None, logger=None, texto=None):
+    """
+    Como visor_logs.leer_pagina, pero continúa por los segmentos
+    archivados cuando llega al inicio del archivo vivo. `cursor` es el
+    Pagina.cursor de la página anterior (texto, ver el encabezado).
+    """
+    nombres = [os.path.basename(ruta) for ruta, _ in segmentos(ruta_log)]
+    ancla = nombres[-1] if nombres else ''
+    # Fuentes de la más reciente a la más antigua
+    fuentes = [(VIVO, ancla)] + [(SEGMENTO, nombre) for nombre in reversed(nombres)]
+
+    fin = None
+    leido = _leer_cursor(cursor) if cursor else None
+    if leido is not None:
+        tipo, nombre, fin = leido
+        if tipo == VIVO and nombre != ancla:
+            # Ese archivo vivo ya se archivó: es el primer segmento posterior a `nombre`
+            posteriores = [n for n in nombres if n > nombre]
+            tipo, nombre = (SEGMENTO, posteriores[0]) if posteriores else (VIVO, ancla)
+        if (tipo, nombre) in fuentes:
+            fuentes = fuentes[fuentes.index((tipo, nombre)):]
+        else:
+            # Segmento eliminado (backupCount): se sigue por los más antiguos
+            fuentes = [(SEGMENTO, n) for n in reversed(nombres) if n < nombre]
+            fin = None
+
+    def siguiente(i, offset):
+        if offset:
+            return _cursor(*fuentes[i], offset)
+        return _cursor(*fuentes[i + 1]) if i + 1 < len(fuentes) else None
+
+    entradas, escaneado = [], 0
+    for i, (tipo, nombre) in enumerate(fuentes):
+        archivo = _abrir(ruta_log, tipo, nombre)
+        if archivo is None:
+            fin = None
+            continue
+        with archivo:
+            tamano_archivo = archivo.seek(0, os.SEEK_END)
+            fin_fuente = tamano_archivo if fin is None else max(0, min(fin, tamano_archivo))
+            fin = None
+            for offset, entrada in coincidencias_inverso(archivo, fin_fuente, nivel, logger, texto):
+                if entrada is not None:
+                    entradas.append(entrada)
+                    if len(entradas) >= tamano:
+                        return Pagina(entradas, siguiente(i, offset), False)
+                if escaneado + fin_fuente - offset > LIMITE_ESCANEO:
+                    return Pagina(entradas, siguiente(i, offset), True)
+        escaneado += fin_fuente
+    return Pagina(entradas, None, False)
+
+
+class SegmentosComprimidosHandler(logging.handlers.RotatingFileHandler):
+    """
+    RotatingFileHandler que, al rotar, comprime el archivo en un segmento
+    con índice (archivar) en lugar de renombrarlo a .1, .2, ...
+    backupCount > 0 conserva solo esa cantidad de segmentos.
+
+    Solo debe rotar el único proceso que escribe el archivo (el colector
+    de logs): archivar mueve el archivo vivo y lo que otro proceso escriba
+    en él después se pierde. Con maxBytes=0 no rota (settings.LOGGING
+    sin colector).
+
+    El colector de logs (users/colector_logs.py) desactiva
+    flush_por_registro y llama a vaciar() al final de cada lote.
+    """
+
+    flush_por_registro = True
+    # Segundos sin reintentar archivar después de un fallo
+    ESPERA_TRAS_FALLO = 60
+    _siguiente_intento = 0.0
+
+    def __init__(self, filename, maxBytes=10 * 1024 * 1024, backupCount=0, encoding='utf-8', delay=False):
+        super().__init__(filename, maxBytes=maxBytes, backupCount=backupCount, encoding=encoding, delay=delay)
+
+    def flush(self):
+        if self.flush_por_registro:
+            super().flush()
+
+    def vaciar(self):
+        super().flush()
+
+    def shouldRollover(self, record):
+        if time.monotonic() < self._siguiente_intento:
+            return False
+        return super().shouldRollover(record)
+
+    def doRollover(self):
+        if self.stream:
+            self.stream.close()
+            self.stream = None
+        if os.path.exists(self.baseFilename) and os.path.getsize(self.baseFilename) > 0:
+            try:
+                archivar(self.baseFilename)
+            except OSError:
+                # Otro proceso tiene el archivo abierto (Windows): se sigue escribiendo
+                # en él y no se reintenta en cada registro
+                self._siguiente_intento = time.monotonic() + self.ESPERA_TRAS_FALLO
+        if self.backupCount > 0:
+            for ruta, _ in segmentos(self.baseFilename)[:-self.backupCount]:
+                for archivo in (ruta, f"{ruta}.json"):
+                    if os.path.exists(archivo):
+                        os.remove(archivo)
+        if not self.delay:
+            self.stream = self._open()
+
+
+# =====================================================================
+# CONTROL DE CAMBIOS
+# =====================================================================
+# Versión | Fecha       | Autor / Responsable      | Descripción
+# 1.0     | 17/10/2026  | Prixma Software Projects | Segmentos comprimidos con índice y búsqueda
+# 1.1     | 17/10/2026  | Prixma Software Projects | Vaciado por lotes para el colector de logs
+# 1.2     | 17/10/2026  | Prixma Software Projects | Rotación solo con un escritor; espera tras un archivado fallido
+# 1.3     | 18/10/2026  | Prixma Software Projects | leer_historial: paginación del visor sobre archivo vivo y segmentos
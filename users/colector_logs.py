@@ -0,0 +1,255 @@
+# =====================================================================
+# Proyecto: SOFT-MEDIC
+# Archivo: users/colector_logs.py
+# Versión: 1.1
+# Fecha: 17/10/2026
+# Elaborado por: Prixma Software Projects
+# Revisado por: Dirección Técnica de SOFT-MEDIC
+# =====================================================================
+#
+# Recolección de logs en un solo proceso escritor.
+#
+# Con varios workers WSGI, cada uno abría los mismos archivos de log:
+# las líneas se intercalaban, la rotación competía entre procesos y
+# cada escritura bloqueaba la petición. Con LOG_COLECTOR configurado:
+#
+#   - En cada worker, ColectorHandler solo encola el registro (no hay
+#     E/S en el hilo de la petición). Un hilo de fondo lo envía por TCP
+#     local como JSON con prefijo de longitud, igual que el marco de
+#     logging.handlers.SocketHandler pero sin pickle. El hilo y el socket
+#     se crean con el primer registro de cada proceso, así los workers
+#     que hace fork el servidor WSGI tienen los suyos.
+#   - Si el colector no responde, cada worker retiene hasta
+#     PENDIENTES_MAXIMO registros; los que se descartan se cuentan y se
+#     informan con un WARNING al reconectar.
+#   - El comando colector_logs recibe los registros, los despacha a los
+#     handlers de archivo de LOGGING_ARCHIVOS y vacía los archivos por
+#     lotes. Es el único proceso que escribe y rota los logs.
+# ---------------------------------------------------------------------
+
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import socketserver
+import struct
+import threading
+import time
+from collections import deque
+
+# Campos del LogRecord que viajan al colector
+CAMPOS_REGISTRO = (
+    'name', 'msg', 'levelno', 'levelname', 'pathname', 'filename', 'module', 'lineno',
+    'funcName', 'created', 'msecs', 'relativeCreated', 'thread', 'threadName', 'process',
+)
+# Registros que un worker retiene mientras el colector no responde
+PENDIENTES_MAXIMO = 10000
+LOTE = 500
+
+
+def separar_direccion(direccion):
+    """'host:puerto' -> (host, puerto)."""
+    host, _, puerto = direccion.rpartition(':')
+    return host or '127.0.0.1', int(puerto)
+
+
+class EnvioJSONHandler(logging.handlers.SocketHandler):
+    """
+    SocketHandler que serializa en JSON y conserva los registros no
+    enviados (hasta PENDIENTES_MAXIMO) para reintentar al reconectar.
+    `descartados` cuenta los que no cupieron.
+    """
+
+    def __init__(self, host, port):
+        super().__init__(host, port)
+        self.pendientes = deque(maxlen=PENDIENTES_MAXIMO)
+        self.descartados = 0
+
+    def makePickle(self, record):
+        datos = {campo: getattr(record, campo, None) for campo in CAMPOS_REGISTRO}
+        datos['msg'] = record.getMessage()
+        cuerpo = json.dumps(datos, ensure_ascii=False, default=str).encode('utf-8')
+        return struct.pack('>L', len(cuerpo)) + cuerpo
+
+    def emit(self, record):
+        try:
+            if len(self.pendientes) == self.pendientes.maxlen:
+                self.descartados += 1  # el append expulsa el más antiguo
+            self.pendientes.append(self.makePickle(record))
+            self.enviar_pendientes()
+        except Exception:
+            self.handleError(record)
+
+    def enviar_pendientes(self):
+        if self.sock is None:
+            # createSocket respeta la espera exponencial entre reintentos
+            self.createSocket()
+        if self.sock is None:
+            return
+        while self.pendientes:
+            try:
+                self.sock.sendall(self.pendientes[0])
+            except OSError:
+                # El marco se reenvía completo por la conexión nueva
+                self.sock.close()
+                self.sock = None
+                return
+            self.pendientes.popleft()
+        if self.descartados:
+            self._informar_descartados()
+
+    def _informar_descartados(self):
+        aviso = logging.makeLogRecord({
+            'name': __name__,
+            'levelno': logging.WARNING,
+            'levelname': 'WARNING',
+            'msg': f"COLECTOR: {self.descartados} registros descartados del proceso {os.getpid()} "
+                   f"mientras el colector no respondía",
+        })
+        self.descartados = 0
+        self.pendientes.append(self.makePickle(aviso))
+        self.enviar_pendientes()
+
+    def close(self):
+        self.acquire()
+        try:
+            if self.pendientes:
+                self.enviar_pendientes()
+        finally:
+            self.release()
+        super().close()
+
+
+class ColectorHandler(logging.handlers.QueueHandler):
+    """
+    Handler de los workers: encola el registro ya formateado y un
+    QueueListener lo envía al colector en segundo plano.
+
+    La configuración de logging se carga antes de que el servidor WSGI
+    haga fork, y ni el hilo del oyente ni el socket deben heredarse: el
+    oyente se arranca con el primer registro de cada proceso.
+    """
+
+    def __init__(self, direccion):
+        super().__init__(queue.SimpleQueue())
+        self.direccion = direccion
+        self.envio = None
+        self.oyente = None
+        self._pid = None
+
+    def _iniciar_oyente(self):
+        self.queue = queue.SimpleQueue()
+        self.envio = EnvioJSONHandler(*separar_direccion(self.direccion))
+        self.oyente = logging.handlers.QueueListener(self.queue, self.envio)
+        self.oyente.start()
+        self._pid = os.getpid()
+
+    def enqueue(self, record):
+        # handle() ya tiene el candado del handler (reiniciado por logging tras un fork)
+        if self._pid != os.getpid():
+            self._iniciar_oyente()
+        super().enqueue(record)
+
+    def close(self):
+        # Vacía la cola antes de cerrar (logging.shutdown al salir del proceso)
+        if self.oyente is not None and self._pid == os.getpid():
+            self.oyente.stop()
+            self.envio.close()
+        self.oyente = None
+        super().close()
+
+
+class _ReceptorRegistros(socketserver.StreamRequestHandler):
+    def setup(self):
+        super().setup()
+        self.server.conexiones.add(self)
+
+    def finish(self):
+        self.server.conexiones.discard(self)
+        super().finish()
+
+    def handle(self):
+        while True:
+            cabecera = self.rfile.read(4)
+            if len(cabecera) < 4:
+                return
+            (longitud,) = struct.unpack('>L', cabecera)
+            cuerpo = self.rfile.read(longitud)
+            if len(cuerpo) < longitud:
+                return  # Conexión cortada a mitad de un registro: el worker lo reenvía
+            try:
+                datos = json.loads(cuerpo.decode('utf-8'))
+            except ValueError:
+                continue
+            self.server.cola.put(logging.makeLogRecord(datos))
+
+
+class _Servidor(socketserver.ThreadingTCPServer):
+    allow_reuse_address = True
+    daemon_threads = True
+
+
+class ColectorLogs:
+    """
+    Servidor que recibe registros de los workers y los escribe por lotes
+    desde un único hilo. `despachar(registro)` los entrega a los handlers
+    (por defecto, al logger de su nombre); `handlers`, los que se vacían
+    al final de cada lote.
+    """
+
+    def __init__(self, direccion, handlers=(), despachar=None, lote=LOTE):
+        self.servidor = _Servidor(separar_direccion(direccion), _ReceptorRegistros)
+        self.servidor.cola = queue.Queue()
+        self.servidor.conexiones = set()
+        self.handlers = list(handlers)
+        self.despachar = despachar or (lambda registro: logging.getLogger(registro.name).handle(registro))
+        self.lote = lote
+        self._detener = threading.Event()
+        self._hilos = []
+        for handler in self.handlers:
+            if hasattr(handler, 'flush_por_registro'):
+                handler.flush_por_registro = False
+
+    @property
+    def direccion(self):
+        host, puerto = self.servidor.server_address[:2]
+        return f"{host}:{puerto}"
+
+    def _escribir(self):
+        cola = self.servidor.cola
+        while not (self._detener.is_set() and cola.empty()):
+            try:
+                registros = [cola.get(timeout=0.5)]
+            except queue.Empty:
+                continue
+            while len(registros) < self.lote:
+                try:
+                    registros.append(cola.get_nowait())
+                except queue.Empty:
+                    break
+            for registro in registros:
+                self.despachar(registro)
+            for handler in self.handlers:
+                getattr(handler, 'vaciar', handler.flush)()
+
+    def iniciar(self):
+        for destino in (self.servidor.serve_forever, self._escribir):
+            hilo = threading.Thread(target=destino, daemon=True)
+            hilo.start()
+            self._hilos.append(hilo)
+
+    def detener(self, espera=5):
+        """
+        Deja de aceptar conexiones, espera (hasta `espera` segundos) a que
+        los workers conectados terminen de enviar, escribe lo pendiente y
+        cierra.
+        """
+        self.servidor.shutdown()
+        limite = time.monotonic() + espera
+        while self.servidor.conexiones and time.monotonic() < limite:
+            time.sleep(0.05)
+        self.servidor.server_close()
+        self._detener.set()
+        for hilo in self._hilos:
+            hilo.join()
@@ -0,0 +1,86 @@
+# =====================================================================
+# Proyecto: SOFT-MEDIC
+# Archivo: users/directorio.py
+# Versión: 1.0
+# Fecha: 17/10/2026
+# Elaborado por: Prixma Software Projects
+# Revisado por: Dirección Técnica de SOFT-MEDIC
+# =====================================================================
+#
+# Directorio de médicos en caché.
+#
+# La lista cambia muy rara vez, así que se guarda en la caché de Django
+# bajo una clave con número de versión. Guardar o eliminar un usuario
+# (ver users/signals.py) incrementa la versión y las entradas
+# anteriores dejan de usarse sin tener que borrarlas.
+#
+# Con varios procesos debe configurarse una caché compartida
+# (settings.CACHES); la caché local en memoria es por proceso.
+# ---------------------------------------------------------------------
+
+import time
+from collections import namedtuple
+
+from django.conf import settings
+from django.contrib import admin
+from django.core.cache import cache
+
+from .models import CustomUser
+
+CLAVE_VERSION = 'directorio_medicos:version'
+
+# Campos de usuario que afectan al directorio
+CAMPOS_DIRECTORIO = {'nombre', 'correo', 'rol', 'is_active'}
+
+Medico = namedtuple('Medico', ['id', 'nombre', 'correo'])
+
+
+def _version():
+    version = cache.get(CLAVE_VERSION)
+    if version is None:
+        # Un valor basado en la hora evita reutilizar versiones antiguas
+        # si la clave fue desalojada de la caché
+        cache.add(CLAVE_VERSION, int(time.time() * 1000), None)
+        version = cache.get(CLAVE_VERSION)
+    return version
+
+
+def invalidar_directorio():
+    """Descarta el directorio en caché (nueva versión)."""
+    try:
+        cache.incr(CLAVE_VERSION)
+    except ValueError:
+        cache.set(CLAVE_VERSION, int(time.time() * 1000), None)
+
+
+def medicos():
+    """Lista de médicos activos como tuplas Medico(id, nombre, correo)."""
+    clave = f'directorio_medicos:v{_version()}'
+    directorio = cache.get(clave)
+    if directorio is None:
+        directorio = [
+            Medico(*fila)
+            for fila in CustomUser.objects.filter(rol='MEDICO', is_active=True)
+            .order_by('nombre', 'pk')
+            .values_list('pk', 'nombre', 'correo')
+        ]
+        cache.set(clave, directorio, getattr(settings, 'DIRECTORIO_MEDICOS_SEGUNDOS', 86400))
+    return directorio
+
+
+class FiltroMedico(admin.SimpleListFilter):
+    """
+    Filtro lateral del admin por médico, alimentado por el directorio
+    en caché. `campo_medico` indica la relación a filtrar.
+    """
+    title = 'médico'
+    parameter_name = 'medico'
+    campo_medico = 'medico_responsable'
+
+    def lookups(self, request, model_admin):
+        return [(medico.id, medico.nombre) for medico in medicos()]
+
+    def queryset(self, request, queryset):
+        if self.value():
+            return queryset.filter(**{f'{self.campo_medico}_id': self.value()})
+        return queryset
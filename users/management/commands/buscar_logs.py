@@ -0,0 +1,60 @@
+# =====================================================================
+# Proyecto: SOFT-MEDIC
+# Archivo: users/management/commands/buscar_logs.py
+# Versión: 1.0
+# Fecha: 17/10/2026
+# Elaborado por: Prixma Software Projects
+# Revisado por: Dirección Técnica de SOFT-MEDIC
+# =====================================================================
+
+from datetime import date
+
+from django.core.management.base import BaseCommand, CommandError
+
+from users.archivo_logs import buscar, puede_coincidir, segmentos
+from users.visor_logs import ARCHIVOS_LOG, NIVELES, ruta_log
+
+
+def _fecha(valor):
+    try:
+        return date.fromisoformat(valor)
+    except ValueError:
+        raise CommandError(f"Fecha inválida: {valor} (use AAAA-MM-DD).")
+
+
+class Command(BaseCommand):
+    help = (
+        "Busca en un log y en sus segmentos archivados. Solo se descomprimen los segmentos "
+        "cuyo índice puede coincidir. Ej.: buscar_logs users --texto 'LOGIN FALLIDO' "
+        "--correo ana@test.com --desde 2026-10-01 --hasta 2026-10-17"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('archivo', choices=sorted(ARCHIVOS_LOG), help="Log a consultar.")
+        parser.add_argument('--desde', type=_fecha, help="Fecha inicial (AAAA-MM-DD), incluida.")
+        parser.add_argument('--hasta', type=_fecha, help="Fecha final (AAAA-MM-DD), incluida.")
+        parser.add_argument('--nivel', choices=NIVELES, help="Nivel mínimo.")
+        parser.add_argument('--logger', help="Logger (nombre exacto o prefijo con punto).")
+        parser.add_argument('--correo', help="Correo de usuario que debe aparecer en la entrada.")
+        parser.add_argument('--texto', help="Texto que debe aparecer en la entrada.")
+        parser.add_argument('--limite', type=int, default=500, help="Máximo de resultados (por defecto 500).")
+
+    def handle(self, *args, **options):
+        ruta = ruta_log(options['archivo'])
+        consulta = {clave: options[clave] for clave in ('desde', 'hasta', 'nivel', 'logger', 'correo')}
+
+        archivados = segmentos(ruta)
+        abiertos = sum(1 for _, indice in archivados if puede_coincidir(indice, **consulta))
+
+        encontrados = 0
+        for origen, entrada in buscar(ruta, texto=options['texto'], **consulta):
+            self.stdout.write(f"[{origen}] {entrada.nivel} {entrada.fecha} [{entrada.logger}] {entrada.mensaje}")
+            if entrada.detalle:
+                self.stdout.write(entrada.detalle)
+            encontrados += 1
+            if encontrados >= options['limite']:
+                break
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Resultados: {encontrados}. Segmentos descomprimidos: {abiertos} de {len(archivados)}."
+        ))
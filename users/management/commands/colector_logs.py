@@ -0,0 +1,55 @@
+# =====================================================================
+# Proyecto: SOFT-MEDIC
+# Archivo: users/management/commands/colector_logs.py
+# Versión: 1.0
+# Fecha: 17/10/2026
+# Elaborado por: Prixma Software Projects
+# Revisado por: Dirección Técnica de SOFT-MEDIC
+# =====================================================================
+
+import logging
+import logging.config
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from users.colector_logs import LOTE, ColectorLogs
+
+
+class Command(BaseCommand):
+    help = (
+        "Proceso único que recibe los registros de log de los workers (LOG_COLECTOR) "
+        "y los escribe por lotes en los archivos de LOGGING_ARCHIVOS."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--direccion',
+            default=settings.LOG_COLECTOR or '127.0.0.1:9020',
+            help="host:puerto de escucha (por defecto LOG_COLECTOR o 127.0.0.1:9020).",
+        )
+        parser.add_argument('--lote', type=int, default=LOTE, help=f"Registros por lote (por defecto {LOTE}).")
+
+    def handle(self, *args, **options):
+        # Este proceso escribe directamente en los archivos, no en sí mismo
+        logging.config.dictConfig(settings.LOGGING_ARCHIVOS)
+        handlers = {
+            handler
+            for nombre in settings.LOGGING_ARCHIVOS['loggers']
+            for handler in logging.getLogger(nombre).handlers
+        }
+
+        colector = ColectorLogs(options['direccion'], handlers=handlers, lote=options['lote'])
+        colector.iniciar()
+        self.stdout.write(self.style.SUCCESS(f"Colector de logs escuchando en {colector.direccion}."))
+        try:
+            while True:
+                time.sleep(3600)
+        except KeyboardInterrupt:
+            pass
+        finally:
+            colector.detener()
+            for handler in handlers:
+                handler.close()
+        self.stdout.write("Colector de logs detenido.")
@@ -1,17 +1,25 @@
 # users/middleware.py
 from django.contrib.auth import logout
-from django.contrib.sessions.models import Session
+
+from .models import SesionActiva
+
 
 class OneSessionPerUserMiddleware:
+    """
+    Mantiene una única sesión activa por usuario.
+
+    Las sesiones anteriores se expulsan al iniciar sesión (ver
+    users/signals.py). Aquí solo se comprueba, con una consulta por
+    índice, que la sesión de la petición siga registrada; si no lo está
+    (expulsada o anterior al registro), se cierra.
+    """
+
     def __init__(self, get_response):
         self.get_response = get_response
 
     def __call__(self, request):
         if request.user.is_authenticated:
             current_session_key = request.session.session_key
-            active_sessions = Session.objects.filter(expire_date__gt=request.session.get_expiry_date())
-            for session in active_sessions:
-                data = session.get_decoded()
-                if data.get('_auth_user_id') == str(request.user.id) and session.session_key != current_session_key:
-                    session.delete()  # Elimina otras sesiones activas
+            if not SesionActiva.objects.filter(sesion_id=current_session_key, usuario_id=request.user.pk).exists():
+                logout(request)  # Sesión expulsada por un inicio de sesión más reciente
         return self.get_response(request)
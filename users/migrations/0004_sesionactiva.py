@@ -0,0 +1,30 @@
+# Generated by Django 5.2.18 on 2026-10-17 22:48
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0003_alter_customuser_date_joined_alter_customuser_rol'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SesionActiva',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('session_key', models.CharField(max_length=40, unique=True, verbose_name='Clave de sesión')),
+                ('creada_en', models.DateTimeField(default=django.utils.timezone.now, verbose_name='Creada en')),
+                ('usuario', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='sesiones_activas', to=settings.AUTH_USER_MODEL, verbose_name='Usuario')),
+            ],
+            options={
+                'verbose_name': 'Sesión activa',
+                'verbose_name_plural': 'Sesiones activas',
+                'indexes': [models.Index(fields=['usuario', 'session_key'], name='sesion_usuario_clave_idx')],
+            },
+        ),
+    ]
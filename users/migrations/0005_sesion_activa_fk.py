@@ -0,0 +1,37 @@
+# Generated by Django 5.2.18 on 2026-10-17 23:58
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def borrar_registros_huerfanos(apps, schema_editor):
+    # Registros de sesiones ya cerradas o purgadas: la clave foránea los rechazaría
+    SesionActiva = apps.get_model('users', 'SesionActiva')
+    Session = apps.get_model('sessions', 'Session')
+    SesionActiva.objects.exclude(session_key__in=Session.objects.values('session_key')).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('sessions', '0001_initial'),
+        ('users', '0004_sesionactiva'),
+    ]
+
+    operations = [
+        migrations.RunPython(borrar_registros_huerfanos, migrations.RunPython.noop),
+        migrations.RemoveIndex(
+            model_name='sesionactiva',
+            name='sesion_usuario_clave_idx',
+        ),
+        migrations.RenameField(
+            model_name='sesionactiva',
+            old_name='session_key',
+            new_name='sesion',
+        ),
+        migrations.AlterField(
+            model_name='sesionactiva',
+            name='sesion',
+            field=models.OneToOneField(db_column='session_key', on_delete=django.db.models.deletion.CASCADE, related_name='registro_usuario', to='sessions.session', verbose_name='Sesión'),
+        ),
+    ]
@@ -1,5 +1,6 @@
 from django.db import models
 from django.contrib.auth.models import AbstractBaseUser, PermissionsMixin, BaseUserManager
+from django.contrib.sessions.models import Session
 from django.utils import timezone
 
 
@@ -69,3 +70,37 @@ class CustomUser(AbstractBaseUser, PermissionsMixin):
         verbose_name = 'Usuario'
         verbose_name_plural = 'Usuarios'
         ordering = ['nombre']
+
+
+class SesionActiva(models.Model):
+    """
+    Registro indexado usuario → sesión.
+
+    Se alimenta al iniciar sesión (ver users/signals.py), donde también
+    se expulsan las sesiones anteriores del usuario con una consulta por
+    índice, sin decodificar la tabla de sesiones. La fila depende de la
+    sesión: al cerrar sesión o al purgar las vencidas (`clearsessions`)
+    se borra con ella.
+    """
+
+    usuario = models.ForeignKey(
+        CustomUser,
+        on_delete=models.CASCADE,
+        related_name='sesiones_activas',
+        verbose_name='Usuario'
+    )
+    sesion = models.OneToOneField(
+        Session,
+        on_delete=models.CASCADE,
+        db_column='session_key',
+        related_name='registro_usuario',
+        verbose_name='Sesión'
+    )
+    creada_en = models.DateTimeField(default=timezone.now, verbose_name='Creada en')
+
+    class Meta:
+        verbose_name = 'Sesión activa'
+        verbose_name_plural = 'Sesiones activas'
+
+    def __str__(self):
+        return f"{self.usuario_id} → {self.sesion_id}"
@@ -1,7 +1,11 @@
-from django.db.models.signals import post_save
+from django.db.models.signals import post_save, post_delete
 from django.contrib.auth.models import Group
+from django.contrib.auth.signals import user_logged_in
+from django.contrib.sessions.models import Session
+from django.db import transaction
 from django.dispatch import receiver
-from .models import CustomUser
+from .models import CustomUser, SesionActiva
+from .directorio import CAMPOS_DIRECTORIO, invalidar_directorio
 
 @receiver(post_save, sender=CustomUser)
 def asignar_grupo_por_rol(sender, instance, created, **kwargs):
@@ -21,3 +25,42 @@ def asignar_grupo_por_rol(sender, instance, created, **kwargs):
 
         if grupo:
             instance.groups.add(grupo)
+
+
+@receiver(user_logged_in)
+def registrar_sesion_activa(sender, request, user, **kwargs):
+    """
+    Registra la sesión recién creada y expulsa las anteriores del
+    usuario. Solo se borran las registradas antes que esta, así la
+    sesión más reciente sobrevive aunque dos inicios se crucen y una
+    pestaña vieja no puede expulsar a la nueva.
+    """
+    session_key = getattr(getattr(request, 'session', None), 'session_key', None)
+    if not session_key:
+        return
+    registro, _ = SesionActiva.objects.update_or_create(sesion_id=session_key, defaults={'usuario': user})
+    anteriores = list(
+        SesionActiva.objects
+        .filter(usuario_id=user.pk, pk__lt=registro.pk)
+        .values_list('sesion_id', flat=True)
+    )
+    if anteriores:
+        # El registro se borra en cascada con la sesión
+        Session.objects.filter(session_key__in=anteriores).delete()
+
+
+@receiver(post_save, sender=CustomUser)
+def actualizar_directorio_medicos(sender, instance, update_fields=None, **kwargs):
+    """
+    Invalida el directorio de médicos en caché al confirmar la
+    transacción: antes, otra petición podría volver a cachear los datos
+    sin el cambio. Los guardados parciales que no tocan campos del
+    directorio (p. ej. last_login) se ignoran.
+    """
+    if update_fields is None or CAMPOS_DIRECTORIO & set(update_fields):
+        transaction.on_commit(invalidar_directorio)
+
+
+@receiver(post_delete, sender=CustomUser)
+def retirar_del_directorio_medicos(sender, instance, **kwargs):
+    transaction.on_commit(invalidar_directorio)
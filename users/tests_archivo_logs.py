@@ -0,0 +1,163 @@
+# =============================================================================
+# Proyecto: SOFT-MEDIC
+# Archivo: users/tests_archivo_logs.py
+# Versión: 1.2
+# Fecha: 17/10/2026
+# Elaborado por: Prixma Software Projects
+# Revisado por: Dirección Técnica de SOFT-MEDIC
+# =============================================================================
+
+import gzip
+import json
+import logging
+import os
+import shutil
+import tempfile
+from datetime import date
+from io import StringIO
+from unittest import mock
+
+from django.conf import settings
+from django.core.management import call_command
+from django.test import SimpleTestCase
+
+from .archivo_logs import SegmentosComprimidosHandler, archivar, buscar, leer_historial, segmentos
+
+
+class ArchivoLogsTest(SimpleTestCase):
+    """
+    Pruebas de la rotación en segmentos comprimidos y de la búsqueda por índice.
+    """
+
+    def setUp(self):
+        self.directorio = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directorio)
+        self.ruta = os.path.join(self.directorio, 'users.log')
+
+        self.handler = SegmentosComprimidosHandler(self.ruta, maxBytes=1)
+        self.handler.setFormatter(logging.Formatter('{levelname} {asctime} [{name}] {module} - {message}', style='{'))
+        self.addCleanup(self.handler.close)
+
+    def escribir(self, nivel, mensaje, fecha):
+        with mock.patch('time.time', return_value=fecha):
+            registro = logging.LogRecord('users', nivel, __file__, 1, mensaje, None, None)
+        self.handler.handle(registro)
+
+    def test_rota_en_segmentos_con_indice(self):
+        # 2026-10-01 y 2026-10-10 al mediodía (UTC)
+        self.escribir(logging.WARNING, "LOGIN FALLIDO: Intento de acceso con ana@test.com", 1790856000)
+        self.escribir(logging.INFO, "LOGIN EXITOSO: luis@test.com", 1791633600)
+        self.escribir(logging.WARNING, "LOGIN FALLIDO: Intento de acceso con luis@test.com", 1791633601)
+
+        archivados = segmentos(self.ruta)
+        self.assertEqual(len(archivados), 2)
+        ruta_segmento, indice = archivados[0]
+        self.assertEqual(indice['correos'], ['ana@test.com'])
+        self.assertEqual(indice['niveles'], {'WARNING': 1})
+        with gzip.open(ruta_segmento, 'rt', encoding='utf-8') as segmento:
+            self.assertIn("ana@test.com", segmento.read())
+
+        resultados = list(buscar(self.ruta, texto="LOGIN FALLIDO", correo="LUIS@test.com"))
+        self.assertEqual(len(resultados), 1)
+        self.assertIn("luis@test.com", resultados[0][1].mensaje)
+
+        resultados = list(buscar(self.ruta, desde=date(2026, 10, 5), nivel='WARNING'))
+        self.assertEqual(len(resultados), 1)
+        self.assertIn("LOGIN FALLIDO", resultados[0][1].mensaje)
+        self.assertEqual(resultados[0][1].fecha[:10], '2026-10-10')
+
+    def test_archivado_fallido_no_se_reintenta_en_cada_registro(self):
+        with mock.patch('users.archivo_logs.archivar', side_effect=PermissionError) as archivar:
+            for i in range(5):
+                self.escribir(logging.INFO, f"Registro {i}", 1790856000 + i)
+        self.assertEqual(archivar.call_count, 1)
+        with open(self.ruta, encoding='utf-8') as archivo:
+            self.assertEqual(archivo.read().count("Registro"), 5)
+
+    def test_sin_colector_varios_procesos_solo_agregan(self):
+        if not settings.LOG_COLECTOR:
+            for nombre, handler in settings.LOGGING_ARCHIVOS['handlers'].items():
+                if 'maxBytes' in handler:
+                    self.assertEqual(settings.LOGGING['handlers'][nombre]['maxBytes'], 0)
+
+        # Dos handlers sobre el mismo archivo (dos workers) sin rotación
+        otro = SegmentosComprimidosHandler(self.ruta, maxBytes=0)
+        self.addCleanup(otro.close)
+        self.handler.maxBytes = 0
+        for i in range(40):
+            (self.handler if i % 2 else otro).handle(logging.LogRecord('users', logging.INFO, __file__, 1, f"R{i}", None, None))
+        self.handler.flush()
+        otro.flush()
+        with open(self.ruta, encoding='utf-8') as archivo:
+            self.assertEqual(len(archivo.read().splitlines()), 40)
+        self.assertEqual(segmentos(self.ruta), [])
+
+    def test_solo_abre_segmentos_que_pueden_coincidir(self):
+        self.escribir(logging.WARNING, "LOGIN FALLIDO: Intento de acceso con ana@test.com", 1790856000)
+        self.escribir(logging.INFO, "LOGIN EXITOSO: luis@test.com", 1791633600)
+        self.escribir(logging.INFO, "Cierre de sesión", 1791633601)
+
+        abiertos = []
+        original = gzip.open
+
+        def abrir(ruta, *args, **kwargs):
+            abiertos.append(os.path.basename(ruta))
+            return original(ruta, *args, **kwargs)
+
+        with mock.patch('users.archivo_logs.gzip.open', side_effect=abrir):
+            list(buscar(self.ruta, correo='ana@test.com'))
+        self.assertEqual(abiertos, [os.path.basename(segmentos(self.ruta)[0][0])])
+
+        with open(f"{segmentos(self.ruta)[0][0]}.json", encoding='utf-8') as archivo_indice:
+            self.assertEqual(json.load(archivo_indice)['archivo'], 'users.log')
+
+    def agregar_eventos(self, *numeros):
+        with open(self.ruta, 'a', encoding='utf-8') as archivo:
+            for n in numeros:
+                archivo.write(f"INFO 2026-10-17 08:00:{n:02d},000 [users] views - Evento {n}\n")
+
+    def mensajes(self, pagina):
+        return [int(entrada.mensaje.rsplit(' ', 1)[1]) for entrada in pagina.entradas]
+
+    def test_historial_sigue_el_cursor_aunque_se_rote(self):
+        self.agregar_eventos(0, 1, 2, 3, 4)
+        archivar(self.ruta)
+        self.agregar_eventos(5, 6, 7, 8, 9)
+
+        primera = leer_historial(self.ruta, tamano=3)
+        self.assertEqual(self.mensajes(primera), [9, 8, 7])
+
+        # Se rota entre una página y otra: el cursor apuntaba al archivo vivo
+        archivar(self.ruta)
+        self.agregar_eventos(10, 11)
+
+        segunda = leer_historial(self.ruta, cursor=primera.cursor, tamano=3)
+        self.assertEqual(self.mensajes(segunda), [6, 5, 4])
+        tercera = leer_historial(self.ruta, cursor=segunda.cursor, tamano=4)
+        self.assertEqual(self.mensajes(tercera), [3, 2, 1, 0])
+        self.assertIsNone(leer_historial(self.ruta, cursor=tercera.cursor).cursor)
+
+        self.assertEqual(self.mensajes(leer_historial(self.ruta, tamano=3)), [11, 10, 9])
+        self.assertEqual(self.mensajes(leer_historial(self.ruta, cursor='no-valido', tamano=2)), [11, 10])
+
+    def test_historial_con_segmento_eliminado(self):
+        self.agregar_eventos(0, 1)
+        archivar(self.ruta)
+        self.agregar_eventos(2, 3)
+        archivar(self.ruta)
+        self.agregar_eventos(4)
+
+        primera = leer_historial(self.ruta, tamano=2)
+        self.assertEqual(self.mensajes(primera), [4, 3])
+        # backupCount borró el segmento al que apunta el cursor
+        os.remove(segmentos(self.ruta)[-1][0])
+        self.assertEqual(self.mensajes(leer_historial(self.ruta, cursor=primera.cursor)), [1, 0])
+
+    def test_comando_buscar_logs(self):
+        self.escribir(logging.WARNING, "LOGIN FALLIDO: Intento de acceso con ana@test.com", 1790856000)
+        self.escribir(logging.INFO, "LOGIN EXITOSO: luis@test.com", 1791633600)
+
+        salida = StringIO()
+        with mock.patch('users.management.commands.buscar_logs.ruta_log', return_value=self.ruta):
+            call_command('buscar_logs', 'users', '--correo', 'ana@test.com', '--texto', 'LOGIN FALLIDO', stdout=salida)
+        self.assertIn("Resultados: 1. Segmentos descomprimidos: 1 de 1.", salida.getvalue())
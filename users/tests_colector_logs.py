@@ -0,0 +1,134 @@
+# =============================================================================
+# Proyecto: SOFT-MEDIC
+# Archivo: users/tests_colector_logs.py
+# Versión: 1.1
+# Fecha: 17/10/2026
+# Elaborado por: Prixma Software Projects
+# Revisado por: Dirección Técnica de SOFT-MEDIC
+# =============================================================================
+
+import logging
+import os
+import shutil
+import socket
+import tempfile
+import time
+from unittest import mock, skipUnless
+
+from django.test import SimpleTestCase
+
+from .archivo_logs import SegmentosComprimidosHandler
+from . import colector_logs
+from .colector_logs import ColectorHandler, ColectorLogs, EnvioJSONHandler
+
+
+class ColectorLogsTest(SimpleTestCase):
+    """
+    Pruebas del envío de registros desde los workers a un único proceso escritor.
+    """
+
+    def setUp(self):
+        directorio = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directorio)
+        self.ruta = os.path.join(directorio, 'audit.log')
+
+        self.archivo = SegmentosComprimidosHandler(self.ruta)
+        self.archivo.setFormatter(logging.Formatter('{levelname} {asctime} [{name}] {module} - {message}', style='{'))
+        self.addCleanup(self.archivo.close)
+        self.colector = ColectorLogs('127.0.0.1:0', handlers=[self.archivo], despachar=self.archivo.handle, lote=10)
+        self.colector.iniciar()
+
+    def test_registros_de_varios_workers_llegan_completos(self):
+        workers = [ColectorHandler(self.colector.direccion) for _ in range(3)]
+        logger = logging.getLogger('prueba.colector')
+        logger.propagate = False
+        logger.setLevel(logging.INFO)
+        try:
+            for numero, handler in enumerate(workers):
+                logger.handlers = [handler]
+                for i in range(20):
+                    logger.info("Worker %s registro %s ñ", numero, i)
+            try:
+                raise ValueError("fallo de prueba")
+            except ValueError:
+                logger.exception("Con traza")
+        finally:
+            logger.handlers = []
+            for handler in workers:
+                handler.close()  # vacía la cola del worker
+        self.colector.detener()
+
+        with open(self.ruta, encoding='utf-8') as archivo:
+            contenido = archivo.read()
+        lineas = [linea for linea in contenido.splitlines() if linea.startswith('INFO ')]
+        self.assertEqual(len(lineas), 60)
+        self.assertIn("[prueba.colector] tests_colector_logs - Worker 2 registro 19 ñ", contenido)
+        self.assertIn("ValueError: fallo de prueba", contenido)
+        self.assertFalse(self.archivo.flush_por_registro)
+
+    def _leer(self, esperado):
+        # La última conexión puede seguir en la cola de aceptación del colector
+        limite = time.monotonic() + 5
+        while time.monotonic() < limite:
+            with open(self.ruta, encoding='utf-8') as archivo:
+                if esperado in archivo.read():
+                    break
+            time.sleep(0.05)
+        self.colector.detener()
+        with open(self.ruta, encoding='utf-8') as archivo:
+            return archivo.read()
+
+    def _registro(self, mensaje):
+        return logging.makeLogRecord({'name': 'prueba.colector', 'levelno': logging.INFO,
+                                      'levelname': 'INFO', 'msg': mensaje})
+
+    def test_registros_descartados_se_informan_al_reconectar(self):
+        # Puerto sin colector escuchando
+        libre = socket.socket()
+        libre.bind(('127.0.0.1', 0))
+        puerto = libre.getsockname()[1]
+        libre.close()
+
+        with mock.patch.object(colector_logs, 'PENDIENTES_MAXIMO', 3):
+            envio = EnvioJSONHandler('127.0.0.1', puerto)
+        self.addCleanup(envio.close)
+        for i in range(5):
+            envio.handle(self._registro(f"registro {i}"))
+        self.assertEqual(envio.descartados, 2)
+
+        envio.host, envio.port = colector_logs.separar_direccion(self.colector.direccion)
+        envio.address = (envio.host, envio.port)
+        envio.retryTime = None
+        envio.handle(self._registro("registro 5"))
+        self.assertEqual(envio.descartados, 0)
+        envio.close()
+
+        contenido = self._leer("registros descartados")
+        self.assertNotIn("registro 2", contenido)
+        self.assertIn("registro 3", contenido)
+        self.assertIn("registro 5", contenido)
+        self.assertIn("WARNING", contenido)
+        self.assertIn("COLECTOR: 3 registros descartados", contenido)
+
+    @skipUnless(hasattr(os, 'fork'), "requiere fork")
+    def test_oyente_se_inicia_en_cada_proceso(self):
+        handler = ColectorHandler(self.colector.direccion)
+        self.assertIsNone(handler.oyente)
+        handler.handle(self._registro("desde el padre"))
+        oyente_padre = handler.oyente
+
+        pid = os.fork()
+        if pid == 0:  # pragma: no cover - proceso hijo
+            try:
+                handler.handle(self._registro("desde el hijo"))
+                handler.close()
+            finally:
+                os._exit(0 if handler.oyente is None and handler._pid == os.getpid() else 1)
+        _, estado = os.waitpid(pid, 0)
+        self.assertEqual(os.waitstatus_to_exitcode(estado), 0)
+        self.assertIs(handler.oyente, oyente_padre)
+        handler.close()
+
+        contenido = self._leer("desde el hijo")
+        self.assertIn("desde el padre", contenido)
+        self.assertIn("desde el hijo", contenido)
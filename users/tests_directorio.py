@@ -0,0 +1,71 @@
+# =============================================================================
+# Proyecto: SOFT-MEDIC
+# Archivo: users/tests_directorio.py
+# Versión: 1.1
+# Fecha: 17/10/2026
+# Elaborado por: Prixma Software Projects
+# Revisado por: Dirección Técnica de SOFT-MEDIC
+# =============================================================================
+
+from django.core.cache import cache
+from django.test import TestCase
+
+from .directorio import medicos
+from .models import CustomUser
+
+
+class DirectorioMedicosTest(TestCase):
+    """
+    Pruebas del directorio de médicos en caché con invalidación por versión.
+    """
+
+    def setUp(self):
+        cache.clear()
+        self.medico = CustomUser.objects.create_user(
+            correo='medico.directorio@test.com', nombre='Ana Medico', rol='MEDICO', password='123456'
+        )
+        CustomUser.objects.create_user(
+            correo='recepcion.directorio@test.com', nombre='Recepcion', rol='RECEPCIONISTA', password='123456'
+        )
+
+    def test_solo_medicos_y_en_cache(self):
+        self.assertEqual([m.nombre for m in medicos()], ['Ana Medico'])
+        with self.assertNumQueries(0):
+            medicos()
+
+    def test_se_invalida_al_guardar(self):
+        medicos()
+        self.medico.nombre = 'Ana María Medico'
+        with self.captureOnCommitCallbacks(execute=True):
+            self.medico.save()
+        self.assertEqual([m.nombre for m in medicos()], ['Ana María Medico'])
+
+        self.medico.is_active = False
+        with self.captureOnCommitCallbacks(execute=True):
+            self.medico.save(update_fields=['is_active'])
+        self.assertEqual(medicos(), [])
+
+    def test_se_invalida_al_confirmar(self):
+        medicos()
+        self.medico.nombre = 'Ana María Medico'
+        with self.captureOnCommitCallbacks() as pendientes:
+            self.medico.save()
+            # Sin confirmar, una lectura no cachea el nombre nuevo
+            self.assertEqual([m.nombre for m in medicos()], ['Ana Medico'])
+        self.assertEqual(len(pendientes), 1)
+        pendientes[0]()
+        self.assertEqual([m.nombre for m in medicos()], ['Ana María Medico'])
+
+    def test_se_invalida_al_eliminar(self):
+        medicos()
+        with self.captureOnCommitCallbacks(execute=True):
+            self.medico.delete()
+        self.assertEqual(medicos(), [])
+
+    def test_last_login_no_invalida(self):
+        medicos()
+        with self.captureOnCommitCallbacks(execute=True) as pendientes:
+            self.medico.save(update_fields=['last_login'])
+        self.assertEqual(pendientes, [])
+        with self.assertNumQueries(0):
+            medicos()
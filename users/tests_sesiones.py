@@ -0,0 +1,83 @@
+# =============================================================================
+# Proyecto: SOFT-MEDIC
+# Archivo: users/tests_sesiones.py
+# Versión: 1.1
+# Fecha: 17/10/2026
+# Elaborado por: Prixma Software Projects
+# Revisado por: Dirección Técnica de SOFT-MEDIC
+# =============================================================================
+
+from datetime import timedelta
+
+from django.contrib.sessions.models import Session
+from django.core.management import call_command
+from django.test import TestCase, Client
+from django.urls import reverse
+from django.utils import timezone
+
+from .models import CustomUser, SesionActiva
+
+
+class UnaSesionPorUsuarioTest(TestCase):
+    """
+    Pruebas del registro indexado usuario → sesión y del middleware
+    OneSessionPerUserMiddleware.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.medico = CustomUser.objects.create_user(
+            correo='medico.sesion@test.com',
+            nombre='Medico Sesion',
+            rol='MEDICO',
+            password='medico123'
+        )
+
+    # -------------------------------------------------------------------------
+    def test_login_y_logout_mantienen_registro(self):
+        """El login registra la sesión y el logout la retira del índice."""
+        cliente = Client()
+        cliente.login(username='medico.sesion@test.com', password='medico123')
+        clave = cliente.session.session_key
+        self.assertTrue(SesionActiva.objects.filter(usuario=self.medico, sesion_id=clave).exists())
+
+        cliente.get(reverse('users:logout'))
+        self.assertFalse(SesionActiva.objects.filter(sesion_id=clave).exists())
+
+    # -------------------------------------------------------------------------
+    def test_nueva_sesion_expulsa_la_anterior(self):
+        """El inicio de sesión nuevo elimina la sesión previa del usuario."""
+        primero, segundo = Client(), Client()
+        primero.login(username='medico.sesion@test.com', password='medico123')
+        clave_anterior = primero.session.session_key
+
+        segundo.login(username='medico.sesion@test.com', password='medico123')
+
+        self.assertFalse(Session.objects.filter(session_key=clave_anterior).exists())
+        self.assertEqual(
+            list(SesionActiva.objects.filter(usuario=self.medico).values_list('sesion_id', flat=True)),
+            [segundo.session.session_key]
+        )
+
+        respuesta = primero.get(reverse('users:medico_dashboard'))
+        self.assertEqual(respuesta.status_code, 302)
+
+    # -------------------------------------------------------------------------
+    def test_pestana_vieja_no_expulsa_la_sesion_nueva(self):
+        """Peticiones desde la sesión expulsada no afectan a la más reciente."""
+        primero, segundo = Client(), Client()
+        primero.login(username='medico.sesion@test.com', password='medico123')
+        segundo.login(username='medico.sesion@test.com', password='medico123')
+
+        self.assertEqual(primero.get(reverse('users:medico_dashboard')).status_code, 302)
+        self.assertEqual(segundo.get(reverse('users:medico_dashboard')).status_code, 200)
+
+    # -------------------------------------------------------------------------
+    def test_sesiones_purgadas_salen_del_registro(self):
+        """clearsessions borra también el registro de las sesiones vencidas."""
+        cliente = Client()
+        cliente.login(username='medico.sesion@test.com', password='medico123')
+        Session.objects.update(expire_date=timezone.now() - timedelta(seconds=1))
+
+        call_command('clearsessions')
+        self.assertFalse(SesionActiva.objects.exists())
@@ -0,0 +1,79 @@
+# =============================================================================
+# Proyecto: SOFT-MEDIC
+# Archivo: users/tests_visor_logs.py
+# Versión: 1.0
+# Fecha: 17/10/2026
+# Elaborado por: Prixma Software Projects
+# Revisado por: Dirección Técnica de SOFT-MEDIC
+# =============================================================================
+
+import os
+import tempfile
+from io import BytesIO
+from unittest import mock
+
+from django.test import TestCase
+from django.urls import reverse
+
+from .models import CustomUser
+from .visor_logs import _lineas_inverso, leer_pagina
+
+CONTENIDO = (
+    "INFO 2026-10-17 08:00:00,001 [users] views - Inicio de sesión de ana@test.com\r\n"
+    "ERROR 2026-10-17 08:01:00,002 [django.request] log - Internal Server Error: /historias/\r\n"
+    "Traceback (most recent call last):\r\n"
+    "  File \"views.py\", line 35, in reporte\r\n"
+    "AttributeError: 'HistoriaClinica' object has no attribute 'fecha_creacion'\r\n"
+    "WARNING 2026-10-17 08:02:00,003 [security] middleware - Sesión duplicada cerrada\n"
+    "INFO 2026-10-17 08:03:00,004 [historias.agenda] agenda - Cita agendada \xf1\n"
+)
+
+
+class VisorLogsTest(TestCase):
+    """
+    Pruebas de la lectura inversa y paginada de los logs.
+    """
+
+    def setUp(self):
+        descriptor, self.ruta = tempfile.mkstemp(suffix='.log')
+        with os.fdopen(descriptor, 'wb') as archivo:
+            archivo.write(CONTENIDO.encode('utf-8'))
+        self.addCleanup(os.remove, self.ruta)
+
+    def test_lineas_inversas_con_bloques_pequenos(self):
+        datos = CONTENIDO.encode('utf-8')
+        lineas = list(_lineas_inverso(BytesIO(datos), len(datos), bloque=7))
+        esperadas = []
+        offset = 0
+        for linea in datos.split(b'\n'):
+            esperadas.append((offset, linea))
+            offset += len(linea) + 1
+        self.assertEqual(lineas, list(reversed(esperadas)))
+
+    def test_paginas_de_la_mas_reciente_a_la_mas_antigua(self):
+        primera = leer_pagina(self.ruta, tamano=2)
+        self.assertEqual([e.logger for e in primera.entradas], ['historias.agenda', 'security'])
+        self.assertTrue(primera.entradas[0].mensaje.endswith('Cita agendada ñ'))
+
+        segunda = leer_pagina(self.ruta, cursor=primera.cursor, tamano=2)
+        self.assertEqual([e.nivel for e in segunda.entradas], ['ERROR', 'INFO'])
+        self.assertIn("fecha_creacion'", segunda.entradas[0].detalle)
+        self.assertEqual(segunda.entradas[0].detalle.count('\n'), 2)
+        self.assertIsNone(segunda.cursor)
+
+    def test_filtros(self):
+        self.assertEqual([e.nivel for e in leer_pagina(self.ruta, nivel='WARNING').entradas], ['WARNING', 'ERROR'])
+        self.assertEqual(len(leer_pagina(self.ruta, logger='historias').entradas), 1)
+        self.assertEqual(len(leer_pagina(self.ruta, logger='histor').entradas), 0)
+        self.assertEqual([e.nivel for e in leer_pagina(self.ruta, texto='ATTRIBUTEERROR').entradas], ['ERROR'])
+
+    def test_vista_reportes_sistema(self):
+        admin = CustomUser.objects.create_user(
+            correo='admin.logs@test.com', nombre='Admin Logs', rol='ADMIN', password='123456'
+        )
+        self.client.force_login(admin)
+        with mock.patch('users.views.ruta_log', return_value=self.ruta):
+            respuesta = self.client.get(reverse('users:reportes_sistema'), {'archivo': 'errors', 'nivel': 'ERROR'})
+        self.assertEqual(respuesta.status_code, 200)
+        self.assertEqual(len(respuesta.context['pagina'].entradas), 1)
+        self.assertContains(respuesta, "Internal Server Error")
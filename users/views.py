@@ -1,9 +1,7 @@
 # -------------------------------------------------------------------
 # users/views.py
 # -------------------------------------------------------------------
-import os
 import logging
-from django.conf import settings
 from django.shortcuts import render, redirect
 from django.contrib.auth import login, logout, authenticate, get_user_model
 from django.contrib import messages
@@ -18,10 +16,14 @@ from django.urls import reverse
 
 from .forms import CustomUserCreationForm, CustomLoginForm, PasswordResetRequestForm
 from .decorators import admin_required, medico_required, recepcionista_required
+from .archivo_logs import leer_historial
+from .visor_logs import ARCHIVOS_LOG, NIVELES, ruta_log
 
 User = get_user_model()
 logger = logging.getLogger('users')  # Logger específico para la app 'users'
 
+ENTRADAS_POR_PAGINA = 50
+
 
 # -------------------------------------------------------------------
 # REGISTRO DE USUARIO
@@ -176,31 +178,35 @@ def password_reset_request(request):
 @login_required
 @user_passes_test(lambda u: u.rol == 'ADMIN')
 def reportes_sistema(request):
-    """Muestra los contenidos de los archivos de logs del sistema con manejo de codificación segura."""
-    log_dir = os.path.join(settings.BASE_DIR, 'logs')
-    logs_content = ""
-
-    log_files = [
-        ('users.log', '📘 Actividades de Usuarios'),
-        ('security.log', '🛡️ Seguridad y Accesos'),
-        ('audit.log', '📋 Auditoría del Sistema'),
-        ('errors.log', '❌ Errores del Sistema'),
-    ]
-
-    for filename, title in log_files:
-        file_path = os.path.join(log_dir, filename)
-        if os.path.exists(file_path):
-            try:
-                # Intentar primero UTF-8
-                with open(file_path, 'r', encoding='utf-8') as f:
-                    content = f.read().strip() or "Sin registros disponibles."
-            except UnicodeDecodeError:
-                # Si falla, intentar Latin-1
-                with open(file_path, 'r', encoding='latin-1', errors='replace') as f:
-                    content = f.read().strip() or "Sin registros disponibles (codificación incompatible)."
-            logs_content += f"\n\n===== {title} ({filename}) =====\n{content}\n"
-        else:
-            logs_content += f"\n\n===== {title} ({filename}) =====\nArchivo no encontrado.\n"
+    """
+    Visor de los archivos de logs del sistema: lee desde el final del
+    archivo, por páginas y con filtros, sin cargarlo completo, y sigue
+    por los segmentos archivados (users/archivo_logs.py).
+    """
+    clave = request.GET.get('archivo', 'errors')
+    if clave not in ARCHIVOS_LOG:
+        clave = 'errors'
+    cursor = request.GET.get('cursor') or None
+    filtros = {
+        'nivel': request.GET.get('nivel') or None,
+        'logger': request.GET.get('logger', '').strip() or None,
+        'texto': request.GET.get('q', '').strip() or None,
+    }
 
-    logger.info(f"ACCESO: {request.user.correo} ingresó a la sección de REPORTES DEL SISTEMA.")
-    return render(request, 'users/reportes_sistema.html', {'logs_content': logs_content})
+    pagina = leer_historial(ruta_log(clave), cursor=cursor, tamano=ENTRADAS_POR_PAGINA, **filtros)
+
+    parametros = request.GET.copy()
+    parametros.pop('cursor', None)
+
+    if cursor is None:
+        logger.info(f"ACCESO: {request.user.correo} ingresó a la sección de REPORTES DEL SISTEMA.")
+    return render(request, 'users/reportes_sistema.html', {
+        'archivos': [(c, titulo) for c, (_, titulo) in ARCHIVOS_LOG.items()],
+        'archivo': clave,
+        'titulo': ARCHIVOS_LOG[clave][1],
+        'niveles': NIVELES,
+        'filtros': filtros,
+        'pagina': pagina,
+        'cursor': cursor,
+        'parametros': parametros.urlencode(),
+    })
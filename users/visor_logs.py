@@ -0,0 +1,211 @@
+# =====================================================================
+# Proyecto: SOFT-MEDIC
+# Archivo: users/visor_logs.py
+# Versión: 1.3
+# Fecha: 17/10/2026
+# Elaborado por: Prixma Software Projects
+# Revisado por: Dirección Técnica de SOFT-MEDIC
+# =====================================================================
+#
+# Lectura paginada de los archivos de log, de lo más reciente a lo más
+# antiguo, sin cargar el archivo completo.
+#
+# El archivo se recorre hacia atrás desde el final (o desde el cursor)
+# en bloques de tamaño fijo con seek(). Las líneas de continuación
+# (trazas de excepción) se agrupan con la cabecera que las precede:
+#
+#     NIVEL AAAA-MM-DD HH:MM:SS,mmm [logger] módulo - mensaje
+#
+# El cursor de leer_pagina es el desplazamiento en bytes de la entrada
+# más antigua mostrada dentro del archivo leído. Al rotar, el contenido
+# del archivo vivo pasa a un segmento de logs/archivo/ y ese
+# desplazamiento deja de valer para el archivo vivo: el visor de
+# reportes_sistema usa archivo_logs.leer_historial, cuyo cursor nombra
+# además el archivo (vivo o segmento) al que se refiere.
+# ---------------------------------------------------------------------
+
+import logging
+import os
+import re
+from collections import namedtuple
+
+from django.conf import settings
+
+# Archivos visibles en reportes_sistema: clave -> (archivo, título)
+ARCHIVOS_LOG = {
+    'users': ('users.log', '📘 Actividades de Usuarios'),
+    'security': ('security.log', '🛡️ Seguridad y Accesos'),
+    'audit': ('audit.log', '📋 Auditoría del Sistema'),
+    'errors': ('errors.log', '❌ Errores del Sistema'),
+}
+
+NIVELES = ['DEBUG', 'INFO', 'WARNING', 'ERROR', 'CRITICAL']
+
+BLOQUE = 64 * 1024
+# Bytes que se recorren como máximo por página cuando los filtros descartan casi todo
+LIMITE_ESCANEO = 16 * 1024 * 1024
+
+CABECERA = re.compile(
+    rb'^(DEBUG|INFO|WARNING|ERROR|CRITICAL) (\d{4}-\d{2}-\d{2} [\d:,.]+) \[([^\]]+)\] (.*)$'
+)
+
+Entrada = namedtuple('Entrada', ['offset', 'nivel', 'fecha', 'logger', 'mensaje', 'detalle'])
+Pagina = namedtuple('Pagina', ['entradas', 'cursor', 'incompleta'])
+
+
+def ruta_log(clave):
+    return os.path.join(settings.LOG_DIR, ARCHIVOS_LOG[clave][0])
+
+
+def _decodificar(datos):
+    return datos.decode('utf-8', errors='replace')
+
+
+def _lineas_inverso(archivo, fin, bloque=BLOQUE):
+    """(offset, línea) de las líneas que terminan antes de `fin`, de la última a la primera."""
+    posicion, resto = fin, b''
+    while posicion > 0:
+        leer = min(bloque, posicion)
+        posicion -= leer
+        archivo.seek(posicion)
+        partes = (archivo.read(leer) + resto).split(b'\n')
+        # La primera parte puede continuar en el bloque anterior
+        resto = partes.pop(0)
+        offset = posicion + len(resto) + 1
+        ubicadas = []
+        for parte in partes:
+            ubicadas.append((offset, parte))
+            offset += len(parte) + 1
+        yield from reversed(ubicadas)
+    yield 0, resto
+
+
+def _entradas_inverso(archivo, fin):
+    """Entradas completas (cabecera + continuación) que empiezan antes de `fin`, de la última a la primera."""
+    continuacion, inicio = [], None
+    for offset, linea in _lineas_inverso(archivo, fin):
+        linea = linea.rstrip(b'\r')
+        coincidencia = CABECERA.match(linea)
+        if coincidencia is None:
+            if linea.strip():
+                continuacion.append(linea)
+                inicio = offset
+            continue
+        nivel, fecha, nombre, mensaje = coincidencia.groups()
+        detalle = b'\n'.join(reversed(continuacion))
+        yield offset, nivel, fecha, nombre, mensaje, detalle
+        continuacion, inicio = [], None
+    if continuacion:
+        # Líneas sin cabecera al inicio del archivo
+        yield inicio, None, None, None, b'', b'\n'.join(reversed(continuacion))
+
+
+def entradas_en_orden(archivo):
+    """Entradas de un archivo binario abierto, de la primera a la última."""
+    offset, inicio, cabecera, continuacion = 0, 0, None, []
+    for linea in archivo:
+        posicion, offset = offset, offset + len(linea)
+        linea = linea.rstrip(b'\r\n')
+        coincidencia = CABECERA.match(linea)
+        if coincidencia is None:
+            if linea.strip():
+                continuacion.append(linea)
+            continue
+        if cabecera is not None or continuacion:
+            yield _entrada(inicio, cabecera, continuacion)
+        inicio, cabecera, continuacion = posicion, coincidencia, []
+    if cabecera is not None or continuacion:
+        yield _entrada(inicio, cabecera, continuacion)
+
+
+def _entrada(offset, cabecera, continuacion):
+    nivel, fecha, nombre, mensaje = cabecera.groups() if cabecera else (b'', b'', b'', b'')
+    return Entrada(
+        offset, nivel.decode(), fecha.decode(), _decodificar(nombre),
+        _decodificar(mensaje), _decodificar(b'\n'.join(continuacion)),
+    )
+
+
+def coincide(entrada, nivel=None, logger=None, texto=None):
+    """Aplica a una entrada ya decodificada los mismos filtros de leer_pagina."""
+    if nivel in NIVELES and (
+        not entrada.nivel or logging.getLevelName(entrada.nivel) < logging.getLevelName(nivel)
+    ):
+        return False
+    if logger and entrada.logger != logger and not entrada.logger.startswith(f"{logger}."):
+        return False
+    if texto and texto.lower() not in f"{entrada.logger} {entrada.mensaje}\n{entrada.detalle}".lower():
+        return False
+    return True
+
+
+def coincidencias_inverso(archivo, fin, nivel=None, logger=None, texto=None):
+    """
+    (offset, Entrada o None) de cada entrada de `archivo` que empieza
+    antes de `fin`, de la más reciente a la más antigua. None indica
+    que la entrada no pasa los filtros (ver leer_pagina).
+    """
+    nivel_minimo = logging.getLevelName(nivel) if nivel in NIVELES else None
+    prefijo = f"{logger}.".encode() if logger else None
+    logger_bytes = logger.encode() if logger else None
+    texto = texto.lower() if texto else None
+
+    for offset, nivel_e, fecha, nombre, mensaje, detalle in _entradas_inverso(archivo, fin):
+        # Los filtros de nivel y logger se resuelven sin decodificar la entrada
+        if nivel_minimo is not None and (nivel_e is None or logging.getLevelName(nivel_e.decode()) < nivel_minimo):
+            yield offset, None
+        elif logger_bytes and nombre != logger_bytes and not (nombre or b'').startswith(prefijo):
+            yield offset, None
+        else:
+            entrada = Entrada(
+                offset,
+                nivel_e.decode() if nivel_e else '',
+                fecha.decode() if fecha else '',
+                _decodificar(nombre) if nombre else '',
+                _decodificar(mensaje),
+                _decodificar(detalle),
+            )
+            if texto is None or texto in f"{entrada.logger} {entrada.mensaje}\n{entrada.detalle}".lower():
+                yield offset, entrada
+            else:
+                yield offset, None
+
+
+def leer_pagina(ruta, cursor=None, tamano=50, nivel=None, logger=None, texto=None):
+    """
+    Hasta `tamano` entradas, de la más reciente a la más antigua, que
+    empiezan antes de `cursor` (byte) y pasan los filtros:
+
+      - nivel: nivel mínimo ('WARNING' incluye ERROR y CRITICAL).
+      - logger: nombre exacto o prefijo con punto ('historias' incluye 'historias.x').
+      - texto: subcadena sin distinguir mayúsculas.
+
+    `Pagina.cursor` es None cuando se llegó al inicio del archivo;
+    `incompleta` indica que se cortó por LIMITE_ESCANEO.
+    """
+    if not os.path.exists(ruta):
+        return Pagina([], None, False)
+
+    entradas = []
+    with open(ruta, 'rb') as archivo:
+        tamano_archivo = archivo.seek(0, os.SEEK_END)
+        fin = tamano_archivo if cursor is None else max(0, min(cursor, tamano_archivo))
+
+        for offset, entrada in coincidencias_inverso(archivo, fin, nivel, logger, texto):
+            if entrada is not None:
+                entradas.append(entrada)
+                if len(entradas) >= tamano:
+                    return Pagina(entradas, offset or None, False)
+            if fin - offset > LIMITE_ESCANEO:
+                return Pagina(entradas, offset or None, True)
+    return Pagina(entradas, None, False)
+
+
+# =====================================================================
+# CONTROL DE CAMBIOS
+# =====================================================================
+# Versión | Fecha       | Autor / Responsable      | Descripción
+# 1.0     | 17/10/2026  | Prixma Software Projects | Lectura inversa y paginada de los logs
+# 1.1     | 17/10/2026  | Prixma Software Projects | Lectura hacia adelante y filtros reutilizables (segmentos archivados)
+# 1.2     | 18/10/2026  | Prixma Software Projects | ruta_log usa settings.LOG_DIR
+# 1.3     | 18/10/2026  | Prixma Software Projects | Filtros de la lectura inversa reutilizables (coincidencias_inverso)